@@ -75,7 +75,9 @@ def cache_delete(key: str):
 
 
 def cache_delete_pattern(pattern: str):
-    """패턴에 맞는 키 모두 삭제"""
+    """패턴에 맞는 키 모두 삭제 (인메모리 캐시 포함)"""
+    memory_cache_delete_pattern(pattern)
+
     client = get_redis()
     if not client:
         return
@@ -112,6 +114,14 @@ def memory_cache_set(key: str, value: Any, expire: int = 300):
     _memory_cache_expiry[key] = time.time() + expire
 
 
+def memory_cache_delete_pattern(pattern: str):
+    """인메모리 캐시에서 패턴에 맞는 키 삭제"""
+    import fnmatch
+    for key in [k for k in _memory_cache if fnmatch.fnmatchcase(k, pattern)]:
+        _memory_cache.pop(key, None)
+        _memory_cache_expiry.pop(key, None)
+
+
 def smart_cache_get(key: str) -> Optional[Any]:
     """Redis 또는 인메모리 캐시에서 조회"""
     result = cache_get(key)
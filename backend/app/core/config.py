@@ -19,6 +19,7 @@ class Settings(BaseSettings):
     SECRET_KEY: str = ""
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 365  # 365일 (웹뷰 앱용 - 로그아웃 전까지 유지)
+    CRYPTO_EXECUTOR_WORKERS: int = 2  # bcrypt/RSA 전용 스레드 수 (로그인 폭주 시 이벤트 루프 보호)
 
     # Login Rate Limiting
     LOGIN_MAX_ATTEMPTS: int = 5  # 최대 로그인 시도 횟수
@@ -33,6 +34,67 @@ class Settings(BaseSettings):
     # Swing2App Push Notification
     SWING_APP_ID: str = ""
     SWING_API_KEY: str = ""
+    SWING_PUSH_URL: str = "https://www.swing2app.com/swapi/push_api_send_message"
+
+    # Push Outbox Dispatcher
+    PUSH_BATCH_SIZE: int = 500  # send_target_list 1회 최대 수신자 수
+    PUSH_DISPATCH_INTERVAL_SECONDS: int = 5  # 아웃박스 폴링 주기
+    PUSH_MAX_ATTEMPTS: int = 5  # 최대 재시도 횟수
+    PUSH_RETRY_BASE_SECONDS: int = 30  # 재시도 지수 백오프 기준 (30s, 60s, 120s...)
+    PUSH_RETENTION_DAYS: int = 14  # 발송 완료/실패 행 보관 기간 (지나면 매일 삭제)
+    PUSH_PURGE_BATCH_SIZE: int = 5000  # 정리 시 한 번에 삭제할 행 수
+
+    # 공지사항 크롤러
+    CRAWLER_MAX_PAGES: int = 5  # 목록 최대 페이지 (이미 아는 공지에 도달하면 조기 종료)
+    CRAWLER_DETAIL_CONCURRENCY: int = 4  # 상세 페이지 동시 요청 수
+    CRAWLER_HOST_MIN_INTERVAL: float = 0.2  # 같은 호스트 요청 간 최소 간격 (초)
+
+    # 공지사항 검색
+    ANNOUNCEMENT_SEARCH_BACKEND: str = "auto"  # auto(FULLTEXT 인덱스 있으면 mysql), mysql, memory
+    ANNOUNCEMENT_SEARCH_REFRESH_SECONDS: int = 30  # 프로세스 내 인덱스 증분 갱신 최소 간격
+    ANNOUNCEMENT_SEARCH_BODY_CHARS: int = 1000  # 프로세스 내 인덱스에 넣을 본문 앞부분 길이
+
+    # upstream 스냅샷 디스크 저장소 (워커 재시작 시 즉시 응답용)
+    SNAPSHOT_STORE_PATH: str = "data/snapshots.db"  # 상대 경로는 backend 디렉터리 기준
+    CRAWLER_STARTUP_MIN_INTERVAL: int = 600  # 이 시간 안에 크롤링했으면 시작 시 크롤링 생략 (초)
+
+    # 본문 이미지 프록시 (내용 주소 디스크 캐시)
+    IMAGE_CACHE_DIR: str = "data/images"  # 상대 경로는 backend 디렉터리 기준
+    IMAGE_CACHE_MAX_MB: int = 512  # 넘으면 오래 안 쓴 이미지부터 삭제
+    IMAGE_MAX_BYTES: int = 10 * 1024 * 1024  # 이보다 큰 이미지는 원본 URL 유지
+
+    # 로그인 직후 캐시 워밍 (Canvas 할 일/과목, EARS 출석, folio 마일리지)
+    WARMUP_CONCURRENCY: int = 4  # 학교 서버로 동시에 나가는 워밍 작업 수 (전체)
+    WARMUP_QUEUE_SIZE: int = 1000  # 대기 작업 최대 수 (넘치면 워밍 생략)
+    WARMUP_DEDUPE_SECONDS: int = 600  # 같은 사용자를 다시 워밍하지 않는 시간
+
+    # 포털 세션 유지 (Canvas/EARS/GPT/folio 세션을 만료 전에 미리 재로그인)
+    KEEPALIVE_INTERVAL_SECONDS: int = 60  # 만료 임박 세션 확인 주기
+    KEEPALIVE_ACTIVE_SECONDS: int = 3 * 3600  # 이 시간 안에 사용한 세션만 유지
+    KEEPALIVE_REFRESH_RATIO: float = 0.8  # 예상 수명의 이 비율이 지나면 세션 확인 (확인 요청이 없는 서비스는 재로그인)
+    KEEPALIVE_PROBE_INTERVAL_SECONDS: int = 300  # 확인 결과 살아 있는 세션을 다시 확인하는 간격 (수명 관측 정밀도)
+    KEEPALIVE_JITTER_SECONDS: int = 300  # 확인/재로그인 시점을 세션마다 최대 이만큼 앞당겨 분산
+    KEEPALIVE_MAX_PER_MINUTE: int = 20  # 전체 확인/재로그인 속도 제한
+    KEEPALIVE_MIN_SAMPLES: int = 20  # 관측 수명을 예상 수명으로 쓰기 위한 최소 만료 관측 수
+
+    # folio (장학 마일리지)
+    FOLIO_CONCURRENCY: int = 4  # folio로 동시에 나가는 요청 수 (워커당, 일괄 갱신 시 차단 방지)
+
+    # EARS 출석 캐시 (과목별, 오래되면 응답 후 백그라운드 갱신, 수업이 끝나면 예약 갱신)
+    EARS_ATTENDANCE_FRESH_SECONDS: int = 300  # 이 시간 안에 조회한 과목은 캐시 그대로 응답
+    EARS_ATTENDANCE_STALE_SECONDS: int = 6 * 3600  # 이 시간까지는 캐시로 응답하고 백그라운드 갱신 (넘으면 바로 조회)
+    EARS_USER_CONCURRENCY: int = 3  # 사용자 한 명이 EARS로 동시에 보내는 출석 조회 수
+    EARS_CLASS_END_DELAY_MINUTES: int = 15  # 수업 종료 후 이만큼 지나 출석 갱신 (교수 출석 입력 대기)
+    EARS_ACTIVE_SECONDS: int = 24 * 3600  # 이 시간 안에 출석을 조회한 사용자만 수업 종료 후 갱신
+    EARS_SCHEDULED_MAX_PER_MINUTE: int = 30  # 수업 종료 후 갱신 사용자 수 제한 (낮은 우선순위)
+
+    # 스크래핑 페이지 파싱 (큰 페이지는 프로세스 풀에서 파싱해 이벤트 루프를 막지 않음)
+    PARSE_POOL_WORKERS: int = 0  # 파싱 프로세스 수 (0이면 CPU 코어 수, 워커 프로세스마다 따로 생김)
+    PARSE_INLINE_MAX_BYTES: int = 64 * 1024  # 이보다 작은 페이지는 이벤트 루프에서 바로 파싱 (음수면 풀 사용 안 함)
+
+    # 학교 서버 HAR 재생 (부하 테스트/벤치마크용, 비워 두면 실제 서버)
+    UPSTREAM_REPLAY_URL: str = ""  # 재생 서버 주소(http://127.0.0.1:8799) 또는 HAR 파일 경로(콤마 구분)
+    UPSTREAM_REPLAY_HOSTS: str = "sunmoon.ac.kr,*.sunmoon.ac.kr"  # 재생 서버로 보낼 호스트 패턴
 
     @property
     def DATABASE_URL(self) -> str:
@@ -0,0 +1,38 @@
+"""
+한글 검색 유틸 (초성 변환, 초성/완성형 혼합 매칭)
+"""
+
+CHOSEONG = [
+    "ㄱ", "ㄲ", "ㄴ", "ㄷ", "ㄸ", "ㄹ", "ㅁ", "ㅂ", "ㅃ", "ㅅ",
+    "ㅆ", "ㅇ", "ㅈ", "ㅉ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+]
+CHOSEONG_SET = set(CHOSEONG)
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절을 초성으로 변환 (그 외 문자는 유지)"""
+    result = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            result.append(CHOSEONG[code // 588])
+        else:
+            result.append(ch)
+    return "".join(result)
+
+
+def has_choseong(text: str) -> bool:
+    return any(ch in CHOSEONG_SET for ch in text)
+
+
+def mixed_find(text: str, text_choseong: str, query: str, query_choseong: str, start: int = 0) -> int:
+    """초성/완성형 혼합 검색어 위치 (초성 자리는 초성만, 음절 자리는 음절까지 일치)"""
+    pos = text_choseong.find(query_choseong, start)
+    while pos != -1:
+        if all(
+            q in CHOSEONG_SET or text[pos + i] == q
+            for i, q in enumerate(query)
+        ):
+            return pos
+        pos = text_choseong.find(query_choseong, pos + 1)
+    return -1
@@ -0,0 +1,209 @@
+"""
+이미지 프록시 디스크 저장소 (내용 주소 방식)
+
+Canvas 공지/학교 공지 본문 이미지를 한 번만 받아 sha256 이름으로 저장하고
+/api/images/{sha256}으로 서빙한다 (app/routers/image.py, app/services/image_proxy.py).
+
+- 파일: {IMAGE_CACHE_DIR}/ab/abcdef... (같은 내용은 URL이 달라도 한 파일)
+- 색인(SQLite, WAL): 원본 URL → sha256, sha256 → 타입/크기/마지막 사용 시각
+- 전체 크기가 IMAGE_CACHE_MAX_MB를 넘으면 오래 안 쓴 이미지부터 삭제 (LRU)
+  공개 원본(로그인 불필요)은 URL 색인을 남겨 두어 다시 요청되면 새로 받는다
+- 같은 서버의 모든 워커가 같은 디렉터리를 공유 (파일은 임시 파일 → rename)
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+# 마지막 사용 시각은 이 간격보다 오래됐을 때만 갱신 (조회마다 쓰기 방지)
+TOUCH_INTERVAL_SECONDS = 3600
+# 한도를 넘으면 이 비율까지 줄인다 (매 저장마다 지우지 않도록)
+EVICT_TARGET_RATIO = 0.9
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized_paths = set()
+
+
+def _root() -> str:
+    path = settings.IMAGE_CACHE_DIR
+    if not os.path.isabs(path):
+        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        path = os.path.join(backend_dir, path)
+    return path
+
+
+def _connect() -> Optional[sqlite3.Connection]:
+    """스레드별 색인 연결 (실패 시 None - 프록시 없이 원본 URL 유지)"""
+    path = os.path.join(_root(), "index.db")
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == path:
+        return conn
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+        with _init_lock:
+            if path not in _initialized_paths:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS blobs (
+                        digest TEXT PRIMARY KEY,
+                        content_type TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        public INTEGER NOT NULL,
+                        last_access REAL NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS ix_blobs_last_access ON blobs (last_access)")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS sources (
+                        url TEXT PRIMARY KEY,
+                        digest TEXT NOT NULL,
+                        public INTEGER NOT NULL,
+                        fetched_at REAL NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS ix_sources_digest ON sources (digest)")
+                _initialized_paths.add(path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+    except Exception as e:
+        print(f"[ImageStore] 저장소 열기 실패 ({path}): {e}")
+        return None
+    _local.conn = conn
+    _local.path = path
+    return conn
+
+
+def blob_path(digest: str) -> str:
+    return os.path.join(_root(), digest[:2], digest)
+
+
+def _touch(conn: sqlite3.Connection, digest: str, last_access: float):
+    now = time.time()
+    if now - last_access > TOUCH_INTERVAL_SECONDS:
+        conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (now, digest))
+
+
+def lookup_source(url: str) -> Optional[str]:
+    """이미 받아 둔 원본 URL이면 sha256 (파일이 지워졌으면 None)"""
+    conn = _connect()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute(
+            "SELECT s.digest, b.last_access FROM sources s JOIN blobs b ON b.digest = s.digest WHERE s.url = ?",
+            (url,)
+        ).fetchone()
+        if row is None or not os.path.exists(blob_path(row[0])):
+            return None
+        _touch(conn, row[0], row[1])
+    except Exception as e:
+        print(f"[ImageStore] 조회 오류 ({url}): {e}")
+        return None
+    return row[0]
+
+
+def put(url: str, body: bytes, content_type: str, public: bool) -> Optional[str]:
+    """이미지 저장 후 sha256 (색인을 쓸 수 없으면 None)"""
+    conn = _connect()
+    if conn is None:
+        return None
+    digest = hashlib.sha256(body).hexdigest()
+    path = blob_path(digest)
+    now = time.time()
+    try:
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        # 공개 원본이 하나라도 있으면 공개로 (다른 사용자 쿠키로 받은 같은 이미지 포함)
+        conn.execute(
+            """
+            INSERT INTO blobs (digest, content_type, size, public, last_access) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(digest) DO UPDATE SET last_access = excluded.last_access,
+                public = MAX(public, excluded.public)
+            """,
+            (digest, content_type, len(body), int(public), now)
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO sources (url, digest, public, fetched_at) VALUES (?, ?, ?, ?)",
+            (url, digest, int(public), now)
+        )
+    except Exception as e:
+        print(f"[ImageStore] 저장 오류 ({url}): {e}")
+        return None
+    evict(settings.IMAGE_CACHE_MAX_MB * 1024 * 1024)
+    return digest
+
+
+def get(digest: str) -> Optional[Dict]:
+    """{"path", "content_type", "public"} 또는 None"""
+    conn = _connect()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute(
+            "SELECT content_type, public, last_access FROM blobs WHERE digest = ?", (digest,)
+        ).fetchone()
+        if row is None:
+            return None
+        path = blob_path(digest)
+        if not os.path.exists(path):
+            return None
+        _touch(conn, digest, row[2])
+    except Exception as e:
+        print(f"[ImageStore] 조회 오류 ({digest}): {e}")
+        return None
+    return {"path": path, "content_type": row[0], "public": bool(row[1])}
+
+
+def public_source(digest: str) -> Optional[str]:
+    """로그인 없이 다시 받을 수 있는 원본 URL (삭제된 이미지 복구용)"""
+    conn = _connect()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute(
+            "SELECT url FROM sources WHERE digest = ? AND public = 1 ORDER BY fetched_at DESC LIMIT 1",
+            (digest,)
+        ).fetchone()
+    except Exception as e:
+        print(f"[ImageStore] 조회 오류 ({digest}): {e}")
+        return None
+    return row[0] if row else None
+
+
+def evict(max_bytes: int) -> int:
+    """전체 크기가 max_bytes를 넘으면 오래 안 쓴 이미지부터 삭제, 삭제한 개수"""
+    conn = _connect()
+    if conn is None:
+        return 0
+    try:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= max_bytes:
+            return 0
+        target = max_bytes * EVICT_TARGET_RATIO
+        removed = 0
+        for digest, size in conn.execute("SELECT digest, size FROM blobs ORDER BY last_access").fetchall():
+            if total <= target:
+                break
+            conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            # 로그인이 필요한 원본은 다시 받을 수 없으므로 URL 색인도 지운다
+            conn.execute("DELETE FROM sources WHERE digest = ? AND public = 0", (digest,))
+            try:
+                os.remove(blob_path(digest))
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+    except Exception as e:
+        print(f"[ImageStore] 정리 오류: {e}")
+        return 0
+    print(f"[ImageStore] LRU 정리: {removed}개 삭제 (남은 용량 {total / 1024 / 1024:.1f}MB)")
+    return removed
@@ -1,4 +1,7 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Optional
 
 from jose import JWTError, jwt
@@ -8,6 +11,11 @@ from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt/RSA처럼 수십~수백 ms 걸리는 암호 연산 전용 스레드 (이벤트 루프 밖에서 실행)
+# bcrypt와 pycryptodome은 C 코드 실행 중 GIL을 놓으므로 스레드로 충분하다
+# 워커 수를 제한해 로그인이 몰려도 CPU를 전부 쓰지 않게 한다 (나머지는 대기열)
+_crypto_executor = ThreadPoolExecutor(max_workers=settings.CRYPTO_EXECUTOR_WORKERS, thread_name_prefix="crypto")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -17,6 +25,20 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def run_crypto(func, *args, **kwargs):
+    """CPU를 오래 쓰는 암호 연산을 전용 스레드에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_crypto_executor, partial(func, *args, **kwargs))
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await run_crypto(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_crypto(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
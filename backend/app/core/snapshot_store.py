@@ -0,0 +1,149 @@
+"""
+upstream 스냅샷 디스크 저장소 (SQLite)
+
+배포나 워커 재시작(max_requests) 직후에도 식단/셔틀 등 upstream 데이터를
+다시 긁어오기 전에 바로 응답할 수 있도록, 소스별 마지막 정상 파싱 결과를
+가져온 시각·내용 해시와 함께 파일에 보관한다.
+
+- 같은 서버의 모든 워커가 하나의 파일을 공유 (WAL 모드)
+- 내용 해시가 같으면 fetched_at만 갱신
+- claim()으로 여러 워커 중 하나만 주기 작업을 실행
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized_paths = set()
+
+
+def _path() -> str:
+    path = settings.SNAPSHOT_STORE_PATH
+    if not os.path.isabs(path):
+        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        path = os.path.join(backend_dir, path)
+    return path
+
+
+def _connect() -> Optional[sqlite3.Connection]:
+    """스레드별 연결 (실패 시 None - 저장소 없이 동작)"""
+    path = _path()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == path:
+        return conn
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+        with _init_lock:
+            if path not in _initialized_paths:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS snapshots (
+                        key TEXT PRIMARY KEY,
+                        payload TEXT NOT NULL,
+                        content_hash TEXT NOT NULL,
+                        fetched_at REAL NOT NULL
+                    )
+                """)
+                _initialized_paths.add(path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+    except Exception as e:
+        print(f"[SnapshotStore] 저장소 열기 실패 ({path}): {e}")
+        return None
+    _local.conn = conn
+    _local.path = path
+    return conn
+
+
+def content_hash(payload: Any) -> str:
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()
+
+
+def snapshot_get(key: str) -> Optional[Dict[str, Any]]:
+    """{"payload", "content_hash", "fetched_at"} 또는 None"""
+    conn = _connect()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute(
+            "SELECT payload, content_hash, fetched_at FROM snapshots WHERE key = ?", (key,)
+        ).fetchone()
+    except Exception as e:
+        print(f"[SnapshotStore] 조회 오류 ({key}): {e}")
+        return None
+    if row is None:
+        return None
+    return {"payload": json.loads(row[0]), "content_hash": row[1], "fetched_at": row[2]}
+
+
+def snapshot_get_prefix(prefix: str) -> Dict[str, Dict[str, Any]]:
+    """키가 prefix로 시작하는 스냅샷 전체 {key: snapshot}"""
+    conn = _connect()
+    if conn is None:
+        return {}
+    try:
+        rows = conn.execute(
+            "SELECT key, payload, content_hash, fetched_at FROM snapshots WHERE key >= ? AND key < ?",
+            (prefix, prefix + "\uffff")
+        ).fetchall()
+    except Exception as e:
+        print(f"[SnapshotStore] 조회 오류 ({prefix}*): {e}")
+        return {}
+    return {
+        key: {"payload": json.loads(payload), "content_hash": digest, "fetched_at": fetched_at}
+        for key, payload, digest, fetched_at in rows
+    }
+
+
+def snapshot_set(key: str, payload: Any, fetched_at: Optional[float] = None) -> bool:
+    """스냅샷 저장 (내용이 바뀌었으면 True)"""
+    conn = _connect()
+    if conn is None:
+        return False
+    digest = content_hash(payload)
+    fetched_at = fetched_at or time.time()
+    try:
+        row = conn.execute("SELECT content_hash FROM snapshots WHERE key = ?", (key,)).fetchone()
+        if row is not None and row[0] == digest:
+            conn.execute("UPDATE snapshots SET fetched_at = ? WHERE key = ?", (fetched_at, key))
+            return False
+        conn.execute(
+            "INSERT OR REPLACE INTO snapshots (key, payload, content_hash, fetched_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(payload, ensure_ascii=False, default=str), digest, fetched_at)
+        )
+        return True
+    except Exception as e:
+        print(f"[SnapshotStore] 저장 오류 ({key}): {e}")
+        return False
+
+
+def claim(key: str, interval_seconds: float) -> bool:
+    """
+    interval_seconds 안에 다른 워커가 실행하지 않았으면 실행권을 가져간다.
+    저장소를 쓸 수 없으면 항상 True (각 워커가 실행).
+    """
+    conn = _connect()
+    if conn is None:
+        return True
+    now = time.time()
+    try:
+        conn.execute(
+            "INSERT OR IGNORE INTO snapshots (key, payload, content_hash, fetched_at) VALUES (?, 'null', '', 0)",
+            (key,)
+        )
+        cursor = conn.execute(
+            "UPDATE snapshots SET fetched_at = ? WHERE key = ? AND fetched_at <= ?",
+            (now, key, now - interval_seconds)
+        )
+        return cursor.rowcount == 1
+    except Exception as e:
+        print(f"[SnapshotStore] 실행권 확인 오류 ({key}): {e}")
+        return True
@@ -0,0 +1,81 @@
+"""
+학교 서버(upstream) HTTP 클라이언트
+
+모든 학교 서버 요청은 upstream_client()로 만든 클라이언트를 사용한다.
+UPSTREAM_REPLAY_URL이 설정되면 UPSTREAM_REPLAY_HOSTS에 해당하는 요청을
+HAR 재생 서버로 보낸다 (app/services/har_replay.py).
+- http(s)://... : 별도로 띄운 재생 서버 (python replay_server.py)
+- 그 외 값      : HAR 파일 경로 (콤마 구분) → 프로세스 안에서 바로 재생
+
+요청 URL은 바꾸지 않고 전송 계층에서만 보내는 곳을 바꾸므로
+리다이렉트, 쿠키 도메인 처리는 실제 서버와 똑같이 동작한다.
+"""
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.services.har_replay import REPLAY_HOST_HEADER, HarStore, create_replay_app
+
+_replay_app = None
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """요청을 재생 서버로 보내는 전송 계층 (원래 호스트는 헤더로 전달)"""
+
+    def __init__(self, target: str):
+        if target.startswith(("http://", "https://")):
+            self._base = httpx.URL(target)
+            self._inner = httpx.AsyncHTTPTransport()
+        else:
+            self._base = httpx.URL("http://replay")
+            self._inner = httpx.ASGITransport(app=_get_replay_app(target))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        headers = request.headers.copy()
+        headers[REPLAY_HOST_HEADER] = request.url.netloc.decode("ascii")
+        headers["host"] = self._base.netloc.decode("ascii")
+        routed = httpx.Request(
+            request.method,
+            self._base.copy_with(raw_path=self._base.raw_path.rstrip(b"/") + request.url.raw_path),
+            headers=headers,
+            stream=request.stream,
+            extensions=request.extensions,
+        )
+        return await self._inner.handle_async_request(routed)
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+
+def _get_replay_app(har_paths: str):
+    global _replay_app
+    if _replay_app is None:
+        paths = [path.strip() for path in har_paths.split(",") if path.strip()]
+        store = HarStore.from_files(paths, _replay_hosts())
+        _replay_app = create_replay_app(store)
+        print(f"[Upstream] HAR 재생 모드: {len(paths)}개 파일, 응답 {store.size}개")
+    return _replay_app
+
+
+def _replay_hosts():
+    return [host.strip() for host in settings.UPSTREAM_REPLAY_HOSTS.split(",") if host.strip()]
+
+
+def replay_enabled() -> bool:
+    return bool(settings.UPSTREAM_REPLAY_URL)
+
+
+def _replay_mounts() -> Optional[Dict[str, httpx.AsyncBaseTransport]]:
+    if not replay_enabled():
+        return None
+    transport = ReplayTransport(settings.UPSTREAM_REPLAY_URL)
+    return {f"all://{host}": transport for host in _replay_hosts()}
+
+
+def upstream_client(**kwargs) -> httpx.AsyncClient:
+    """학교 서버용 httpx.AsyncClient (인자는 httpx.AsyncClient와 동일)"""
+    mounts = _replay_mounts()
+    if mounts:
+        kwargs["mounts"] = {**mounts, **kwargs.get("mounts", {})}
+    return httpx.AsyncClient(**kwargs)
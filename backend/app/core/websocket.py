@@ -14,6 +14,8 @@ class ConnectionManager:
         self.active_connections: Dict[int, Dict[str, tuple]] = {}
         # user_id -> websocket (랜덤 채팅용)
         self.random_connections: Dict[int, WebSocket] = {}
+        # user_id -> {conn_id: websocket} (사용자 알림 채널, 기기/탭마다 하나)
+        self.user_connections: Dict[int, Dict[str, WebSocket]] = {}
         self._conn_counter = 0
 
     def _get_conn_id(self) -> str:
@@ -92,6 +94,37 @@ class ConnectionManager:
                 print(f"사용자 메시지 오류: {e}")
                 del self.random_connections[user_id]
 
+    # 사용자 알림 채널 (캐시 갱신 등 서버 → 클라이언트 푸시)
+    async def connect_user(self, websocket: WebSocket, user_id: int) -> str:
+        """사용자 알림 채널 연결, 연결 ID 반환"""
+        await websocket.accept()
+        conn_id = self._get_conn_id()
+        self.user_connections.setdefault(user_id, {})[conn_id] = websocket
+        return conn_id
+
+    def disconnect_user(self, user_id: int, conn_id: str):
+        """사용자 알림 채널 연결 해제"""
+        connections = self.user_connections.get(user_id)
+        if connections is not None:
+            connections.pop(conn_id, None)
+            if not connections:
+                del self.user_connections[user_id]
+
+    def has_user_channel(self, user_id: int) -> bool:
+        return bool(self.user_connections.get(user_id))
+
+    async def push_to_user(self, user_id: int, message: dict) -> int:
+        """사용자의 모든 알림 채널에 전송, 전송한 연결 수 반환"""
+        sent = 0
+        for conn_id, ws in list(self.user_connections.get(user_id, {}).items()):
+            try:
+                await ws.send_json(message)
+                sent += 1
+            except Exception as e:
+                print(f"사용자 알림 오류: {e}")
+                self.disconnect_user(user_id, conn_id)
+        return sent
+
 
 # 전역 매니저 인스턴스
 manager = ConnectionManager()
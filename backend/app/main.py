@@ -10,13 +10,13 @@ import random
 
 from app.core.database import engine, Base, SessionLocal
 from app.core.config import settings
-from app.routers import auth, schedule, chat, commute, announcement, phonebook, friend, sunmoon, random_chat, ws_chat, block, gpt, canvas, cafeteria, club, meeting, scholarship, notification, shuttle, admin, banner, dotori, quick_room, ears
+from app.routers import auth, schedule, chat, commute, announcement, phonebook, friend, sunmoon, random_chat, ws_chat, block, gpt, canvas, cafeteria, club, meeting, scholarship, notification, shuttle, admin, banner, dotori, quick_room, ears, subscription, image, dashboard
 from app.models.commute import CommuteSchedule, CommuteGroup, CommuteGroupMember
 from app.models.user import User
 from app.models.club import Club, ClubApplication
 from app.models.meeting import Meeting, MeetingApplication
 from app.services.crawler import sync_run_crawler
-from app.services.push import send_push_sync
+from app.services.push import enqueue_push
 
 # 모든 모델 임포트 (테이블 생성을 위해)
 from app.models import user, schedule as schedule_model, chat as chat_model
@@ -25,6 +25,7 @@ from app.models import phonebook as phonebook_model, friend as friend_model
 from app.models import block as block_model, club as club_model, meeting as meeting_model
 from app.models import notification as notification_model, dotori as dotori_model
 from app.models import quick_room as quick_room_model
+from app.models import push as push_model, subscription as subscription_model
 from app.models.quick_room import QuickRoom
 
 # 데이터베이스 테이블 생성
@@ -204,6 +205,113 @@ def init_announcement_system():
         except Exception:
             db.rollback()
 
+        # content_hash 컬럼 추가 (증분 크롤링 변경 감지용)
+        try:
+            db.execute(text("""
+                ALTER TABLE SMU_ANNOUNCEMENTS
+                ADD COLUMN content_hash VARCHAR(40) NULL
+            """))
+            db.commit()
+        except Exception:
+            db.rollback()
+
+        # notice_no UNIQUE 인덱스 (크롤러의 INSERT … ON DUPLICATE KEY UPDATE가 기대는 키)
+        # ALTER로 컬럼만 추가된 기존 테이블에는 인덱스가 없으므로 중복 공지를 정리한 뒤 생성
+        try:
+            has_unique = db.execute(text("""
+                SELECT COUNT(*) FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE()
+                  AND TABLE_NAME = 'SMU_ANNOUNCEMENTS'
+                  AND COLUMN_NAME = 'notice_no'
+                  AND NON_UNIQUE = 0
+            """)).scalar()
+            if not has_unique:
+                # 같은 notice_no 중 가장 최근 행(id가 큰 행)만 남김
+                removed = db.execute(text("""
+                    DELETE older FROM SMU_ANNOUNCEMENTS older
+                    JOIN SMU_ANNOUNCEMENTS newer
+                      ON older.notice_no = newer.notice_no AND older.id < newer.id
+                """)).rowcount
+                db.execute(text("""
+                    CREATE UNIQUE INDEX uq_announcement_notice_no ON SMU_ANNOUNCEMENTS(notice_no)
+                """))
+                db.commit()
+                print(f"공지사항 notice_no UNIQUE 인덱스 생성 완료 (중복 {removed}개 삭제)")
+        except Exception as e:
+            print(f"notice_no UNIQUE 인덱스 생성 오류: {e}")
+            db.rollback()
+
+        # notice_date 문자열 → DATE 변환 (키셋 페이지네이션 정렬용)
+        try:
+            column_type = db.execute(text("""
+                SELECT DATA_TYPE FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE()
+                  AND TABLE_NAME = 'SMU_ANNOUNCEMENTS'
+                  AND COLUMN_NAME = 'notice_date'
+            """)).scalar()
+            if column_type and column_type.lower() != 'date':
+                db.execute(text("""
+                    UPDATE SMU_ANNOUNCEMENTS
+                    SET notice_date = CASE
+                        WHEN notice_date REGEXP '^[0-9]{4}[./-][0-9]{1,2}[./-][0-9]{1,2}'
+                        THEN STR_TO_DATE(REPLACE(REPLACE(LEFT(notice_date, 10), '.', '-'), '/', '-'), '%Y-%m-%d')
+                        ELSE NULL
+                    END
+                """))
+                db.execute(text("""
+                    ALTER TABLE SMU_ANNOUNCEMENTS
+                    MODIFY COLUMN notice_date DATE NULL
+                """))
+                db.commit()
+                print("공지사항 notice_date DATE 컬럼 변환 완료")
+        except Exception as e:
+            print(f"notice_date 컬럼 변환 오류: {e}")
+            db.rollback()
+
+        # search_text 컬럼 추가 (검색용 본문 평문)
+        try:
+            db.execute(text("""
+                ALTER TABLE SMU_ANNOUNCEMENTS
+                ADD COLUMN search_text TEXT NULL
+            """))
+            db.commit()
+        except Exception:
+            db.rollback()
+
+        # 비어 있는 search_text 채우기 (워커마다 하지 않도록 한 워커만)
+        try:
+            from app.services.announcement_search import backfill_search_text
+            from app.core.snapshot_store import claim
+            if claim("claim:announcement:backfill", settings.CRAWLER_STARTUP_MIN_INTERVAL):
+                filled = backfill_search_text(db)
+                if filled:
+                    print(f"공지사항 search_text 채움: {filled}개")
+        except Exception as e:
+            print(f"search_text 채우기 오류: {e}")
+            db.rollback()
+
+        # 검색용 FULLTEXT ngram 인덱스 (미지원 환경이면 프로세스 내 인덱스로 대체)
+        for idx_sql in [
+            "CREATE FULLTEXT INDEX ft_announcement_title ON SMU_ANNOUNCEMENTS(title) WITH PARSER ngram",
+            "CREATE FULLTEXT INDEX ft_announcement_search ON SMU_ANNOUNCEMENTS(title, search_text) WITH PARSER ngram",
+        ]:
+            try:
+                db.execute(text(idx_sql))
+                db.commit()
+            except Exception:
+                db.rollback()
+
+        # 목록 키셋 페이지네이션 인덱스
+        for idx_sql in [
+            "CREATE INDEX idx_announcement_date_id ON SMU_ANNOUNCEMENTS(notice_date, id)",
+            "CREATE INDEX idx_announcement_category_date_id ON SMU_ANNOUNCEMENTS(category, notice_date, id)",
+        ]:
+            try:
+                db.execute(text(idx_sql))
+                db.commit()
+            except Exception:
+                db.rollback()
+
     finally:
         db.close()
 
@@ -556,11 +664,6 @@ def refresh_dotori_ranking_cache():
 # DB 연결 풀 워밍업 및 캐시 프리로딩
 def warmup_database_and_cache():
     """서버 시작 시 DB 연결 풀 워밍업 및 자주 사용되는 데이터 캐시"""
-    from app.core.cache import smart_cache_set, smart_cache_get
-    from app.models.phonebook import PhoneEntry
-    from app.models.announcement import Announcement
-    from app.schemas.phonebook import PhoneEntryResponse
-
     db = SessionLocal()
     try:
         # 1. DB 연결 풀 워밍업 (간단한 쿼리 실행)
@@ -568,24 +671,14 @@ def warmup_database_and_cache():
             db.execute(text("SELECT 1"))
         print("DB 연결 풀 워밍업 완료")
 
-        # 2. 전화번호부 캐시 프리로딩
-        cache_key = "phonebook:list:all:none"
-        if not smart_cache_get(cache_key):
-            entries = db.query(PhoneEntry).order_by(PhoneEntry.department, PhoneEntry.name).all()
-            result = [PhoneEntryResponse.model_validate(e).model_dump() for e in entries]
-            smart_cache_set(cache_key, result, 3600)
-            print(f"전화번호부 캐시 로딩 완료 ({len(result)}개)")
-
-        # 3. 공지사항 캐시 프리로딩
-        from app.schemas.announcement import AnnouncementResponse
-        ann_cache_key = "announcements:list:None:50:0"
-        if not smart_cache_get(ann_cache_key):
-            announcements = db.query(Announcement).order_by(
-                Announcement.notice_date.desc()
-            ).limit(50).all()
-            ann_result = [AnnouncementResponse.model_validate(a).model_dump() for a in announcements]
-            smart_cache_set(ann_cache_key, ann_result, 1800)
-            print(f"공지사항 캐시 로딩 완료 ({len(ann_result)}개)")
+        # 2. 전화번호부 검색 인덱스 빌드
+        from app.services.phonebook_index import phonebook_index
+        phonebook_index.get()
+
+        # 3. 공지사항 첫 페이지 캐시 프리로딩
+        from app.routers.announcement import get_announcements
+        page = get_announcements(category=None, cursor=None, limit=20, db=db)
+        print(f"공지사항 캐시 로딩 완료 ({len(page['items'])}개)")
 
     except Exception as e:
         print(f"워밍업 오류: {e}")
@@ -727,15 +820,17 @@ def auto_match_commute():
                         new_members.append(member["user"])
                 db.commit()
 
-                # 새로 매칭된 멤버들에게 푸시 알림 전송
+                # 새로 매칭된 멤버들에게 푸시 알림 적재 (발송은 디스패처)
                 if new_members:
                     user_ids = [u.student_id for u in new_members]
                     type_text = "등교" if commute_type == "등교" else "하교"
                     location_text = f" ({location})" if location else ""
-                    send_push_sync(
+                    enqueue_push(
+                        db,
                         user_ids=user_ids,
                         title=f"🚗 {type_text} 메이트 매칭 완료!",
-                        content=f"{time_slot}{location_text} - 채팅방에서 메이트를 확인하세요!"
+                        content=f"{time_slot}{location_text} - 채팅방에서 메이트를 확인하세요!",
+                        dedupe_key=f"commute-match:{existing_group.id}"
                     )
 
     except Exception as e:
@@ -793,10 +888,19 @@ from apscheduler.schedulers.background import BackgroundScheduler
 scheduler = BackgroundScheduler()
 scheduler.add_job(auto_match_commute, 'interval', minutes=1)
 scheduler.add_job(sync_run_crawler, 'interval', hours=1)
+# 식단 스냅샷 프리패치 (점심 직전 포함, 이번 주/다음 주)
+from app.routers.cafeteria import sync_prefetch_menus
+scheduler.add_job(sync_prefetch_menus, 'cron', hour='0,6,10,13,17', minute=30)
+# 셔틀 시간표 스냅샷 갱신 (6시간마다)
+from app.routers.shuttle import sync_refresh_shuttle_snapshots
+scheduler.add_job(sync_refresh_shuttle_snapshots, 'interval', hours=6)
 # 매일 자정에 오래된 등하교 채팅방 삭제
 scheduler.add_job(cleanup_old_commute_groups, 'cron', hour=0, minute=0)
 # 매일 자정에 도토리 랭킹 캐시 갱신 (KST 자정 = UTC 15:00)
 scheduler.add_job(refresh_dotori_ranking_cache, 'cron', hour=0, minute=5)
+# 매일 새벽 오래된 푸시 아웃박스 행 정리
+from app.services.push import purge_push_outbox
+scheduler.add_job(purge_push_outbox, 'cron', hour=4, minute=0)
 
 
 def cleanup_quick_rooms():
@@ -1031,20 +1135,64 @@ async def lifespan(app: FastAPI):
     # 시작 시 스케줄러 시작
     scheduler.start()
 
-    # 서버 시작 시 초기 크롤링 실행
+    # 서버 시작 시 초기 크롤링 실행 (최근에 다른 워커가 크롤링했으면 생략)
     from app.services.crawler import run_crawler
+    from app.core.snapshot_store import claim
     import asyncio
-    asyncio.create_task(run_crawler())
+    if claim("claim:crawler:startup", settings.CRAWLER_STARTUP_MIN_INTERVAL):
+        asyncio.create_task(run_crawler())
+
+    # 공지사항 검색 인덱스 (FULLTEXT 미사용 시 백그라운드 빌드, 그동안은 순차 검색)
+    from app.services.announcement_search import start_search_index
+    asyncio.create_task(start_search_index())
+
+    # 식단 스냅샷 초기 프리패치 (디스크 스냅샷이 있으면 요청은 바로 응답)
+    from app.routers.cafeteria import startup_prefetch_menus
+    asyncio.create_task(startup_prefetch_menus())
+
+    # 셔틀 시간표: 디스크 스냅샷 즉시 로드, 오래됐으면 갱신
+    from app.routers.shuttle import load_shuttle_snapshots, ensure_shuttle_snapshots
+    load_shuttle_snapshots()
+    asyncio.create_task(ensure_shuttle_snapshots())
+
+    # 푸시 아웃박스 디스패처 시작
+    from app.services.push import run_push_dispatcher
+    push_dispatcher_task = asyncio.create_task(run_push_dispatcher())
+
+    # 포털 세션 유지 (만료 전 미리 재로그인)
+    from app.services.session_keepalive import run_session_keepalive
+    keepalive_task = asyncio.create_task(run_session_keepalive())
+
+    # 수업 종료 후 EARS 출석 예약 갱신
+    from app.services.attendance_refresh import run_attendance_refresh
+    attendance_refresh_task = asyncio.create_task(run_attendance_refresh())
+
+    # 큰 페이지 파싱용 프로세스 풀 (첫 요청 전에 워커 프로세스 생성)
+    from app.services.parsing import start_parse_pool, shutdown_parse_pool
+    start_parse_pool()
 
     # 데모 데이터 시드
     seed_demo_commute_group()
     seed_demo_club()
     seed_demo_meeting()
 
+    # 전화번호부 검색 인덱스 빌드
+    from app.services.phonebook_index import phonebook_index
+    try:
+        phonebook_index.get()
+    except Exception as e:
+        print(f"[Phonebook] 검색 인덱스 빌드 오류: {e}")
+
     yield
 
-    # 종료 시 스케줄러 종료
+    # 종료 시 디스패처, 세션 유지, 출석 예약 갱신, 캐시 워밍 워커, 스케줄러 및 파싱 프로세스 풀 종료
+    push_dispatcher_task.cancel()
+    keepalive_task.cancel()
+    attendance_refresh_task.cancel()
+    from app.services.cache_warmer import stop_cache_warmer
+    stop_cache_warmer()
     scheduler.shutdown()
+    shutdown_parse_pool()
 
 # Rate Limiting 저장소
 rate_limit_store = defaultdict(list)
@@ -1130,6 +1278,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Fetched-At", "X-Cache"],
 )
 
 # 라우터 등록
@@ -1156,6 +1305,9 @@ app.include_router(banner.router, prefix="/api")
 app.include_router(dotori.router, prefix="/api")
 app.include_router(quick_room.router, prefix="/api")
 app.include_router(ears.router, prefix="/api")
+app.include_router(subscription.router, prefix="/api")
+app.include_router(image.router, prefix="/api")
+app.include_router(dashboard.router, prefix="/api")
 app.include_router(ws_chat.router)
 
 
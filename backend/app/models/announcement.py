@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Index
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -13,9 +13,16 @@ class Announcement(Base):
     content = Column(Text, nullable=True, comment="내용")
     category = Column(String(50), nullable=False, default="일반", comment="카테고리 (학사/일반/장학/취업)")
     writer = Column(String(100), nullable=True, comment="작성자")
-    notice_date = Column(String(20), nullable=True, comment="공지 날짜")
+    notice_date = Column(Date, nullable=True, comment="공지 날짜")
     views = Column(Integer, default=0, comment="조회수")
     external_url = Column(String(500), nullable=True, comment="외부 링크")
+    content_hash = Column(String(40), nullable=True, comment="본문 해시 (증분 크롤링용)")
+    search_text = Column(Text, nullable=True, comment="검색용 본문 평문 (HTML 제거)")
     is_new = Column(Integer, default=1, comment="새 글 여부")
     created_at = Column(DateTime, server_default=func.now(), comment="생성일시")
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), comment="수정일시")
+
+    __table_args__ = (
+        Index('idx_announcement_date_id', 'notice_date', 'id'),
+        Index('idx_announcement_category_date_id', 'category', 'notice_date', 'id'),
+    )
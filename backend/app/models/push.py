@@ -0,0 +1,31 @@
+"""
+푸시 알림 아웃박스 모델
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class PushOutbox(Base):
+    """발송 대기 푸시 알림 (수신자 1명당 1행)"""
+    __tablename__ = "SMU_PUSH_OUTBOX"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    recipient = Column(String(20), nullable=False, comment="수신자 학번 (-1=전체 발송)")
+    title = Column(String(200), nullable=False, comment="푸시 제목")
+    content = Column(Text, nullable=False, comment="푸시 내용")
+    image_url = Column(String(500), nullable=True, comment="이미지 URL")
+    link_url = Column(String(500), nullable=True, comment="클릭 시 이동 URL")
+    dedupe_key = Column(String(191), nullable=True, unique=True, comment="중복 방지 키 (수신자별)")
+    status = Column(String(20), nullable=False, default="pending", comment="상태: pending, sending, sent, failed")
+    attempts = Column(Integer, nullable=False, default=0, comment="발송 시도 횟수")
+    next_attempt_at = Column(DateTime, server_default=func.now(), comment="다음 발송 시도 시각")
+    last_error = Column(String(500), nullable=True, comment="마지막 오류")
+    created_at = Column(DateTime, server_default=func.now(), comment="생성일시")
+    sent_at = Column(DateTime, nullable=True, comment="발송 완료 일시")
+
+    __table_args__ = (
+        Index('idx_push_status_next', 'status', 'next_attempt_at'),
+        Index('idx_push_recipient_status', 'recipient', 'status'),
+    )
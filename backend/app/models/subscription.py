@@ -0,0 +1,22 @@
+"""
+공지사항 키워드/카테고리 구독 모델
+"""
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class NoticeSubscription(Base):
+    """공지 알림 구독 (키워드 또는 카테고리)"""
+    __tablename__ = "SMU_NOTICE_SUBSCRIPTIONS"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("SMU_USERS.id"), nullable=False, index=True, comment="사용자 ID")
+    kind = Column(String(20), nullable=False, comment="구독 유형: keyword, category")
+    value = Column(String(100), nullable=False, comment="키워드 또는 카테고리명")
+    created_at = Column(DateTime, server_default=func.now(), comment="생성일시")
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'kind', 'value', name='uq_notice_sub_user_kind_value'),
+    )
@@ -23,7 +23,12 @@ from ..models.meeting import Meeting, MeetingApplication
 from ..models.block import UserReport, UserBlock
 from ..models.notification import AppLastViewed
 from ..models.dotori import DotoriGift
-from ..services.push import send_push_notification
+from ..services.push import enqueue_push, enqueue_push_to_all
+from .ears import attendance_cache_stats
+from .gpt import gpt_stream_stats
+from .scholarship import folio_session_stats
+from ..services.parsing import parsing_stats
+from ..services.session_keepalive import session_stats
 
 router = APIRouter(prefix="/admin", tags=["관리자"])
 
@@ -72,7 +77,7 @@ class LoginResponse(BaseModel):
 @router.post("/login")
 async def admin_login(request: LoginRequest):
     """관리자 로그인"""
-    if request.password == ADMIN_PASSWORD:
+    if secrets.compare_digest(request.password.encode(), ADMIN_PASSWORD.encode()):
         # 안전한 세션 토큰 생성
         token = generate_session_token()
         active_sessions[token] = datetime.now()
@@ -121,6 +126,36 @@ async def get_stats(
     }
 
 
+@router.get("/sessions/stats")
+async def get_session_stats(_: bool = Depends(verify_admin_token)):
+    """포털 세션 만료 통계 (이 워커 기준, 세션 유지 갱신 시점 조정용)"""
+    return session_stats()
+
+
+@router.get("/gpt/stream-stats")
+async def get_gpt_stream_stats(_: bool = Depends(verify_admin_token)):
+    """GPT 스트리밍 응답 첫 토큰 시간(TTFT)과 중단 수 (이 워커 기준)"""
+    return gpt_stream_stats()
+
+
+@router.get("/ears/attendance-stats")
+async def get_ears_attendance_stats(_: bool = Depends(verify_admin_token)):
+    """EARS 출석 캐시 적중/백그라운드 갱신 수 (이 워커 기준, EARS_ATTENDANCE_FRESH_SECONDS 조정용)"""
+    return attendance_cache_stats()
+
+
+@router.get("/folio/stats")
+async def get_folio_stats(_: bool = Depends(verify_admin_token)):
+    """folio 세션 재사용/로그인 수와 동시 요청 대기 (이 워커 기준, FOLIO_CONCURRENCY 조정용)"""
+    return folio_session_stats()
+
+
+@router.get("/parsing/stats")
+async def get_parsing_stats(_: bool = Depends(verify_admin_token)):
+    """파서별 파싱 시간 히스토그램과 프로세스 풀 대기 수 (이 워커 기준, PARSE_INLINE_MAX_BYTES 조정용)"""
+    return parsing_stats()
+
+
 @router.get("/users")
 async def get_all_users(
     db: Session = Depends(get_db),
@@ -532,7 +567,7 @@ async def send_push_to_users(
     db: Session = Depends(get_db),
     _: bool = Depends(verify_admin_token)
 ):
-    """특정 유저들에게 푸시 알림 전송"""
+    """특정 유저들에게 푸시 알림 전송 (아웃박스 적재 후 디스패처가 발송)"""
     # 유저 ID로 학번 조회
     users = db.query(User).filter(User.id.in_(request.user_ids)).all()
 
@@ -542,37 +577,37 @@ async def send_push_to_users(
     # 학번 리스트 추출
     student_ids = [user.student_id for user in users]
 
-    # 푸시 알림 전송
-    import asyncio
-    result = await send_push_notification(
+    # 푸시 알림 적재 (수신자 수와 무관하게 즉시 반환, 배치 분할은 디스패처)
+    queued = enqueue_push(
+        db,
         user_ids=student_ids,
         title=request.title,
         content=request.content
     )
 
     return {
-        "success": result.get("success", False),
+        "success": True,
+        "queued": queued,
         "sent_to": [{"id": u.id, "name": u.name, "student_id": u.student_id} for u in users],
-        "response": result.get("response", {})
     }
 
 
 @router.post("/push/all")
 async def send_push_to_all_users(
     request: PushAllRequest,
+    db: Session = Depends(get_db),
     _: bool = Depends(verify_admin_token)
 ):
-    """전체 유저에게 푸시 알림 전송"""
-    from ..services.push import send_push_to_all
-
-    result = await send_push_to_all(
+    """전체 유저에게 푸시 알림 전송 (아웃박스 적재)"""
+    queued = enqueue_push_to_all(
+        db,
         title=request.title,
         content=request.content
     )
 
     return {
-        "success": result.get("success", False),
-        "response": result.get("response", {})
+        "success": True,
+        "queued": queued,
     }
 
 
@@ -1,45 +1,164 @@
-from typing import List, Optional
+from datetime import date
+from typing import Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, or_, and_
 
 from app.core.database import get_db
 from app.core.deps import get_current_user, get_optional_user
 from app.core.cache import smart_cache_get, smart_cache_set, cache_delete_pattern
 from app.models.user import User
 from app.models.announcement import Announcement
-from app.schemas.announcement import AnnouncementCreate, AnnouncementUpdate, AnnouncementResponse
+from app.schemas.announcement import (
+    AnnouncementCreate, AnnouncementUpdate, AnnouncementResponse,
+    AnnouncementSummary, AnnouncementPage, AnnouncementSearchHit, AnnouncementSearchPage
+)
+from app.services.announcement_search import search_announcements, strip_html
 
 router = APIRouter(prefix="/announcements", tags=["공지사항"])
 
 CACHE_KEY_LIST = "announcements:list"
 CACHE_KEY_DETAIL = "announcements:detail"
+CACHE_KEY_SEARCH = "announcements:search"
 CACHE_EXPIRE = 600  # 10분
+CACHE_EXPIRE_SEARCH = 120  # 2분
 
 
-@router.get("", response_model=List[AnnouncementResponse])
+def encode_cursor(notice_date: Optional[date], announcement_id: int) -> str:
+    """키셋 커서 생성 ("YYYY-MM-DD:id", 날짜 없는 공지는 ":id")"""
+    return f"{notice_date.isoformat() if notice_date else ''}:{announcement_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[date], int]:
+    """키셋 커서 해석"""
+    try:
+        date_part, id_part = cursor.split(":", 1)
+        return (date.fromisoformat(date_part) if date_part else None), int(id_part)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 커서입니다"
+        )
+
+
+@router.get("", response_model=AnnouncementPage)
 def get_announcements(
     category: Optional[str] = Query(None, description="카테고리 필터"),
+    cursor: Optional[str] = Query(None, description="이전 페이지의 next_cursor"),
+    limit: int = Query(20, ge=1, le=100, description="페이지 크기"),
     db: Session = Depends(get_db)
 ):
-    """공지사항 목록 조회 (캐싱 적용)"""
+    """
+    공지사항 목록 조회 (요약 필드만, 키셋 페이지네이션, 캐싱 적용)
+
+    정렬: notice_date DESC, id DESC (날짜 없는 공지는 마지막)
+    본문은 상세 조회에서만 제공
+    """
     # 캐시 확인
-    cache_key = f"{CACHE_KEY_LIST}:{category or 'all'}"
+    cache_key = f"{CACHE_KEY_LIST}:{category or 'all'}:{cursor or 'first'}:{limit}"
     cached = smart_cache_get(cache_key)
     if cached:
         return cached
 
-    query = db.query(Announcement)
+    query = db.query(
+        Announcement.id,
+        Announcement.notice_no,
+        Announcement.title,
+        Announcement.category,
+        Announcement.writer,
+        Announcement.notice_date,
+        Announcement.views,
+        Announcement.external_url,
+        Announcement.is_new
+    )
 
     if category:
         query = query.filter(Announcement.category == category)
 
-    announcements = query.order_by(desc(Announcement.notice_date)).all()
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        if cursor_date is None:
+            query = query.filter(
+                Announcement.notice_date.is_(None),
+                Announcement.id < cursor_id
+            )
+        else:
+            query = query.filter(or_(
+                Announcement.notice_date < cursor_date,
+                and_(Announcement.notice_date == cursor_date, Announcement.id < cursor_id),
+                Announcement.notice_date.is_(None)
+            ))
 
-    # 캐시 저장 (10분)
-    smart_cache_set(cache_key, announcements, CACHE_EXPIRE)
-    return announcements
+    # MySQL은 DESC 정렬 시 NULL이 마지막 → (notice_date, id) 인덱스 역순 스캔
+    rows = query.order_by(
+        desc(Announcement.notice_date),
+        desc(Announcement.id)
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].notice_date, rows[-1].id)
+
+    page = AnnouncementPage(
+        items=[AnnouncementSummary.model_validate(row) for row in rows],
+        next_cursor=next_cursor
+    ).model_dump(mode="json")
+
+    # 캐시 저장 (10분) - 직렬화된 응답 페이로드
+    smart_cache_set(cache_key, page, CACHE_EXPIRE)
+    return page
+
+
+@router.get("/search", response_model=AnnouncementSearchPage)
+def search_announcements_endpoint(
+    q: str = Query(..., min_length=2, max_length=100, description="검색어 (공백으로 구분된 단어 모두 포함)"),
+    category: Optional[str] = Query(None, description="카테고리 필터"),
+    page: int = Query(1, ge=1, le=50, description="페이지 번호"),
+    size: int = Query(20, ge=1, le=50, description="페이지 크기"),
+    db: Session = Depends(get_db)
+):
+    """공지사항 제목/본문 검색 (관련도순, 동점이면 최신순)"""
+    cache_key = f"{CACHE_KEY_SEARCH}:{category or 'all'}:{page}:{size}:{q.strip().casefold()}"
+    cached = smart_cache_get(cache_key)
+    if cached:
+        return cached
+
+    result = search_announcements(db, q, category, page, size)
+    scores = dict(result["items"])
+
+    items = []
+    if scores:
+        rows = db.query(
+            Announcement.id,
+            Announcement.notice_no,
+            Announcement.title,
+            Announcement.category,
+            Announcement.writer,
+            Announcement.notice_date,
+            Announcement.views,
+            Announcement.external_url,
+            Announcement.is_new
+        ).filter(Announcement.id.in_(list(scores.keys()))).all()
+        by_id = {row.id: row for row in rows}
+        items = [
+            AnnouncementSearchHit(
+                **AnnouncementSummary.model_validate(by_id[doc_id]).model_dump(),
+                score=score
+            )
+            for doc_id, score in result["items"] if doc_id in by_id
+        ]
+
+    response = AnnouncementSearchPage(
+        items=items,
+        total=result["total"],
+        page=page,
+        size=size
+    ).model_dump(mode="json")
+
+    smart_cache_set(cache_key, response, CACHE_EXPIRE_SEARCH)
+    return response
 
 
 @router.get("/{announcement_id}", response_model=AnnouncementResponse)
@@ -47,7 +166,7 @@ def get_announcement(
     announcement_id: int,
     db: Session = Depends(get_db)
 ):
-    """공지사항 상세 조회 (캐싱 적용)"""
+    """공지사항 상세 조회 (본문 포함, 캐싱 적용)"""
     # 캐시 확인
     cache_key = f"{CACHE_KEY_DETAIL}:{announcement_id}"
     cached = smart_cache_get(cache_key)
@@ -64,9 +183,11 @@ def get_announcement(
             detail="공지사항을 찾을 수 없습니다"
         )
 
+    result = AnnouncementResponse.model_validate(announcement).model_dump(mode="json")
+
     # 캐시 저장 (10분)
-    smart_cache_set(cache_key, announcement, CACHE_EXPIRE)
-    return announcement
+    smart_cache_set(cache_key, result, CACHE_EXPIRE)
+    return result
 
 
 @router.post("", response_model=AnnouncementResponse, status_code=status.HTTP_201_CREATED)
@@ -77,13 +198,15 @@ def create_announcement(
 ):
     """공지사항 생성 (관리자용)"""
     new_announcement = Announcement(**announcement_data.model_dump())
+    new_announcement.search_text = strip_html(new_announcement.content)
 
     db.add(new_announcement)
     db.commit()
     db.refresh(new_announcement)
 
     # 목록 캐시 무효화
-    cache_delete_pattern(CACHE_KEY_LIST)
+    cache_delete_pattern(f"{CACHE_KEY_LIST}:*")
+    cache_delete_pattern(f"{CACHE_KEY_SEARCH}:*")
     return new_announcement
 
 
@@ -108,12 +231,15 @@ def update_announcement(
     update_data = announcement_data.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(announcement, key, value)
+    if "content" in update_data:
+        announcement.search_text = strip_html(announcement.content)
 
     db.commit()
     db.refresh(announcement)
 
     # 캐시 무효화
-    cache_delete_pattern(CACHE_KEY_LIST)
+    cache_delete_pattern(f"{CACHE_KEY_LIST}:*")
+    cache_delete_pattern(f"{CACHE_KEY_SEARCH}:*")
     cache_delete_pattern(f"{CACHE_KEY_DETAIL}:{announcement_id}")
     return announcement
 
@@ -139,5 +265,6 @@ def delete_announcement(
     db.commit()
 
     # 캐시 무효화
-    cache_delete_pattern(CACHE_KEY_LIST)
+    cache_delete_pattern(f"{CACHE_KEY_LIST}:*")
+    cache_delete_pattern(f"{CACHE_KEY_SEARCH}:*")
     cache_delete_pattern(f"{CACHE_KEY_DETAIL}:{announcement_id}")
@@ -5,6 +5,7 @@ from app.core.database import get_db
 from app.core.deps import get_current_user
 from app.models.user import User
 from app.schemas.user import UserResponse
+from app.services.user_directory import user_directory
 
 router = APIRouter(prefix="/auth", tags=["인증"])
 
@@ -63,4 +64,7 @@ def withdraw(current_user: User = Depends(get_current_user), db: Session = Depen
 
     db.commit()
 
+    # 친구 검색용 사용자 디렉터리에서 제거
+    user_directory.remove(user_id)
+
     return {"message": "회원탈퇴가 완료되었습니다"}
@@ -1,11 +1,19 @@
 """
 선문대학교 식단 정보 API
 """
-import re
-import httpx
-from typing import List, Dict, Optional
-from fastapi import APIRouter, HTTPException
-from bs4 import BeautifulSoup
+import json
+import time
+import asyncio
+import hashlib
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+
+from app.core.cache import smart_cache_get, smart_cache_set
+from app.core.snapshot_store import claim, snapshot_get, snapshot_set
+from app.core.upstream import upstream_client
+from app.services.parsing import parse_menu_html, run_parser
 
 router = APIRouter(prefix="/cafeteria", tags=["식단"])
 
@@ -23,164 +31,178 @@ CAFETERIA_NAMES = {
 }
 
 
-def preprocess_html(html: str) -> str:
-    """HTML 전처리 - 비정상적인 태그 수정"""
-    # </br>를 <br>로 변환
-    html = re.sub(r'</br>', '<br>', html, flags=re.IGNORECASE)
-    # <br>를 표준 형식으로
-    html = re.sub(r'<br\s*/?>', '<br/>', html, flags=re.IGNORECASE)
-
-    # 잘못된 행 닫힘 수정: </td> 또는 </th> 뒤에 오는 <tr>을 </tr>로 변환
-    # 패턴: </td>    <tr> -> </td></tr>
-    html = re.sub(r'(</td>)\s*<tr>\s*(?=<tr|</thead|</tbody|</table|\Z)', r'\1</tr>', html, flags=re.IGNORECASE)
-    html = re.sub(r'(</th>)\s*<tr>\s*(?=<tr|</thead|</tbody|</table|\Z)', r'\1</tr>', html, flags=re.IGNORECASE)
-
-    # 반복 적용 (중첩된 경우)
-    for _ in range(3):
-        html = re.sub(r'(</td>)\s*<tr>\s*(?=<tr|</thead|</tbody|</table|\Z)', r'\1</tr>', html, flags=re.IGNORECASE)
+async def fetch_cafeteria_menu(ca: str, day: Optional[str] = None) -> dict:
+    """식단 페이지 가져오기"""
+    url = f"https://info.sunmoon.ac.kr/PageN/content/activity_10.aspx?ca={ca}"
+    if day:
+        url += f"&day={day}"
 
-    # 단독 빈 <tr> 제거
-    html = re.sub(r'<tr>\s*</tr>', '', html, flags=re.IGNORECASE)
-    html = re.sub(r'<tr>\s*(?=</tbody>|</thead>|</table>)', '', html, flags=re.IGNORECASE)
+    async with upstream_client(verify=False, timeout=15.0) as client:
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        response = await client.get(url, headers=headers)
 
-    return html
+        if response.status_code != 200:
+            raise HTTPException(status_code=500, detail="식단 정보를 가져올 수 없습니다.")
 
+        return await run_parser(parse_menu_html, response.text)
 
-def extract_menu_items(cell) -> List[str]:
-    """셀에서 메뉴 항목 추출 (br 태그로 구분)"""
-    # br 태그를 특수 구분자로 치환
-    cell_html = str(cell)
-    # </br> 및 다양한 br 형식 처리
-    cell_html = re.sub(r'</br>', '|||', cell_html, flags=re.IGNORECASE)
-    cell_html = re.sub(r'<br\s*/?>', '|||', cell_html, flags=re.IGNORECASE)
 
-    # 다시 파싱해서 텍스트만 추출
-    cell_soup = BeautifulSoup(cell_html, 'html.parser')
-    text = cell_soup.get_text()
+# ==================== 주간 식단 스냅샷 ====================
+# (식당 코드, 주 시작 월요일) 단위로 파싱 결과를 캐시 레이어에 저장
+# - 스케줄러가 이번 주/다음 주를 미리 가져옴
+# - 스냅샷이 없는 주는 요청 시 가져오고 (동시 요청은 한 번만 upstream 호출)
+# - upstream 실패 또는 빈 식단이면 마지막 정상 스냅샷 유지
+# - 정상 스냅샷은 디스크 저장소에도 기록해 워커 재시작 직후 캐시 미스에도 즉시 응답
 
-    # 구분자로 분리하고 정리
-    items = [item.strip() for item in text.split('|||') if item.strip()]
-    return items
+SNAPSHOT_CACHE_PREFIX = "cafeteria:snapshot"
+SNAPSHOT_EXPIRE = 86400 * 14  # 2주 (마지막 정상본 보관)
+SNAPSHOT_REFRESH_SECONDS = 3600  # 요청 시 이보다 오래된 스냅샷은 백그라운드 갱신
+STARTUP_PREFETCH_MIN_INTERVAL = 1800  # 이 시간 안에 다른 워커가 프리패치했으면 시작 시 생략
 
+# 진행 중인 upstream 요청 ((이벤트 루프 id, 스냅샷 키) → Future)
+_inflight: Dict[tuple, asyncio.Future] = {}
 
-def parse_menu_html(html: str) -> dict:
-    """식단 HTML 파싱"""
-    # HTML 전처리 (비정상 태그 수정)
-    html = preprocess_html(html)
-    soup = BeautifulSoup(html, 'html.parser')
 
-    result = {
-        "cafeteria_name": "",
-        "operating_info": [],
-        "date_range": "",
-        "menu_categories": [],
-        "daily_menus": []
-    }
+def week_start(day: Optional[date] = None) -> date:
+    """해당 날짜가 속한 주의 월요일"""
+    day = day or datetime.now().date()
+    return day - timedelta(days=day.weekday())
 
-    # 운영 정보 추출
-    info_list = soup.find('ul', class_='bu_dot')
-    if info_list:
-        for li in info_list.find_all('li'):
-            text = li.get_text(strip=True)
-            if text:
-                result["operating_info"].append(text)
-
-    # 테이블 파싱
-    table = soup.find('table')
-    if not table:
-        return result
-
-    # 날짜 범위 추출
-    date_span = soup.find('span', class_='tit_day')
-    if date_span:
-        result["date_range"] = date_span.get_text(strip=True)
-
-    # thead에서 카테고리 추출
-    thead = table.find('thead')
-    if thead:
-        header_rows = thead.find_all('tr')
-        for row in header_rows:
-            ths = row.find_all('th')
-            # '일자' 헤더가 있는 행 찾기
-            if ths and ths[0].get_text(strip=True) == '일자':
-                for th in ths[1:]:
-                    cat_text = th.get_text(strip=True)
-                    if cat_text:
-                        result["menu_categories"].append(cat_text)
-                break
-
-    # tbody에서 일별 메뉴 추출
-    tbody = table.find('tbody')
-    if tbody:
-        rows = tbody.find_all('tr')
-    else:
-        rows = table.find_all('tr')
-
-    for row in rows:
-        # 첫 번째 셀에서 날짜 찾기
-        first_cell = row.find(['th', 'td'])
-        if not first_cell:
-            continue
-
-        date_text = first_cell.get_text(strip=True)
-
-        # 날짜 형식 확인 (예: "03.02 (월)" 또는 "03.02(월)")
-        if not re.match(r'\d{2}\.\d{2}', date_text):
-            continue
-
-        # 메뉴 셀들 찾기 (td만)
-        menu_cells = row.find_all('td')
-
-        if not menu_cells:
-            continue
-
-        day_menu = {
-            "date": date_text,
-            "menus": []
-        }
 
-        for td in menu_cells:
-            menu_items = extract_menu_items(td)
-            day_menu["menus"].append(menu_items)
+def snapshot_key(ca: str, week: date) -> str:
+    return f"{SNAPSHOT_CACHE_PREFIX}:{ca}:{week.isoformat()}"
 
-        result["daily_menus"].append(day_menu)
 
-    return result
+def load_snapshot(key: str) -> Optional[dict]:
+    """캐시 레이어 → 디스크 저장소 순으로 스냅샷 조회 (디스크 적중 시 캐시에 다시 올림)"""
+    snapshot = smart_cache_get(key)
+    if snapshot is None:
+        stored = snapshot_get(key)
+        if stored is not None:
+            snapshot = stored["payload"]
+            smart_cache_set(key, snapshot, SNAPSHOT_EXPIRE)
+    return snapshot
 
 
-async def fetch_cafeteria_menu(ca: str, day: Optional[str] = None) -> dict:
-    """식단 페이지 가져오기"""
-    url = f"https://info.sunmoon.ac.kr/PageN/content/activity_10.aspx?ca={ca}"
-    if day:
-        url += f"&day={day}"
-
-    async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = await client.get(url, headers=headers)
+def _make_snapshot(menu_data: dict) -> dict:
+    body = json.dumps(menu_data, ensure_ascii=False, sort_keys=True)
+    return {
+        "data": menu_data,
+        "etag": '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"',
+        "fetched_at": time.time(),
+    }
 
-        if response.status_code != 200:
-            raise HTTPException(status_code=500, detail="식단 정보를 가져올 수 없습니다.")
 
-        return parse_menu_html(response.text)
+async def refresh_menu_snapshot(ca: str, week: date) -> Optional[dict]:
+    """upstream에서 주간 식단을 가져와 스냅샷 갱신 (실패 시 기존 스냅샷 반환)"""
+    key = snapshot_key(ca, week)
+    loop = asyncio.get_running_loop()
+    inflight_key = (id(loop), key)
+    inflight = _inflight.get(inflight_key)
+    if inflight:
+        return await inflight
+
+    future = loop.create_future()
+    _inflight[inflight_key] = future
+    try:
+        previous = load_snapshot(key)
+        try:
+            menu_data = await fetch_cafeteria_menu(ca, week.strftime("%Y%m%d"))
+            if not menu_data.get("daily_menus") and previous:
+                print(f"[Cafeteria] 빈 식단 응답, 기존 스냅샷 유지: {key}")
+                snapshot = previous
+            else:
+                snapshot = _make_snapshot(menu_data)
+                smart_cache_set(key, snapshot, SNAPSHOT_EXPIRE)
+                snapshot_set(key, snapshot, snapshot["fetched_at"])
+        except Exception as e:
+            print(f"[Cafeteria] 식단 가져오기 실패 ({key}): {e}")
+            snapshot = previous
+        future.set_result(snapshot)
+        return snapshot
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        _inflight.pop(inflight_key, None)
+
+
+async def prefetch_menus():
+    """모든 식당의 이번 주/다음 주 식단 미리 가져오기"""
+    this_week = week_start()
+    weeks = [this_week, this_week + timedelta(days=7)]
+    results = await asyncio.gather(*[
+        refresh_menu_snapshot(ca, week)
+        for ca in CAFETERIA_CODES.values()
+        for week in weeks
+    ])
+    ok = sum(1 for r in results if r)
+    print(f"[Cafeteria] 식단 스냅샷 프리패치 완료: {ok}/{len(results)}")
+
+
+async def startup_prefetch_menus():
+    """서버 시작 시 프리패치 (최근에 다른 워커가 했으면 디스크 스냅샷으로 충분)"""
+    if claim("claim:cafeteria:prefetch", STARTUP_PREFETCH_MIN_INTERVAL):
+        await prefetch_menus()
+
+
+def sync_prefetch_menus():
+    """동기 버전 프리패치 (APScheduler용)"""
+    try:
+        asyncio.run(prefetch_menus())
+    except Exception as e:
+        print(f"[Cafeteria] 프리패치 오류: {e}")
 
 
 @router.get("/menu/{cafeteria_type}")
-async def get_cafeteria_menu(cafeteria_type: str, day: Optional[str] = None):
+async def get_cafeteria_menu(request: Request, cafeteria_type: str, day: Optional[str] = None):
     """
-    식당별 식단 조회
+    식당별 식단 조회 (주간 스냅샷, ETag 지원)
     - cafeteria_type: student(학생회관), orange(오렌지), staff(교직원)
     - day: 날짜 (YYYYMMDD 형식, 선택)
     """
     if cafeteria_type not in CAFETERIA_CODES:
         raise HTTPException(status_code=400, detail="잘못된 식당 코드입니다. (student, orange, staff)")
 
+    target_day = None
+    if day:
+        try:
+            target_day = datetime.strptime(day, "%Y%m%d").date()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다. (YYYYMMDD)")
+
+    snapshot = await get_menu_snapshot(cafeteria_type, target_day)
+
+    headers = {"ETag": snapshot["etag"], "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == snapshot["etag"]:
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse(content=menu_payload(snapshot, cafeteria_type), headers=headers)
+
+
+async def get_menu_snapshot(cafeteria_type: str, target_day: Optional[date] = None) -> dict:
+    """주간 식단 스냅샷 (없으면 즉시 조회, 오래됐으면 응답 후 백그라운드 갱신)"""
     ca = CAFETERIA_CODES[cafeteria_type]
-    menu_data = await fetch_cafeteria_menu(ca, day)
-    menu_data["cafeteria_name"] = CAFETERIA_NAMES.get(ca, "")
-    menu_data["cafeteria_type"] = cafeteria_type
+    week = week_start(target_day)
 
+    snapshot = load_snapshot(snapshot_key(ca, week))
+    if snapshot is None:
+        snapshot = await refresh_menu_snapshot(ca, week)
+        if snapshot is None:
+            raise HTTPException(status_code=500, detail="식단 정보를 가져올 수 없습니다.")
+    elif time.time() - snapshot.get("fetched_at", 0) > SNAPSHOT_REFRESH_SECONDS:
+        # 오래된 스냅샷은 그대로 응답하고 백그라운드에서 갱신
+        asyncio.create_task(refresh_menu_snapshot(ca, week))
+    return snapshot
+
+
+def menu_payload(snapshot: dict, cafeteria_type: str) -> dict:
+    """스냅샷 → 식단 응답 본문"""
+    menu_data = dict(snapshot["data"])
+    menu_data["cafeteria_name"] = CAFETERIA_NAMES.get(CAFETERIA_CODES[cafeteria_type], "")
+    menu_data["cafeteria_type"] = cafeteria_type
     return menu_data
 
 
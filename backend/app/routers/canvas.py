@@ -2,18 +2,25 @@
 선문대 Canvas LMS API
 """
 import re
+import time
 import asyncio
 import base64
-import httpx
 from typing import Optional, Dict
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from app.core.cache import cache_delete_pattern, smart_cache_get, smart_cache_set
 from app.core.database import get_db
 from app.core.deps import get_current_user
+from app.core.security import run_crypto
 from app.core.session_store import save_credentials, load_credentials, remove_credentials
+from app.core.upstream import upstream_client
+from app.core.websocket import manager
 from app.models.user import User
+from app.services.image_proxy import cache_images
+from app.services.session_keepalive import note_created, note_expired, note_used
+from app.services.parsing import fill_image_placeholders, parse_announcement_page, parse_syllabus_html, run_parser
 
 # RSA 암호화를 위한 라이브러리
 try:
@@ -28,6 +35,37 @@ router = APIRouter(prefix="/canvas", tags=["Canvas LMS"])
 # Canvas 세션 캐시 (user_id -> {cookies, xn_api_token, username, password})
 canvas_session_cache: Dict[int, dict] = {}
 
+# 과목 단위 공유 캐시 (같은 과목 수강생 모두에게 같은 데이터) - 자원별 TTL (초)
+COURSE_CACHE_TTL = {
+    "syllabus": 6 * 3600,
+    "users": 3600,
+    "boards": 1800,
+    "board_posts": 300,
+    "announcements": 300,
+}
+USER_COURSES_TTL = 1800  # 수강 확인용 사용자별 과목 ID 목록
+
+# 사용자별 캐시 (할 일/과목 목록) - (fresh 기간, 최대 보관 기간) 초
+# fresh 기간이 지나면 캐시를 먼저 응답하고 백그라운드에서 갱신 (stale-while-revalidate)
+USER_CACHE_TTL = {
+    "todos": (60, 1800),
+    "courses": (600, 86400),
+}
+
+# 같은 사용자 캐시의 백그라운드 갱신은 하나만 (프로세스 내)
+_user_inflight: Dict[str, asyncio.Task] = {}
+
+# 공지 목록에서 사용자마다 다른 필드 (공유 캐시에 넣지 않음)
+ANNOUNCEMENT_USER_FIELDS = ("read_state", "unread_count", "subscribed", "permissions", "user_can_see_posts")
+
+# 같은 과목 데이터를 동시에 여러 명이 요청하면 upstream 요청 하나로 합친다 (프로세스 내)
+_course_inflight: Dict[str, asyncio.Task] = {}
+
+# 자원별 공유 캐시 적중/upstream 호출 수 (GET /canvas/course-cache/stats)
+course_cache_stats: Dict[str, Dict[str, int]] = {
+    resource: {"hits": 0, "joined": 0, "upstream": 0} for resource in COURSE_CACHE_TTL
+}
+
 
 async def ensure_canvas_session(user_id: int) -> dict:
     """Canvas 세션 확인 및 필요시 재로그인"""
@@ -41,6 +79,7 @@ async def ensure_canvas_session(user_id: int) -> dict:
                 session_data['username'] = creds['username']
                 session_data['password'] = creds['password']
                 canvas_session_cache[user_id] = session_data
+                note_created("canvas", user_id)
                 return session_data
             except Exception as e:
                 print(f"[Canvas] 세션 복원 실패: {e}")
@@ -65,11 +104,29 @@ async def refresh_canvas_session(user_id: int) -> dict:
     new_session['username'] = username
     new_session['password'] = password
     canvas_session_cache[user_id] = new_session
+    note_created("canvas", user_id)
     print(f"[Canvas] 세션 자동 갱신 성공: user_id={user_id}")
 
     return new_session
 
 
+async def probe_canvas_session(user_id: int) -> Optional[bool]:
+    """Canvas 세션이 살아 있는지 (세션 유지용, 사용자 정보 API 한 번)"""
+    session_data = canvas_session_cache.get(user_id)
+    if session_data is None:
+        return None
+    async with upstream_client(verify=False, timeout=15.0) as client:
+        response = await client.get(
+            "https://canvas.sunmoon.ac.kr/api/v1/users/self",
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                'Accept': 'application/json'
+            },
+            cookies=session_data.get('cookies', {})
+        )
+    return response.status_code == 200
+
+
 def decrypt_password(encrypted_b64: str, private_key_pem: str) -> Optional[str]:
     """JSEncrypt와 호환되는 RSA 복호화"""
     try:
@@ -97,7 +154,7 @@ async def login_canvas(username: str, password: str) -> dict:
     from bs4 import BeautifulSoup
     from urllib.parse import urlparse, parse_qs, unquote
 
-    async with httpx.AsyncClient(follow_redirects=True, verify=False, timeout=25.0) as client:
+    async with upstream_client(follow_redirects=True, verify=False, timeout=25.0) as client:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/145.0.0.0 Safari/537.36'
         }
@@ -172,8 +229,8 @@ async def login_canvas(username: str, password: str) -> dict:
         encrypted_password = cryption_match.group(1)
         private_key = cryption_match.group(2)
 
-        # 5. 비밀번호 RSA 복호화
-        decrypted_password = decrypt_password(encrypted_password, private_key)
+        # 5. 비밀번호 RSA 복호화 (이벤트 루프 밖에서)
+        decrypted_password = await run_crypto(decrypt_password, encrypted_password, private_key)
 
         if not decrypted_password:
             raise HTTPException(status_code=401, detail="비밀번호 복호화 실패")
@@ -274,6 +331,9 @@ async def init_canvas_session(
         session_data['username'] = request.username
         session_data['password'] = request.password
         canvas_session_cache[current_user.id] = session_data
+        note_created("canvas", current_user.id)
+        # 다른 계정일 수 있으므로 이전 세션으로 받은 캐시는 버린다
+        evict_user_canvas_cache(current_user.id)
         # 자격 증명 영속화 (서버 재시작 시 자동 복원용)
         save_credentials('canvas', current_user.id, {
             'username': request.username,
@@ -305,7 +365,7 @@ async def _fetch_todos(session_data: dict) -> dict:
     cookies = session_data.get('cookies', {})
     xn_api_token = session_data.get('xn_api_token', '')
 
-    async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
+    async with upstream_client(verify=False, timeout=15.0) as client:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json',
@@ -327,32 +387,16 @@ async def _fetch_todos(session_data: dict) -> dict:
 
 @router.get("/todos")
 async def get_canvas_todos(
+    response: Response,
+    refresh: bool = Query(False, description="캐시를 무시하고 Canvas에서 다시 조회"),
     current_user: User = Depends(get_current_user)
 ):
-    """Canvas 할 일 목록 조회 (세션 만료 시 자동 갱신)"""
-    user_id = current_user.id
-
-    session_data = await ensure_canvas_session(user_id)
-
-    # 첫 번째 시도
-    response = await _fetch_todos(session_data)
-
-    # 실패 시 세션 갱신 후 재시도
-    if response.status_code != 200:
-        print(f"[Canvas] todos API 실패, 세션 갱신 시도: status={response.status_code}")
-        try:
-            session_data = await refresh_canvas_session(user_id)
-            response = await _fetch_todos(session_data)
-        except Exception as e:
-            print(f"[Canvas] 세션 갱신 실패: {e}")
-            if user_id in canvas_session_cache:
-                del canvas_session_cache[user_id]
-            raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다. 다시 로그인하세요.")
+    """Canvas 할 일 목록 조회 (사용자별 캐시, 오래되면 먼저 응답 후 백그라운드 갱신)"""
+    return await _user_cached(current_user.id, "todos", _load_todos, response, refresh)
 
-    if response.status_code != 200:
-        print(f"[Canvas] todos API 재시도 실패: {response.text[:500]}")
-        raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다.")
 
+async def _load_todos(user_id: int):
+    response = await _fetch_with_session_refresh(user_id, _fetch_todos, "todos")
     return response.json()
 
 
@@ -360,7 +404,7 @@ async def _fetch_courses(session_data: dict):
     """courses API 호출 내부 함수"""
     cookies = session_data.get('cookies', {})
 
-    async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
+    async with upstream_client(verify=False, timeout=15.0) as client:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json'
@@ -378,22 +422,136 @@ async def _fetch_courses(session_data: dict):
 
 @router.get("/courses")
 async def get_canvas_courses(
+    response: Response,
+    refresh: bool = Query(False, description="캐시를 무시하고 Canvas에서 다시 조회"),
     current_user: User = Depends(get_current_user)
 ):
-    """Canvas 수강 과목 목록 조회 (세션 만료 시 자동 갱신)"""
-    user_id = current_user.id
+    """Canvas 수강 과목 목록 조회 (사용자별 캐시, 오래되면 먼저 응답 후 백그라운드 갱신)"""
+    return await _user_cached(current_user.id, "courses", _load_courses, response, refresh)
 
-    session_data = await ensure_canvas_session(user_id)
 
-    # 첫 번째 시도
-    response = await _fetch_courses(session_data)
+async def _load_courses(user_id: int):
+    response = await _fetch_with_session_refresh(user_id, _fetch_courses, "courses")
+    courses = response.json()
+    _store_user_course_ids(user_id, courses)
+    return courses
+
+
+def _user_cache_key(user_id: int, resource: str) -> str:
+    return f"canvas:user:{user_id}:{resource}"
+
+
+def evict_user_canvas_cache(user_id: int):
+    """사용자별 Canvas 캐시 삭제 (세션 만료/재로그인 시)"""
+    cache_delete_pattern(f"canvas:user:{user_id}:*")
+    cache_delete_pattern(f"canvas:user_courses:{user_id}")
+
+
+async def _refresh_user_cache(user_id: int, resource: str, load) -> dict:
+    """upstream 조회 후 사용자별 캐시에 저장 (세션 만료면 캐시 삭제 후 예외 전파)"""
+    try:
+        data = await load(user_id)
+    except HTTPException as e:
+        if e.status_code == 401:
+            evict_user_canvas_cache(user_id)
+        raise
+    entry = {"data": data, "fetched_at": time.time()}
+    smart_cache_set(_user_cache_key(user_id, resource), entry, USER_CACHE_TTL[resource][1])
+    return entry
+
+
+async def _background_refresh(user_id: int, resource: str, load, previous: dict):
+    """오래된 캐시를 응답한 뒤 갱신, 바뀌었으면 사용자 알림 채널로 푸시"""
+    try:
+        entry = await _refresh_user_cache(user_id, resource, load)
+    except HTTPException as e:
+        print(f"[Canvas] {resource} 백그라운드 갱신 실패: user_id={user_id}, status={e.status_code}")
+        if e.status_code == 401:
+            await manager.push_to_user(user_id, {"type": "canvas_session_expired"})
+        return
+    except Exception as e:
+        print(f"[Canvas] {resource} 백그라운드 갱신 오류: user_id={user_id}, {e}")
+        return
+    if entry["data"] != previous["data"]:
+        await manager.push_to_user(user_id, {
+            "type": f"canvas_{resource}",
+            "data": entry["data"],
+            "fetched_at": entry["fetched_at"],
+        })
+
+
+async def warm_user_cache(user_id: int, resource: str):
+    """로그인 직후 캐시 워밍 (app/services/cache_warmer.py)"""
+    loader = {"todos": _load_todos, "courses": _load_courses}[resource]
+    await _refresh_user_cache(user_id, resource, loader)
+
+
+async def _user_cached(user_id: int, resource: str, load, response: Response, refresh: bool = False):
+    """
+    사용자별 stale-while-revalidate 캐시
+    - fresh(USER_CACHE_TTL[0] 이내): 캐시 응답
+    - stale(USER_CACHE_TTL[1] 이내): 캐시를 바로 응답하고 백그라운드에서 갱신
+    - 없음/refresh: upstream 조회 후 응답
+    응답 헤더 X-Fetched-At(epoch 초), X-Cache(fresh/stale/miss)로 신선도를 알린다.
+    """
+    key = _user_cache_key(user_id, resource)
+    fresh_ttl = USER_CACHE_TTL[resource][0]
+
+    # 메모리 세션이 없으면(재시작/로그아웃) 복원 가능할 때만 캐시를 쓴다
+    try:
+        await ensure_canvas_session(user_id)
+    except HTTPException:
+        evict_user_canvas_cache(user_id)
+        raise
+
+    entry = None if refresh else smart_cache_get(key)
+    status = "miss"
+    if entry is not None:
+        status = "fresh" if time.time() - entry["fetched_at"] < fresh_ttl else "stale"
+        if status == "stale" and key not in _user_inflight:
+            task = asyncio.ensure_future(_background_refresh(user_id, resource, load, entry))
+            _user_inflight[key] = task
+            task.add_done_callback(lambda done: _user_inflight.pop(key, None) if _user_inflight.get(key) is done else None)
+    else:
+        entry = await _refresh_user_cache(user_id, resource, load)
+
+    response.headers["X-Fetched-At"] = str(int(entry["fetched_at"]))
+    response.headers["X-Cache"] = status
+    return entry["data"]
+
+
+def _store_user_course_ids(user_id: int, courses) -> None:
+    if isinstance(courses, list):
+        course_ids = [c["id"] for c in courses if isinstance(c, dict) and "id" in c]
+        smart_cache_set(f"canvas:user_courses:{user_id}", course_ids, USER_COURSES_TTL)
+
+
+async def _is_enrolled(user_id: int, course_id: int) -> bool:
+    """사용자 과목 목록(캐시, 없으면 한 번 조회)에 있는 과목인지"""
+    course_ids = smart_cache_get(f"canvas:user_courses:{user_id}")
+    if course_ids is None:
+        entry = smart_cache_get(_user_cache_key(user_id, "courses"))
+        try:
+            if entry is None:
+                entry = await _refresh_user_cache(user_id, "courses", _load_courses)
+        except HTTPException:
+            return False
+        _store_user_course_ids(user_id, entry["data"])
+        course_ids = smart_cache_get(f"canvas:user_courses:{user_id}") or []
+    return course_id in course_ids
+
+
+async def _fetch_with_session_refresh(user_id: int, fetch, label: str):
+    """사용자 세션으로 upstream 호출 (실패 시 세션 갱신 후 재시도)"""
+    session_data = await ensure_canvas_session(user_id)
+    response = await fetch(session_data)
 
-    # 실패 시 세션 갱신 후 재시도
     if response.status_code != 200:
-        print(f"[Canvas] courses API 실패, 세션 갱신 시도: status={response.status_code}")
+        print(f"[Canvas] {label} API 실패, 세션 갱신 시도: status={response.status_code}")
+        note_expired("canvas", user_id)
         try:
             session_data = await refresh_canvas_session(user_id)
-            response = await _fetch_courses(session_data)
+            response = await fetch(session_data)
         except Exception as e:
             print(f"[Canvas] 세션 갱신 실패: {e}")
             if user_id in canvas_session_cache:
@@ -403,7 +561,85 @@ async def get_canvas_courses(
     if response.status_code != 200:
         raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다.")
 
-    return response.json()
+    note_used("canvas", user_id)
+    return response
+
+
+async def _course_cached(user_id: int, course_id: int, resource: str, key_suffix: str,
+                         fetch, parse, refresh: bool = False):
+    """
+    과목 단위 공유 캐시 조회
+    - 수강 중인 과목이면 다른 수강생이 먼저 받아 둔 데이터를 그대로 사용
+    - 없으면(또는 refresh) 이 사용자 세션으로 받아 캐시에 저장
+    - parse는 async (응답) → (데이터, 공유 가능 여부)
+    """
+    key = f"canvas:course:{course_id}:{key_suffix}"
+    stats = course_cache_stats[resource]
+
+    # 수강 확인은 캐시를 읽을 때만 필요 (refresh는 각자 세션으로 받으므로 Canvas가 권한 확인)
+    enrolled = not refresh and await _is_enrolled(user_id, course_id)
+    if enrolled:
+        cached = smart_cache_get(key)
+        if cached is not None:
+            stats["hits"] += 1
+            return cached
+        task = _course_inflight.get(key)
+        if task is not None:
+            try:
+                result = await asyncio.shield(task)
+                stats["joined"] += 1
+                return result
+            except HTTPException:
+                pass  # 먼저 요청한 사용자의 세션 문제 → 이 사용자 세션으로 직접 조회
+
+    async def load():
+        response = await _fetch_with_session_refresh(user_id, fetch, resource)
+        stats["upstream"] += 1
+        data, shareable = await parse(response)
+        # 응답을 받았다는 것 자체가 접근 권한이 있다는 뜻이므로 공유 캐시에 저장
+        if shareable:
+            smart_cache_set(key, {"data": data, "fetched_at": time.time()}, COURSE_CACHE_TTL[resource])
+        else:
+            cache_delete_pattern(key)
+        return {"data": data, "fetched_at": time.time()}
+
+    task = asyncio.ensure_future(load())
+    if enrolled:
+        _course_inflight[key] = task
+        task.add_done_callback(lambda done: _course_inflight.pop(key, None) if _course_inflight.get(key) is done else None)
+    return await asyncio.shield(task)
+
+
+async def _json_response(response):
+    return response.json(), True
+
+
+async def _shared_announcements(response):
+    """공지 목록에서 사용자별 필드 제거 (분반 지정 공지가 있으면 공유하지 않음)"""
+    topics = response.json()
+    if not isinstance(topics, list):
+        return topics, False
+    shareable = not any(topic.get("is_section_specific") for topic in topics if isinstance(topic, dict))
+    if shareable:
+        topics = [
+            {k: v for k, v in topic.items() if k not in ANNOUNCEMENT_USER_FIELDS} if isinstance(topic, dict) else topic
+            for topic in topics
+        ]
+    return topics, shareable
+
+
+@router.get("/course-cache/stats")
+async def get_course_cache_stats(current_user: User = Depends(get_current_user)):
+    """과목 공유 캐시 적중률 (이 워커 기준)"""
+    result = {}
+    for resource, stats in course_cache_stats.items():
+        requests = stats["hits"] + stats["joined"] + stats["upstream"]
+        result[resource] = {
+            **stats,
+            "requests": requests,
+            "upstream_saved_ratio": round(1 - stats["upstream"] / requests, 3) if requests else 0.0,
+        }
+    return result
 
 
 async def _fetch_announcement(session_data: dict, course_id: int, topic_id: int):
@@ -412,7 +648,7 @@ async def _fetch_announcement(session_data: dict, course_id: int, topic_id: int)
 
     cookies = session_data.get('cookies', {})
 
-    async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
+    async with upstream_client(verify=False, timeout=15.0) as client:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
@@ -432,7 +668,7 @@ async def _fetch_announcements_list(session_data: dict, course_id: int):
     """과목별 공지사항 목록 조회 내부 함수"""
     cookies = session_data.get('cookies', {})
 
-    async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
+    async with upstream_client(verify=False, timeout=15.0) as client:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json'
@@ -450,89 +686,14 @@ async def _fetch_announcements_list(session_data: dict, course_id: int):
 
 
 async def parse_announcement_html(html: str, cookies: dict) -> dict:
-    """공지사항 HTML에서 내용 파싱 및 이미지를 base64로 변환"""
-    from bs4 import BeautifulSoup
-    import base64
-
-    soup = BeautifulSoup(html, 'html.parser')
-
-    result = {
-        'title': '',
-        'author': '',
-        'course_name': '',
-        'content': '',
-        'posted_at': ''
-    }
-
-    # 제목 추출
-    title_el = soup.find('h1', class_='discussion-title')
-    if title_el:
-        result['title'] = title_el.get_text(strip=True)
-
-    # 작성자 추출
-    author_el = soup.find('a', class_='author')
-    if author_el:
-        result['author'] = author_el.get_text(strip=True)
-
-    # 과목명 추출 (breadcrumb에서)
-    breadcrumb = soup.find('nav', id='breadcrumbs')
-    if breadcrumb:
-        links = breadcrumb.find_all('a')
-        if len(links) >= 2:
-            result['course_name'] = links[1].get_text(strip=True)
-
-    # 내용 추출 - enhanced 클래스가 있는 message div 찾기
-    content_el = soup.find('div', class_='message user_content enhanced')
-    if not content_el:
-        # fallback: 일반 message div
-        content_el = soup.find('div', class_='message user_content')
-
-    if content_el:
-        # 이미지를 base64로 변환 (병렬 처리)
-        images = content_el.find_all('img')
-        canvas_images = []
-
-        for img in images:
-            src = img.get('src', '')
-            if src:
-                if src.startswith('/'):
-                    src = f"https://canvas.sunmoon.ac.kr{src}"
-                if 'canvas.sunmoon.ac.kr' in src:
-                    canvas_images.append((img, src))
-                img['style'] = 'max-width: 100%; height: auto;'
-
-        # Canvas 이미지들을 병렬로 다운로드
-        if canvas_images:
-            async def fetch_image(client, src):
-                try:
-                    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-                    response = await client.get(src, headers=headers, cookies=cookies)
-                    if response.status_code == 200:
-                        content_type = response.headers.get('content-type', 'image/png')
-                        img_base64 = base64.b64encode(response.content).decode('utf-8')
-                        return f"data:{content_type};base64,{img_base64}"
-                except Exception as e:
-                    print(f"[Canvas] 이미지 변환 실패: {src}, {e}")
-                return None
-
-            async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
-                results = await asyncio.gather(*[fetch_image(client, src) for _, src in canvas_images])
-                for (img, _), data_url in zip(canvas_images, results):
-                    if data_url:
-                        img['src'] = data_url
-
-        # 링크를 새 탭에서 열리도록 처리
-        for link in content_el.find_all('a'):
-            href = link.get('href', '')
-            if href and not href.startswith('#'):
-                # 상대 경로를 절대 경로로 변환
-                if href.startswith('/'):
-                    link['href'] = f"https://canvas.sunmoon.ac.kr{href}"
-                # 새 탭에서 열리도록 설정
-                link['target'] = '_blank'
-                link['rel'] = 'noopener noreferrer'
-
-        result['content'] = str(content_el)
+    """공지사항 HTML에서 내용 파싱 및 Canvas 이미지를 프록시 URL로 변환"""
+    result = await run_parser(parse_announcement_page, html)
+    images = result.pop('images')
+
+    # Canvas 이미지는 사용자 쿠키로 한 번만 받아 프록시 URL로 (다른 학생은 저장본 재사용)
+    if images:
+        proxied = await cache_images(images, cookies=cookies)
+        result['content'] = fill_image_placeholders(result['content'], images, proxied)
 
     return result
 
@@ -540,32 +701,16 @@ async def parse_announcement_html(html: str, cookies: dict) -> dict:
 @router.get("/courses/{course_id}/announcements")
 async def get_course_announcements(
     course_id: int,
+    refresh: bool = Query(False, description="공유 캐시를 무시하고 새로 조회"),
     current_user: User = Depends(get_current_user)
 ):
-    """과목별 공지사항 목록 조회"""
-    user_id = current_user.id
-
-    session_data = await ensure_canvas_session(user_id)
-
-    # 첫 번째 시도
-    response = await _fetch_announcements_list(session_data, course_id)
-
-    # 실패 시 세션 갱신 후 재시도
-    if response.status_code != 200:
-        print(f"[Canvas] announcements list API 실패, 세션 갱신 시도: status={response.status_code}")
-        try:
-            session_data = await refresh_canvas_session(user_id)
-            response = await _fetch_announcements_list(session_data, course_id)
-        except Exception as e:
-            print(f"[Canvas] 세션 갱신 실패: {e}")
-            if user_id in canvas_session_cache:
-                del canvas_session_cache[user_id]
-            raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다.")
-
-    if response.status_code != 200:
-        raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다.")
-
-    return response.json()
+    """과목별 공지사항 목록 조회 (과목 공유 캐시)"""
+    cached = await _course_cached(
+        current_user.id, course_id, "announcements", "announcements",
+        lambda session_data: _fetch_announcements_list(session_data, course_id),
+        _shared_announcements, refresh
+    )
+    return cached["data"]
 
 
 @router.get("/announcements/{course_id}/{topic_id}")
@@ -585,6 +730,7 @@ async def get_canvas_announcement(
     # 실패 시 세션 갱신 후 재시도
     if response.status_code != 200:
         print(f"[Canvas] announcement API 실패, 세션 갱신 시도: status={response.status_code}")
+        note_expired("canvas", user_id)
         try:
             session_data = await refresh_canvas_session(user_id)
             response = await _fetch_announcement(session_data, course_id, topic_id)
@@ -597,7 +743,9 @@ async def get_canvas_announcement(
     if response.status_code != 200:
         raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다.")
 
-    # HTML 파싱 (이미지 base64 변환 포함)
+    note_used("canvas", user_id)
+
+    # HTML 파싱 (이미지 프록시 URL 변환 포함)
     cookies = session_data.get('cookies', {})
     announcement = await parse_announcement_html(response.text, cookies)
 
@@ -609,7 +757,7 @@ async def _fetch_boards(session_data: dict, course_id: int):
     cookies = session_data.get('cookies', {})
     xn_api_token = session_data.get('xn_api_token', '')
 
-    async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
+    async with upstream_client(verify=False, timeout=15.0) as client:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json',
@@ -631,7 +779,7 @@ async def _fetch_board_posts(session_data: dict, course_id: int, board_id: int):
     cookies = session_data.get('cookies', {})
     xn_api_token = session_data.get('xn_api_token', '')
 
-    async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
+    async with upstream_client(verify=False, timeout=15.0) as client:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json',
@@ -652,63 +800,39 @@ async def _fetch_board_posts(session_data: dict, course_id: int, board_id: int):
 @router.get("/courses/{course_id}/boards")
 async def get_course_boards(
     course_id: int,
+    refresh: bool = Query(False, description="공유 캐시를 무시하고 새로 조회"),
     current_user: User = Depends(get_current_user)
 ):
-    """과목별 게시판 목록 조회"""
-    user_id = current_user.id
-
-    session_data = await ensure_canvas_session(user_id)
-    response = await _fetch_boards(session_data, course_id)
-
-    if response.status_code != 200:
-        try:
-            session_data = await refresh_canvas_session(user_id)
-            response = await _fetch_boards(session_data, course_id)
-        except Exception as e:
-            print(f"[Canvas] 세션 갱신 실패: {e}")
-            if user_id in canvas_session_cache:
-                del canvas_session_cache[user_id]
-            raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다.")
-
-    if response.status_code != 200:
-        raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다.")
-
-    return response.json()
+    """과목별 게시판 목록 조회 (과목 공유 캐시)"""
+    cached = await _course_cached(
+        current_user.id, course_id, "boards", "boards",
+        lambda session_data: _fetch_boards(session_data, course_id),
+        _json_response, refresh
+    )
+    return cached["data"]
 
 
 @router.get("/courses/{course_id}/boards/{board_id}/posts")
 async def get_board_posts(
     course_id: int,
     board_id: int,
+    refresh: bool = Query(False, description="공유 캐시를 무시하고 새로 조회"),
     current_user: User = Depends(get_current_user)
 ):
-    """게시판 게시글 목록 조회"""
-    user_id = current_user.id
-
-    session_data = await ensure_canvas_session(user_id)
-    response = await _fetch_board_posts(session_data, course_id, board_id)
-
-    if response.status_code != 200:
-        try:
-            session_data = await refresh_canvas_session(user_id)
-            response = await _fetch_board_posts(session_data, course_id, board_id)
-        except Exception as e:
-            print(f"[Canvas] 세션 갱신 실패: {e}")
-            if user_id in canvas_session_cache:
-                del canvas_session_cache[user_id]
-            raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다.")
-
-    if response.status_code != 200:
-        raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다.")
-
-    return response.json()
+    """게시판 게시글 목록 조회 (과목 공유 캐시)"""
+    cached = await _course_cached(
+        current_user.id, course_id, "board_posts", f"boards:{board_id}:posts",
+        lambda session_data: _fetch_board_posts(session_data, course_id, board_id),
+        _json_response, refresh
+    )
+    return cached["data"]
 
 
 async def _fetch_course_users(session_data: dict, course_id: int):
     """과목 수강생 목록 조회 내부 함수"""
     cookies = session_data.get('cookies', {})
 
-    async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
+    async with upstream_client(verify=False, timeout=15.0) as client:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json',
@@ -730,35 +854,23 @@ async def _fetch_course_users(session_data: dict, course_id: int):
 @router.get("/courses/{course_id}/users")
 async def get_course_users(
     course_id: int,
+    refresh: bool = Query(False, description="공유 캐시를 무시하고 새로 조회"),
     current_user: User = Depends(get_current_user)
 ):
-    """과목 수강생 목록 조회"""
-    user_id = current_user.id
-
-    session_data = await ensure_canvas_session(user_id)
-    response = await _fetch_course_users(session_data, course_id)
-
-    if response.status_code != 200:
-        try:
-            session_data = await refresh_canvas_session(user_id)
-            response = await _fetch_course_users(session_data, course_id)
-        except Exception as e:
-            print(f"[Canvas] 세션 갱신 실패: {e}")
-            if user_id in canvas_session_cache:
-                del canvas_session_cache[user_id]
-            raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다.")
-
-    if response.status_code != 200:
-        raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다.")
-
-    return response.json()
+    """과목 수강생 목록 조회 (과목 공유 캐시)"""
+    cached = await _course_cached(
+        current_user.id, course_id, "users", "users",
+        lambda session_data: _fetch_course_users(session_data, course_id),
+        _json_response, refresh
+    )
+    return cached["data"]
 
 
 async def _fetch_syllabus(session_data: dict, course_id: int):
     """수업 계획서 페이지 HTML 조회 내부 함수"""
     cookies = session_data.get('cookies', {})
 
-    async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
+    async with upstream_client(verify=False, timeout=15.0) as client:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
@@ -772,66 +884,22 @@ async def _fetch_syllabus(session_data: dict, course_id: int):
         return response
 
 
-def parse_syllabus_html(html: str) -> dict:
-    """수업 계획서 HTML에서 내용 파싱"""
-    from bs4 import BeautifulSoup
-
-    soup = BeautifulSoup(html, 'html.parser')
-
-    result = {
-        'syllabus_html': '',
-        'grading_weights': []
-    }
-
-    # 수업 계획서 본문 추출
-    syllabus_div = soup.find('div', id='course_syllabus')
-    if syllabus_div:
-        result['syllabus_html'] = str(syllabus_div)
-
-    # 평가 비중 추출
-    grading_div = soup.find('div', attrs={'aria-label': '과제 비중'})
-    if grading_div:
-        table = grading_div.find('table', class_='summary')
-        if table:
-            tbody = table.find('tbody')
-            if tbody:
-                for tr in tbody.find_all('tr'):
-                    th = tr.find('th', scope='row')
-                    td = tr.find('td')
-                    if th and td:
-                        result['grading_weights'].append({
-                            'group': th.get_text(strip=True),
-                            'weight': td.get_text(strip=True),
-                            'is_total': 'font-weight' in (tr.get('style') or '')
-                        })
-
-    return result
+async def _parse_syllabus(response):
+    return await run_parser(parse_syllabus_html, response.text), True
 
 
 @router.get("/courses/{course_id}/syllabus")
 async def get_course_syllabus(
     course_id: int,
+    refresh: bool = Query(False, description="공유 캐시를 무시하고 새로 조회"),
     current_user: User = Depends(get_current_user)
 ):
-    """과목 수업 계획서 조회"""
-    user_id = current_user.id
-
-    session_data = await ensure_canvas_session(user_id)
-    response = await _fetch_syllabus(session_data, course_id)
-
-    if response.status_code != 200:
-        try:
-            session_data = await refresh_canvas_session(user_id)
-            response = await _fetch_syllabus(session_data, course_id)
-        except Exception as e:
-            print(f"[Canvas] 세션 갱신 실패: {e}")
-            if user_id in canvas_session_cache:
-                del canvas_session_cache[user_id]
-            raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다.")
-
-    if response.status_code != 200:
-        raise HTTPException(status_code=401, detail="Canvas 세션이 만료되었습니다.")
-
-    return parse_syllabus_html(response.text)
+    """과목 수업 계획서 조회 (과목 공유 캐시, 파싱 결과 저장)"""
+    cached = await _course_cached(
+        current_user.id, course_id, "syllabus", "syllabus",
+        lambda session_data: _fetch_syllabus(session_data, course_id),
+        _parse_syllabus, refresh
+    )
+    return cached["data"]
 
 
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func, distinct
 
+from app.core.cache import cache_delete, cache_get, cache_set
 from app.core.database import get_db
 from app.core.deps import get_current_user
 from app.models.user import User
@@ -11,11 +12,15 @@ from app.models.chat import ChatRoom, ChatRoomMember, ChatMessage
 from app.models.block import UserBlock
 from app.models.schedule import Schedule
 from app.schemas.chat import ChatRoomCreate, ChatRoomResponse, ChatMessageCreate, ChatMessageResponse
+from app.services.schedule_sync import subscribe, user_subject_keys
 
 router = APIRouter(prefix="/chat", tags=["채팅"])
 
 GLOBAL_ROOM_NAME = "전체 채팅"
 
+# 과목 채팅방 접근 확인용 사용자별 과목 키 캐시 (시간표 변경 이벤트로 무효화, 초)
+SUBJECT_KEYS_CACHE_TTL = 120
+
 
 def get_or_create_global_room(db: Session) -> ChatRoom:
     """전체 채팅방 조회 또는 생성"""
@@ -82,10 +87,31 @@ def get_or_create_subject_room(db: Session, schedule: Schedule, all_schedules: l
     return room
 
 
+def _subject_keys_cache_key(user_id: int) -> str:
+    return f"schedule:subject_keys:{user_id}"
+
+
 def get_user_subject_keys(db: Session, user_id: int) -> List[str]:
-    """사용자의 모든 과목 키 목록 조회"""
-    schedules = db.query(Schedule).filter(Schedule.user_id == user_id).all()
-    return [generate_subject_key(s) for s in schedules]
+    """
+    사용자의 모든 과목 키 목록 조회 (메시지마다 접근 확인을 하므로 캐시)
+    시간표 변경 이벤트로 지우는 키라 워커별 메모리 사본 없이 Redis에만 둔다
+    (다른 워커의 메모리 사본은 지울 수 없음)
+    """
+    cache_key = _subject_keys_cache_key(user_id)
+    keys = cache_get(cache_key)
+    if keys is None:
+        keys = sorted(user_subject_keys(db, user_id))
+        cache_set(cache_key, keys, SUBJECT_KEYS_CACHE_TTL)
+    return keys
+
+
+def _on_schedule_change(event: dict):
+    """시간표가 바뀌면 과목 키 캐시 삭제 (과목이 그대로면 유지)"""
+    if event["subject_keys_added"] or event["subject_keys_removed"]:
+        cache_delete(_subject_keys_cache_key(event["user_id"]))
+
+
+subscribe(_on_schedule_change)
 
 
 def can_access_room(db: Session, user_id: int, room: ChatRoom) -> bool:
@@ -0,0 +1,176 @@
+"""
+대시보드 묶음 조회 API
+
+앱 첫 화면이 따로 부르던 API(배너, 배지, 도토리, 랭킹, 선물 등)를 한 요청으로 모아
+서버에서 동시에 실행한다. 각 섹션은 기존 라우터 함수와 캐시를 그대로 쓰고,
+섹션별 시간 제한을 넘기거나 실패하면 그 섹션만 상태와 함께 비워서 응답한다.
+(느린 포털 하나가 화면 전체를 붙잡지 않도록)
+"""
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import SessionLocal
+from app.core.deps import get_current_user
+from app.models.user import User
+from app.routers import announcement, banner, cafeteria, canvas, dotori, ears, notification, schedule, shuttle
+from app.schemas.schedule import ScheduleResponse
+
+router = APIRouter(prefix="/dashboard", tags=["대시보드"])
+
+# sections 파라미터를 생략하면 대시보드 첫 화면이 쓰는 섹션
+DEFAULT_SECTIONS = ("banner", "popup", "badges", "dotori", "ranking", "gifts")
+
+# 섹션별 시간 제한 (초) - DB/메모리 섹션은 짧게, 외부 포털 섹션은 길게
+DB_SECTION_TIMEOUT = 2.0
+UPSTREAM_SECTION_TIMEOUT = 4.0
+
+
+def _with_db(func: Callable, user_id: Optional[int] = None):
+    """동기 라우터 함수를 섹션 전용 DB 세션으로 실행 (스레드풀, 섹션끼리 세션 공유 안 함)"""
+    def run():
+        db = SessionLocal()
+        try:
+            if user_id is None:
+                return jsonable_encoder(func(db))
+            user = db.query(User).filter(User.id == user_id).first()
+            return jsonable_encoder(func(user, db))
+        finally:
+            db.close()
+    return run_in_threadpool(run)
+
+
+async def _banner(user: User):
+    return await banner.get_main_banner()
+
+
+async def _popup(user: User):
+    return await banner.get_popup()
+
+
+async def _badges(user: User):
+    # async 함수 안에서 동기 DB 조회를 하므로 이벤트 루프에서 실행 (1분 캐시)
+    db = SessionLocal()
+    try:
+        return await notification.get_notification_badges(db=db, current_user=user)
+    finally:
+        db.close()
+
+
+async def _dotori(user: User):
+    return await _with_db(lambda u, db: dotori.get_dotori_info(current_user=u, db=db), user.id)
+
+
+async def _ranking(user: User):
+    return await _with_db(lambda u, db: dotori.get_ranking(current_user=u, db=db), user.id)
+
+
+async def _gifts(user: User):
+    return await _with_db(lambda u, db: dotori.get_unread_gifts(current_user=u, db=db), user.id)
+
+
+async def _schedules(user: User):
+    return await _with_db(
+        lambda u, db: [ScheduleResponse.model_validate(s) for s in schedule.get_schedules(current_user=u, db=db)],
+        user.id
+    )
+
+
+async def _announcements(user: User):
+    return await _with_db(lambda db: announcement.get_announcements(category=None, cursor=None, limit=5, db=db))
+
+
+async def _cafeteria(user: User):
+    snapshot = await cafeteria.get_menu_snapshot("student")
+    return cafeteria.menu_payload(snapshot, "student")
+
+
+async def _shuttle(user: User):
+    return await shuttle.get_next_departures(route="asan_ktx", stop=None, n=3, day_type=None)
+
+
+async def _canvas_todos(user: User):
+    response = Response()
+    data = await canvas.get_canvas_todos(response, refresh=False, current_user=user)
+    return {
+        "todos": data,
+        "fetched_at": int(response.headers["X-Fetched-At"]),
+        "cache": response.headers["X-Cache"],
+    }
+
+
+async def _attendance(user: User):
+    return await ears.get_all_attendance(refresh=False, current_user=user)
+
+
+# 섹션 이름 → (조회 함수, 시간 제한)
+SECTIONS: Dict[str, tuple] = {
+    "banner": (_banner, DB_SECTION_TIMEOUT),
+    "popup": (_popup, DB_SECTION_TIMEOUT),
+    "badges": (_badges, DB_SECTION_TIMEOUT),
+    "dotori": (_dotori, DB_SECTION_TIMEOUT),
+    "ranking": (_ranking, DB_SECTION_TIMEOUT),
+    "gifts": (_gifts, DB_SECTION_TIMEOUT),
+    "schedules": (_schedules, DB_SECTION_TIMEOUT),
+    "announcements": (_announcements, DB_SECTION_TIMEOUT),
+    "cafeteria": (_cafeteria, UPSTREAM_SECTION_TIMEOUT),
+    "shuttle": (_shuttle, UPSTREAM_SECTION_TIMEOUT),
+    "canvas_todos": (_canvas_todos, UPSTREAM_SECTION_TIMEOUT),
+    "attendance": (_attendance, UPSTREAM_SECTION_TIMEOUT),
+}
+
+
+def _finish_in_background(task: asyncio.Task, name: str):
+    """시간 제한을 넘긴 섹션은 끝까지 실행해 캐시를 채우고 결과는 버린다"""
+    def done(t: asyncio.Task):
+        if not t.cancelled() and t.exception() is not None:
+            print(f"[Dashboard] {name} 섹션 백그라운드 완료 실패: {t.exception()}")
+    task.add_done_callback(done)
+
+
+async def _run_section(name: str, user: User) -> dict:
+    func, timeout = SECTIONS[name]
+    started = time.perf_counter()
+    task = asyncio.ensure_future(func(user))
+    try:
+        data = await asyncio.wait_for(asyncio.shield(task), timeout)
+        result = {"status": "ok", "data": data}
+    except asyncio.TimeoutError:
+        _finish_in_background(task, name)
+        print(f"[Dashboard] {name} 섹션 시간 초과 ({timeout}s)")
+        result = {"status": "timeout", "data": None}
+    except HTTPException as e:
+        status = "unauthorized" if e.status_code == 401 else "error"
+        result = {"status": status, "data": None, "detail": e.detail}
+    except Exception as e:
+        print(f"[Dashboard] {name} 섹션 오류: {e}")
+        result = {"status": "error", "data": None, "detail": "조회 중 오류가 발생했습니다."}
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+@router.get("")
+async def get_dashboard(
+    sections: Optional[str] = Query(
+        None, description=f"쉼표로 구분한 섹션 ({', '.join(SECTIONS)}), 생략 시 {', '.join(DEFAULT_SECTIONS)}"
+    ),
+    current_user: User = Depends(get_current_user)
+):
+    """대시보드 섹션 동시 조회 (섹션별 status: ok, timeout, unauthorized, error)"""
+    names: List[str] = list(DEFAULT_SECTIONS)
+    if sections:
+        names = list(dict.fromkeys(name.strip() for name in sections.split(",") if name.strip()))
+        unknown = [name for name in names if name not in SECTIONS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"알 수 없는 섹션: {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*[_run_section(name, current_user) for name in names])
+    return {
+        "sections": dict(zip(names, results)),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -4,14 +4,21 @@ SSO 플로우: SWS MenuAuthCheck → EARS SSO LoginSSO.jsp → iwin_sin → 세
 """
 import re
 import asyncio
+import hashlib
+import json
+import time
 import httpx
-from typing import Dict
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse, parse_qs, unquote
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
+from app.core.cache import cache_delete_pattern, smart_cache_get, smart_cache_set
+from app.core.config import settings
 from app.core.deps import get_current_user
 from app.core.session_store import save_credentials, load_credentials
+from app.core.upstream import upstream_client
 from app.models.user import User
+from app.services.session_keepalive import note_created, note_expired, note_used
 
 router = APIRouter(prefix="/ears", tags=["EARS 출석"])
 
@@ -22,6 +29,31 @@ SWS_MENU_AUTH_URL = "https://sws.sunmoon.ac.kr/MenuAuthCheck"
 # EARS 세션 캐시 (user_id -> {cookies, courses, student_id})
 ears_session_cache: Dict[int, dict] = {}
 
+# 과목별 출석 캐시 (ears:attendance:{user_id}:{dclass} -> {attendance, fetched_at, hash})
+# 로그인 직후 워밍, 오래되면 응답 후 백그라운드 갱신, 수업이 끝나면 예약 갱신 (attendance_refresh), ?refresh=true로 즉시 갱신
+
+# 사용자별 EARS 동시 조회 제한 (user_id -> Semaphore)
+_user_limits: Dict[int, asyncio.Semaphore] = {}
+
+# 백그라운드 갱신 중인 (user_id, dclass)
+_refreshing: Set[Tuple[int, str]] = set()
+_background_tasks: Set[asyncio.Task] = set()
+
+# 출석을 조회한 사용자 (user_id -> (마지막 조회 시각, 학번)) - 수업 종료 후 예약 갱신 대상
+attendance_viewers: Dict[int, Tuple[float, str]] = {}
+
+attendance_stats = {
+    "fresh": 0,       # 캐시 그대로 응답
+    "stale": 0,       # 캐시로 응답 + 백그라운드 갱신
+    "missing": 0,     # 캐시 없어 바로 조회
+    "fetched": 0,     # EARS 과목 조회 수
+    "changed": 0,     # 조회 결과가 이전 캐시와 다름
+    "unchanged": 0,
+    "failed": 0,
+    "background": 0,  # 오래된 캐시 백그라운드 갱신 예약
+    "scheduled": 0,   # 수업 종료 후 갱신 예약
+}
+
 
 def _parse_attend_kind(kind: str) -> str:
     """출석 상태 코드를 문자열로 변환 (function3.js attend_state 기반)"""
@@ -43,7 +75,7 @@ async def _ears_sso_and_login(sso_id: str, sso_pw: str, sso_type: str, student_i
     """
     EARS SSO 인증 + iwin_sin 로그인 (SWS에서 받은 SSO 데이터 사용)
     """
-    async with httpx.AsyncClient(follow_redirects=False, verify=False, timeout=20.0) as client:
+    async with upstream_client(follow_redirects=False, verify=False, timeout=20.0) as client:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/145.0.0.0 Safari/537.36'
         }
@@ -185,7 +217,7 @@ async def login_ears(student_id: str, password: str) -> dict:
     SWS_BASE = "https://sws.sunmoon.ac.kr"
     ua = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/145.0.0.0 Safari/537.36'
 
-    async with httpx.AsyncClient(follow_redirects=False, verify=False, timeout=20.0) as client:
+    async with upstream_client(follow_redirects=False, verify=False, timeout=20.0) as client:
         # 1. GET Login.aspx (쿠키 + viewstate)
         login_page = await client.get(f"{SWS_BASE}/Login.aspx", headers={'User-Agent': ua})
 
@@ -251,7 +283,11 @@ async def ensure_ears_session(user_id: int) -> dict:
     """EARS 세션 확인 및 필요시 재로그인"""
     if user_id in ears_session_cache:
         return ears_session_cache[user_id]
+    return await refresh_ears_session(user_id)
 
+
+async def refresh_ears_session(user_id: int) -> dict:
+    """저장된 SSO 데이터/자격 증명으로 EARS 재로그인 (기존 세션은 새 세션이 생길 때까지 유지)"""
     # 1. 저장된 SSO 데이터로 빠른 복원 (MenuAuthCheck 불필요)
     creds = load_credentials('ears', user_id)
     if creds and creds.get('sso_id') and creds.get('sso_pw'):
@@ -262,6 +298,7 @@ async def ensure_ears_session(user_id: int) -> dict:
                 creds.get('student_id', '')
             )
             ears_session_cache[user_id] = session_data
+            note_created("ears", user_id)
             return session_data
         except Exception as e:
             print(f"[EARS] SSO 빠른 복원 실패: {e}")
@@ -277,6 +314,7 @@ async def ensure_ears_session(user_id: int) -> dict:
             print(f"[EARS] SWS 전체 로그인으로 세션 복원: user_id={user_id}")
             session_data = await login_ears(creds['student_id'], creds['password'])
             ears_session_cache[user_id] = session_data
+            note_created("ears", user_id)
             # SSO 데이터 포함하여 저장
             save_data = {
                 'student_id': creds['student_id'],
@@ -295,7 +333,7 @@ async def ensure_ears_session(user_id: int) -> dict:
 async def _fetch_attendance(cookies: dict, dclass: str, duser_id: str) -> dict:
     """EARS 출석부 API 호출 (세션 쿠키 사용)"""
     ikey = f'{{"dclass":"{dclass}","duser_id":"{duser_id}"}}'
-    async with httpx.AsyncClient(verify=False, timeout=20.0) as client:
+    async with upstream_client(verify=False, timeout=20.0) as client:
         response = await client.post(
             f"{EARS_BASE_URL}/attend/iwin_st_chulseokbu",
             data={"ikey": ikey},
@@ -396,41 +434,191 @@ async def get_ears_courses(current_user: User = Depends(get_current_user)):
 
 
 @router.get("/attendance/all")
-async def get_all_attendance(current_user: User = Depends(get_current_user)):
-    """모든 수강과목의 출석 현황 일괄 조회 (병렬 처리)"""
-    session = await ensure_ears_session(current_user.id)
-    cookies = session.get("cookies", {})
-    courses = session.get("courses", [])
-    student_id = current_user.student_id
+async def get_all_attendance(
+    refresh: bool = Query(False, description="캐시를 무시하고 EARS에서 다시 조회"),
+    current_user: User = Depends(get_current_user)
+):
+    """모든 수강과목의 출석 현황 일괄 조회 (과목별 캐시, 오래된 과목은 응답 후 백그라운드 갱신)"""
+    attendance_viewers[current_user.id] = (time.time(), current_user.student_id)
+    return await load_all_attendance(current_user.id, current_user.student_id, refresh=refresh)
 
-    # 유효한 과목만 필터링
-    valid_courses = [c for c in courses if c.get("sugang_codes")]
-    if not valid_courses:
-        return {"courses": []}
 
-    # 모든 과목 출석을 병렬로 조회
-    async def fetch_one(course):
-        dclass = course["sugang_codes"][0]
-        try:
-            data = await _fetch_attendance(cookies, dclass, student_id)
-            if data.get("xidedu", {}).get("xmsg") == "NoLogin":
-                return {"error": "session_expired"}
-            attendance = _process_attendance(data, student_id)
-            attendance["color"] = None
-            return attendance
-        except Exception as e:
-            print(f"[EARS] 출석 조회 실패: {dclass}, {e}")
-            return None
+def attendance_cache_key(user_id: int, dclass: str) -> str:
+    return f"ears:attendance:{user_id}:{dclass}"
+
+
+def _user_slot(user_id: int) -> asyncio.Semaphore:
+    """사용자별 EARS 동시 조회 제한"""
+    semaphore = _user_limits.get(user_id)
+    if semaphore is None:
+        semaphore = _user_limits[user_id] = asyncio.Semaphore(settings.EARS_USER_CONCURRENCY)
+    return semaphore
+
+
+def _attendance_hash(attendance: dict) -> str:
+    return hashlib.sha256(json.dumps(attendance, ensure_ascii=False, sort_keys=True).encode()).hexdigest()[:16]
 
-    fetch_results = await asyncio.gather(*[fetch_one(c) for c in valid_courses])
+
+async def probe_ears_session(user_id: int) -> Optional[bool]:
+    """EARS 세션이 살아 있는지 (세션 유지용, 첫 과목 출석부 조회 한 번)"""
+    session = ears_session_cache.get(user_id)
+    dclasses = [c["sugang_codes"][0] for c in (session or {}).get("courses", []) if c.get("sugang_codes")]
+    if not dclasses:
+        return None
+    student_id = attendance_viewers.get(user_id, (0, ""))[1] or (load_credentials('ears', user_id) or {}).get('student_id', '')
+    data = await _fetch_attendance(session.get("cookies", {}), dclasses[0], student_id)
+    return data.get("xidedu", {}).get("xmsg") != "NoLogin"
+
+
+def _expire_ears_session(user_id: int):
+    """세션 만료 - 캐시 삭제 (다음 조회에서 다시 로그인)"""
+    if user_id in ears_session_cache:
+        del ears_session_cache[user_id]
+    note_expired("ears", user_id)
+
+
+async def session_course_codes(user_id: int, refresh: bool = False) -> Dict[str, str]:
+    """
+    EARS 수강과목 dclass -> 과목명
+    이 워커에 세션이 있으면 세션에서, 없으면 캐시에서 (재시작 후 캐시만으로 응답하도록), 둘 다 없으면 재로그인
+    """
+    cached = None if refresh else smart_cache_get(f"ears:attendance_courses:{user_id}")
+    session = ears_session_cache.get(user_id)
+    if session is None:
+        if cached is not None:
+            return cached
+        session = await ensure_ears_session(user_id)
+    courses = {c["sugang_codes"][0]: c.get("course_name", "") for c in session.get("courses", []) if c.get("sugang_codes")}
+    if courses != cached:
+        smart_cache_set(f"ears:attendance_courses:{user_id}", courses, settings.EARS_ATTENDANCE_STALE_SECONDS)
+    return courses
+
+
+async def fetch_course_attendance(user_id: int, student_id: str, dclasses: List[str]) -> Dict[str, Optional[dict]]:
+    """
+    과목별 출석을 EARS에서 조회해 캐시에 저장 (사용자당 EARS_USER_CONCURRENCY개씩)
+    반환: dclass -> 캐시 항목 {attendance, fetched_at, hash} (실패한 과목은 None)
+    세션이 만료됐으면 세션을 지우고 401
+    """
+    session = await ensure_ears_session(user_id)
+    cookies = session.get("cookies", {})
+    slot = _user_slot(user_id)
+
+    async def fetch_one(dclass):
+        async with slot:
+            try:
+                data = await _fetch_attendance(cookies, dclass, student_id)
+                if data.get("xidedu", {}).get("xmsg") == "NoLogin":
+                    return "session_expired"
+                attendance = _process_attendance(data, student_id)
+                attendance["color"] = None
+                return attendance
+            except Exception as e:
+                print(f"[EARS] 출석 조회 실패: {dclass}, {e}")
+                return None
+
+    fetch_results = await asyncio.gather(*[fetch_one(d) for d in dclasses])
 
     # 세션 만료 체크
-    for r in fetch_results:
-        if isinstance(r, dict) and r.get("error") == "session_expired":
-            if current_user.id in ears_session_cache:
-                del ears_session_cache[current_user.id]
-            raise HTTPException(status_code=401, detail="EARS 세션이 만료되었습니다.")
-
-    # 성공한 결과만 반환
-    results = [r for r in fetch_results if r and not isinstance(r, dict) or (isinstance(r, dict) and "error" not in r)]
-    return {"courses": results}
+    if "session_expired" in fetch_results:
+        _expire_ears_session(user_id)
+        raise HTTPException(status_code=401, detail="EARS 세션이 만료되었습니다.")
+
+    entries: Dict[str, Optional[dict]] = {}
+    now = time.time()
+    for dclass, attendance in zip(dclasses, fetch_results):
+        if attendance is None:
+            attendance_stats["failed"] += 1
+            entries[dclass] = None
+            continue
+        entry = {"attendance": attendance, "fetched_at": now, "hash": _attendance_hash(attendance)}
+        previous = smart_cache_get(attendance_cache_key(user_id, dclass))
+        if previous is not None and previous.get("hash") == entry["hash"]:
+            attendance_stats["unchanged"] += 1
+        else:
+            attendance_stats["changed"] += 1
+        smart_cache_set(attendance_cache_key(user_id, dclass), entry, settings.EARS_ATTENDANCE_STALE_SECONDS)
+        entries[dclass] = entry
+    attendance_stats["fetched"] += len(dclasses)
+    if any(entries.values()):
+        note_used("ears", user_id)
+    return entries
+
+
+async def _refresh_in_background(user_id: int, student_id: str, dclasses: List[str], reason: str):
+    try:
+        await fetch_course_attendance(user_id, student_id, dclasses)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"[EARS] 출석 {reason} 갱신 실패: user_id={user_id}, {getattr(e, 'detail', e)}")
+    finally:
+        for dclass in dclasses:
+            _refreshing.discard((user_id, dclass))
+
+
+def schedule_attendance_refresh(user_id: int, student_id: str, dclasses: List[str],
+                                reason: str = "background") -> Optional[asyncio.Task]:
+    """과목 출석을 백그라운드에서 갱신 (이미 갱신 중인 과목 제외), 예약할 과목이 없으면 None"""
+    pending = [d for d in dclasses if (user_id, d) not in _refreshing]
+    if not pending:
+        return None
+    _refreshing.update((user_id, d) for d in pending)
+    task = asyncio.create_task(_refresh_in_background(user_id, student_id, pending, reason))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    attendance_stats[reason] += len(pending)
+    return task
+
+
+async def load_all_attendance(user_id: int, student_id: str, refresh: bool = False) -> dict:
+    """
+    전 과목 출석 (과목별 캐시)
+    - EARS_ATTENDANCE_FRESH_SECONDS 안에 조회한 과목: 캐시 그대로
+    - 그보다 오래된 과목: 캐시로 응답하고 백그라운드에서 갱신
+    - 캐시가 없는 과목 (또는 refresh): 바로 조회
+    세션 만료 시 캐시 삭제 후 401
+    """
+    courses = await session_course_codes(user_id, refresh)
+    if not courses:
+        return {"courses": []}
+
+    now = time.time()
+    entries = {}
+    stale = []
+    for dclass in courses:
+        entry = None if refresh else smart_cache_get(attendance_cache_key(user_id, dclass))
+        entries[dclass] = entry
+        if entry is None:
+            attendance_stats["missing"] += 1
+        elif now - entry["fetched_at"] < settings.EARS_ATTENDANCE_FRESH_SECONDS:
+            attendance_stats["fresh"] += 1
+        else:
+            attendance_stats["stale"] += 1
+            stale.append(dclass)
+
+    missing = [dclass for dclass, entry in entries.items() if entry is None]
+    if missing:
+        try:
+            entries.update(await fetch_course_attendance(user_id, student_id, missing))
+        except HTTPException as e:
+            if e.status_code == 401:
+                cache_delete_pattern(f"ears:attendance:{user_id}:*")
+                cache_delete_pattern(f"ears:attendance_courses:{user_id}")
+            raise
+    if stale:
+        schedule_attendance_refresh(user_id, student_id, stale)
+
+    # 성공한 과목만 반환 (수강과목 순서 유지)
+    return {"courses": [entry["attendance"] for entry in entries.values() if entry]}
+
+
+def attendance_cache_stats() -> dict:
+    """출석 캐시 적중/갱신 통계 (이 워커 기준, EARS_ATTENDANCE_FRESH_SECONDS 조정용)"""
+    now = time.time()
+    return {
+        **attendance_stats,
+        "refreshing": len(_refreshing),
+        "active_viewers": sum(1 for viewed, _ in attendance_viewers.values()
+                              if now - viewed <= settings.EARS_ACTIVE_SECONDS),
+    }
@@ -1,18 +1,61 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
 
+from app.core.cache import cache_delete, cache_get, cache_set
 from app.core.database import get_db
 from app.core.deps import get_current_user
 from app.models.user import User
 from app.models.friend import Friend
 from app.models.schedule import Schedule
 from app.schemas.friend import FriendCreate, FriendUpdate, FriendResponse, FreeTimeSlot
+from app.services.schedule_sync import subscribe
+from app.services.user_directory import user_directory
 
 router = APIRouter(prefix="/friends", tags=["친구"])
 
+FREE_TIME_DAYS = ["월", "화", "수", "목", "금"]
+# 30분 단위 시간 슬롯 (09:00 ~ 17:30)
+FREE_TIME_SLOTS = [f"{h:02d}:{m:02d}" for h in range(9, 18) for m in (0, 30)]
+# 사용자별 바쁜 시간 비트맵 캐시 (시간표 변경 이벤트로 무효화, 초)
+BUSY_BITMAP_CACHE_TTL = 600
+
+
+def _time_to_minutes(t: str) -> int:
+    h, m = map(int, t.split(":"))
+    return h * 60 + m
+
+
+_SLOT_MINUTES = [_time_to_minutes(slot) for slot in FREE_TIME_SLOTS]
+
+
+def _busy_cache_key(user_id: int) -> str:
+    return f"schedule:busy:{user_id}"
+
+
+def _busy_bitmaps(schedules) -> List[int]:
+    """시간표 → 요일별 바쁜 슬롯 비트맵 (비트 i = FREE_TIME_SLOTS[i]와 수업이 겹침)"""
+    bitmaps = [0] * len(FREE_TIME_DAYS)
+    for schedule in schedules:
+        if schedule.day not in FREE_TIME_DAYS:
+            continue
+        start_min = _time_to_minutes(schedule.start_time)
+        end_min = _time_to_minutes(schedule.end_time)
+        day = FREE_TIME_DAYS.index(schedule.day)
+        for i, slot_min in enumerate(_SLOT_MINUTES):
+            if start_min <= slot_min < end_min:
+                bitmaps[day] |= 1 << i
+    return bitmaps
+
+
+def _on_schedule_change(event: dict):
+    cache_delete(_busy_cache_key(event["user_id"]))
+
+
+subscribe(_on_schedule_change)
+
 
 @router.get("", response_model=List[FriendResponse])
 def get_friends(
@@ -297,45 +340,36 @@ def compare_free_time(
     db: Session = Depends(get_db)
 ):
     """공강 시간 비교"""
-    days = ["월", "화", "수", "목", "금"]
-
-    # 30분 단위 시간 슬롯 생성 (09:00 ~ 17:30)
-    time_slots = []
-    for h in range(9, 18):
-        time_slots.append(f"{h:02d}:00")
-        time_slots.append(f"{h:02d}:30")
+    days = FREE_TIME_DAYS
+    time_slots = FREE_TIME_SLOTS
 
     # 모든 사용자 ID (본인 포함)
-    all_user_ids = [current_user.id] + friend_ids
-
-    # 각 사용자의 시간표 조회
-    all_schedules = db.query(Schedule).filter(
-        Schedule.user_id.in_(all_user_ids)
-    ).all()
-
-    def time_to_minutes(t: str) -> int:
-        h, m = map(int, t.split(":"))
-        return h * 60 + m
-
-    # 바쁜 시간 슬롯 계산 (30분 단위)
-    busy_slots = set()
-    for schedule in all_schedules:
-        day = schedule.day
-        start_min = time_to_minutes(schedule.start_time)
-        end_min = time_to_minutes(schedule.end_time)
-
-        for slot in time_slots:
-            slot_min = time_to_minutes(slot)
-            # 슬롯이 수업 시간과 겹치면 바쁜 시간
-            if start_min <= slot_min < end_min:
-                busy_slots.add((day, slot))
+    all_user_ids = list(dict.fromkeys([current_user.id] + friend_ids))
+
+    # 사용자별 바쁜 시간 비트맵 (캐시에 없는 사용자만 시간표 조회)
+    # 시간표 변경 이벤트로 지우는 키라 워커별 메모리 사본 없이 Redis에만 둔다
+    bitmaps = {user_id: cache_get(_busy_cache_key(user_id)) for user_id in all_user_ids}
+    missing = [user_id for user_id, bitmap in bitmaps.items() if bitmap is None]
+    if missing:
+        schedules_by_user = {user_id: [] for user_id in missing}
+        for schedule in db.query(Schedule).filter(Schedule.user_id.in_(missing)).all():
+            schedules_by_user[schedule.user_id].append(schedule)
+        for user_id, schedules in schedules_by_user.items():
+            bitmaps[user_id] = _busy_bitmaps(schedules)
+            cache_set(_busy_cache_key(user_id), bitmaps[user_id], BUSY_BITMAP_CACHE_TTL)
+
+    # 모두의 바쁜 시간 합치기 (요일별 OR)
+    busy = [0] * len(days)
+    for bitmap in bitmaps.values():
+        for d in range(len(days)):
+            busy[d] |= bitmap[d]
 
     # 공강 시간 찾기 (연속된 슬롯 병합)
     free_times = []
-    for day in days:
+    for d, day in enumerate(days):
         free_start = None
         for i, slot in enumerate(time_slots):
-            if (day, slot) not in busy_slots:
+            if not busy[d] >> i & 1:
                 if free_start is None:
                     free_start = slot
             else:
@@ -361,38 +395,40 @@ def compare_free_time(
 @router.get("/search", response_model=List[FriendResponse])
 def search_users(
     q: str,
+    department: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """사용자 검색 (친구 추가용)"""
-    users = db.query(User).filter(
-        User.id != current_user.id,
-        or_(
-            User.name.contains(q),
-            User.student_id.contains(q)
-        )
-    ).limit(20).all()
-
-    if not users:
+    """사용자 검색 (친구 추가용, 이름/초성/학번 접두사, 2글자 이상)"""
+    user_directory.refresh(db)
+    hits = user_directory.search(q, department=department, exclude_user_id=current_user.id)
+    if not hits:
         return []
 
-    # 배치로 친구 관계 조회 (N+1 쿼리 방지)
-    user_ids = [u.id for u in users]
-    friend_relations = db.query(Friend).filter(
-        or_(
-            and_(Friend.user_id == current_user.id, Friend.friend_id.in_(user_ids)),
-            and_(Friend.user_id.in_(user_ids), Friend.friend_id == current_user.id)
-        )
-    ).all()
-
-    # 관계 맵 생성
+    # 내 친구 관계 (사용자당 수십 건) 한 번 조회 후 결과에 바로 매핑
     relation_map = {}
-    for f in friend_relations:
-        other_id = f.friend_id if f.user_id == current_user.id else f.user_id
-        relation_map[other_id] = f.status
+    for user_id, friend_id, relation_status in db.query(
+        Friend.user_id, Friend.friend_id, Friend.status
+    ).filter(
+        or_(Friend.user_id == current_user.id, Friend.friend_id == current_user.id)
+    ):
+        other_id = friend_id if user_id == current_user.id else user_id
+        relation_map[other_id] = relation_status
+
+    user_ids = [user_id for user_id, _ in hits]
+    users = {
+        u.id: u for u in db.query(
+            User.id, User.name, User.student_id, User.department, User.created_at
+        ).filter(User.id.in_(user_ids))
+    }
 
     result = []
-    for user in users:
+    for user_id in user_ids:
+        user = users.get(user_id)
+        if user is None:
+            # 다른 워커에서 탈퇴 처리된 사용자
+            user_directory.remove(user_id)
+            continue
         result.append(FriendResponse(
             id=0,
             user_id=current_user.id,
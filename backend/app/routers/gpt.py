@@ -2,18 +2,26 @@
 선문대 GPT 챗봇 API
 """
 import re
+import asyncio
 import json
-import httpx
+import time
+from collections import deque
+from contextlib import AsyncExitStack
 from typing import List, Optional
+import anyio
+import httpx
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db
 from app.core.deps import get_current_user
 from app.core.session_store import save_credentials, load_credentials, remove_credentials
+from app.core.upstream import upstream_client
 from app.models.user import User
+from app.services.session_keepalive import note_created, note_expired, note_used
 
 router = APIRouter(prefix="/gpt", tags=["GPT 챗봇"])
 
@@ -50,7 +58,7 @@ session_cache = {}
 
 async def get_gpt_session(student_id: str, password: str) -> dict:
     """선문대 GPT 세션 획득"""
-    async with httpx.AsyncClient(follow_redirects=True, verify=False, timeout=20.0) as client:
+    async with upstream_client(follow_redirects=True, verify=False, timeout=20.0) as client:
         # 1. 로그인 페이지에서 토큰 가져오기
         login_page = await client.get(SWS_LOGIN_URL, headers=HEADERS)
 
@@ -106,14 +114,33 @@ async def get_gpt_session(student_id: str, password: str) -> dict:
         return cookies
 
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat_with_gpt(
-    request: ChatRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """GPT와 대화"""
-    # 세션 캐시 확인
+def _load_student_id(user_id: int) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        return user.student_id if user else None
+    finally:
+        db.close()
+
+
+async def refresh_gpt_session(user_id: int) -> dict:
+    """저장된 자격 증명으로 GPT 세션 갱신 (세션 유지 스케줄러용)"""
+    creds = load_credentials('gpt', user_id)
+    if not (creds and creds.get('password')):
+        raise HTTPException(status_code=401, detail="저장된 자격 증명이 없습니다.")
+    # 동기 DB 조회는 이벤트 루프 밖에서
+    student_id = await asyncio.to_thread(_load_student_id, user_id)
+    if not student_id:
+        raise HTTPException(status_code=401, detail="사용자를 찾을 수 없습니다.")
+
+    cookies = await get_gpt_session(student_id, creds['password'])
+    session_cache[user_id] = cookies
+    note_created("gpt", user_id)
+    return cookies
+
+
+async def _ensure_gpt_cookies(current_user: User) -> dict:
+    """GPT 세션 쿠키 (캐시에 없으면 저장된 자격 증명으로 복원)"""
     user_id = current_user.id
 
     if user_id not in session_cache:
@@ -124,6 +151,7 @@ async def chat_with_gpt(
                 print(f"[GPT] 저장된 자격 증명으로 세션 복원: user_id={user_id}")
                 cookies = await get_gpt_session(current_user.student_id, creds['password'])
                 session_cache[user_id] = cookies
+                note_created("gpt", user_id)
             except Exception as e:
                 print(f"[GPT] 세션 복원 실패: {e}")
                 remove_credentials('gpt', user_id)
@@ -131,9 +159,18 @@ async def chat_with_gpt(
         else:
             raise HTTPException(status_code=401, detail="GPT 세션이 필요합니다. 먼저 /gpt/init을 호출하세요.")
 
-    cookies = session_cache[user_id]
+    return session_cache[user_id]
+
+
+def _expire_gpt_session(user_id: int):
+    """세션 만료 - 캐시 삭제"""
+    if user_id in session_cache:
+        del session_cache[user_id]
+    note_expired("gpt", user_id)
 
-    # GPT API 호출
+
+def _gpt_request(request: ChatRequest):
+    """GPT API 요청 헤더와 본문"""
     gpt_headers = {
         "content-type": "application/json",
         "x-api-key": "sunmoon000000",
@@ -147,8 +184,21 @@ async def chat_with_gpt(
         "rid": request.rid,
         "rtype": 1
     }
+    return gpt_headers, payload
+
+
+@router.post("/chat", response_model=ChatResponse)
+async def chat_with_gpt(
+    request: ChatRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """GPT와 대화"""
+    user_id = current_user.id
+    cookies = await _ensure_gpt_cookies(current_user)
+    gpt_headers, payload = _gpt_request(request)
 
-    async with httpx.AsyncClient(verify=False, timeout=30.0) as client:
+    async with upstream_client(verify=False, timeout=30.0) as client:
         response = await client.post(
             GPT_API_URL,
             headers=gpt_headers,
@@ -157,11 +207,11 @@ async def chat_with_gpt(
         )
 
         if response.status_code != 200:
-            # 세션 만료 - 캐시 삭제
-            if user_id in session_cache:
-                del session_cache[user_id]
+            _expire_gpt_session(user_id)
             raise HTTPException(status_code=401, detail="GPT 세션이 만료되었습니다")
 
+        note_used("gpt", user_id)
+
         # SSE 응답 파싱
         text = response.content.decode('utf-8')
         lines = text.strip().split('\n')
@@ -181,6 +231,147 @@ async def chat_with_gpt(
         raise HTTPException(status_code=500, detail="GPT 응답 파싱 실패")
 
 
+# 스트리밍 응답에서 조각 텍스트로 보는 필드 (answer는 누적 전체 답변)
+DELTA_FIELDS = ("delta", "content", "text", "token")
+
+# 스트리밍 통계 (최근 STREAM_STATS_WINDOW건의 첫 토큰/전체 시간, ms)
+STREAM_STATS_WINDOW = 200
+stream_stats = {
+    "started": 0,
+    "completed": 0,
+    "cancelled": 0,  # 답변 도중 클라이언트 연결 끊김
+    "failed": 0,
+    "ttft_ms": deque(maxlen=STREAM_STATS_WINDOW),
+    "total_ms": deque(maxlen=STREAM_STATS_WINDOW),
+}
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _answer_delta(data: dict, answer: str):
+    """upstream 이벤트 하나 → (새 누적 답변, 보낼 조각, 앞부분이 바뀌었는지)"""
+    full = data.get('answer')
+    if isinstance(full, str):
+        if full.startswith(answer):
+            return full, full[len(answer):], False
+        return full, full, True
+    for field in DELTA_FIELDS:
+        delta = data.get(field)
+        if isinstance(delta, str):
+            return answer + delta, delta, False
+    return answer, "", False
+
+
+async def _relay_answer(upstream: httpx.Response, stack: AsyncExitStack, user_id: int, rid: int, started: float):
+    """upstream SSE를 줄 단위로 읽어 조각이 올 때마다 전달 (delta / replace / done / error)"""
+    answer = ""
+    first_token_at = None
+    outcome = "failed"
+    try:
+        async for line in upstream.aiter_lines():
+            if not line.startswith('data:'):
+                continue
+            try:
+                data = json.loads(line[5:].strip())
+            except ValueError:
+                continue
+            if not isinstance(data, dict):
+                continue
+            if 'answer' in data:
+                rid = data.get('id', rid)
+            answer, delta, replaced = _answer_delta(data, answer)
+            if not delta:
+                continue
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+                stream_stats["ttft_ms"].append((first_token_at - started) * 1000)
+            yield _sse("replace" if replaced else "delta", {"answer": answer} if replaced else {"delta": delta})
+
+        if answer:
+            outcome = "completed"
+            yield _sse("done", {"answer": answer, "rid": rid})
+        else:
+            yield _sse("error", {"detail": "GPT 응답 파싱 실패"})
+    except httpx.HTTPError as e:
+        print(f"[GPT] 스트리밍 중 upstream 오류: user_id={user_id}, {e}")
+        yield _sse("error", {"detail": "GPT 응답이 중단되었습니다"})
+    except (anyio.get_cancelled_exc_class(), GeneratorExit):
+        # 클라이언트 연결 끊김 → upstream 연결도 바로 닫아 생성 중인 응답을 더 받지 않음
+        outcome = "cancelled"
+        raise
+    finally:
+        with anyio.CancelScope(shield=True):
+            await stack.aclose()
+        stream_stats[outcome] += 1
+        total_ms = (time.perf_counter() - started) * 1000
+        stream_stats["total_ms"].append(total_ms)
+        ttft = f"{(first_token_at - started) * 1000:.0f}ms" if first_token_at else "-"
+        print(f"[GPT] 스트리밍 {outcome}: user_id={user_id}, 첫 토큰 {ttft}, 전체 {total_ms:.0f}ms, {len(answer)}자")
+
+
+@router.post("/chat/stream")
+async def chat_with_gpt_stream(
+    request: ChatRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    GPT와 대화 (SSE 스트리밍) - upstream 응답 조각을 받는 대로 전달
+    이벤트: delta {delta} / replace {answer} (앞부분이 바뀐 경우 전체) / done {answer, rid} / error {detail}
+    세션 만료는 스트림 시작 전에 401로 응답한다 (/chat과 같음)
+    """
+    started = time.perf_counter()
+    user_id = current_user.id
+    cookies = await _ensure_gpt_cookies(current_user)
+    gpt_headers, payload = _gpt_request(request)
+
+    # 응답 상태를 확인한 뒤에 스트림을 시작하므로 클라이언트/스트림은 _relay_answer가 닫는다
+    stack = AsyncExitStack()
+    try:
+        client = await stack.enter_async_context(upstream_client(verify=False, timeout=30.0))
+        upstream = await stack.enter_async_context(
+            client.stream("POST", GPT_API_URL, headers=gpt_headers, json=payload, cookies=cookies)
+        )
+    except BaseException:
+        await stack.aclose()
+        raise
+
+    if upstream.status_code != 200:
+        await stack.aclose()
+        _expire_gpt_session(user_id)
+        raise HTTPException(status_code=401, detail="GPT 세션이 만료되었습니다")
+
+    note_used("gpt", user_id)
+    stream_stats["started"] += 1
+    return StreamingResponse(
+        _relay_answer(upstream, stack, user_id, request.rid, started),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # 첫 조각을 보내기 전에 연결이 끊겨 스트림이 시작되지 않은 경우에도 upstream 정리
+        background=BackgroundTask(stack.aclose),
+    )
+
+
+def gpt_stream_stats() -> dict:
+    """스트리밍 응답 통계 (이 워커 기준)"""
+    def percentile(values, ratio):
+        if not values:
+            return None
+        ordered = sorted(values)
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * ratio))], 1)
+
+    return {
+        "started": stream_stats["started"],
+        "completed": stream_stats["completed"],
+        "cancelled": stream_stats["cancelled"],
+        "failed": stream_stats["failed"],
+        "ttft_p50_ms": percentile(stream_stats["ttft_ms"], 0.5),
+        "ttft_p95_ms": percentile(stream_stats["ttft_ms"], 0.95),
+        "total_p50_ms": percentile(stream_stats["total_ms"], 0.5),
+    }
+
+
 class InitRequest(BaseModel):
     password: str
 
@@ -194,6 +385,7 @@ async def init_gpt_session(
     try:
         cookies = await get_gpt_session(current_user.student_id, request.password)
         session_cache[current_user.id] = cookies
+        note_created("gpt", current_user.id)
         # 자격 증명 영속화
         save_credentials('gpt', current_user.id, {'password': request.password})
         return {"message": "GPT 세션이 초기화되었습니다"}
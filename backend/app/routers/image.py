@@ -0,0 +1,50 @@
+"""
+본문 이미지 프록시 API
+
+/api/images/{sha256}: 내용 주소 저장소의 이미지를 서빙한다.
+로그인한 사용자만 받을 수 있다 (<img>는 Authorization 헤더를 보내지 못하므로
+프론트엔드가 토큰을 붙여 받아 blob URL로 바꾼다, lib/api.ts resolveImageProxyUrls).
+내용이 바뀌면 URL도 바뀌므로 1년 캐시(immutable)와 ETag(sha256)를 준다.
+"""
+import asyncio
+import re
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+from app.core import image_store
+from app.core.deps import get_current_user
+from app.models.user import User
+from app.services.image_proxy import refetch_public
+
+router = APIRouter(prefix="/images", tags=["이미지 프록시"])
+
+_DIGEST_RE = re.compile(r'^[0-9a-f]{64}$')
+CACHE_MAX_AGE = 365 * 24 * 3600
+
+
+@router.get("/{digest}")
+async def get_image(
+    request: Request,
+    digest: str,
+    current_user: User = Depends(get_current_user)
+):
+    """프록시 이미지 조회"""
+    if not _DIGEST_RE.match(digest):
+        raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
+
+    # 저장소 조회는 SQLite 접근(마지막 접근 시각 갱신)이라 이벤트 루프 밖에서
+    blob = await asyncio.to_thread(image_store.get, digest)
+    if blob is None and await refetch_public(digest):
+        blob = await asyncio.to_thread(image_store.get, digest)
+    if blob is None:
+        raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
+
+    # 로그인한 사용자에게만 주므로 공용 캐시(CDN/프록시)에 남기지 않는다
+    headers = {
+        "ETag": f'"{digest}"',
+        "Cache-Control": f"private, max-age={CACHE_MAX_AGE}, immutable",
+    }
+    if request.headers.get("if-none-match") in (f'"{digest}"', f'W/"{digest}"'):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(blob["path"], media_type=blob["content_type"], headers=headers)
@@ -7,10 +7,10 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.deps import get_current_user
-from app.core.cache import smart_cache_get, smart_cache_set, cache_delete_pattern
 from app.models.user import User
 from app.models.phonebook import PhoneEntry
 from app.schemas.phonebook import PhoneEntryCreate, PhoneEntryUpdate, PhoneEntryResponse
+from app.services.phonebook_index import phonebook_index
 
 router = APIRouter(prefix="/phonebook", tags=["전화번호부"])
 
@@ -54,55 +54,22 @@ def sanitize_search_query(query: str) -> str:
     # 최대 길이 제한 (100자)
     return query[:100]
 
-CACHE_KEY = "phonebook"
-CACHE_EXPIRE = 3600  # 1시간
-
-
 @router.get("", response_model=List[PhoneEntryResponse])
 def get_phone_entries(
-    search: Optional[str] = Query(None, description="검색어"),
+    search: Optional[str] = Query(None, description="검색어 (부분 문자열, 초성, 전화번호 숫자)"),
     category: Optional[str] = Query(None, description="카테고리: dept/admin"),
-    department: Optional[str] = Query(None, description="부서 필터"),
-    db: Session = Depends(get_db)
+    department: Optional[str] = Query(None, description="부서 필터")
 ):
-    """전화번호부 조회"""
-    query = db.query(PhoneEntry)
-
-    if category:
-        query = query.filter(PhoneEntry.category == category)
-
-    if department:
-        query = query.filter(PhoneEntry.department == department)
-
-    if search:
-        # 검색어 정규화 (이모지/특수 유니코드 필터링)
-        sanitized_search = sanitize_search_query(search)
-        if sanitized_search:
-            query = query.filter(
-                (PhoneEntry.department.contains(sanitized_search)) |
-                (PhoneEntry.name.contains(sanitized_search)) |
-                (PhoneEntry.phone.contains(sanitized_search))
-            )
-
-    entries = query.order_by(PhoneEntry.department, PhoneEntry.name).all()
-    return entries
+    """전화번호부 조회 (메모리 인덱스 검색, 검색어가 있으면 일치도순)"""
+    # 검색어 정규화 (이모지/특수 유니코드 필터링)
+    sanitized_search = sanitize_search_query(search) if search else None
+    return phonebook_index.get().search(sanitized_search, category, department)
 
 
 @router.get("/departments", response_model=List[str])
-def get_departments(db: Session = Depends(get_db)):
-    """부서 목록 조회 (캐싱 적용)"""
-    cache_key = f"{CACHE_KEY}:departments"
-
-    cached = smart_cache_get(cache_key)
-    if cached:
-        return cached
-
-    departments = db.query(PhoneEntry.department).distinct().all()
-    result = [d[0] for d in departments if d[0]]
-
-    smart_cache_set(cache_key, result, CACHE_EXPIRE)
-
-    return result
+def get_departments():
+    """부서 목록 조회 (메모리 인덱스)"""
+    return phonebook_index.get().departments()
 
 
 @router.get("/{entry_id}", response_model=PhoneEntryResponse)
@@ -135,6 +102,9 @@ def create_phone_entry(
     db.commit()
     db.refresh(new_entry)
 
+    # 검색 인덱스 재빌드 및 다른 워커에 전파
+    phonebook_index.rebuild()
+
     return new_entry
 
 
@@ -161,6 +131,8 @@ def update_phone_entry(
     db.commit()
     db.refresh(entry)
 
+    phonebook_index.rebuild()
+
     return entry
 
 
@@ -181,3 +153,5 @@ def delete_phone_entry(
 
     db.delete(entry)
     db.commit()
+
+    phonebook_index.rebuild()
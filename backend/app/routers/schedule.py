@@ -10,10 +10,15 @@ from app.models.user import User
 from app.models.schedule import Schedule
 from app.models.friend import Friend
 from app.schemas.schedule import ScheduleCreate, ScheduleUpdate, ScheduleResponse
+from app.services.schedule_sync import SYNC_FIELDS, notify_schedule_change, user_subject_keys
 
 router = APIRouter(prefix="/schedules", tags=["시간표"])
 
 
+def _fields(schedule: Schedule) -> dict:
+    return {field: getattr(schedule, field) for field in SYNC_FIELDS}
+
+
 @router.get("", response_model=List[ScheduleResponse])
 def get_schedules(
     current_user: User = Depends(get_current_user),
@@ -31,6 +36,7 @@ def create_schedule(
     db: Session = Depends(get_db)
 ):
     """시간표 추가"""
+    keys_before = user_subject_keys(db, current_user.id)
     new_schedule = Schedule(
         user_id=current_user.id,
         **schedule_data.model_dump()
@@ -40,6 +46,10 @@ def create_schedule(
     db.commit()
     db.refresh(new_schedule)
 
+    notify_schedule_change(
+        current_user.id, "manual", added=[_fields(new_schedule)],
+        keys_before=keys_before, keys_after=user_subject_keys(db, current_user.id)
+    )
     return new_schedule
 
 
@@ -62,6 +72,7 @@ def update_schedule(
             detail="시간표를 찾을 수 없습니다"
         )
 
+    keys_before = user_subject_keys(db, current_user.id)
     update_data = schedule_data.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(schedule, key, value)
@@ -69,6 +80,10 @@ def update_schedule(
     db.commit()
     db.refresh(schedule)
 
+    notify_schedule_change(
+        current_user.id, "manual", updated=[_fields(schedule)],
+        keys_before=keys_before, keys_after=user_subject_keys(db, current_user.id)
+    )
     return schedule
 
 
@@ -90,9 +105,16 @@ def delete_schedule(
             detail="시간표를 찾을 수 없습니다"
         )
 
+    keys_before = user_subject_keys(db, current_user.id)
+    removed = _fields(schedule)
     db.delete(schedule)
     db.commit()
 
+    notify_schedule_change(
+        current_user.id, "manual", removed=[removed],
+        keys_before=keys_before, keys_after=user_subject_keys(db, current_user.id)
+    )
+
 
 @router.get("/user/{user_id}", response_model=List[ScheduleResponse])
 def get_user_schedules(
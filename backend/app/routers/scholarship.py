@@ -1,16 +1,29 @@
 """
 장학금 마일리지 API
+
+folio는 로그인 한 번으로 받은 세션 쿠키를 사용자별로 보관해 다시 쓰고
+(마일리지 요청이 로그인 페이지를 받으면 만료로 보고 재로그인),
+folio로 나가는 요청은 워커당 FOLIO_CONCURRENCY개로 제한한다.
+마일리지 결과는 사용자/연도별로 MILEAGE_CACHE_TTL 동안 캐시 (?refresh=true로 즉시 갱신).
 """
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+
 import httpx
 from typing import Optional, Dict
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel
-from bs4 import BeautifulSoup
 
+from app.core.cache import smart_cache_get, smart_cache_set
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.deps import get_current_user
 from app.core.session_store import load_credentials
+from app.core.upstream import upstream_client
 from app.models.user import User
+from app.services.parsing import find_mileage_values, run_parser
+from app.services.session_keepalive import note_created, note_expired, note_used
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/scholarship", tags=["장학금"])
@@ -18,6 +31,21 @@ router = APIRouter(prefix="/scholarship", tags=["장학금"])
 # folio 세션 캐시 (user_id -> credentials)
 folio_credentials_cache: Dict[int, dict] = {}
 
+# folio 로그인 세션 캐시 (user_id -> {cookies})
+folio_session_cache: Dict[int, dict] = {}
+
+# 사용자별 로그인 잠금 (동시에 여러 번 로그인하지 않도록)
+_login_locks: Dict[int, asyncio.Lock] = {}
+
+_folio_semaphore: Optional[asyncio.Semaphore] = None
+_folio_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+_folio_waiting = 0
+
+folio_stats = {"logins": 0, "login_failed": 0, "reused": 0, "expired": 0, "waiting_max": 0}
+
+# 마일리지 캐시 (초) - 로그인 직후 워밍, ?refresh=true로 즉시 갱신
+MILEAGE_CACHE_TTL = 1800
+
 FOLIO_LOGIN_URL = "https://folio.sunmoon.ac.kr/hmpg/com/login/LoginConfirm.do"
 FOLIO_MILEAGE_URL = "https://folio.sunmoon.ac.kr/hmpg/efo/album/mlg/MlgList.do"
 
@@ -54,74 +82,51 @@ class MileageData(BaseModel):
 
 def parse_mileage_html(html: str) -> MileageData:
     """마일리지 HTML 파싱"""
-    soup = BeautifulSoup(html, 'html.parser')
-
-    data = MileageData()
+    return mileage_from_values(find_mileage_values(html))
 
-    def get_value(td) -> int:
-        text = td.get_text(strip=True)
-        try:
-            return int(text)
-        except:
-            return 0
-
-    # 방법 1: tbody id='tbMileageList'에서 찾기
-    tbody = soup.find('tbody', id='tbMileageList')
-    if tbody:
-        tr = tbody.find('tr')
-        if tr:
-            tds = tr.find_all('td')
-            if len(tds) >= 19:
-                return parse_tds(tds, data, get_value)
-
-    # 방법 2: class='a_C'인 td들 직접 찾기
-    tds = soup.find_all('td', class_='a_C')
-    if len(tds) >= 19:
-        return parse_tds(tds, data, get_value)
-
-    # 방법 3: 모든 tr에서 td 19개 이상 있는 행 찾기
-    for tr in soup.find_all('tr'):
-        tds = tr.find_all('td')
-        if len(tds) >= 19:
-            return parse_tds(tds, data, get_value)
 
+def mileage_from_values(values) -> MileageData:
+    """find_mileage_values 결과 → 마일리지 데이터 (값이 없으면 모두 0)"""
+    data = MileageData()
+    if values:
+        return parse_tds(values, data)
     return data
 
 
-def parse_tds(tds, data: MileageData, get_value) -> MileageData:
-    """td 리스트에서 마일리지 데이터 추출"""
+def parse_tds(values, data: MileageData) -> MileageData:
+    """마일리지 값 리스트(19개)에서 마일리지 데이터 추출"""
     # S 영역 (5개)
-    data.s_subject = get_value(tds[0])
-    data.s_self_diagnosis = get_value(tds[1])
-    data.s_career_counseling = get_value(tds[2])
-    data.s_certification = get_value(tds[3])
-    data.s_extracurricular = get_value(tds[4])
+    data.s_subject = values[0]
+    data.s_self_diagnosis = values[1]
+    data.s_career_counseling = values[2]
+    data.s_certification = values[3]
+    data.s_extracurricular = values[4]
     data.s_total = data.s_subject + data.s_self_diagnosis + data.s_career_counseling + data.s_certification + data.s_extracurricular
 
     # T 영역 (3개)
-    data.t_subject = get_value(tds[5])
-    data.t_awards = get_value(tds[6])
-    data.t_extracurricular = get_value(tds[7])
+    data.t_subject = values[5]
+    data.t_awards = values[6]
+    data.t_extracurricular = values[7]
     data.t_total = data.t_subject + data.t_awards + data.t_extracurricular
 
     # A 영역 (6개)
-    data.a_subject = get_value(tds[8])
-    data.a_volunteer = get_value(tds[9])
-    data.a_language_test = get_value(tds[10])
-    data.a_language_training = get_value(tds[11])
-    data.a_internship = get_value(tds[12])
-    data.a_extracurricular = get_value(tds[13])
+    data.a_subject = values[8]
+    data.a_volunteer = values[9]
+    data.a_language_test = values[10]
+    data.a_language_training = values[11]
+    data.a_internship = values[12]
+    data.a_extracurricular = values[13]
     data.a_total = data.a_subject + data.a_volunteer + data.a_language_test + data.a_language_training + data.a_internship + data.a_extracurricular
 
     # R 영역 (4개)
-    data.r_subject = get_value(tds[14])
-    data.r_student_council = get_value(tds[15])
-    data.r_club = get_value(tds[16])
-    data.r_extracurricular = get_value(tds[17])
+    data.r_subject = values[14]
+    data.r_student_council = values[15]
+    data.r_club = values[16]
+    data.r_extracurricular = values[17]
     data.r_total = data.r_subject + data.r_student_council + data.r_club + data.r_extracurricular
 
     # 합계
-    data.total = get_value(tds[18])
+    data.total = values[18]
 
     return data
 
@@ -145,110 +150,243 @@ async def login_folio(client: httpx.AsyncClient, login_id: str, password: str) -
     return response.status_code == 200
 
 
+def _folio_slot() -> asyncio.Semaphore:
+    """folio 요청 동시 실행 제한 (이벤트 루프마다 새로 만듦)"""
+    global _folio_semaphore, _folio_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _folio_semaphore is None or _folio_semaphore_loop is not loop:
+        _folio_semaphore = asyncio.Semaphore(settings.FOLIO_CONCURRENCY)
+        _folio_semaphore_loop = loop
+    return _folio_semaphore
+
+
+@asynccontextmanager
+async def _folio_request():
+    """folio로 나가는 요청 하나 (FOLIO_CONCURRENCY개를 넘으면 대기)"""
+    global _folio_waiting
+    _folio_waiting += 1
+    folio_stats["waiting_max"] = max(folio_stats["waiting_max"], _folio_waiting)
+    try:
+        await _folio_slot().acquire()
+    finally:
+        _folio_waiting -= 1
+    try:
+        yield
+    finally:
+        _folio_slot().release()
+
+
+def _folio_credentials(user_id: int) -> dict:
+    """저장된 자격증명 확인 (메모리 → 파일 순서)"""
+    credentials = folio_credentials_cache.get(user_id)
+    if credentials:
+        return credentials
+    # 파일에서 복원 시도
+    stored = load_credentials('folio', user_id)
+    if stored and stored.get('login_id') and stored.get('password'):
+        credentials = {'login_id': stored['login_id'], 'password': stored['password']}
+        folio_credentials_cache[user_id] = credentials
+        print(f"[Folio] 저장된 자격 증명으로 복원: user_id={user_id}")
+        return credentials
+    raise HTTPException(
+        status_code=401,
+        detail="세션이 만료되었습니다. 앱을 재시작하거나 다시 로그인해주세요."
+    )
+
+
+async def _login_folio_session(user_id: int, credentials: dict) -> Optional[dict]:
+    """folio 로그인 후 세션 쿠키 저장 (로그인 실패 시 None)"""
+    async with _folio_request():
+        async with upstream_client(verify=False, timeout=20.0, follow_redirects=True) as client:
+            if not await login_folio(client, credentials['login_id'], credentials['password']):
+                folio_stats["login_failed"] += 1
+                return None
+            cookies = {cookie.name: cookie.value for cookie in client.cookies.jar}
+    folio_stats["logins"] += 1
+    session = {"cookies": cookies}
+    folio_session_cache[user_id] = session
+    note_created("folio", user_id)
+    return session
+
+
+async def ensure_folio_session(user_id: int, credentials: dict) -> Optional[dict]:
+    """folio 세션 확인 및 필요시 로그인 (같은 사용자의 동시 요청은 로그인 한 번을 같이 기다림)"""
+    session = folio_session_cache.get(user_id)
+    if session:
+        folio_stats["reused"] += 1
+        return session
+    lock = _login_locks.setdefault(user_id, asyncio.Lock())
+    async with lock:
+        session = folio_session_cache.get(user_id)
+        if session:
+            folio_stats["reused"] += 1
+            return session
+        return await _login_folio_session(user_id, credentials)
+
+
+async def refresh_folio_session(user_id: int) -> dict:
+    """저장된 자격 증명으로 folio 재로그인 (세션 유지용, 기존 세션은 새 세션이 생길 때까지 유지)"""
+    session = await _login_folio_session(user_id, _folio_credentials(user_id))
+    if session is None:
+        raise HTTPException(status_code=401, detail="포트폴리오 로그인 실패. 다시 로그인해주세요.")
+    return session
+
+
+def _expire_folio_session(user_id: int):
+    """세션 만료 - 캐시 삭제 (다음 시도에서 다시 로그인)"""
+    if folio_session_cache.pop(user_id, None) is not None:
+        folio_stats["expired"] += 1
+        note_expired("folio", user_id)
+
+
+def _is_login_page(response: httpx.Response, values) -> bool:
+    """세션이 만료돼 로그인 페이지를 받았는지 (로그인 URL로 리다이렉트되었거나 마일리지 표 없이 로그인 폼)"""
+    if '/login/' in response.url.path:
+        return True
+    if values is not None:
+        return False
+    text = response.text
+    return 'loginPassword' in text or '로그인' in text or 'login' in text.lower()
+
+
 @router.get("/mileage")
 async def get_mileage(
     year: int = 2025,
+    refresh: bool = Query(False, description="캐시를 무시하고 folio에서 다시 조회"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    마일리지 조회
+    마일리지 조회 (사용자/연도별 캐시)
     - year: 조회 연도 (2025, 2026 등)
     """
-    # 저장된 자격증명 확인 (메모리 → 파일 순서)
-    credentials = folio_credentials_cache.get(current_user.id)
-    if not credentials:
-        # 파일에서 복원 시도
-        stored = load_credentials('folio', current_user.id)
-        if stored and stored.get('login_id') and stored.get('password'):
-            credentials = {'login_id': stored['login_id'], 'password': stored['password']}
-            folio_credentials_cache[current_user.id] = credentials
-            print(f"[Folio] 저장된 자격 증명으로 복원: user_id={current_user.id}")
-        else:
-            raise HTTPException(
-                status_code=401,
-                detail="세션이 만료되었습니다. 앱을 재시작하거나 다시 로그인해주세요."
-            )
-
-    async with httpx.AsyncClient(verify=False, timeout=20.0, follow_redirects=True) as client:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Content-Type': 'application/x-www-form-urlencoded',
-        }
+    if not refresh:
+        cached = smart_cache_get(f"folio:mileage:{current_user.id}:{year}")
+        if cached is not None:
+            return cached
+    return await load_mileage(current_user.id, current_user.student_id, year)
+
+
+async def load_mileage(user_id: int, student_id: str, year: int) -> dict:
+    """folio에서 마일리지 조회 후 캐시에 저장"""
+    result = await _fetch_mileage(user_id, student_id, year)
+    # 모두 0이면 일시적 오류일 수 있으므로 캐시하지 않음
+    if result["data"]["total"]:
+        smart_cache_set(f"folio:mileage:{user_id}:{year}", result, MILEAGE_CACHE_TTL)
+    return result
+
+
+async def _post_mileage(session: dict, year: int) -> httpx.Response:
+    """저장된 세션 쿠키로 마일리지 페이지 요청"""
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'Content-Type': 'application/x-www-form-urlencoded',
+    }
+    mileage_data_form = {
+        'userId': '',
+        'year': str(year)
+    }
+    async with _folio_request():
+        async with upstream_client(verify=False, timeout=20.0, follow_redirects=True,
+                                   cookies=session["cookies"]) as client:
+            return await client.post(FOLIO_MILEAGE_URL, headers=headers, data=mileage_data_form)
+
+
+async def probe_folio_session(user_id: int) -> Optional[bool]:
+    """folio 세션이 살아 있는지 (세션 유지용, 올해 마일리지 페이지 한 번)"""
+    session = folio_session_cache.get(user_id)
+    if session is None:
+        return None
+    response = await _post_mileage(session, datetime.now().year)
+    if response.status_code != 200:
+        return None
+    values = await run_parser(find_mileage_values, response.text)
+    return not _is_login_page(response, values)
+
+
+async def _fetch_mileage(user_id: int, student_id: str, year: int) -> dict:
+    credentials = _folio_credentials(user_id)
+
+    # 최대 3회 재시도
+    last_mileage_data = None
+    for attempt in range(3):
+        try:
+            # 1. folio 세션 (없을 때만 로그인)
+            session = await ensure_folio_session(user_id, credentials)
+            if session is None:
+                print(f"[Folio] 로그인 실패 (시도 {attempt + 1}): user_id={user_id}")
+                if attempt == 2:
+                    raise HTTPException(status_code=401, detail="포트폴리오 로그인 실패. 다시 로그인해주세요.")
+                continue
 
-        # 최대 3회 재시도
-        last_mileage_data = None
-        for attempt in range(3):
-            try:
-                # 1. folio 로그인
-                login_success = await login_folio(client, credentials['login_id'], credentials['password'])
-                if not login_success:
-                    print(f"[Folio] 로그인 실패 (시도 {attempt + 1}): user_id={current_user.id}")
-                    if attempt == 2:
-                        raise HTTPException(status_code=401, detail="포트폴리오 로그인 실패. 다시 로그인해주세요.")
-                    continue
-
-                # 2. 마일리지 조회 (세션 쿠키 자동 사용)
-                mileage_data_form = {
-                    'userId': '',
-                    'year': str(year)
-                }
-
-                response = await client.post(FOLIO_MILEAGE_URL, headers=headers, data=mileage_data_form)
-
-                if response.status_code != 200:
-                    print(f"[Folio] 마일리지 조회 실패: status={response.status_code}")
-                    if attempt == 2:
-                        raise HTTPException(status_code=500, detail="마일리지 정보를 가져올 수 없습니다.")
-                    continue
-
-                mileage_data = parse_mileage_html(response.text)
-                last_mileage_data = mileage_data
-
-                # 파싱 결과 검증 - 모든 값이 0이면 재시도
-                all_zero = (mileage_data.total == 0 and mileage_data.s_total == 0 and
-                           mileage_data.t_total == 0 and mileage_data.a_total == 0 and
-                           mileage_data.r_total == 0)
-
-                if all_zero:
-                    # 로그인 페이지로 리다이렉트 되었는지 확인
-                    if '로그인' in response.text or 'login' in response.text.lower():
-                        print(f"[Folio] 세션 만료 감지 (시도 {attempt + 1})")
-                        if attempt == 2:
-                            raise HTTPException(status_code=401, detail="세션이 만료되었습니다. 다시 로그인해주세요.")
-                        continue
-
-                    # 모든 값이 0인 경우 한 번 더 시도 (서버 일시적 오류 가능성)
-                    if attempt < 2:
-                        print(f"[Folio] 모든 값이 0, 재시도 (시도 {attempt + 1})")
-                        import asyncio
-                        await asyncio.sleep(0.5)  # 잠시 대기 후 재시도
-                        continue
-
-                # 값이 있거나, 마지막 시도에서 0이면 반환
-                return {
-                    "year": year,
-                    "student_id": current_user.student_id,
-                    "data": mileage_data.model_dump()
-                }
-
-            except HTTPException:
-                raise
-            except httpx.RequestError as e:
-                print(f"[Folio] 요청 오류 (시도 {attempt + 1}): {e}")
+            # 2. 마일리지 조회 (저장된 세션 쿠키 사용)
+            response = await _post_mileage(session, year)
+
+            if response.status_code != 200:
+                print(f"[Folio] 마일리지 조회 실패: status={response.status_code}")
                 if attempt == 2:
-                    raise HTTPException(status_code=500, detail=f"요청 실패: {str(e)}")
-            except Exception as e:
-                print(f"[Folio] 예외 발생 (시도 {attempt + 1}): {e}")
+                    raise HTTPException(status_code=500, detail="마일리지 정보를 가져올 수 없습니다.")
+                continue
+
+            values = await run_parser(find_mileage_values, response.text)
+
+            # 로그인 페이지로 리다이렉트 되었는지 확인 → 세션을 버리고 다시 로그인
+            if _is_login_page(response, values):
+                print(f"[Folio] 세션 만료 감지 (시도 {attempt + 1})")
+                _expire_folio_session(user_id)
                 if attempt == 2:
-                    raise HTTPException(status_code=500, detail="마일리지 조회 중 오류가 발생했습니다.")
+                    raise HTTPException(status_code=401, detail="세션이 만료되었습니다. 다시 로그인해주세요.")
+                continue
+
+            note_used("folio", user_id)
+            mileage_data = mileage_from_values(values)
+            last_mileage_data = mileage_data
+
+            # 파싱 결과 검증 - 모든 값이 0이면 재시도
+            all_zero = (mileage_data.total == 0 and mileage_data.s_total == 0 and
+                       mileage_data.t_total == 0 and mileage_data.a_total == 0 and
+                       mileage_data.r_total == 0)
 
-        # 마지막으로 받은 데이터 반환 (모두 0이어도)
-        if last_mileage_data:
+            # 모든 값이 0인 경우 한 번 더 시도 (서버 일시적 오류 가능성)
+            if all_zero and attempt < 2:
+                print(f"[Folio] 모든 값이 0, 재시도 (시도 {attempt + 1})")
+                await asyncio.sleep(0.5)  # 잠시 대기 후 재시도
+                continue
+
+            # 값이 있거나, 마지막 시도에서 0이면 반환
             return {
                 "year": year,
-                "student_id": current_user.student_id,
-                "data": last_mileage_data.model_dump()
+                "student_id": student_id,
+                "data": mileage_data.model_dump()
             }
 
-        raise HTTPException(status_code=500, detail="마일리지 조회 실패")
+        except HTTPException:
+            raise
+        except httpx.RequestError as e:
+            print(f"[Folio] 요청 오류 (시도 {attempt + 1}): {e}")
+            if attempt == 2:
+                raise HTTPException(status_code=500, detail=f"요청 실패: {str(e)}")
+        except Exception as e:
+            print(f"[Folio] 예외 발생 (시도 {attempt + 1}): {e}")
+            if attempt == 2:
+                raise HTTPException(status_code=500, detail="마일리지 조회 중 오류가 발생했습니다.")
+
+    # 마지막으로 받은 데이터 반환 (모두 0이어도)
+    if last_mileage_data:
+        return {
+            "year": year,
+            "student_id": student_id,
+            "data": last_mileage_data.model_dump()
+        }
+
+    raise HTTPException(status_code=500, detail="마일리지 조회 실패")
+
+
+def folio_session_stats() -> dict:
+    """folio 세션 재사용/로그인 수와 동시 요청 대기 (이 워커 기준)"""
+    return {
+        **folio_stats,
+        "sessions": len(folio_session_cache),
+        "concurrency": settings.FOLIO_CONCURRENCY,
+        "waiting": _folio_waiting,
+    }
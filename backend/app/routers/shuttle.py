@@ -1,11 +1,17 @@
 """
 선문대학교 셔틀버스 시간표 API
 """
-import re
-import httpx
-from typing import List, Dict, Optional
+import time
+import bisect
+import asyncio
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
 from fastapi import APIRouter, HTTPException, Query
-from bs4 import BeautifulSoup
+
+from app.core.snapshot_store import claim, snapshot_get_prefix, snapshot_set
+from app.core.upstream import upstream_client
+from app.services.parsing import parse_departures, parse_shuttle_page, run_parser
 
 router = APIRouter(prefix="/shuttle", tags=["셔틀버스"])
 
@@ -44,120 +50,19 @@ ROUTE_NAMES = {
 BASE_URL = "https://lily.sunmoon.ac.kr"
 
 
-def clean_text(text: str) -> str:
-    """텍스트 정리"""
-    if not text:
-        return ""
-    text = re.sub(r'\s+', ' ', text.strip())
-    text = text.replace('\xa0', ' ').replace('&nbsp;', ' ')
-    return text.strip()
-
-
-def format_notice(raw_text: str) -> dict:
-    """안내사항 텍스트를 섹션별로 분류"""
-    holidays = []  # 공휴일 운행 안내
-    bus_info = []  # 시내버스 정보
-    general = []   # 일반 안내사항
-
-    seen = set()  # 중복 제거용
-
-    # 줄바꿈 정규화
-    text = raw_text.replace('\r\n', '\n').replace('\r', '\n')
-
-    # *로 시작하는 항목 분리 (공휴일 안내)
-    holiday_pattern = r'\*[^*\n]+'
-    holiday_matches = re.findall(holiday_pattern, text)
-    for match in holiday_matches:
-        item = clean_text(match)
-        if item and item not in seen:
-            holidays.append(item)
-            seen.add(item)
-
-    # - 로 시작하는 항목 분리
-    dash_pattern = r'-\s*[^-\n]+'
-    dash_matches = re.findall(dash_pattern, text)
-    for match in dash_matches:
-        item = clean_text(match)
-        if item and item not in seen:
-            # 시내버스 관련
-            if '번' in item and ('터미널' in item or '역' in item or '환승' in item):
-                bus_info.append(item)
-            else:
-                general.append(item)
-            seen.add(item)
-
-    return {
-        "holidays": holidays[:10],  # 최대 10개
-        "bus_info": bus_info[:10],
-        "general": general[:10]
-    }
-
-
 def parse_shuttle_html(html: str, route: str) -> dict:
-    """셔틀버스 HTML에서 테이블 추출"""
-    soup = BeautifulSoup(html, 'html.parser')
+    """셔틀버스 HTML에서 노선 정보, 안내사항, 테이블 추출"""
+    return shuttle_result(route, parse_shuttle_page(html))
 
-    result = {
+
+def shuttle_result(route: str, page: dict) -> dict:
+    """파싱한 시간표 페이지에 노선 정보 추가"""
+    return {
         "route": route,
         "route_name": ROUTE_NAMES.get(route, route),
-        "route_info": "",
-        "notice": {
-            "holidays": [],
-            "bus_info": [],
-            "general": []
-        },
-        "table_html": ""
+        **page,
     }
 
-    # 노선 정보 추출 (grayBox 내의 정보)
-    gray_box = soup.find('div', class_='grayBox')
-    if gray_box:
-        route_info_parts = []
-        title = gray_box.find('h4', class_='title22')
-        if title:
-            route_info_parts.append(clean_text(title.get_text()))
-
-        for p in gray_box.find_all('p', class_='blue_gray'):
-            text = clean_text(p.get_text())
-            if text:
-                route_info_parts.append(text)
-
-        result["route_info"] = ' / '.join(route_info_parts)
-
-    # 테이블 HTML 추출 (table_type2 div 내의 테이블)
-    table_div = soup.find('div', class_='table_type2')
-    if table_div:
-        # 빈 table 태그 제거하고 실제 테이블만 추출
-        tables = table_div.find_all('table')
-        for table in tables:
-            # thead나 tbody가 있는 테이블만 사용
-            if table.find('thead') or table.find('tbody') or table.find('tr'):
-                # 테이블 내용이 있는지 확인
-                if table.get_text(strip=True):
-                    result["table_html"] = str(table)
-                    break
-
-    # 안내사항 추출
-    notice_texts = []
-
-    # mgT30 div에서 안내사항 추출
-    content_div = soup.find('div', id='tabcontent22') or soup.find('div', class_='shuttle_wrap')
-    if content_div:
-        for div in content_div.find_all('div', class_='mgT30'):
-            # 테이블이 아닌 텍스트만
-            if not div.find('table'):
-                # 각 span/text 요소별로 텍스트 추출
-                text = div.get_text(separator='\n')
-                if text and ('*' in text or '안내' in text or '운행' in text or '-' in text):
-                    notice_texts.append(text)
-
-    # 안내사항 분류
-    if notice_texts:
-        combined = '\n'.join(notice_texts)
-        result["notice"] = format_notice(combined)
-
-    return result
-
 
 async def fetch_shuttle_schedule(day_type: str, route: str) -> dict:
     """셔틀버스 시간표 페이지 가져오기"""
@@ -177,7 +82,7 @@ async def fetch_shuttle_schedule(day_type: str, route: str) -> dict:
 
     url = BASE_URL + url_map[route]
 
-    async with httpx.AsyncClient(verify=False, timeout=15.0) as client:
+    async with upstream_client(verify=False, timeout=15.0) as client:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
@@ -186,7 +91,109 @@ async def fetch_shuttle_schedule(day_type: str, route: str) -> dict:
         if response.status_code != 200:
             raise HTTPException(status_code=500, detail="셔틀버스 시간표를 가져올 수 없습니다.")
 
-        return parse_shuttle_html(response.text, route)
+        return shuttle_result(route, await run_parser(parse_shuttle_page, response.text))
+
+
+# ==================== 시간표 스냅샷 / 출발 시각 인덱스 ====================
+# 시간표는 학기 중 몇 번만 바뀌므로 전체 노선을 주기적으로 가져와
+# (day_type, route) → 파싱 결과, (day_type, route) → {정류장: 정렬된 출발 분} 으로 보관
+# 정상본은 디스크 저장소에도 기록해 워커 재시작 시 upstream 없이 바로 로드
+
+DAY_TYPE_URLS = {
+    "weekday": WEEKDAY_URLS,
+    "saturday": SATURDAY_URLS,
+    "sunday": SUNDAY_URLS,
+}
+
+KST = ZoneInfo("Asia/Seoul")
+
+SNAPSHOT_STORE_PREFIX = "shuttle:snapshot:"
+SNAPSHOT_REFRESH_SECONDS = 6 * 3600  # 디스크 스냅샷이 이보다 오래되면 upstream에서 다시 가져옴
+REFRESH_CLAIM_SECONDS = 600  # 여러 워커가 동시에 전체 노선을 가져오지 않도록
+
+# (day_type, route) → parse_shuttle_html 결과 (마지막 정상본)
+schedule_snapshots: Dict[Tuple[str, str], dict] = {}
+# (day_type, route) → {정류장: [출발 시각(분), ...]}
+departure_index: Dict[Tuple[str, str], Dict[str, List[int]]] = {}
+
+
+async def refresh_shuttle_snapshots():
+    """모든 요일/노선 시간표를 가져와 스냅샷과 출발 인덱스 갱신 (실패 노선은 기존 유지)"""
+    targets = [(day_type, route) for day_type, urls in DAY_TYPE_URLS.items() for route in urls]
+    results = await asyncio.gather(
+        *[fetch_shuttle_schedule(day_type, route) for day_type, route in targets],
+        return_exceptions=True
+    )
+
+    updated = 0
+    for (day_type, route), result in zip(targets, results):
+        if isinstance(result, BaseException):
+            print(f"[Shuttle] 시간표 가져오기 실패 ({day_type}/{route}): {result}")
+            continue
+        departures = parse_departures(result.get("table_html", ""))
+        if not departures and (day_type, route) in departure_index:
+            print(f"[Shuttle] 출발 시각 없음, 기존 스냅샷 유지 ({day_type}/{route})")
+            continue
+        _store_snapshot(day_type, route, result, departures)
+        updated += 1
+
+    print(f"[Shuttle] 시간표 스냅샷 갱신: {updated}/{len(targets)}")
+
+
+def _store_snapshot(day_type: str, route: str, schedule: dict, departures: Dict[str, List[int]]):
+    schedule_snapshots[(day_type, route)] = schedule
+    departure_index[(day_type, route)] = departures
+    snapshot_set(
+        f"{SNAPSHOT_STORE_PREFIX}{day_type}:{route}",
+        {"schedule": schedule, "departures": departures}
+    )
+
+
+def load_shuttle_snapshots() -> Optional[float]:
+    """디스크 저장소의 스냅샷 로드 → 가장 오래된 fetched_at (전 노선이 없으면 None)"""
+    stored = snapshot_get_prefix(SNAPSHOT_STORE_PREFIX)
+    for key, snapshot in stored.items():
+        day_type, _, route = key[len(SNAPSHOT_STORE_PREFIX):].partition(":")
+        schedule_snapshots[(day_type, route)] = snapshot["payload"]["schedule"]
+        departure_index[(day_type, route)] = snapshot["payload"]["departures"]
+
+    total = sum(len(urls) for urls in DAY_TYPE_URLS.values())
+    if stored:
+        print(f"[Shuttle] 디스크 스냅샷 로드: {len(stored)}/{total}")
+    if len(stored) < total:
+        return None
+    return min(snapshot["fetched_at"] for snapshot in stored.values())
+
+
+async def ensure_shuttle_snapshots():
+    """디스크 스냅샷을 로드하고, 오래됐으면 (한 워커만) upstream에서 갱신"""
+    oldest = load_shuttle_snapshots()
+    if oldest is not None and time.time() - oldest < SNAPSHOT_REFRESH_SECONDS:
+        return
+    if claim("claim:shuttle:refresh", REFRESH_CLAIM_SECONDS):
+        await refresh_shuttle_snapshots()
+
+
+def sync_refresh_shuttle_snapshots():
+    """동기 버전 스냅샷 갱신 (APScheduler용)"""
+    try:
+        asyncio.run(ensure_shuttle_snapshots())
+    except Exception as e:
+        print(f"[Shuttle] 스냅샷 갱신 오류: {e}")
+
+
+def kst_day_type(now: datetime) -> str:
+    """KST 기준 요일 타입 (공휴일은 day_type 파라미터로 지정)"""
+    weekday = now.weekday()
+    if weekday == 5:
+        return "saturday"
+    if weekday == 6:
+        return "sunday"
+    return "weekday"
+
+
+def format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
 
 
 @router.get("/schedule")
@@ -195,17 +202,76 @@ async def get_shuttle_schedule(
     route: str = Query(..., description="노선 (asan_ktx, cheonan_station, cheonan_terminal, onyang, cheonan_campus)")
 ):
     """
-    셔틀버스 시간표 조회
+    셔틀버스 시간표 조회 (스냅샷 우선, 없으면 즉시 조회)
     - day_type: weekday(평일), saturday(토요일/공휴일), sunday(일요일)
     - route: asan_ktx(아산역), cheonan_station(천안역), cheonan_terminal(천안터미널),
              onyang(온양역/터미널), cheonan_campus(천안캠퍼스)
     """
-    schedule_data = await fetch_shuttle_schedule(day_type, route)
+    snapshot = schedule_snapshots.get((day_type, route))
+    if snapshot is None:
+        snapshot = await fetch_shuttle_schedule(day_type, route)
+        _store_snapshot(day_type, route, snapshot, parse_departures(snapshot.get("table_html", "")))
+
+    schedule_data = dict(snapshot)
     schedule_data["day_type"] = day_type
 
     return schedule_data
 
 
+@router.get("/next")
+async def get_next_departures(
+    route: str = Query(..., description="노선 (asan_ktx, cheonan_station, cheonan_terminal, onyang, cheonan_campus)"),
+    stop: Optional[str] = Query(None, description="정류장 (생략 시 시간표 첫 정류장)"),
+    n: int = Query(3, ge=1, le=20, description="조회할 출발 편수"),
+    day_type: Optional[str] = Query(None, description="요일 타입 지정 (생략 시 KST 기준 오늘)")
+):
+    """다음 셔틀 출발 시각 조회 (KST 기준)"""
+    now = datetime.now(KST)
+    day_type = day_type or kst_day_type(now)
+    if day_type not in DAY_TYPE_URLS:
+        raise HTTPException(status_code=400, detail="잘못된 요일 타입입니다. (weekday, saturday, sunday)")
+
+    key = (day_type, route)
+    if key not in departure_index:
+        # 스냅샷이 아직 없으면 해당 노선만 즉시 조회
+        await get_shuttle_schedule(day_type=day_type, route=route)
+
+    stops = departure_index.get(key, {})
+    if not stops:
+        raise HTTPException(status_code=404, detail="시간표에서 출발 시각을 찾을 수 없습니다.")
+
+    stop_names = list(stops.keys())
+    if stop is None:
+        stop_name = stop_names[0]
+    else:
+        matches = [name for name in stop_names if name == stop] or \
+                  [name for name in stop_names if stop in name]
+        if not matches:
+            raise HTTPException(
+                status_code=404,
+                detail=f"정류장을 찾을 수 없습니다. (가능한 정류장: {', '.join(stop_names)})"
+            )
+        stop_name = matches[0]
+
+    times = stops[stop_name]
+    now_minutes = now.hour * 60 + now.minute
+    start = bisect.bisect_left(times, now_minutes)
+    upcoming = times[start:start + n]
+
+    return {
+        "route": route,
+        "route_name": ROUTE_NAMES.get(route, route),
+        "day_type": day_type,
+        "stop": stop_name,
+        "stops": stop_names,
+        "now": format_minutes(now_minutes),
+        "departures": [
+            {"time": format_minutes(t), "minutes_until": t - now_minutes}
+            for t in upcoming
+        ],
+    }
+
+
 @router.get("/routes")
 async def get_shuttle_routes():
     """셔틀버스 노선 목록 조회"""
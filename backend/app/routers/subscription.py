@@ -0,0 +1,95 @@
+"""
+공지사항 키워드/카테고리 구독 API
+"""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.deps import get_current_user
+from app.models.user import User
+from app.models.subscription import NoticeSubscription
+from app.schemas.subscription import SubscriptionCreate, SubscriptionResponse
+from app.services.notice_matcher import subscription_index
+
+router = APIRouter(prefix="/subscriptions", tags=["공지 구독"])
+
+MAX_SUBSCRIPTIONS_PER_USER = 30
+
+
+@router.get("", response_model=List[SubscriptionResponse])
+def get_my_subscriptions(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """내 공지 구독 목록"""
+    return db.query(NoticeSubscription).filter(
+        NoticeSubscription.user_id == current_user.id
+    ).order_by(NoticeSubscription.created_at.desc()).all()
+
+
+@router.post("", response_model=SubscriptionResponse, status_code=status.HTTP_201_CREATED)
+def create_subscription(
+    data: SubscriptionCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """키워드/카테고리 구독 추가"""
+    existing = db.query(NoticeSubscription).filter(
+        NoticeSubscription.user_id == current_user.id,
+        NoticeSubscription.kind == data.kind,
+        NoticeSubscription.value == data.value
+    ).first()
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="이미 구독 중입니다"
+        )
+
+    count = db.query(NoticeSubscription).filter(
+        NoticeSubscription.user_id == current_user.id
+    ).count()
+    if count >= MAX_SUBSCRIPTIONS_PER_USER:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"구독은 최대 {MAX_SUBSCRIPTIONS_PER_USER}개까지 가능합니다"
+        )
+
+    subscription = NoticeSubscription(
+        user_id=current_user.id,
+        kind=data.kind,
+        value=data.value
+    )
+    db.add(subscription)
+    db.commit()
+    db.refresh(subscription)
+
+    # 매칭 인덱스 증분 반영
+    subscription_index.add(current_user.id, subscription.kind, subscription.value)
+    return subscription
+
+
+@router.delete("/{subscription_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_subscription(
+    subscription_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """구독 삭제"""
+    subscription = db.query(NoticeSubscription).filter(
+        NoticeSubscription.id == subscription_id,
+        NoticeSubscription.user_id == current_user.id
+    ).first()
+
+    if not subscription:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="구독을 찾을 수 없습니다"
+        )
+
+    kind, value = subscription.kind, subscription.value
+    db.delete(subscription)
+    db.commit()
+
+    subscription_index.remove(current_user.id, kind, value)
@@ -3,7 +3,6 @@
 """
 import re
 import asyncio
-import httpx
 from typing import Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Request
@@ -11,15 +10,20 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app.core.database import get_db
-from app.core.security import get_password_hash, create_access_token
+from app.core.security import get_password_hash_async, create_access_token
 from app.core.config import settings
+from app.core.upstream import upstream_client
 from app.models.user import User
-from app.models.schedule import Schedule
 from app.routers.gpt import get_gpt_session, session_cache as gpt_session_cache
 from app.routers.canvas import login_canvas, canvas_session_cache
 from app.routers.ears import login_ears, login_ears_with_sws_client, ears_session_cache
-from app.routers.scholarship import folio_credentials_cache
+from app.routers.scholarship import folio_credentials_cache, folio_session_cache
 from app.core.session_store import save_credentials
+from app.services.cache_warmer import CANVAS_JOBS, EARS_JOBS, FOLIO_JOBS, enqueue_warmup
+from app.services.parsing import parse_timetable, run_parser
+from app.services.schedule_sync import sync_user_schedules
+from app.services.session_keepalive import note_created
+from app.services.user_directory import user_directory
 
 router = APIRouter(prefix="/sunmoon", tags=["선문대 연동"])
 
@@ -215,120 +219,6 @@ def parse_student_info(html: str) -> dict:
     return info
 
 
-def parse_timetable(html: str) -> list:
-    """시간표 HTML에서 수업 정보 파싱"""
-    schedules = []
-    colors = ["#3B82F6", "#0EA5E9", "#06B6D4", "#8B5CF6", "#F59E0B", "#10B981", "#EF4444", "#EC4899"]
-    color_idx = 0
-    subject_colors = {}
-
-    period_times = {
-        0: ("08:30", "09:20"),
-        1: ("09:30", "10:20"),
-        2: ("10:30", "11:20"),
-        3: ("11:30", "12:20"),
-        4: ("12:30", "13:20"),
-        5: ("13:30", "14:20"),
-        6: ("14:30", "15:20"),
-        7: ("15:30", "16:20"),
-        8: ("16:30", "17:20"),
-        9: ("17:30", "18:20"),
-        10: ("18:30", "19:20"),
-        11: ("19:30", "20:20"),
-        12: ("20:30", "21:20"),
-        13: ("21:30", "22:20"),
-    }
-
-    days = ["월", "화", "수", "목", "금"]
-
-    # tbody 내의 tr들 파싱
-    rows = re.findall(r'<tr>(.*?)</tr>', html, re.DOTALL)
-
-    period_idx = -1
-    for row in rows:
-        # 교시 정보 확인
-        period_match = re.search(r'(\d+)교시', row)
-        if period_match:
-            period_idx = int(period_match.group(1))
-
-        if period_idx < 0 or period_idx > 13:
-            continue
-
-        # td 셀들 추출
-        cells = re.findall(r'<td[^>]*>(.*?)</td>', row, re.DOTALL)
-
-        for day_idx, cell in enumerate(cells[:5]):
-            if '&nbsp;' in cell or not cell.strip():
-                continue
-
-            # 과목명 추출
-            cell_clean = re.sub(r'<[^>]+>', '\n', cell)
-            lines = [l.strip() for l in cell_clean.split('\n') if l.strip()]
-
-            if not lines:
-                continue
-
-            subject = lines[0]
-            class_num = lines[1] if len(lines) > 1 else ""
-            professor = lines[2] if len(lines) > 2 else ""
-            room = lines[3] if len(lines) > 3 else ""
-
-            if subject in ['', '&nbsp;']:
-                continue
-
-            # 색상 할당
-            if subject not in subject_colors:
-                subject_colors[subject] = colors[color_idx % len(colors)]
-                color_idx += 1
-
-            start_time, end_time = period_times.get(period_idx, ("09:00", "10:00"))
-
-            schedules.append({
-                "day": days[day_idx],
-                "start_time": start_time,
-                "end_time": end_time,
-                "subject": subject,
-                "professor": professor,
-                "room": room,
-                "color": subject_colors[subject]
-            })
-
-    # 연속 수업 병합
-    return merge_consecutive_classes(schedules)
-
-
-def merge_consecutive_classes(schedules: list) -> list:
-    if not schedules:
-        return []
-
-    groups = {}
-    for s in schedules:
-        key = (s["subject"], s["day"])
-        if key not in groups:
-            groups[key] = []
-        groups[key].append(s)
-
-    merged = []
-    for key, classes in groups.items():
-        classes.sort(key=lambda x: x["start_time"])
-        current = classes[0].copy()
-
-        for i in range(1, len(classes)):
-            next_class = classes[i]
-            current_end = int(current["end_time"].replace(":", ""))
-            next_start = int(next_class["start_time"].replace(":", ""))
-
-            if next_start - current_end <= 10:
-                current["end_time"] = next_class["end_time"]
-            else:
-                merged.append(current)
-                current = next_class.copy()
-
-        merged.append(current)
-
-    return merged
-
-
 @router.post("/login", response_model=SunmoonLoginResponse)
 async def login_with_sunmoon(
     request: Request,
@@ -348,7 +238,7 @@ async def login_with_sunmoon(
         )
 
     try:
-        async with httpx.AsyncClient(
+        async with upstream_client(
             follow_redirects=True,
             verify=False,
             timeout=30.0
@@ -465,15 +355,16 @@ async def login_with_sunmoon(
                 headers=ajax_headers
             )
 
-            schedules = parse_timetable(timetable_response.text)
+            schedules = await run_parser(parse_timetable, timetable_response.text)
 
             # 7. DB 저장
             user = db.query(User).filter(User.student_id == real_student_id).first()
 
+            # 비밀번호 해시는 가입 시에만 (인증은 포털이 하므로 기존 사용자는 bcrypt 생략)
             if not user:
                 user = User(
                     student_id=real_student_id,
-                    password=get_password_hash(login_data.password),
+                    password=await get_password_hash_async(login_data.password),
                     name=user_info["name"],
                     department=user_info["department"]
                 )
@@ -485,23 +376,14 @@ async def login_with_sunmoon(
                 user.department = user_info["department"]
                 db.commit()
 
-            # 기존 시간표 삭제 후 새로 저장
-            db.query(Schedule).filter(Schedule.user_id == user.id).delete()
-
-            for sched in schedules:
-                new_schedule = Schedule(
-                    user_id=user.id,
-                    day=sched["day"],
-                    start_time=sched["start_time"],
-                    end_time=sched["end_time"],
-                    subject=sched["subject"],
-                    professor=sched["professor"],
-                    room=sched["room"],
-                    color=sched["color"]
-                )
-                db.add(new_schedule)
+            # 친구 검색용 사용자 디렉터리 반영
+            user_directory.upsert(user.id, user.name, user.student_id, user.department)
 
-            db.commit()
+            # 시간표 동기화 (바뀐 게 없으면 쓰지 않고, 바뀌면 변경분만 반영)
+            sync_result = sync_user_schedules(db, user.id, schedules)
+            if sync_result["changed"]:
+                print(f"[Schedule] 시간표 변경 반영: user_id={user.id}, 추가 {sync_result['inserted']}, "
+                      f"수정 {sync_result['updated']}, 삭제 {sync_result['deleted']}")
 
             # 7. JWT 토큰 발급
             access_token = create_access_token(data={"sub": str(user.id)})
@@ -512,6 +394,7 @@ async def login_with_sunmoon(
                 try:
                     cookies = await get_gpt_session(login_data.student_id, login_data.password)
                     gpt_session_cache[user.id] = cookies
+                    note_created("gpt", user.id)
                     print(f"[GPT] 세션 자동 초기화 성공: user_id={user.id}")
                     return cookies
                 except Exception as e:
@@ -522,6 +405,7 @@ async def login_with_sunmoon(
                 try:
                     session = await login_ears_with_sws_client(client, login_data.student_id)
                     ears_session_cache[user.id] = session
+                    note_created("ears", user.id)
                     save_data = {
                         'student_id': login_data.student_id,
                         'password': login_data.password
@@ -541,6 +425,7 @@ async def login_with_sunmoon(
                     session['username'] = login_data.student_id
                     session['password'] = login_data.password
                     canvas_session_cache[user.id] = session
+                    note_created("canvas", user.id)
                     save_credentials('canvas', user.id, {
                         'username': login_data.student_id,
                         'password': login_data.password
@@ -552,9 +437,10 @@ async def login_with_sunmoon(
                     return None
 
             # 병렬 실행으로 로그인 속도 개선
-            await asyncio.gather(init_gpt(), init_ears(), init_canvas())
+            _, ears_session, canvas_session = await asyncio.gather(init_gpt(), init_ears(), init_canvas())
 
-            # 11. Folio 자격증명 저장 (마일리지 조회용)
+            # 11. Folio 자격증명 저장 (마일리지 조회용, 이전 세션은 새 자격증명으로 다시 로그인)
+            folio_session_cache.pop(user.id, None)
             folio_credentials_cache[user.id] = {
                 'login_id': login_data.student_id,
                 'password': login_data.password
@@ -566,6 +452,14 @@ async def login_with_sunmoon(
             save_credentials('gpt', user.id, {'password': login_data.password})
             print(f"[Folio] 자격증명 저장 완료: user_id={user.id}")
 
+            # 12. 첫 화면 캐시 워밍 (세션이 생긴 서비스만, 백그라운드)
+            warmup_jobs = FOLIO_JOBS
+            if canvas_session:
+                warmup_jobs = CANVAS_JOBS + warmup_jobs
+            if ears_session:
+                warmup_jobs = EARS_JOBS + warmup_jobs
+            enqueue_warmup(user.id, user.student_id, warmup_jobs)
+
             # 로그인 성공 - 시도 횟수 초기화
             record_login_attempt(client_ip, success=True)
 
@@ -10,7 +10,7 @@ from app.core.config import settings
 from app.core.websocket import manager
 from app.models.user import User
 from app.models.chat import ChatRoom, ChatMessage, RandomChatQueue, RandomChatRoom, RandomChatMessage
-from app.models.schedule import Schedule
+from app.routers.chat import get_user_subject_keys
 
 router = APIRouter()
 
@@ -35,21 +35,13 @@ def verify_token(token: str) -> int:
         return None
 
 
-def generate_subject_key(schedule: Schedule) -> str:
-    """시간표에서 과목 키 생성"""
-    professor = schedule.professor or ''
-    return f"{schedule.subject}|{professor}"
-
-
 def can_access_room(db: Session, user_id: int, room: ChatRoom) -> bool:
     """사용자가 채팅방에 접근 가능한지 확인"""
     if room.room_type == "global":
         return True
 
     if room.room_type == "subject":
-        schedules = db.query(Schedule).filter(Schedule.user_id == user_id).all()
-        user_keys = [generate_subject_key(s) for s in schedules]
-        return room.subject_key in user_keys
+        return room.subject_key in get_user_subject_keys(db, user_id)
 
     return False
 
@@ -151,6 +143,30 @@ async def websocket_chat(
         })
 
 
+@router.websocket("/ws/user")
+async def websocket_user_channel(
+    websocket: WebSocket,
+    token: str = Query(...)
+):
+    """사용자 알림 채널 (Canvas 할 일/과목 목록 백그라운드 갱신 결과 등 푸시)"""
+    user_id = verify_token(token)
+    if not user_id:
+        await websocket.close(code=4001)
+        return
+
+    conn_id = await manager.connect_user(websocket, user_id)
+    try:
+        while True:
+            data = await websocket.receive_json()
+            if data.get("type") == "ping":
+                await manager.send_personal(websocket, {"type": "pong"})
+    except WebSocketDisconnect:
+        manager.disconnect_user(user_id, conn_id)
+    except Exception as e:
+        print(f"[WS] 사용자 채널 오류: {e}")
+        manager.disconnect_user(user_id, conn_id)
+
+
 @router.websocket("/ws/random")
 async def websocket_random_chat(
     websocket: WebSocket,
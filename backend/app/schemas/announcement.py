@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import date, datetime
 
 
 class AnnouncementBase(BaseModel):
@@ -12,7 +12,7 @@ class AnnouncementBase(BaseModel):
 class AnnouncementCreate(AnnouncementBase):
     notice_no: Optional[int] = None
     writer: Optional[str] = None
-    notice_date: Optional[str] = None
+    notice_date: Optional[date] = None
     views: Optional[int] = 0
     external_url: Optional[str] = None
 
@@ -24,6 +24,40 @@ class AnnouncementUpdate(BaseModel):
     is_new: Optional[int] = None
 
 
+class AnnouncementSummary(BaseModel):
+    """목록용 요약 (본문 제외)"""
+    id: int
+    notice_no: Optional[int] = None
+    title: str
+    category: str
+    writer: Optional[str] = None
+    notice_date: Optional[date] = None
+    views: int = 0
+    external_url: Optional[str] = None
+    is_new: int
+
+    class Config:
+        from_attributes = True
+
+
+class AnnouncementPage(BaseModel):
+    """목록 페이지 (next_cursor가 없으면 마지막 페이지)"""
+    items: List[AnnouncementSummary]
+    next_cursor: Optional[str] = None
+
+
+class AnnouncementSearchHit(AnnouncementSummary):
+    """검색 결과 (요약 + 관련도 점수)"""
+    score: float = 0
+
+
+class AnnouncementSearchPage(BaseModel):
+    items: List[AnnouncementSearchHit]
+    total: int
+    page: int
+    size: int
+
+
 class AnnouncementResponse(BaseModel):
     id: int
     notice_no: Optional[int] = None
@@ -31,7 +65,7 @@ class AnnouncementResponse(BaseModel):
     content: Optional[str] = None
     category: str
     writer: Optional[str] = None
-    notice_date: Optional[str] = None
+    notice_date: Optional[date] = None
     views: int = 0
     external_url: Optional[str] = None
     is_new: int
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
+
+
+class SubscriptionCreate(BaseModel):
+    kind: str = Field(..., description="keyword 또는 category")
+    value: str = Field(..., description="키워드 또는 카테고리명")
+
+    @field_validator('kind')
+    @classmethod
+    def validate_kind(cls, v):
+        if v not in ['keyword', 'category']:
+            raise ValueError('kind는 keyword 또는 category여야 합니다')
+        return v
+
+    @field_validator('value')
+    @classmethod
+    def validate_value(cls, v):
+        v = (v or "").strip()
+        if not v:
+            raise ValueError('값을 입력하세요')
+        if len(v) > 100:
+            raise ValueError('100자 이하로 입력하세요')
+        return v
+
+
+class SubscriptionResponse(BaseModel):
+    id: int
+    kind: str
+    value: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
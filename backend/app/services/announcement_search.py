@@ -0,0 +1,494 @@
+"""
+공지사항 검색 서비스
+
+- MySQL FULLTEXT(ngram) 인덱스가 있으면 MATCH ... AGAINST 로 검색
+- 없으면 프로세스 내 2-gram 역색인 사용
+  (서버 시작 시 백그라운드 스레드에서 빌드, 빌드 전에는 LIKE 순차 검색으로 응답)
+  (DB의 updated_at 기준으로 증분 갱신, 크롤러 저장 직후에도 갱신)
+  (삭제는 행 수가 인덱스 문서 수와 다를 때만 id 전체를 비교해 반영)
+
+랭킹: 검색어별 idf × (제목 등장 수 × TITLE_WEIGHT + 본문 등장 수), 동점이면 최신순
+"""
+import asyncio
+import heapq
+import math
+import re
+import threading
+import time
+from array import array
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from bs4 import BeautifulSoup
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.announcement import Announcement
+
+TITLE_WEIGHT = 3
+MAX_BODY_TERM_COUNT = 5  # 본문 반복 등장 가중치 상한
+SEARCH_TEXT_MAX_CHARS = 15000  # DB search_text(TEXT, 64KB) 저장 상한
+MIN_TERM_LENGTH = 2  # MySQL ngram_token_size 기본값과 동일
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_BOOLEAN_OPERATORS_RE = re.compile(r'[+\-<>()~*"@]')
+
+
+def strip_html(html: Optional[str]) -> str:
+    """본문 HTML → 검색용 평문"""
+    if not html:
+        return ""
+    soup = BeautifulSoup(html, "lxml")
+    for tag in soup(["script", "style", "img"]):
+        tag.decompose()
+    return _WHITESPACE_RE.sub(" ", soup.get_text(" ")).strip()[:SEARCH_TEXT_MAX_CHARS]
+
+
+def normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", (text or "").casefold()).strip()
+
+
+def split_terms(query: str) -> List[str]:
+    """검색어 → 중복 제거된 검색 단어 목록 (최소 길이 미만 제외)"""
+    terms = []
+    for term in normalize(_BOOLEAN_OPERATORS_RE.sub(" ", query or "")).split(" "):
+        if len(term) >= MIN_TERM_LENGTH and term not in terms:
+            terms.append(term)
+    return terms
+
+
+def bigrams(text: str) -> Set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1) if " " not in text[i:i + 2]}
+
+
+# 바이트 값 → 켜진 비트 위치 (비트맵 → 슬롯 목록 변환용)
+_BYTE_BITS = [tuple(b for b in range(8) if value >> b & 1) for value in range(256)]
+
+
+def _new_posting() -> array:
+    return array("I")
+
+
+def _bitmap_slots(bitmap: int) -> List[int]:
+    slots = []
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for i, value in enumerate(data):
+        if value:
+            base = i << 3
+            slots.extend(base + b for b in _BYTE_BITS[value])
+    return slots
+
+
+class NgramIndex:
+    """
+    프로세스 내 2-gram 역색인
+
+    문서마다 슬롯을 배정하고 gram → 슬롯 배열(array('I'))로 저장한다.
+    많은 문서에 등장하는 gram(HOT_RATIO 이상)은 교집합 시 정수 비트맵으로 변환해
+    AND 연산으로 처리하고, 변환 결과는 posting 길이가 바뀔 때까지 재사용한다.
+    수정/삭제된 문서의 옛 슬롯은 비활성 처리 후, 비활성 비율이 커지면 압축한다.
+    """
+
+    HOT_RATIO = 0.01
+
+    def __init__(self, body_chars: int = 1000):
+        self.body_chars = body_chars
+        self._postings: Dict[str, array] = defaultdict(_new_posting)
+        self._slot_doc: List[Optional[int]] = []  # 슬롯 → 공지 id (비활성이면 None)
+        self._slot_text: List[Tuple[str, str]] = []  # 슬롯 → (정규화 제목, 정규화 본문)
+        self._doc_slot: Dict[int, int] = {}
+        self._doc_meta: Dict[int, Tuple[str, Optional[date]]] = {}  # id → (category, notice_date)
+        self._bitmaps: Dict[str, Tuple[int, int]] = {}  # gram → (변환 시 posting 길이, 비트맵)
+        self._dead = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._doc_slot)
+
+    def upsert(self, doc_id: int, title: str, body: str, category: str, notice_date: Optional[date]):
+        title_n = normalize(title)
+        body_n = normalize(body)[:self.body_chars]
+        with self._lock:
+            self._remove_slot(doc_id)
+            postings = self._postings
+            slot = len(self._slot_doc)
+            self._slot_doc.append(doc_id)
+            self._slot_text.append((title_n, body_n))
+            self._doc_slot[doc_id] = slot
+            self._doc_meta[doc_id] = (category, notice_date)
+            for gram in bigrams(title_n) | bigrams(body_n):
+                postings[gram].append(slot)
+            self._maybe_compact()
+
+    def doc_ids(self) -> List[int]:
+        with self._lock:
+            return list(self._doc_slot)
+
+    def update_meta(self, doc_id: int, category: str, notice_date: Optional[date]):
+        with self._lock:
+            if doc_id in self._doc_meta:
+                self._doc_meta[doc_id] = (category, notice_date)
+
+    def remove(self, doc_id: int):
+        with self._lock:
+            self._remove_slot(doc_id)
+            self._doc_meta.pop(doc_id, None)
+            self._maybe_compact()
+
+    def _remove_slot(self, doc_id: int):
+        slot = self._doc_slot.pop(doc_id, None)
+        if slot is not None:
+            self._slot_doc[slot] = None
+            self._slot_text[slot] = ("", "")
+            self._dead += 1
+
+    def _maybe_compact(self):
+        """비활성 슬롯이 25%를 넘으면 역색인 재구성"""
+        if self._dead < 1000 or self._dead * 4 < len(self._slot_doc):
+            return
+        live = [(self._slot_doc[s], self._slot_text[s]) for s in sorted(self._doc_slot.values())]
+        self._postings, self._slot_doc, self._slot_text, self._doc_slot = defaultdict(_new_posting), [], [], {}
+        self._bitmaps = {}
+        self._dead = 0
+        postings = self._postings
+        for doc_id, (title_n, body_n) in live:
+            slot = len(self._slot_doc)
+            self._slot_doc.append(doc_id)
+            self._slot_text.append((title_n, body_n))
+            self._doc_slot[doc_id] = slot
+            for gram in bigrams(title_n) | bigrams(body_n):
+                postings[gram].append(slot)
+
+    def _bitmap(self, gram: str, posting: array) -> int:
+        cached = self._bitmaps.get(gram)
+        if cached and cached[0] == len(posting):
+            return cached[1]
+        bits = bytearray((len(self._slot_doc) >> 3) + 1)
+        for slot in posting:
+            bits[slot >> 3] |= 1 << (slot & 7)
+        bitmap = int.from_bytes(bits, "little")
+        self._bitmaps[gram] = (len(posting), bitmap)
+        return bitmap
+
+    def _term_slots(self, term: str) -> Set[int]:
+        """단어의 모든 2-gram을 가진 슬롯 → 실제 포함 여부 확인"""
+        grams = bigrams(term)
+        hot_min = max(64, int(len(self._doc_slot) * self.HOT_RATIO))
+        hot, cold = [], []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            if len(posting) >= hot_min:
+                hot.append(self._bitmap(gram, posting))
+            else:
+                cold.append(posting)
+
+        bitmap = None
+        for value in hot:
+            bitmap = value if bitmap is None else bitmap & value
+
+        if cold:
+            cold.sort(key=len)
+            slots = set(cold[0])
+            for posting in cold[1:]:
+                slots.intersection_update(posting)
+            if bitmap is not None:
+                slots = {s for s in slots if bitmap >> s & 1}
+        else:
+            slots = set(_bitmap_slots(bitmap))
+
+        texts = self._slot_text
+        if len(grams) == 1 and len(term) == 2:
+            # 2글자 단어는 gram 자체가 단어 → 비활성 슬롯만 제외
+            return {s for s in slots if self._slot_doc[s] is not None}
+        return {s for s in slots if term in texts[s][0] or term in texts[s][1]}
+
+    def search(
+        self,
+        terms: List[str],
+        category: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 20
+    ) -> Tuple[List[Tuple[int, float]], int]:
+        """(공지 id, 점수) 목록과 전체 매칭 수 반환 (모든 단어를 포함한 공지만)"""
+        if not terms:
+            return [], 0
+
+        with self._lock:
+            total_docs = max(len(self._doc_slot), 1)
+            per_term = []
+            for term in terms:
+                slots = self._term_slots(term)
+                if not slots:
+                    return [], 0
+                per_term.append((term, slots))
+
+            per_term.sort(key=lambda item: len(item[1]))
+            candidates = set(per_term[0][1])
+            for _, slots in per_term[1:]:
+                candidates &= slots
+
+            scored = []
+            for slot in candidates:
+                doc_id = self._slot_doc[slot]
+                doc_category, notice_date = self._doc_meta[doc_id]
+                if category and doc_category != category:
+                    continue
+                title_n, body_n = self._slot_text[slot]
+                score = 0.0
+                for term, slots in per_term:
+                    idf = math.log(1 + total_docs / len(slots))
+                    score += idf * (title_n.count(term) * TITLE_WEIGHT
+                                    + min(body_n.count(term), MAX_BODY_TERM_COUNT))
+                scored.append((score, notice_date.toordinal() if notice_date else 0, doc_id))
+
+        top = heapq.nlargest(offset + limit, scored)
+        page = [(doc_id, round(score, 4)) for score, _, doc_id in top[offset:]]
+        return page, len(scored)
+
+
+class AnnouncementSearchIndex:
+    """DB와 증분 동기화되는 프로세스 내 검색 인덱스"""
+
+    def __init__(self):
+        self.index = NgramIndex(settings.ANNOUNCEMENT_SEARCH_BODY_CHARS)
+        self._watermark: Optional[datetime] = None
+        self._last_refresh = 0.0
+        self._refresh_lock = threading.Lock()
+        self.ready = threading.Event()  # 첫 전체 빌드 완료
+
+    def refresh(self, db: Session, force: bool = False) -> int:
+        """updated_at 워터마크 이후 변경분과 삭제분 반영 (반영 건수 반환)"""
+        now = time.monotonic()
+        if not force and now - self._last_refresh < settings.ANNOUNCEMENT_SEARCH_REFRESH_SECONDS:
+            return 0
+        if not self._refresh_lock.acquire(blocking=force):
+            return 0
+        try:
+            query = db.query(
+                Announcement.id,
+                Announcement.title,
+                Announcement.search_text,
+                Announcement.content,
+                Announcement.category,
+                Announcement.notice_date,
+                Announcement.updated_at
+            )
+            if self._watermark is not None:
+                # DATETIME은 초 단위 → 같은 초의 행은 다시 반영 (upsert라 중복 무해)
+                query = query.filter(Announcement.updated_at >= self._watermark)
+
+            changed = 0
+            for row in query.yield_per(1000):
+                body = row.search_text if row.search_text is not None else strip_html(row.content)
+                self.index.upsert(row.id, row.title, body, row.category, row.notice_date)
+                if row.updated_at and (self._watermark is None or row.updated_at > self._watermark):
+                    self._watermark = row.updated_at
+                changed += 1
+
+            # 삭제된 공지 제거 - 변경분을 반영한 뒤 행 수가 인덱스 문서 수와 같으면 삭제 없음
+            live_count = db.query(func.count(Announcement.id)).scalar() or 0
+            if live_count != len(self.index):
+                live_ids = {row.id for row in db.query(Announcement.id)}
+                for doc_id in [d for d in self.index.doc_ids() if d not in live_ids]:
+                    self.index.remove(doc_id)
+                    changed += 1
+
+            self._last_refresh = time.monotonic()
+            return changed
+        finally:
+            self._refresh_lock.release()
+
+
+# 프로세스 전역 인덱스 (MySQL FULLTEXT 미사용 시)
+search_index = AnnouncementSearchIndex()
+
+# 검색 백엔드 판별 결과 캐시 ("mysql" / "memory")
+_backend: Optional[str] = None
+
+
+def get_search_backend(db: Session) -> str:
+    """설정과 FULLTEXT 인덱스 존재 여부로 검색 백엔드 결정"""
+    global _backend
+    if _backend is not None:
+        return _backend
+
+    configured = settings.ANNOUNCEMENT_SEARCH_BACKEND
+    if configured in ("mysql", "memory"):
+        _backend = configured
+        return _backend
+
+    try:
+        count = db.execute(text("""
+            SELECT COUNT(DISTINCT INDEX_NAME) FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+              AND TABLE_NAME = 'SMU_ANNOUNCEMENTS'
+              AND INDEX_NAME IN ('ft_announcement_title', 'ft_announcement_search')
+        """)).scalar()
+        _backend = "mysql" if count == 2 else "memory"
+    except Exception:
+        db.rollback()
+        _backend = "memory"
+
+    print(f"[Search] 공지사항 검색 백엔드: {_backend}")
+    return _backend
+
+
+def _mysql_search(
+    db: Session,
+    terms: List[str],
+    category: Optional[str],
+    offset: int,
+    limit: int
+) -> Tuple[List[Tuple[int, float]], int]:
+    """MySQL FULLTEXT(ngram) 검색 - 모든 단어를 구문으로 포함해야 매칭"""
+    against = " ".join(f'+"{term}"' for term in terms)
+    where = "MATCH(title, search_text) AGAINST(:q IN BOOLEAN MODE)"
+    params = {"q": against, "offset": offset, "limit": limit}
+    if category:
+        where += " AND category = :category"
+        params["category"] = category
+
+    total = db.execute(
+        text(f"SELECT COUNT(*) FROM SMU_ANNOUNCEMENTS WHERE {where}"), params
+    ).scalar() or 0
+    if not total:
+        return [], 0
+
+    rows = db.execute(text(f"""
+        SELECT id,
+               MATCH(title) AGAINST(:q IN BOOLEAN MODE) * {TITLE_WEIGHT}
+               + MATCH(title, search_text) AGAINST(:q IN BOOLEAN MODE) AS score
+        FROM SMU_ANNOUNCEMENTS
+        WHERE {where}
+        ORDER BY score DESC, notice_date DESC, id DESC
+        LIMIT :limit OFFSET :offset
+    """), params).all()
+    return [(row.id, round(float(row.score), 4)) for row in rows], total
+
+
+def search_announcements(
+    db: Session,
+    query: str,
+    category: Optional[str] = None,
+    page: int = 1,
+    size: int = 20
+) -> Dict:
+    """
+    공지사항 검색
+
+    Returns:
+        {"items": [(id, score), ...], "total": int}
+    """
+    terms = split_terms(query)
+    offset = (page - 1) * size
+
+    if get_search_backend(db) == "mysql":
+        items, total = _mysql_search(db, terms, category, offset, size)
+    elif not search_index.ready.is_set():
+        # 인덱스 빌드 중 (서버 시작 직후) - 빌드를 기다리지 않고 순차 검색
+        items, total = _like_search(db, terms, category, offset, size)
+    else:
+        search_index.refresh(db)
+        items, total = search_index.index.search(terms, category, offset, size)
+
+    return {"items": items, "total": total}
+
+
+def _like_search(
+    db: Session,
+    terms: List[str],
+    category: Optional[str],
+    offset: int,
+    limit: int
+) -> Tuple[List[Tuple[int, float]], int]:
+    """LIKE 순차 검색 (프로세스 내 인덱스 빌드 전 임시) - 제목에 있는 단어 수로 정렬"""
+    if not terms:
+        return [], 0
+    conditions, score_parts = [], []
+    params = {"offset": offset, "limit": limit}
+    for i, term in enumerate(terms):
+        escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params[f"t{i}"] = f"%{escaped}%"
+        conditions.append(f"(title LIKE :t{i} OR COALESCE(search_text, '') LIKE :t{i})")
+        score_parts.append(f"(title LIKE :t{i}) * {TITLE_WEIGHT} + (COALESCE(search_text, '') LIKE :t{i})")
+    where = " AND ".join(conditions)
+    if category:
+        where += " AND category = :category"
+        params["category"] = category
+
+    total = db.execute(
+        text(f"SELECT COUNT(*) FROM SMU_ANNOUNCEMENTS WHERE {where}"), params
+    ).scalar() or 0
+    if not total:
+        return [], 0
+
+    rows = db.execute(text(f"""
+        SELECT id, {" + ".join(score_parts)} AS score
+        FROM SMU_ANNOUNCEMENTS
+        WHERE {where}
+        ORDER BY score DESC, notice_date DESC, id DESC
+        LIMIT :limit OFFSET :offset
+    """), params).all()
+    return [(row.id, float(row.score)) for row in rows], total
+
+
+def _build_search_index():
+    db = SessionLocal()
+    try:
+        if get_search_backend(db) != "memory":
+            return
+        started = time.perf_counter()
+        search_index.refresh(db, force=True)
+        search_index.ready.set()
+        print(f"[Search] 검색 인덱스 빌드 완료: {len(search_index.index)}건 ({time.perf_counter() - started:.1f}s)")
+    except Exception as e:
+        print(f"[Search] 검색 인덱스 빌드 오류: {e}")
+    finally:
+        db.close()
+
+
+async def start_search_index():
+    """서버 시작 시 프로세스 내 인덱스 빌드 (FULLTEXT 미사용 시에만, 스레드에서 실행해 이벤트 루프를 막지 않음)"""
+    await asyncio.to_thread(_build_search_index)
+
+
+def refresh_search_index():
+    """크롤러 저장 직후 프로세스 내 인덱스 증분 갱신 (아직 빌드 중이면 빌드가 반영)"""
+    if _backend != "memory" or not search_index.ready.is_set():
+        return
+    db = SessionLocal()
+    try:
+        changed = search_index.refresh(db, force=True)
+        if changed:
+            print(f"[Search] 검색 인덱스 갱신: {changed}건")
+    except Exception as e:
+        print(f"[Search] 검색 인덱스 갱신 오류: {e}")
+    finally:
+        db.close()
+
+
+def backfill_search_text(db: Session, batch_size: int = 200) -> int:
+    """search_text가 비어 있는 기존 공지 채우기 (마이그레이션용)"""
+    filled = 0
+    last_id = 0
+    while True:
+        rows = db.query(Announcement.id, Announcement.content).filter(
+            Announcement.search_text.is_(None),
+            Announcement.id > last_id
+        ).order_by(Announcement.id).limit(batch_size).all()
+        if not rows:
+            break
+        for row in rows:
+            db.query(Announcement).filter(Announcement.id == row.id).update(
+                {Announcement.search_text: strip_html(row.content)},
+                synchronize_session=False
+            )
+        db.commit()
+        last_id = rows[-1].id
+        filled += len(rows)
+    return filled
@@ -0,0 +1,157 @@
+"""
+수업 종료 후 EARS 출석 예약 갱신
+
+출석은 교수가 수업 중/직후에 입력할 때만 바뀐다. 최근 출석을 조회한 사용자의
+시간표(SMU_SCHEDULES)에서 수업 종료 시각을 구해 EARS_CLASS_END_DELAY_MINUTES 뒤에
+그 과목 출석 캐시를 미리 갱신해 두면, 수업 직후 조회도 캐시에서 최신 결과를 받는다.
+- 대상: EARS_ACTIVE_SECONDS 안에 출석을 조회했고 이 워커에 EARS 세션이 있는 사용자 (재로그인은 하지 않음)
+- 시간표 과목명과 같은 EARS 과목만 갱신, 맞는 과목이 없으면 전 과목
+- 이미 EARS_ATTENDANCE_FRESH_SECONDS 안에 조회한 과목은 건너뜀
+- 낮은 우선순위: 사용자 한 명씩, 분당 EARS_SCHEDULED_MAX_PER_MINUTE명까지
+  (과목 조회는 화면 조회와 같은 사용자별 동시 조회 제한을 따름)
+시간표가 바뀌면 schedule_sync 변경 이벤트로 수업 종료 시각 캐시를 지운다.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.core.cache import smart_cache_get
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.schedule import Schedule
+from app.routers import ears
+from app.services.schedule_sync import subscribe
+
+WEEKDAYS = "월화수목금토일"
+
+# 수업 종료 확인 주기 (초)
+TICK_SECONDS = 60
+
+# user_id -> [(요일, 종료 시각 "HH:MM", 과목명)]
+_class_ends: Dict[int, List[Tuple[str, str, str]]] = {}
+
+
+def _on_schedule_change(event: dict):
+    """시간표가 바뀌면 수업 종료 시각을 다시 읽도록"""
+    _class_ends.pop(event["user_id"], None)
+
+
+subscribe(_on_schedule_change)
+
+
+def _query_class_ends(user_ids: List[int]) -> list:
+    db = SessionLocal()
+    try:
+        return db.query(Schedule.user_id, Schedule.day, Schedule.end_time, Schedule.subject).filter(
+            Schedule.user_id.in_(user_ids)
+        ).all()
+    finally:
+        db.close()
+
+
+async def _load_class_ends(user_ids):
+    """캐시에 없는 사용자의 수업 종료 시각을 한 번에 조회 (동기 DB 조회는 이벤트 루프 밖에서)"""
+    missing = [user_id for user_id in user_ids if user_id not in _class_ends]
+    if not missing:
+        return
+    rows = await asyncio.to_thread(_query_class_ends, missing)
+    for user_id in missing:
+        _class_ends[user_id] = []
+    for user_id, day, end_time, subject in rows:
+        _class_ends[user_id].append((day, end_time, subject))
+
+
+def _active_users(now: float) -> Dict[int, str]:
+    """수업 종료 후 갱신 대상 (user_id -> 학번), 오래 조회하지 않은 사용자는 추적 중단"""
+    active = {}
+    for user_id, (viewed, student_id) in list(ears.attendance_viewers.items()):
+        if now - viewed > settings.EARS_ACTIVE_SECONDS:
+            del ears.attendance_viewers[user_id]
+            _class_ends.pop(user_id, None)
+            # 동시 조회 제한도 정리 (다시 조회하면 새로 만든다)
+            ears._user_limits.pop(user_id, None)
+            continue
+        if user_id in ears.ears_session_cache:
+            active[user_id] = student_id
+    return active
+
+
+def _class_end_at(day_date, end_time: str) -> Optional[datetime]:
+    try:
+        hour, minute = (int(part) for part in end_time.split(":")[:2])
+        return datetime.combine(day_date, datetime.min.time()).replace(hour=hour, minute=minute)
+    except (ValueError, AttributeError):
+        return None
+
+
+async def ended_classes(since: datetime, until: datetime) -> Dict[int, List[str]]:
+    """(since, until] 사이에 '수업 종료 + 지연'이 된 활성 사용자 → 끝난 수업 과목명"""
+    active = _active_users(until.timestamp())
+    await _load_class_ends(active)
+    delay = timedelta(minutes=settings.EARS_CLASS_END_DELAY_MINUTES)
+    dates = {(since - delay).date(), (until - delay).date()}
+    due: Dict[int, List[str]] = {}
+    for user_id in active:
+        for day, end_time, subject in _class_ends.get(user_id, []):
+            for day_date in dates:
+                if WEEKDAYS[day_date.weekday()] != day:
+                    continue
+                ended_at = _class_end_at(day_date, end_time)
+                if ended_at is not None and since < ended_at + delay <= until:
+                    due.setdefault(user_id, []).append(subject)
+    return due
+
+
+async def refresh_after_class(user_id: int, student_id: str, subjects: List[str]) -> int:
+    """끝난 수업의 과목 출석 갱신, 갱신한 과목 수"""
+    courses = await ears.session_course_codes(user_id)
+    matched = [dclass for dclass, name in courses.items() if name in subjects] or list(courses)
+    now = time.time()
+    pending = []
+    for dclass in matched:
+        entry = smart_cache_get(ears.attendance_cache_key(user_id, dclass))
+        if entry is None or now - entry["fetched_at"] >= settings.EARS_ATTENDANCE_FRESH_SECONDS:
+            pending.append(dclass)
+    task = ears.schedule_attendance_refresh(user_id, student_id, pending, reason="scheduled") if pending else None
+    if task is None:
+        return 0
+    await task
+    return len(pending)
+
+
+async def refresh_ended_classes(since: datetime, until: datetime) -> int:
+    """수업이 끝난 사용자 출석을 한 명씩 갱신 (분당 EARS_SCHEDULED_MAX_PER_MINUTE명 간격), 처리한 사용자 수"""
+    due = await ended_classes(since, until)
+    spacing = 60 / settings.EARS_SCHEDULED_MAX_PER_MINUTE
+    handled = 0
+    for user_id, subjects in due.items():
+        student_id = ears.attendance_viewers.get(user_id, (0, ""))[1]
+        if handled:
+            await asyncio.sleep(spacing)
+        handled += 1
+        try:
+            await refresh_after_class(user_id, student_id, subjects)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[EARS] 수업 종료 후 출석 갱신 실패: user_id={user_id}, {getattr(e, 'detail', e)}")
+    if handled:
+        print(f"[EARS] 수업 종료 후 출석 갱신: {handled}명")
+    return handled
+
+
+async def run_attendance_refresh():
+    """수업 종료 후 출석 갱신 루프 (서버 시작 시 lifespan에서 실행)"""
+    print("[EARS] 수업 종료 후 출석 갱신 시작")
+    last = datetime.now()
+    while True:
+        await asyncio.sleep(TICK_SECONDS)
+        now = datetime.now()
+        try:
+            await refresh_ended_classes(last, now)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[EARS] 출석 예약 갱신 오류: {e}")
+        last = now
@@ -0,0 +1,108 @@
+"""
+로그인 직후 캐시 워밍
+
+선문대 로그인(sunmoon.login_with_sunmoon)에서 Canvas/EARS 세션과 folio 자격 증명이 생긴 직후
+첫 화면들이 읽는 캐시를 백그라운드에서 미리 채운다.
+- Canvas 할 일/과목 목록 (canvas:user:{id}:todos, courses)
+- EARS 전 과목 출석 (ears:attendance:{id}:{dclass})
+- folio 올해 마일리지 (folio:mileage:{id}:{year})
+
+로그인이 몰려도 학교 서버로 한꺼번에 나가지 않도록
+- 큐 길이 제한 (WARMUP_QUEUE_SIZE, 넘치면 버림 - 워밍은 없어도 되는 작업)
+- 전체 동시 실행 수 제한 (WARMUP_CONCURRENCY개 워커)
+- 같은 사용자는 WARMUP_DEDUPE_SECONDS 안에 다시 워밍하지 않음
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.routers import canvas, ears, scholarship
+
+# 워밍 작업 이름 (로그인 시 세션이 생긴 서비스만 넣는다)
+CANVAS_JOBS = ("canvas_todos", "canvas_courses")
+EARS_JOBS = ("ears_attendance",)
+FOLIO_JOBS = ("folio_mileage",)
+
+_queue: Optional[asyncio.Queue] = None
+_queue_loop: Optional[asyncio.AbstractEventLoop] = None
+_workers: List[asyncio.Task] = []
+# user_id -> 마지막 워밍 예약 시각
+_last_enqueued: Dict[int, float] = {}
+
+warmer_stats = {"enqueued": 0, "deduped": 0, "dropped": 0, "done": 0, "failed": 0}
+
+
+async def _run_job(job: str, user_id: int, student_id: str):
+    if job == "canvas_todos":
+        await canvas.warm_user_cache(user_id, "todos")
+    elif job == "canvas_courses":
+        await canvas.warm_user_cache(user_id, "courses")
+    elif job == "ears_attendance":
+        await ears.load_all_attendance(user_id, student_id)
+    elif job == "folio_mileage":
+        await scholarship.load_mileage(user_id, student_id, datetime.now().year)
+
+
+async def _worker():
+    while True:
+        job, user_id, student_id = await _queue.get()
+        started = time.perf_counter()
+        try:
+            await _run_job(job, user_id, student_id)
+            warmer_stats["done"] += 1
+            print(f"[Warmup] {job} 완료: user_id={user_id} ({time.perf_counter() - started:.2f}s)")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            warmer_stats["failed"] += 1
+            print(f"[Warmup] {job} 실패: user_id={user_id}, {getattr(e, 'detail', e)}")
+        finally:
+            _queue.task_done()
+
+
+def _ensure_workers():
+    global _queue, _queue_loop
+    loop = asyncio.get_running_loop()
+    if _queue is None or _queue_loop is not loop:
+        _queue = asyncio.Queue(maxsize=settings.WARMUP_QUEUE_SIZE)
+        _queue_loop = loop
+        _workers.clear()
+    alive = [task for task in _workers if not task.done()]
+    _workers[:] = alive
+    for _ in range(settings.WARMUP_CONCURRENCY - len(alive)):
+        _workers.append(asyncio.create_task(_worker()))
+
+
+def enqueue_warmup(user_id: int, student_id: str, jobs: Tuple[str, ...]) -> int:
+    """로그인 직후 워밍 예약 (예약한 작업 수, 중복/큐 가득이면 0)"""
+    now = time.time()
+    last = _last_enqueued.get(user_id)
+    if last is not None and now - last < settings.WARMUP_DEDUPE_SECONDS:
+        warmer_stats["deduped"] += 1
+        return 0
+
+    _ensure_workers()
+    if _queue.maxsize - _queue.qsize() < len(jobs):
+        warmer_stats["dropped"] += 1
+        print(f"[Warmup] 큐가 가득 차 워밍 생략: user_id={user_id}")
+        return 0
+
+    _last_enqueued[user_id] = now
+    # 오래된 예약 기록 정리
+    if len(_last_enqueued) > settings.WARMUP_QUEUE_SIZE * 4:
+        for uid in [uid for uid, t in _last_enqueued.items() if now - t >= settings.WARMUP_DEDUPE_SECONDS]:
+            del _last_enqueued[uid]
+
+    for job in jobs:
+        _queue.put_nowait((job, user_id, student_id))
+    warmer_stats["enqueued"] += len(jobs)
+    return len(jobs)
+
+
+def stop_cache_warmer():
+    """워커 종료 (서버 종료 시)"""
+    for task in _workers:
+        task.cancel()
+    _workers.clear()
@@ -2,17 +2,25 @@
 선문대학교 공지사항 크롤러
 https://lily.sunmoon.ac.kr/Page2/Story/Notice.aspx
 """
-import re
+import time
 import asyncio
+import hashlib
 import httpx
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from sqlalchemy import func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from app.core.config import settings
+from app.core.cache import cache_delete_pattern
 from app.core.database import SessionLocal
+from app.core.upstream import upstream_client
 from app.models.announcement import Announcement
+from app.services.announcement_search import strip_html, refresh_search_index
+from app.services.image_proxy import cache_images
+from app.services.parsing import fill_image_placeholders, parse_notice_body, parse_notice_page, run_parser
 
 
 BASE_URL = "https://lily.sunmoon.ac.kr/Page2/Story/Notice.aspx"
-VIEW_URL = "https://lily.sunmoon.ac.kr/Page2/Story/Notice_view.aspx"
 
 
 def clean_text(text: str) -> str:
@@ -34,37 +42,50 @@ def clean_text(text: str) -> str:
     return text
 
 
-async def fetch_notice_content(client: httpx.AsyncClient, url: str) -> Optional[str]:
+class HostRateLimiter:
+    """호스트별 최소 요청 간격 보장 (동시 요청이어도 같은 호스트는 간격을 두고 출발)"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last: Dict[str, float] = {}
+
+    async def wait(self, url: str):
+        host = urlparse(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            elapsed = time.monotonic() - self._last.get(host, 0.0)
+            if elapsed < self.min_interval:
+                await asyncio.sleep(self.min_interval - elapsed)
+            self._last[host] = time.monotonic()
+
+
+def content_hash(content: Optional[str]) -> Optional[str]:
+    """본문 변경 감지용 해시"""
+    if content is None:
+        return None
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+async def fetch_notice_content(
+    client: httpx.AsyncClient,
+    url: str,
+    limiter: Optional[HostRateLimiter] = None
+) -> Optional[str]:
     """공지사항 상세 페이지에서 본문 내용 크롤링"""
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        if limiter:
+            await limiter.wait(url)
         response = await client.get(url, headers=headers, timeout=30.0)
-        soup = BeautifulSoup(response.text, 'lxml')
-
-        # 본문 내용 추출 (view_con 클래스)
-        content_td = soup.find('td', class_='view_con')
-        if content_td:
-            # 이미지 src를 절대 경로로 변환
-            for img in content_td.find_all('img'):
-                src = img.get('src', '')
-                if src and not src.startswith('http'):
-                    if src.startswith('/'):
-                        img['src'] = f"https://lily.sunmoon.ac.kr{src}"
-                    else:
-                        img['src'] = f"https://lily.sunmoon.ac.kr/{src}"
-
-            # 링크도 절대 경로로 변환
-            for a in content_td.find_all('a'):
-                href = a.get('href', '')
-                if href and not href.startswith('http') and not href.startswith('mailto:'):
-                    if href.startswith('/'):
-                        a['href'] = f"https://lily.sunmoon.ac.kr{href}"
-                    else:
-                        a['href'] = f"https://lily.sunmoon.ac.kr/{href}"
-
-            content_html = str(content_td.decode_contents())
+        content_html, images = await run_parser(parse_notice_body, response.text)
+        if content_html is not None:
+            # 학교 서버 이미지는 이미지 프록시로 (Canvas 공지와 같은 저장소, 1년 캐시)
+            if images:
+                proxied = await cache_images(images, public=True, client=client, limiter=limiter)
+                content_html = fill_image_placeholders(content_html, images, proxied)
             return clean_text(content_html)
 
         return None
@@ -73,109 +94,16 @@ async def fetch_notice_content(client: httpx.AsyncClient, url: str) -> Optional[
         return None
 
 
-def extract_form_data(html: str) -> Dict[str, str]:
-    """HTML에서 ASP.NET 폼 데이터 추출"""
-    soup = BeautifulSoup(html, 'html.parser')
-
-    form_data = {}
-
-    # Hidden fields 추출
-    hidden_fields = [
-        '__VIEWSTATE', '__VIEWSTATEGENERATOR', '__EVENTVALIDATION',
-        '__SCROLLPOSITIONX', '__SCROLLPOSITIONY',
-        'ctl00$ContentPlaceHolder_Main$BoardList$hidBoardCode',
-        'ctl00$ContentPlaceHolder_Main$BoardList$txtSearch',
-        'ctl00$ContentPlaceHolder_Main$BoardList$pagPager$hidItemTotal',
-        'ctl00$ContentPlaceHolder_Main$BoardList$pagPager$hidCurPage',
-        'ctl00$ContentPlaceHolder_Main$BoardList$pagPager$hidItemInOnePage',
-        'ctl00$ContentPlaceHolder_Main$BoardList$pagPager$hidPagesInScreen'
-    ]
-
-    for field in hidden_fields:
-        element = soup.find('input', {'name': field})
-        if element:
-            form_data[field] = element.get('value', '')
-
-    return form_data
-
-
-def parse_notices(html: str) -> List[Dict]:
-    """HTML에서 공지사항 목록 파싱"""
-    soup = BeautifulSoup(html, 'html.parser')
-    notices = []
-
-    table = soup.find('div', class_='table_list')
-    if not table:
-        return notices
-
-    rows = table.find('tbody')
-    if not rows:
-        return notices
-
-    for row in rows.find_all('tr'):
-        cols = row.find_all('td')
-        if len(cols) < 6:
-            continue
-
-        try:
-            # 번호
-            num_text = cols[0].get_text(strip=True)
-            if not num_text.isdigit():
-                continue
-            notice_no = int(num_text)
-
-            # 카테고리
-            category_span = cols[1].find('span', class_='cate')
-            category = category_span.get_text(strip=True) if category_span else "일반"
-
-            # 제목과 링크
-            title_td = cols[2]
-            title_link = title_td.find('a')
-            if not title_link:
-                continue
-
-            title = title_link.get_text(strip=True)
-            href = title_link.get('href', '')
-
-            # URL에서 no와 cp 파라미터 추출
-            no_match = re.search(r'no=(\d+)', href)
-            cp_match = re.search(r'cp=(\d+)', href)
-
-            if no_match:
-                external_url = f"{VIEW_URL}?no={no_match.group(1)}"
-                if cp_match:
-                    external_url += f"&cp={cp_match.group(1)}"
-            else:
-                external_url = f"https://lily.sunmoon.ac.kr{href}" if href.startswith('/') else href
-
-            # 작성자
-            writer = cols[3].get_text(strip=True)
-
-            # 날짜
-            notice_date = cols[4].get_text(strip=True)
-
-            # 조회수
-            views_text = cols[5].get_text(strip=True)
-            views = int(views_text) if views_text.isdigit() else 0
-
-            notices.append({
-                'notice_no': notice_no,
-                'title': title,
-                'category': category,
-                'writer': writer,
-                'notice_date': notice_date,
-                'views': views,
-                'external_url': external_url
-            })
-        except Exception as e:
-            print(f"공지 파싱 오류: {e}")
-            continue
-
-    return notices
-
-
-async def fetch_page(client: httpx.AsyncClient, page: int, form_data: Dict[str, str] = None) -> str:
+async def fetch_page(
+    client: httpx.AsyncClient,
+    page: int,
+    form_data: Dict[str, str] = None,
+    limiter: Optional[HostRateLimiter] = None
+) -> str:
     """특정 페이지 가져오기"""
+    if limiter:
+        await limiter.wait(BASE_URL)
+
     if page == 1 or form_data is None:
         # 첫 페이지는 GET 요청
         response = await client.get(BASE_URL, timeout=30.0)
@@ -200,97 +128,221 @@ async def fetch_page(client: httpx.AsyncClient, page: int, form_data: Dict[str,
     return response.text
 
 
-async def crawl_notices(max_pages: int = 5) -> List[Dict]:
-    """공지사항 크롤링 (1~max_pages 페이지)"""
-    all_notices = []
-
-    async with httpx.AsyncClient() as client:
-        # 첫 페이지 가져오기
-        print("크롤링 시작: 페이지 1")
-        html = await fetch_page(client, 1)
-        notices = parse_notices(html)
-        all_notices.extend(notices)
-        print(f"페이지 1: {len(notices)}개 공지 수집")
+def load_known_notices() -> Dict[int, dict]:
+    """DB에 저장된 공지 요약 (notice_no -> title/views/content_hash)"""
+    db = SessionLocal()
+    try:
+        rows = db.query(
+            Announcement.notice_no,
+            Announcement.title,
+            Announcement.views,
+            Announcement.content_hash,
+            Announcement.content.is_(None).label('no_content')
+        ).filter(Announcement.notice_no.isnot(None)).all()
+        return {
+            row.notice_no: {
+                'title': row.title,
+                'views': row.views or 0,
+                'content_hash': row.content_hash,
+                'no_content': bool(row.no_content),
+            }
+            for row in rows
+        }
+    finally:
+        db.close()
 
-        # 폼 데이터 추출
-        form_data = extract_form_data(html)
 
-        # 나머지 페이지 가져오기
-        for page in range(2, max_pages + 1):
+def classify_notices(notices: List[Dict], known: Dict[int, dict]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    목록 결과를 신규 / 상세 재수집 필요 / 목록 정보만 갱신으로 분류
+    - 신규: DB에 없는 notice_no
+    - 변경: 제목이 바뀌었거나 본문이 비어 있음 → 상세 재수집
+    - 조회수 등 목록 정보만 바뀐 경우는 상세를 다시 가져오지 않음
+    """
+    new, changed, list_only = [], [], []
+    for notice in notices:
+        prev = known.get(notice['notice_no'])
+        if prev is None:
+            new.append(notice)
+        elif prev['title'] != notice['title'] or prev['no_content']:
+            changed.append(notice)
+        elif prev['views'] != notice['views']:
+            list_only.append(notice)
+    return new, changed, list_only
+
+
+async def crawl_notices(max_pages: int = None, known: Dict[int, dict] = None) -> Dict:
+    """
+    공지사항 증분 크롤링
+    - 한 페이지의 공지가 모두 이미 알고 있는 notice_no이면 이후 페이지는 가져오지 않음
+    - 신규/변경 공지만 상세 페이지를 동시(세마포어) + 호스트별 간격 제한으로 수집
+    """
+    max_pages = max_pages or settings.CRAWLER_MAX_PAGES
+    known = known if known is not None else load_known_notices()
+    limiter = HostRateLimiter(settings.CRAWLER_HOST_MIN_INTERVAL)
+    semaphore = asyncio.Semaphore(settings.CRAWLER_DETAIL_CONCURRENCY)
+
+    stats = {'pages': 0, 'listed': 0, 'new': 0, 'changed': 0, 'views_updated': 0,
+             'details_fetched': 0, 'content_changed': 0}
+    all_notices: Dict[int, Dict] = {}
+
+    async with upstream_client() as client:
+        list_started = time.monotonic()
+        form_data = None
+        for page in range(1, max_pages + 1):
             try:
-                print(f"크롤링: 페이지 {page}")
-                html = await fetch_page(client, page, form_data)
-                notices = parse_notices(html)
-                all_notices.extend(notices)
-                print(f"페이지 {page}: {len(notices)}개 공지 수집")
-
-                # 폼 데이터 업데이트
-                form_data = extract_form_data(html)
+                html = await fetch_page(client, page, form_data, limiter)
             except Exception as e:
                 print(f"페이지 {page} 크롤링 오류: {e}")
-                continue
-
-        # 각 공지의 상세 내용 크롤링
-        print(f"상세 내용 크롤링 시작 ({len(all_notices)}개)")
-        for i, notice in enumerate(all_notices):
-            if notice.get('external_url'):
-                content = await fetch_notice_content(client, notice['external_url'])
-                notice['content'] = content
-                if (i + 1) % 10 == 0:
-                    print(f"상세 내용 크롤링: {i + 1}/{len(all_notices)}")
-                # 서버 부하 방지를 위한 짧은 대기
-                await asyncio.sleep(0.2)
+                break
+
+            notices, next_form_data = await run_parser(parse_notice_page, html)
+            stats['pages'] += 1
+            for notice in notices:
+                all_notices.setdefault(notice['notice_no'], notice)
+
+            # 이미 아는 공지에 도달하면 조기 종료
+            if known and notices and all(n['notice_no'] in known for n in notices):
+                break
+
+            form_data = next_form_data
+        stats['list_seconds'] = round(time.monotonic() - list_started, 3)
+
+        notices = list(all_notices.values())
+        new, changed, list_only = classify_notices(notices, known)
+        stats['listed'] = len(notices)
+        stats['new'] = len(new)
+        stats['changed'] = len(changed)
+        stats['views_updated'] = len(list_only)
+
+        # 신규/변경 공지만 상세 수집
+        detail_started = time.monotonic()
+
+        async def fetch_detail(notice: Dict):
+            if not notice.get('external_url'):
+                return
+            async with semaphore:
+                notice['content'] = await fetch_notice_content(client, notice['external_url'], limiter)
+            notice['content_hash'] = content_hash(notice['content'])
+
+        await asyncio.gather(*[fetch_detail(n) for n in new + changed])
+        stats['details_fetched'] = sum(1 for n in new + changed if n.get('external_url'))
+        stats['detail_seconds'] = round(time.monotonic() - detail_started, 3)
+
+        for notice in changed:
+            prev = known[notice['notice_no']]
+            if notice.get('content_hash') != prev['content_hash']:
+                stats['content_changed'] += 1
+
+    return {
+        'new': new,
+        'changed': changed,
+        'list_only': list_only,
+        'stats': stats,
+    }
 
-    return all_notices
 
+def _notice_row(notice: Dict, with_content: bool) -> Dict:
+    row = {
+        'notice_no': notice['notice_no'],
+        'title': notice['title'],
+        'category': notice['category'],
+        'writer': notice['writer'],
+        'notice_date': notice['notice_date'],
+        'views': notice['views'],
+        'external_url': notice['external_url'],
+    }
+    if with_content:
+        row['content'] = notice.get('content')
+        row['content_hash'] = notice.get('content_hash')
+        row['search_text'] = strip_html(notice.get('content'))
+    return row
+
+
+def save_notices_to_db(result: Dict):
+    """
+    공지사항 일괄 upsert (notice_no 기준, 삭제 없음 → id 유지)
+    - 신규/변경: 목록 정보 + 본문 저장
+    - 조회수 등 목록 정보만 바뀐 공지: 본문은 건드리지 않음
+    """
+    detailed = [_notice_row(n, True) for n in result['new'] + result['changed']]
+    list_only = [_notice_row(n, False) for n in result['list_only']]
+    if not detailed and not list_only:
+        return
 
-def save_notices_to_db(notices: List[Dict]):
-    """공지사항을 DB에 저장 (덮어쓰기)"""
     db = SessionLocal()
     try:
-        # 기존 공지사항 모두 삭제
-        db.query(Announcement).delete()
-        db.commit()
-
-        # 새 공지사항 저장
-        for notice in notices:
-            announcement = Announcement(
-                notice_no=notice['notice_no'],
-                title=notice['title'],
-                content=notice.get('content'),
-                category=notice['category'],
-                writer=notice['writer'],
-                notice_date=notice['notice_date'],
-                views=notice['views'],
-                external_url=notice['external_url'],
-                is_new=1
+        if detailed:
+            stmt = mysql_insert(Announcement.__table__).values(
+                [{**row, 'is_new': 1} for row in detailed]
             )
-            db.add(announcement)
+            db.execute(stmt.on_duplicate_key_update(
+                title=stmt.inserted.title,
+                category=stmt.inserted.category,
+                writer=stmt.inserted.writer,
+                notice_date=stmt.inserted.notice_date,
+                views=stmt.inserted.views,
+                external_url=stmt.inserted.external_url,
+                content=stmt.inserted.content,
+                content_hash=stmt.inserted.content_hash,
+                search_text=stmt.inserted.search_text,
+                updated_at=func.now(),
+            ))
+
+        if list_only:
+            stmt = mysql_insert(Announcement.__table__).values(
+                [{**row, 'is_new': 0} for row in list_only]
+            )
+            db.execute(stmt.on_duplicate_key_update(
+                title=stmt.inserted.title,
+                category=stmt.inserted.category,
+                writer=stmt.inserted.writer,
+                notice_date=stmt.inserted.notice_date,
+                views=stmt.inserted.views,
+                external_url=stmt.inserted.external_url,
+            ))
 
         db.commit()
-        print(f"총 {len(notices)}개 공지사항 저장 완료")
+        print(f"공지사항 upsert 완료: 본문 포함 {len(detailed)}개, 목록 정보 {len(list_only)}개")
     except Exception as e:
         print(f"DB 저장 오류: {e}")
         db.rollback()
+        raise
     finally:
         db.close()
 
 
-async def run_crawler():
-    """크롤러 실행"""
+async def run_crawler() -> Optional[Dict]:
+    """크롤러 실행 (실행별 수집/변경 건수와 소요 시간 반환)"""
     print("=" * 50)
-    print("선문대 공지사항 크롤링 시작")
+    print("선문대 공지사항 증분 크롤링 시작")
     print("=" * 50)
 
+    started = time.monotonic()
     try:
-        notices = await crawl_notices(max_pages=5)
-        if notices:
-            save_notices_to_db(notices)
-            print(f"크롤링 완료: 총 {len(notices)}개 공지")
-        else:
-            print("크롤링된 공지가 없습니다")
+        result = await crawl_notices()
+        stats = result['stats']
+
+        db_started = time.monotonic()
+        save_notices_to_db(result)
+        stats['db_seconds'] = round(time.monotonic() - db_started, 3)
+
+        # 변경이 있을 때만 공지사항 캐시 무효화
+        if result['new'] or result['changed'] or result['list_only']:
+            cache_delete_pattern("announcements:*")
+            refresh_search_index()
+
+        # 새 공지를 구독 매칭 후 푸시 아웃박스에 적재
+        if result['new']:
+            from app.services.notice_matcher import notify_new_notices
+            stats['subscription_pushes'] = notify_new_notices(result['new'])
+        stats['total_seconds'] = round(time.monotonic() - started, 3)
+
+        print(f"크롤링 완료: {stats}")
+        return result
     except Exception as e:
         print(f"크롤러 오류: {e}")
+        return None
 
 
 def sync_run_crawler():
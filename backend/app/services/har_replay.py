@@ -0,0 +1,192 @@
+"""
+HAR 재생(replay) 서버
+
+브라우저에서 저장한 HAR 파일의 응답을 그대로 돌려주는 ASGI 앱.
+학교 서버에 요청하지 않고 로그인/스크래핑 경로를 부하 테스트하거나
+벤치마크할 때 사용한다 (설정: UPSTREAM_REPLAY_URL, app/core/upstream.py).
+
+- 원래 호스트는 X-Replay-Host 헤더로 전달받는다 (없으면 첫 번째 호스트)
+- (호스트, 메서드, 경로+쿼리) 일치 → 없으면 (호스트, 메서드, 경로) 일치
+- 같은 키에 기록이 여러 개면 기록 순서대로 돌아가며 응답 (로그인 단계 재현)
+- Set-Cookie 값과 ASP.NET ViewState는 매 응답마다 같은 길이의 새 값으로 바꿔서
+  클라이언트가 기록된 세션 값에 의존하지 않게 한다
+"""
+import asyncio
+import base64
+import fnmatch
+import itertools
+import json
+import re
+import secrets
+import string
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+REPLAY_HOST_HEADER = "x-replay-host"
+
+# 재생 시 다시 계산되거나 의미가 없는 헤더
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+_TOKEN_CHARS = string.ascii_letters + string.digits
+_SET_COOKIE_VALUE_RE = re.compile(r'^([^=;\s]+)=([^;]*)')
+_VIEWSTATE_INPUT_RE = re.compile(
+    r'((?:name|id)="__(?:VIEWSTATE|EVENTVALIDATION)"[^>]*?value=")([^"]*)(")'
+)
+_VIEWSTATE_DELTA_RE = re.compile(r'(\|hiddenField\|__(?:VIEWSTATE|EVENTVALIDATION)\|)([^|]*)(\|)')
+
+
+def _token(length: int) -> str:
+    return "".join(secrets.choice(_TOKEN_CHARS) for _ in range(length))
+
+
+def template_set_cookie(header: str) -> str:
+    """쿠키 값만 같은 길이의 새 값으로 (속성은 유지)"""
+    match = _SET_COOKIE_VALUE_RE.match(header)
+    if not match or not match.group(2):
+        return header
+    return f"{match.group(1)}={_token(len(match.group(2)))}{header[match.end():]}"
+
+
+def template_viewstate(text: str) -> str:
+    """hidden input / AJAX delta의 ViewState 값을 같은 길이의 새 값으로 (delta 길이 필드 유지)"""
+    def replace(match):
+        return match.group(1) + _token(len(match.group(2))) + match.group(3)
+
+    text = _VIEWSTATE_INPUT_RE.sub(replace, text)
+    return _VIEWSTATE_DELTA_RE.sub(replace, text)
+
+
+class RecordedResponse:
+    """HAR 항목 하나의 응답"""
+
+    __slots__ = ("status", "headers", "body", "is_text", "time_ms")
+
+    def __init__(self, entry: dict):
+        response = entry["response"]
+        content = response.get("content") or {}
+        self.status = response.get("status") or 200
+        self.headers = [
+            (h["name"], h["value"]) for h in response.get("headers", [])
+            if h["name"].lower() not in _DROP_HEADERS and not h["name"].startswith(":")
+        ]
+        text = content.get("text") or ""
+        if content.get("encoding") == "base64":
+            self.body = base64.b64decode(text)
+            self.is_text = False
+        else:
+            self.body = text.encode("utf-8")
+            self.is_text = True
+        self.time_ms = float(entry.get("time") or 0)
+
+    def render(self) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+        body = self.body
+        if self.is_text and (b"__VIEWSTATE" in body or b"__EVENTVALIDATION" in body):
+            body = template_viewstate(body.decode("utf-8")).encode("utf-8")
+        headers = []
+        for name, value in self.headers:
+            if name.lower() == "set-cookie":
+                value = template_set_cookie(value)
+            headers.append((name.lower().encode("latin-1"), value.encode("latin-1", "replace")))
+        headers.append((b"content-length", str(len(body)).encode()))
+        return self.status, headers, body
+
+
+class HarStore:
+    """HAR 항목 색인 ((호스트, 메서드, 경로+쿼리) / (호스트, 메서드, 경로) → 응답 순환)"""
+
+    def __init__(self, entries: Iterable[dict], hosts: Optional[List[str]] = None):
+        self.hosts = hosts
+        exact: Dict[tuple, List[RecordedResponse]] = {}
+        by_path: Dict[tuple, List[RecordedResponse]] = {}
+        seen_hosts: List[str] = []
+        for entry in entries:
+            request = entry["request"]
+            if not entry["response"].get("status"):
+                continue  # 차단/취소된 요청
+            parts = urlsplit(request["url"])
+            host = parts.netloc.lower()
+            if hosts and not any(fnmatch.fnmatch(host, pattern) for pattern in hosts):
+                continue
+            if host not in seen_hosts:
+                seen_hosts.append(host)
+            recorded = RecordedResponse(entry)
+            method = request["method"].upper()
+            path = parts.path or "/"
+            target = path + (f"?{parts.query}" if parts.query else "")
+            exact.setdefault((host, method, target), []).append(recorded)
+            by_path.setdefault((host, method, path), []).append(recorded)
+
+        # 본문이 있는 기록을 우선 (브라우저 캐시로 본문이 빠진 항목 제외)
+        def cycle(responses: List[RecordedResponse]):
+            with_body = [r for r in responses if r.body] or responses
+            return itertools.cycle(with_body)
+
+        self._exact = {key: cycle(value) for key, value in exact.items()}
+        self._by_path = {key: cycle(value) for key, value in by_path.items()}
+        self.default_host = seen_hosts[0] if seen_hosts else ""
+        self.size = sum(len(value) for value in exact.values())
+
+    @classmethod
+    def from_files(cls, paths: Iterable[str], hosts: Optional[List[str]] = None) -> "HarStore":
+        entries: List[dict] = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                entries.extend(json.load(f)["log"]["entries"])
+        return cls(entries, hosts)
+
+    def lookup(self, host: str, method: str, target: str) -> Optional[RecordedResponse]:
+        host = (host or self.default_host).lower()
+        method = method.upper()
+        responses = self._exact.get((host, method, target))
+        if responses is None:
+            responses = self._by_path.get((host, method, target.split("?", 1)[0]))
+        return next(responses) if responses is not None else None
+
+
+def create_replay_app(store: HarStore, latency_ms: float = 0.0, recorded_timing: bool = False):
+    """
+    HAR 재생 ASGI 앱
+    - latency_ms: 모든 응답에 더할 고정 지연
+    - recorded_timing: HAR에 기록된 응답 시간만큼 지연 (실제 서버 지연 재현)
+    """
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        # 요청 본문은 매칭에 쓰지 않지만 끝까지 읽는다
+        more_body = True
+        while more_body:
+            message = await receive()
+            more_body = message.get("more_body", False)
+
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        target = scope.get("raw_path", scope["path"].encode()).decode("latin-1")
+        if scope.get("query_string"):
+            target += "?" + scope["query_string"].decode("latin-1")
+        host = headers.get(REPLAY_HOST_HEADER, "")
+        recorded = store.lookup(host, scope["method"], target)
+
+        if recorded is None:
+            print(f"[Replay] 기록 없음: {scope['method']} {host or store.default_host}{target}")
+            body = json.dumps({"detail": "recorded response not found", "host": host, "target": target}).encode()
+            status, response_headers = 404, [(b"content-type", b"application/json"),
+                                             (b"content-length", str(len(body)).encode())]
+        else:
+            delay = latency_ms + (recorded.time_ms if recorded_timing else 0.0)
+            if delay > 0:
+                await asyncio.sleep(delay / 1000)
+            status, response_headers, body = recorded.render()
+
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": body})
+
+    return app
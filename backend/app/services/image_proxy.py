@@ -0,0 +1,95 @@
+"""
+본문 이미지 프록시
+
+공지 본문의 이미지를 base64로 본문에 넣는 대신 한 번만 받아
+내용 주소 저장소(app/core/image_store.py)에 두고, 본문의 src를 프록시 URL로 바꾼다.
+- Canvas 공지: 사용자 쿠키로 받음 (같은 공지를 여는 다른 학생은 저장본 재사용)
+- 학교 공지(lily): 로그인 없이 받음, 삭제돼도 서빙 시점에 다시 받을 수 있음
+
+프록시 URL은 API 기준 상대 경로(/api/images/{sha256})이며
+프론트엔드가 API 주소를 붙여 표시한다 (lib/api.ts resolveImageProxyUrls).
+"""
+import asyncio
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.core import image_store
+from app.core.config import settings
+from app.core.upstream import upstream_client
+
+PROXY_PATH = "/api/images/"
+
+_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+# 같은 원본을 동시에 여러 요청이 받지 않도록 (프로세스 내)
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+def proxy_url(digest: str) -> str:
+    return f"{PROXY_PATH}{digest}"
+
+
+async def _download(client: httpx.AsyncClient, url: str, cookies: Optional[dict], public: bool, limiter) -> Optional[str]:
+    try:
+        if limiter:
+            await limiter.wait(url)
+        response = await client.get(url, headers=_HEADERS, cookies=cookies)
+    except Exception as e:
+        print(f"[ImageProxy] 이미지 다운로드 실패: {url}, {e}")
+        return None
+
+    content_type = response.headers.get('content-type', '').split(';')[0].strip()
+    if response.status_code != 200 or not content_type.startswith('image/'):
+        print(f"[ImageProxy] 이미지 아님/실패: {url} (status={response.status_code}, type={content_type})")
+        return None
+    if len(response.content) > settings.IMAGE_MAX_BYTES:
+        print(f"[ImageProxy] 이미지가 너무 큼: {url} ({len(response.content)} bytes)")
+        return None
+    # 파일 쓰기 + 용량 초과 시 LRU 정리(SQLite 합계 조회)는 이벤트 루프 밖에서
+    return await asyncio.to_thread(image_store.put, url, response.content, content_type, public)
+
+
+async def cache_image(
+    client: httpx.AsyncClient,
+    url: str,
+    cookies: Optional[dict] = None,
+    public: bool = False,
+    limiter=None
+) -> Optional[str]:
+    """원본 이미지 URL → 프록시 URL (받을 수 없으면 None, 원본 src 유지)"""
+    digest = image_store.lookup_source(url)
+    if digest is None:
+        task = _inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(_download(client, url, cookies, public, limiter))
+            _inflight[url] = task
+            task.add_done_callback(lambda _: _inflight.pop(url, None))
+        digest = await asyncio.shield(task)
+    return proxy_url(digest) if digest else None
+
+
+async def cache_images(
+    urls: List[str],
+    cookies: Optional[dict] = None,
+    public: bool = False,
+    client: Optional[httpx.AsyncClient] = None,
+    limiter=None
+) -> List[Optional[str]]:
+    """여러 이미지를 병렬로 프록시 URL로 (urls와 같은 순서)"""
+    if not urls:
+        return []
+    if client is not None:
+        return await asyncio.gather(*[cache_image(client, url, cookies, public, limiter) for url in urls])
+    async with upstream_client(verify=False, timeout=15.0) as own_client:
+        return await asyncio.gather(*[cache_image(own_client, url, cookies, public, limiter) for url in urls])
+
+
+async def refetch_public(digest: str) -> bool:
+    """LRU로 지워진 공개 이미지를 원본에서 다시 받기 (내용이 같을 때만 True)"""
+    url = image_store.public_source(digest)
+    if url is None:
+        return False
+    async with upstream_client(verify=False, timeout=15.0) as client:
+        restored = await _download(client, url, None, True, None)
+    return restored == digest
@@ -0,0 +1,217 @@
+"""
+공지사항 구독 매칭 서비스
+
+사용자별 키워드를 하나의 Aho-Corasick 오토마톤으로 합쳐
+새 공지 제목을 한 번만 훑어 모든 구독 키워드를 찾는다.
+- 키워드 → 구독자 집합만 바뀌는 경우(기존 키워드 구독 추가/삭제)는 재빌드 없음
+- 고유 키워드 집합이 바뀐 경우에만 다음 매칭 시점에 오토마톤 재빌드
+- 카테고리 구독은 정확히 일치하는 dict 조회
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+from app.core.database import SessionLocal
+from app.models.subscription import NoticeSubscription
+
+
+def normalize(text: str) -> str:
+    """매칭용 정규화 (대소문자 무시)"""
+    return (text or "").casefold()
+
+
+class AhoCorasick:
+    """다중 패턴 문자열 매칭 오토마톤"""
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[str, ...]] = [()]
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str):
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        self._out[node] = self._out[node] + (pattern,)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def search(self, text: str) -> Set[str]:
+        """text에 포함된 패턴 집합 반환"""
+        found: Set[str] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+class SubscriptionIndex:
+    """키워드/카테고리 구독 인덱스 (프로세스 내)"""
+
+    def __init__(self):
+        self.keyword_users: Dict[str, Set[int]] = {}
+        self.category_users: Dict[str, Set[int]] = {}
+        self._automaton = AhoCorasick()
+        self._dirty = False
+
+    def add(self, user_id: int, kind: str, value: str):
+        if kind == "keyword":
+            key = normalize(value)
+            if key not in self.keyword_users:
+                self.keyword_users[key] = set()
+                self._dirty = True
+            self.keyword_users[key].add(user_id)
+        elif kind == "category":
+            self.category_users.setdefault(value, set()).add(user_id)
+
+    def remove(self, user_id: int, kind: str, value: str):
+        if kind == "keyword":
+            key = normalize(value)
+            users = self.keyword_users.get(key)
+            if users is not None:
+                users.discard(user_id)
+                if not users:
+                    del self.keyword_users[key]
+                    self._dirty = True
+        elif kind == "category":
+            users = self.category_users.get(value)
+            if users is not None:
+                users.discard(user_id)
+                if not users:
+                    del self.category_users[value]
+
+    def entries(self) -> Set[Tuple[int, str, str]]:
+        """현재 인덱스의 (user_id, kind, value) 집합"""
+        result = set()
+        for key, users in self.keyword_users.items():
+            result.update((u, "keyword", key) for u in users)
+        for value, users in self.category_users.items():
+            result.update((u, "category", value) for u in users)
+        return result
+
+    def sync(self, rows: Iterable[Tuple[int, str, str]]) -> Tuple[int, int]:
+        """DB 구독 목록과의 차이만 반영 (추가 수, 삭제 수)"""
+        target = {
+            (user_id, kind, normalize(value) if kind == "keyword" else value)
+            for user_id, kind, value in rows
+        }
+        current = self.entries()
+        added = target - current
+        removed = current - target
+        for user_id, kind, value in removed:
+            self.remove(user_id, kind, value)
+        for user_id, kind, value in added:
+            self.add(user_id, kind, value)
+        return len(added), len(removed)
+
+    def _ensure_automaton(self):
+        if self._dirty:
+            self._automaton = AhoCorasick(self.keyword_users.keys())
+            self._dirty = False
+
+    def match(self, notices: List[Dict]) -> Dict[int, List[Dict]]:
+        """공지 목록 매칭 → user_id별 매칭 공지 리스트"""
+        self._ensure_automaton()
+        matches: Dict[int, Dict[int, Dict]] = {}
+        for notice in notices:
+            users: Set[int] = set()
+            for keyword in self._automaton.search(normalize(notice.get("title", ""))):
+                users |= self.keyword_users.get(keyword, set())
+            users |= self.category_users.get(notice.get("category"), set())
+            for user_id in users:
+                matches.setdefault(user_id, {})[notice["notice_no"]] = notice
+        return {user_id: list(found.values()) for user_id, found in matches.items()}
+
+
+# 프로세스 전역 인덱스 (구독 API에서 증분 반영, 크롤러 실행 시 DB와 동기화)
+subscription_index = SubscriptionIndex()
+
+
+def sync_subscription_index(db) -> Tuple[int, int]:
+    """DB의 구독 목록으로 인덱스 동기화 (다른 워커에서 변경된 구독 반영)"""
+    rows = db.query(
+        NoticeSubscription.user_id,
+        NoticeSubscription.kind,
+        NoticeSubscription.value
+    ).all()
+    return subscription_index.sync((r.user_id, r.kind, r.value) for r in rows)
+
+
+def build_user_messages(matches: Dict[int, List[Dict]]) -> Dict[Tuple[str, str, str], List[int]]:
+    """사용자별 매칭 결과를 푸시 메시지로 묶음 → {(title, content, dedupe_key): [user_id, ...]}"""
+    messages: Dict[Tuple[str, str, str], List[int]] = {}
+    for user_id, notices in matches.items():
+        notices = sorted(notices, key=lambda n: n["notice_no"], reverse=True)
+        if len(notices) == 1:
+            title = "📢 관심 공지가 올라왔어요"
+            content = notices[0]["title"]
+        else:
+            title = f"📢 관심 공지 {len(notices)}건이 올라왔어요"
+            content = f"{notices[0]['title']} 외 {len(notices) - 1}건"
+        dedupe_key = "notice-sub:" + ",".join(str(n["notice_no"]) for n in notices)
+        messages.setdefault((title, content, dedupe_key), []).append(user_id)
+    return messages
+
+
+def notify_new_notices(notices: List[Dict]) -> int:
+    """새 공지를 구독 매칭 후 사용자별 묶음 푸시로 아웃박스에 적재"""
+    from app.models.user import User
+    from app.services.push import enqueue_push
+
+    if not notices:
+        return 0
+
+    db = SessionLocal()
+    try:
+        added, removed = sync_subscription_index(db)
+        if added or removed:
+            print(f"[Subscription] 인덱스 동기화: +{added} / -{removed}")
+
+        matches = subscription_index.match(notices)
+        if not matches:
+            return 0
+
+        student_ids = dict(db.query(User.id, User.student_id).filter(
+            User.id.in_(list(matches.keys()))
+        ).all())
+
+        queued = 0
+        for (title, content, dedupe_key), user_ids in build_user_messages(matches).items():
+            targets = [student_ids[u] for u in user_ids if u in student_ids]
+            queued += enqueue_push(db, targets, title, content, dedupe_key=dedupe_key)
+
+        print(f"[Subscription] 새 공지 {len(notices)}건 → {len(matches)}명 매칭, {queued}건 적재")
+        return queued
+    except Exception as e:
+        print(f"[Subscription] 구독 알림 오류: {e}")
+        db.rollback()
+        return 0
+    finally:
+        db.close()
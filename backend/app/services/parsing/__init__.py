@@ -0,0 +1,42 @@
+"""
+스크래핑 페이지 파싱 레이어 (lxml.html + 미리 컴파일한 XPath/정규식)
+
+스크래퍼는 run_parser로 파서를 호출한다 (큰 페이지는 프로세스 풀에서 파싱)
+"""
+from app.services.parsing.core import get_text, has_class, outer_html, parse_html
+from app.services.parsing.cafeteria import extract_menu_items, parse_menu_html
+from app.services.parsing.content import fill_image_placeholders, parse_announcement_page, parse_notice_body
+from app.services.parsing.executor import parsing_stats, run_parser, shutdown_parse_pool, start_parse_pool
+from app.services.parsing.mileage import find_mileage_values
+from app.services.parsing.notices import extract_form_data, parse_notice_date, parse_notice_page, parse_notices
+from app.services.parsing.shuttle import clean_text, format_notice, parse_departures, parse_shuttle_page
+from app.services.parsing.syllabus import parse_syllabus_html
+from app.services.parsing.timetable import merge_consecutive_classes, parse_timetable
+
+__all__ = [
+    "get_text",
+    "has_class",
+    "outer_html",
+    "parse_html",
+    "extract_menu_items",
+    "parse_menu_html",
+    "fill_image_placeholders",
+    "parse_announcement_page",
+    "parse_notice_body",
+    "parsing_stats",
+    "run_parser",
+    "shutdown_parse_pool",
+    "start_parse_pool",
+    "find_mileage_values",
+    "extract_form_data",
+    "parse_notice_date",
+    "parse_notice_page",
+    "parse_notices",
+    "clean_text",
+    "format_notice",
+    "parse_departures",
+    "parse_shuttle_page",
+    "parse_syllabus_html",
+    "merge_consecutive_classes",
+    "parse_timetable",
+]
@@ -0,0 +1,114 @@
+"""
+식단 페이지 파싱
+
+학교 식단표는 행 닫는 태그 대신 <tr>을 쓰는 등 태그가 깨져 있는데,
+lxml(libxml2)은 열린 행을 자동으로 닫아 주므로 정규식 전처리 없이 한 번에 파싱한다.
+"""
+import re
+from typing import List
+
+from lxml import etree
+
+from app.services.parsing.core import first, get_text, has_class, parse_html
+
+_DATE_RE = re.compile(r'\d{2}\.\d{2}')
+
+_OPERATING_INFO = etree.XPath(f"(//ul[{has_class('bu_dot')}])[1]//li")
+_TABLE = etree.XPath("(//table)[1]")
+_DATE_SPAN = etree.XPath(f"(//span[{has_class('tit_day')}])[1]")
+_THEAD_ROWS = etree.XPath("(.//thead)[1]//tr")
+_TBODY = etree.XPath("(.//tbody)[1]")
+_ROWS = etree.XPath(".//tr")
+_HEADER_CELLS = etree.XPath(".//th")
+_FIRST_CELL = etree.XPath("(.//th | .//td)[1]")
+_MENU_CELLS = etree.XPath(".//td")
+
+
+def _collect_menu_text(element, items: List[List[str]]):
+    for child in element:
+        if child.tag == "br":
+            items.append([])
+        elif isinstance(child.tag, str) and child.tag not in ("script", "style", "template"):
+            if child.text:
+                items[-1].append(child.text)
+            _collect_menu_text(child, items)
+        if child.tail:
+            items[-1].append(child.tail)
+
+
+def extract_menu_items(cell) -> List[str]:
+    """셀에서 메뉴 항목 추출 (br 태그로 구분)"""
+    items: List[List[str]] = [[cell.text] if cell.text else []]
+    _collect_menu_text(cell, items)
+    result = []
+    for parts in items:
+        item = "".join(parts).strip()
+        if item:
+            result.append(item)
+    return result
+
+
+def parse_menu_html(html: str) -> dict:
+    """식단 HTML 파싱"""
+    doc = parse_html(html)
+
+    result = {
+        "cafeteria_name": "",
+        "operating_info": [],
+        "date_range": "",
+        "menu_categories": [],
+        "daily_menus": []
+    }
+
+    # 운영 정보 추출
+    for li in _OPERATING_INFO(doc):
+        text = get_text(li, strip=True)
+        if text:
+            result["operating_info"].append(text)
+
+    # 테이블 파싱
+    table = first(_TABLE(doc))
+    if table is None:
+        return result
+
+    # 날짜 범위 추출
+    date_span = first(_DATE_SPAN(doc))
+    if date_span is not None:
+        result["date_range"] = get_text(date_span, strip=True)
+
+    # thead에서 카테고리 추출 ('일자' 헤더가 있는 행)
+    for row in _THEAD_ROWS(table):
+        ths = _HEADER_CELLS(row)
+        if ths and get_text(ths[0], strip=True) == '일자':
+            for th in ths[1:]:
+                cat_text = get_text(th, strip=True)
+                if cat_text:
+                    result["menu_categories"].append(cat_text)
+            break
+
+    # tbody에서 일별 메뉴 추출
+    tbody = first(_TBODY(table))
+    rows = _ROWS(tbody if tbody is not None else table)
+
+    for row in rows:
+        # 첫 번째 셀에서 날짜 찾기
+        first_cell = first(_FIRST_CELL(row))
+        if first_cell is None:
+            continue
+
+        date_text = get_text(first_cell, strip=True)
+
+        # 날짜 형식 확인 (예: "03.02 (월)" 또는 "03.02(월)")
+        if not _DATE_RE.match(date_text):
+            continue
+
+        menu_cells = _MENU_CELLS(row)
+        if not menu_cells:
+            continue
+
+        result["daily_menus"].append({
+            "date": date_text,
+            "menus": [extract_menu_items(td) for td in menu_cells]
+        })
+
+    return result
@@ -0,0 +1,125 @@
+"""
+공지 본문 HTML 정리 (Canvas 공지 상세, lily 공지 상세)
+
+본문은 HTML 그대로 앱에 내려가므로 기존 출력과 같도록 BeautifulSoup으로 정리한다.
+이미지 프록시 저장(cache_images)은 비동기 작업이라 파싱과 분리한다.
+- 파싱 함수는 프록시할 이미지 src를 자리표시자로 바꾸고 원래 주소 목록을 함께 반환
+- 호출한 쪽에서 이미지를 저장한 뒤 fill_image_placeholders로 자리표시자를 채운다
+파싱 함수는 실행기(run_parser)로 프로세스 풀에 보낼 수 있도록 str/dict만 주고받는다.
+"""
+import html as html_lib
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+CANVAS_ORIGIN = "https://canvas.sunmoon.ac.kr"
+LILY_ORIGIN = "https://lily.sunmoon.ac.kr"
+
+_PLACEHOLDER = "__proxied_image_{}__"
+
+
+def fill_image_placeholders(content: str, srcs: List[str], proxied: List[Optional[str]]) -> str:
+    """자리표시자를 프록시 URL로 (저장 실패한 이미지는 원래 주소)"""
+    for i, (src, url) in enumerate(zip(srcs, proxied)):
+        content = content.replace(_PLACEHOLDER.format(i), html_lib.escape(url or src, quote=True))
+    return content
+
+
+def parse_announcement_page(html: str) -> Dict[str, object]:
+    """Canvas 공지사항 상세 페이지 → 제목/작성자/과목명/본문 + 프록시할 Canvas 이미지 주소 (images)"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    result = {
+        'title': '',
+        'author': '',
+        'course_name': '',
+        'content': '',
+        'posted_at': '',
+        'images': [],
+    }
+
+    # 제목 추출
+    title_el = soup.find('h1', class_='discussion-title')
+    if title_el:
+        result['title'] = title_el.get_text(strip=True)
+
+    # 작성자 추출
+    author_el = soup.find('a', class_='author')
+    if author_el:
+        result['author'] = author_el.get_text(strip=True)
+
+    # 과목명 추출 (breadcrumb에서)
+    breadcrumb = soup.find('nav', id='breadcrumbs')
+    if breadcrumb:
+        links = breadcrumb.find_all('a')
+        if len(links) >= 2:
+            result['course_name'] = links[1].get_text(strip=True)
+
+    # 내용 추출 - enhanced 클래스가 있는 message div 찾기
+    content_el = soup.find('div', class_='message user_content enhanced')
+    if not content_el:
+        # fallback: 일반 message div
+        content_el = soup.find('div', class_='message user_content')
+
+    if content_el:
+        images = result['images']
+        for img in content_el.find_all('img'):
+            src = img.get('src', '')
+            if src:
+                if src.startswith('/'):
+                    src = f"{CANVAS_ORIGIN}{src}"
+                if 'canvas.sunmoon.ac.kr' in src:
+                    # Canvas 이미지는 사용자 쿠키로 받아 프록시 URL로 바꿀 자리
+                    img['src'] = _PLACEHOLDER.format(len(images))
+                    images.append(src)
+                img['style'] = 'max-width: 100%; height: auto;'
+
+        # 링크를 새 탭에서 열리도록 처리
+        for link in content_el.find_all('a'):
+            href = link.get('href', '')
+            if href and not href.startswith('#'):
+                # 상대 경로를 절대 경로로 변환
+                if href.startswith('/'):
+                    link['href'] = f"{CANVAS_ORIGIN}{href}"
+                # 새 탭에서 열리도록 설정
+                link['target'] = '_blank'
+                link['rel'] = 'noopener noreferrer'
+
+        result['content'] = str(content_el)
+
+    return result
+
+
+def _absolute_lily_url(url: str) -> str:
+    if url.startswith('/'):
+        return f"{LILY_ORIGIN}{url}"
+    return f"{LILY_ORIGIN}/{url}"
+
+
+def parse_notice_body(html: str) -> Tuple[Optional[str], List[str]]:
+    """lily 공지 상세 페이지 → (본문 HTML, 프록시할 학교 서버 이미지 주소), 본문이 없으면 (None, [])"""
+    soup = BeautifulSoup(html, 'lxml')
+
+    # 본문 내용 추출 (view_con 클래스)
+    content_td = soup.find('td', class_='view_con')
+    if not content_td:
+        return None, []
+
+    # 이미지 src를 절대 경로로 변환
+    images = []
+    for img in content_td.find_all('img'):
+        src = img.get('src', '')
+        if src and not src.startswith('http'):
+            img['src'] = src = _absolute_lily_url(src)
+        if urlparse(src).netloc.endswith('sunmoon.ac.kr'):
+            img['src'] = _PLACEHOLDER.format(len(images))
+            images.append(src)
+
+    # 링크도 절대 경로로 변환
+    for a in content_td.find_all('a'):
+        href = a.get('href', '')
+        if href and not href.startswith('http') and not href.startswith('mailto:'):
+            a['href'] = _absolute_lily_url(href)
+
+    return str(content_td.decode_contents()), images
@@ -0,0 +1,72 @@
+"""
+lxml 기반 공통 파싱 도구
+
+- parse_html: 문서를 한 번만 파싱 (이미 파싱된 요소는 그대로 통과)
+- XPath는 모듈 로드 시 컴파일해 재사용
+- 텍스트 추출은 BeautifulSoup get_text와 같은 규칙
+  (주석, script/style/template 내용 제외)
+"""
+from typing import List, Optional, Union
+
+import lxml.html
+from lxml import etree
+
+Document = lxml.html.HtmlElement
+
+_SKIP_TAGS = ("script", "style", "template")
+
+# 텍스트 노드 (script/style/template 안은 제외)
+_TEXT = etree.XPath(
+    "descendant-or-self::text()[not(ancestor::script or ancestor::style or ancestor::template)]",
+    smart_strings=False
+)
+# 하위에 제외할 태그가 없을 때 쓰는 빠른 경로 (대부분의 셀/행)
+_ALL_TEXT = etree.XPath("descendant-or-self::text()", smart_strings=False)
+
+
+def parse_html(html: Union[str, bytes, Document, None]) -> Document:
+    """HTML 문서 파싱 (빈 문서도 <html> 루트 반환)"""
+    if isinstance(html, lxml.html.HtmlElement):
+        return html
+    if not html or not html.strip():
+        return lxml.html.document_fromstring("<html></html>")
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # <?xml encoding=...?> 선언이 있는 str은 bytes로 파싱
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+    except etree.ParserError:
+        # 주석/공백만 있는 문서
+        return lxml.html.document_fromstring("<html></html>")
+
+
+def has_class(name: str) -> str:
+    """class 속성에 name이 포함된 요소를 고르는 XPath 조건식"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def strings(element) -> List[str]:
+    """요소 안의 텍스트 노드 목록 (문서 순서)"""
+    if next(element.iter(*_SKIP_TAGS), None) is None:
+        return _ALL_TEXT(element)
+    return _TEXT(element)
+
+
+def get_text(element, separator: str = "", strip: bool = False) -> str:
+    """BeautifulSoup get_text와 같은 결과"""
+    texts = strings(element)
+    if strip:
+        texts = [text.strip() for text in texts]
+        texts = [text for text in texts if text]
+    return separator.join(texts)
+
+
+def first(nodes: list):
+    return nodes[0] if nodes else None
+
+
+def outer_html(element: Optional[Document]) -> str:
+    """요소 자신을 포함한 HTML (뒤따르는 tail 텍스트 제외)"""
+    if element is None:
+        return ""
+    return lxml.html.tostring(element, encoding="unicode", with_tail=False)
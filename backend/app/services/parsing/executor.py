@@ -0,0 +1,188 @@
+"""
+파싱 실행기 (큰 페이지는 프로세스 풀에서 파싱)
+
+스크래퍼는 async 핸들러 안에서 응답을 바로 파싱하므로, 큰 페이지 하나가
+이벤트 루프를 수십 ms 붙잡아 같은 워커의 다른 요청/WebSocket이 함께 밀린다.
+- PARSE_INLINE_MAX_BYTES 미만: 지금처럼 이벤트 루프에서 바로 파싱 (풀 왕복 비용이 더 큼)
+- 그 이상: 프로세스 풀(PARSE_POOL_WORKERS, 0이면 CPU 코어 수)에서 파싱
+- 풀을 쓸 수 없으면(깨짐, 종료 후) 인라인으로 파싱하고 풀은 다음 호출에서 다시 만든다
+
+풀로 보내는 함수는 모듈 최상위 함수여야 하고(피클), 인자와 반환값도 피클 가능해야 한다.
+lxml 요소처럼 피클할 수 없는 값 대신 dict/list/str을 주고받는다.
+워커 프로세스는 spawn으로 만들어 부모의 스레드/DB 연결을 물려받지 않는다.
+
+통계: GET /api/admin/parsing/stats (파서별 파싱 시간 히스토그램, 대기 중인 파싱 수)
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+# 파싱 시간 히스토그램 구간 상한 (ms), 마지막 구간은 그 이상
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+# 풀에 보냈지만 아직 끝나지 않은 파싱 수 (워커 수를 넘는 만큼은 풀 큐에서 대기)
+_pending = 0
+
+parse_stats = {
+    "pending_max": 0,
+    "fallback": 0,  # 풀을 쓸 수 없어 인라인으로 파싱한 수
+    "parsers": {},  # 파서 이름 -> {"inline": 히스토그램, "pool": 히스토그램}
+}
+
+
+def _histogram() -> dict:
+    return {
+        "count": 0,
+        "bytes": 0,
+        "total_ms": 0.0,
+        "max_ms": 0.0,
+        "buckets": [0] * (len(HISTOGRAM_BUCKETS_MS) + 1),
+        "queue_ms": 0.0,  # 풀: 보낸 시각부터 워커가 파싱을 시작하기까지 (피클/전송 포함)
+    }
+
+
+def _record(name: str, mode: str, size: int, parse_ms: float, queue_ms: float = 0.0):
+    histograms = parse_stats["parsers"].setdefault(name, {"inline": _histogram(), "pool": _histogram()})
+    histogram = histograms[mode]
+    histogram["count"] += 1
+    histogram["bytes"] += size
+    histogram["total_ms"] += parse_ms
+    histogram["max_ms"] = max(histogram["max_ms"], parse_ms)
+    histogram["buckets"][bisect_right(HISTOGRAM_BUCKETS_MS, parse_ms)] += 1
+    histogram["queue_ms"] += queue_ms
+
+
+def _timed(func: Callable, html: str, args: tuple) -> Tuple[object, float, float]:
+    """워커 프로세스에서 실행: (결과, 시작 시각, 파싱 시간 ms)"""
+    started = time.time()
+    perf_started = time.perf_counter()
+    result = func(html, *args)
+    return result, started, (time.perf_counter() - perf_started) * 1000
+
+
+def _noop() -> int:
+    return os.getpid()
+
+
+def _pool_size() -> int:
+    return settings.PARSE_POOL_WORKERS or os.cpu_count() or 1
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=_pool_size(), mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def _discard_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def start_parse_pool():
+    """
+    파싱 프로세스 하나를 미리 띄움 (서버 시작 시, 첫 큰 페이지가 프로세스 생성 비용을 내지 않도록)
+    나머지는 큰 페이지가 동시에 몰릴 때 풀이 필요한 만큼 PARSE_POOL_WORKERS까지 늘린다
+    (gunicorn 워커마다 풀이 따로 있으므로 처음부터 코어 수만큼 띄우지 않음)
+    """
+    if settings.PARSE_INLINE_MAX_BYTES < 0:
+        return
+    _get_pool().submit(_noop)
+    print(f"[Parsing] 파싱 프로세스 풀 시작 (최대 {_pool_size()}개, {settings.PARSE_INLINE_MAX_BYTES // 1024}KB 이상)")
+
+
+def shutdown_parse_pool():
+    """프로세스 풀 종료 (서버 종료 시)"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+def _run_inline(func: Callable, html: str, args: tuple, size: int):
+    started = time.perf_counter()
+    result = func(html, *args)
+    _record(func.__name__, "inline", size, (time.perf_counter() - started) * 1000)
+    return result
+
+
+def _run_fallback(func: Callable, html: str, args: tuple, size: int, error: Exception):
+    """풀을 쓸 수 없음 → 이번 파싱은 인라인, 풀은 다음 호출에서 다시 생성"""
+    print(f"[Parsing] 프로세스 풀 사용 불가, 인라인 파싱: {func.__name__} ({error})")
+    parse_stats["fallback"] += 1
+    _discard_pool()
+    return _run_inline(func, html, args, size)
+
+
+async def run_parser(func: Callable, html: Optional[str], *args):
+    """
+    func(html, *args) 실행 - 작은 페이지는 이벤트 루프에서, 큰 페이지는 프로세스 풀에서
+    PARSE_INLINE_MAX_BYTES가 음수면 풀을 쓰지 않는다
+    """
+    global _pending
+    html = html or ""
+    size = len(html)  # 문자 수 (한글 페이지는 바이트보다 작게 잡히지만 판단용으로 충분)
+    if settings.PARSE_INLINE_MAX_BYTES < 0 or size < settings.PARSE_INLINE_MAX_BYTES:
+        return _run_inline(func, html, args, size)
+
+    loop = asyncio.get_running_loop()
+    submitted = time.time()
+    _pending += 1
+    parse_stats["pending_max"] = max(parse_stats["pending_max"], _pending)
+    try:
+        try:
+            future = loop.run_in_executor(_get_pool(), _timed, func, html, args)
+        except (BrokenProcessPool, RuntimeError) as e:
+            # 깨졌거나 종료 중인 풀에는 제출할 수 없음
+            return _run_fallback(func, html, args, size, e)
+        try:
+            result, started, parse_ms = await future
+        except BrokenProcessPool as e:
+            # 파싱 중 워커가 죽음 (파서가 낸 예외는 RuntimeError 포함 그대로 전파)
+            return _run_fallback(func, html, args, size, e)
+    finally:
+        _pending -= 1
+    _record(func.__name__, "pool", size, parse_ms, max(0.0, (started - submitted) * 1000))
+    return result
+
+
+def parsing_stats() -> Dict[str, object]:
+    """파서별 파싱 시간 히스토그램과 풀 대기 상태 (이 워커 기준)"""
+    parsers = {}
+    for name, histograms in parse_stats["parsers"].items():
+        parsers[name] = {}
+        for mode, histogram in histograms.items():
+            count = histogram["count"]
+            if not count:
+                continue
+            labels = [f"<{bound}ms" for bound in HISTOGRAM_BUCKETS_MS] + [f">={HISTOGRAM_BUCKETS_MS[-1]}ms"]
+            parsers[name][mode] = {
+                "count": count,
+                "avg_kb": round(histogram["bytes"] / count / 1024, 1),
+                "avg_ms": round(histogram["total_ms"] / count, 2),
+                "max_ms": round(histogram["max_ms"], 2),
+                "avg_queue_ms": round(histogram["queue_ms"] / count, 2),
+                "histogram": dict(zip(labels, histogram["buckets"])),
+            }
+    return {
+        "pool_workers": _pool_size(),
+        "pool_running": _pool is not None,
+        "inline_max_bytes": settings.PARSE_INLINE_MAX_BYTES,
+        "pending": _pending,
+        "queued": max(0, _pending - _pool_size()),
+        "pending_max": parse_stats["pending_max"],
+        "fallback": parse_stats["fallback"],
+        "parsers": parsers,
+    }
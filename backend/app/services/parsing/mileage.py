@@ -0,0 +1,47 @@
+"""
+folio 장학 마일리지 페이지 파싱
+"""
+from typing import List, Optional
+
+from lxml import etree
+
+from app.services.parsing.core import first, get_text, has_class, parse_html
+
+MILEAGE_COLUMNS = 19  # S 5 + T 3 + A 6 + R 4 + 합계 1
+
+_TBODY_FIRST_ROW = etree.XPath("(//tbody[@id='tbMileageList'])[1]/descendant::tr[1]")
+_CENTERED_CELLS = etree.XPath(f"//td[{has_class('a_C')}]")
+_ROWS = etree.XPath("//tr")
+_CELLS = etree.XPath(".//td")
+
+
+def _value(td) -> int:
+    try:
+        return int(get_text(td, strip=True))
+    except ValueError:
+        return 0
+
+
+def find_mileage_values(html: str) -> Optional[List[int]]:
+    """마일리지 표의 19개 값 (S/T/A/R 항목 + 합계 순서), 표가 없으면 None"""
+    doc = parse_html(html)
+
+    # 방법 1: tbody id='tbMileageList'의 첫 행
+    tr = first(_TBODY_FIRST_ROW(doc))
+    if tr is not None:
+        tds = _CELLS(tr)
+        if len(tds) >= MILEAGE_COLUMNS:
+            return [_value(td) for td in tds[:MILEAGE_COLUMNS]]
+
+    # 방법 2: class='a_C'인 td들 직접 찾기
+    tds = _CENTERED_CELLS(doc)
+    if len(tds) >= MILEAGE_COLUMNS:
+        return [_value(td) for td in tds[:MILEAGE_COLUMNS]]
+
+    # 방법 3: 모든 tr에서 td 19개 이상 있는 행 찾기
+    for tr in _ROWS(doc):
+        tds = _CELLS(tr)
+        if len(tds) >= MILEAGE_COLUMNS:
+            return [_value(td) for td in tds[:MILEAGE_COLUMNS]]
+
+    return None
@@ -0,0 +1,125 @@
+"""
+공지사항 목록 페이지 파싱
+
+크롤러는 목록 페이지마다 공지 목록과 다음 페이지 요청용 ASP.NET 폼 데이터를
+모두 읽으므로, parse_html 결과를 두 함수에 같이 넘겨 한 번만 파싱한다.
+"""
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from app.services.parsing.core import Document, first, get_text, has_class, parse_html
+
+VIEW_URL = "https://lily.sunmoon.ac.kr/Page2/Story/Notice_view.aspx"
+
+HIDDEN_FIELDS = (
+    '__VIEWSTATE', '__VIEWSTATEGENERATOR', '__EVENTVALIDATION',
+    '__SCROLLPOSITIONX', '__SCROLLPOSITIONY',
+    'ctl00$ContentPlaceHolder_Main$BoardList$hidBoardCode',
+    'ctl00$ContentPlaceHolder_Main$BoardList$txtSearch',
+    'ctl00$ContentPlaceHolder_Main$BoardList$pagPager$hidItemTotal',
+    'ctl00$ContentPlaceHolder_Main$BoardList$pagPager$hidCurPage',
+    'ctl00$ContentPlaceHolder_Main$BoardList$pagPager$hidItemInOnePage',
+    'ctl00$ContentPlaceHolder_Main$BoardList$pagPager$hidPagesInScreen'
+)
+
+_DATE_RE = re.compile(r'(\d{4})[.\-/](\d{1,2})[.\-/](\d{1,2})')
+_NO_RE = re.compile(r'no=(\d+)')
+_CP_RE = re.compile(r'cp=(\d+)')
+
+_NAMED_INPUTS = etree.XPath("//input[@name]")
+_LIST_ROWS = etree.XPath(f"(//div[{has_class('table_list')}])[1]/descendant::tbody[1]//tr")
+_COLUMNS = etree.XPath(".//td")
+_CATEGORY = etree.XPath(f"(.//span[{has_class('cate')}])[1]")
+_LINK = etree.XPath("(.//a)[1]")
+
+
+def parse_notice_date(text: str) -> Optional[date]:
+    """목록의 날짜 문자열 (2026-03-01 / 2026.03.01 / 2026/03/01) → date"""
+    match = _DATE_RE.search(text or '')
+    if not match:
+        return None
+    try:
+        return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    except ValueError:
+        return None
+
+
+def extract_form_data(html) -> Dict[str, str]:
+    """HTML(또는 parse_html 결과)에서 ASP.NET 폼 데이터 추출"""
+    doc: Document = parse_html(html)
+
+    found: Dict[str, str] = {}
+    for element in _NAMED_INPUTS(doc):
+        name = element.get('name')
+        if name in HIDDEN_FIELDS and name not in found:
+            found[name] = element.get('value', '')
+
+    return {field: found[field] for field in HIDDEN_FIELDS if field in found}
+
+
+def parse_notices(html) -> List[Dict]:
+    """HTML(또는 parse_html 결과)에서 공지사항 목록 파싱"""
+    doc: Document = parse_html(html)
+    notices = []
+
+    for row in _LIST_ROWS(doc):
+        cols = _COLUMNS(row)
+        if len(cols) < 6:
+            continue
+
+        try:
+            # 번호
+            num_text = get_text(cols[0], strip=True)
+            if not num_text.isdigit():
+                continue
+            notice_no = int(num_text)
+
+            # 카테고리
+            category_span = first(_CATEGORY(cols[1]))
+            category = get_text(category_span, strip=True) if category_span is not None else "일반"
+
+            # 제목과 링크
+            title_link = first(_LINK(cols[2]))
+            if title_link is None:
+                continue
+
+            title = get_text(title_link, strip=True)
+            href = title_link.get('href', '')
+
+            # URL에서 no와 cp 파라미터 추출
+            no_match = _NO_RE.search(href)
+            cp_match = _CP_RE.search(href)
+
+            if no_match:
+                external_url = f"{VIEW_URL}?no={no_match.group(1)}"
+                if cp_match:
+                    external_url += f"&cp={cp_match.group(1)}"
+            else:
+                external_url = f"https://lily.sunmoon.ac.kr{href}" if href.startswith('/') else href
+
+            # 조회수
+            views_text = get_text(cols[5], strip=True)
+
+            notices.append({
+                'notice_no': notice_no,
+                'title': title,
+                'category': category,
+                'writer': get_text(cols[3], strip=True),
+                'notice_date': parse_notice_date(get_text(cols[4], strip=True)),
+                'views': int(views_text) if views_text.isdigit() else 0,
+                'external_url': external_url
+            })
+        except Exception as e:
+            print(f"공지 파싱 오류: {e}")
+            continue
+
+    return notices
+
+
+def parse_notice_page(html: str) -> Tuple[List[Dict], Dict[str, str]]:
+    """목록 페이지 한 장 → (공지 목록, 다음 페이지 폼 데이터) - 실행기로 보낼 때 쓰는 묶음"""
+    doc = parse_html(html)
+    return parse_notices(doc), extract_form_data(doc)
@@ -0,0 +1,210 @@
+"""
+셔틀버스 시간표 페이지 파싱
+"""
+import re
+from typing import Dict, List, Tuple
+
+from lxml import etree
+
+from app.services.parsing.core import first, get_text, has_class, outer_html, parse_html
+
+_SPACE_RE = re.compile(r'\s+')
+_HOLIDAY_RE = re.compile(r'\*[^*\n]+')
+_DASH_RE = re.compile(r'-\s*[^-\n]+')
+_TIME_RE = re.compile(r'(\d{1,2})\s*[:;]\s*(\d{2})')
+
+_GRAY_BOX = etree.XPath(f"(//div[{has_class('grayBox')}])[1]")
+_GRAY_BOX_TITLE = etree.XPath(f"(.//h4[{has_class('title22')}])[1]")
+_GRAY_BOX_LINES = etree.XPath(f".//p[{has_class('blue_gray')}]")
+_TABLE_DIV_TABLES = etree.XPath(f"(//div[{has_class('table_type2')}])[1]//table")
+_HAS_ROWS = etree.XPath("boolean(.//thead | .//tbody | .//tr)")
+_CONTENT_DIV = etree.XPath("(//div[@id='tabcontent22'])[1]")
+_SHUTTLE_WRAP = etree.XPath(f"(//div[{has_class('shuttle_wrap')}])[1]")
+_NOTICE_DIVS = etree.XPath(f".//div[{has_class('mgT30')}]")
+_HAS_TABLE = etree.XPath("boolean(.//table)")
+_TABLE = etree.XPath("(//table)[1]")
+_ROWS = etree.XPath(".//tr")
+_CELLS = etree.XPath(".//th | .//td")
+_IN_THEAD = etree.XPath("boolean(ancestor::thead)")
+_HAS_TD = etree.XPath("boolean(.//td)")
+
+
+def clean_text(text: str) -> str:
+    """텍스트 정리"""
+    if not text:
+        return ""
+    text = _SPACE_RE.sub(' ', text.strip())
+    text = text.replace('\xa0', ' ').replace('&nbsp;', ' ')
+    return text.strip()
+
+
+def format_notice(raw_text: str) -> dict:
+    """안내사항 텍스트를 섹션별로 분류"""
+    holidays = []  # 공휴일 운행 안내
+    bus_info = []  # 시내버스 정보
+    general = []   # 일반 안내사항
+
+    seen = set()  # 중복 제거용
+
+    # 줄바꿈 정규화
+    text = raw_text.replace('\r\n', '\n').replace('\r', '\n')
+
+    # *로 시작하는 항목 분리 (공휴일 안내)
+    for match in _HOLIDAY_RE.findall(text):
+        item = clean_text(match)
+        if item and item not in seen:
+            holidays.append(item)
+            seen.add(item)
+
+    # - 로 시작하는 항목 분리
+    for match in _DASH_RE.findall(text):
+        item = clean_text(match)
+        if item and item not in seen:
+            # 시내버스 관련
+            if '번' in item and ('터미널' in item or '역' in item or '환승' in item):
+                bus_info.append(item)
+            else:
+                general.append(item)
+            seen.add(item)
+
+    return {
+        "holidays": holidays[:10],  # 최대 10개
+        "bus_info": bus_info[:10],
+        "general": general[:10]
+    }
+
+
+def parse_shuttle_page(html: str) -> dict:
+    """셔틀버스 HTML에서 노선 정보, 안내사항, 시간표 테이블 추출"""
+    doc = parse_html(html)
+
+    result = {
+        "route_info": "",
+        "notice": {
+            "holidays": [],
+            "bus_info": [],
+            "general": []
+        },
+        "table_html": ""
+    }
+
+    # 노선 정보 추출 (grayBox 내의 정보)
+    gray_box = first(_GRAY_BOX(doc))
+    if gray_box is not None:
+        route_info_parts = []
+        title = first(_GRAY_BOX_TITLE(gray_box))
+        if title is not None:
+            route_info_parts.append(clean_text(get_text(title)))
+
+        for p in _GRAY_BOX_LINES(gray_box):
+            text = clean_text(get_text(p))
+            if text:
+                route_info_parts.append(text)
+
+        result["route_info"] = ' / '.join(route_info_parts)
+
+    # 테이블 HTML 추출 (table_type2 div 내의 내용 있는 첫 테이블)
+    for table in _TABLE_DIV_TABLES(doc):
+        if _HAS_ROWS(table) and get_text(table, strip=True):
+            result["table_html"] = outer_html(table)
+            break
+
+    # 안내사항 추출 (mgT30 div 중 테이블이 아닌 텍스트)
+    notice_texts = []
+    content_div = first(_CONTENT_DIV(doc))
+    if content_div is None:
+        content_div = first(_SHUTTLE_WRAP(doc))
+    if content_div is not None:
+        for div in _NOTICE_DIVS(content_div):
+            if not _HAS_TABLE(div):
+                text = get_text(div, separator='\n')
+                if text and ('*' in text or '안내' in text or '운행' in text or '-' in text):
+                    notice_texts.append(text)
+
+    # 안내사항 분류
+    if notice_texts:
+        result["notice"] = format_notice('\n'.join(notice_texts))
+
+    return result
+
+
+def _expand_rows(rows) -> List[List[str]]:
+    """rowspan/colspan을 펼친 셀 텍스트 격자"""
+    grid: List[List[str]] = []
+    pending: Dict[int, Tuple[int, str]] = {}  # 열 → (남은 행 수, 텍스트)
+    for row in rows:
+        line: List[str] = []
+        cells = iter(_CELLS(row))
+        col = 0
+        while True:
+            if col in pending:
+                remaining, text = pending[col]
+                line.append(text)
+                if remaining > 1:
+                    pending[col] = (remaining - 1, text)
+                else:
+                    del pending[col]
+                col += 1
+                continue
+            cell = next(cells, None)
+            if cell is None:
+                if pending and col <= max(pending):
+                    line.append("")
+                    col += 1
+                    continue
+                break
+            text = clean_text(get_text(cell, separator=' '))
+            try:
+                colspan = max(1, int(cell.get('colspan', 1)))
+                rowspan = max(1, int(cell.get('rowspan', 1)))
+            except ValueError:
+                colspan = rowspan = 1
+            for _ in range(colspan):
+                if rowspan > 1:
+                    pending[col] = (rowspan - 1, text)
+                line.append(text)
+                col += 1
+        grid.append(line)
+    return grid
+
+
+def parse_departures(table_html: str) -> Dict[str, List[int]]:
+    """
+    시간표 테이블 → {정류장명: 정렬된 출발 시각(자정 기준 분)}
+
+    헤더(thead 또는 th만 있는 앞쪽 행)의 열 이름을 정류장으로 보고,
+    본문 셀의 HH:MM 시각을 열별로 모은다. 시각이 하나도 없는 열(순번, 비고 등)은 제외.
+    """
+    if not table_html:
+        return {}
+    table = first(_TABLE(parse_html(table_html)))
+    if table is None:
+        return {}
+
+    rows = _ROWS(table)
+    header_rows = []
+    for row in rows:
+        if _IN_THEAD(row) or not _HAS_TD(row):
+            header_rows.append(row)
+        else:
+            break
+    body_rows = rows[len(header_rows):]
+
+    columns: List[str] = []
+    for line in _expand_rows(header_rows):
+        for i, text in enumerate(line):
+            if i >= len(columns):
+                columns.append(text)
+            elif text and text not in columns[i]:
+                columns[i] = f"{columns[i]} {text}".strip()
+
+    departures: Dict[str, set] = {}
+    for line in _expand_rows(body_rows):
+        for i, text in enumerate(line):
+            name = columns[i] if i < len(columns) and columns[i] else f"{i + 1}열"
+            for hour, minute in _TIME_RE.findall(text):
+                hour, minute = int(hour), int(minute)
+                if hour < 30 and minute < 60:
+                    departures.setdefault(name, set()).add(hour * 60 + minute)
+
+    return {name: sorted(times) for name, times in departures.items() if times}
@@ -0,0 +1,43 @@
+"""
+Canvas 수업 계획서 페이지 파싱
+"""
+from lxml import etree
+
+from app.services.parsing.core import first, get_text, has_class, outer_html, parse_html
+
+_SYLLABUS = etree.XPath("(//div[@id='course_syllabus'])[1]")
+_WEIGHT_ROWS = etree.XPath(
+    f"(//div[@aria-label='과제 비중'])[1]"
+    f"/descendant::table[{has_class('summary')}][1]"
+    f"/descendant::tbody[1]//tr"
+)
+_ROW_HEADER = etree.XPath("(.//th[@scope='row'])[1]")
+_ROW_VALUE = etree.XPath("(.//td)[1]")
+
+
+def parse_syllabus_html(html: str) -> dict:
+    """수업 계획서 HTML에서 내용 파싱"""
+    doc = parse_html(html)
+
+    result = {
+        'syllabus_html': '',
+        'grading_weights': []
+    }
+
+    # 수업 계획서 본문 추출
+    syllabus_div = first(_SYLLABUS(doc))
+    if syllabus_div is not None:
+        result['syllabus_html'] = outer_html(syllabus_div)
+
+    # 평가 비중 추출
+    for tr in _WEIGHT_ROWS(doc):
+        th = first(_ROW_HEADER(tr))
+        td = first(_ROW_VALUE(tr))
+        if th is not None and td is not None:
+            result['grading_weights'].append({
+                'group': get_text(th, strip=True),
+                'weight': get_text(td, strip=True),
+                'is_total': 'font-weight' in (tr.get('style') or '')
+            })
+
+    return result
@@ -0,0 +1,128 @@
+"""
+종합정보시스템(SWS) 시간표 파싱
+
+시간표 응답은 ASP.NET AJAX delta(파이프 구분 텍스트 안에 HTML 조각)라서
+ViewState 등 나머지 필드를 건너뛰고 표 부분만 잘라 파싱한다.
+"""
+import re
+
+from lxml import etree
+
+from app.services.parsing.core import parse_html
+
+COLORS = ["#3B82F6", "#0EA5E9", "#06B6D4", "#8B5CF6", "#F59E0B", "#10B981", "#EF4444", "#EC4899"]
+
+PERIOD_TIMES = {
+    0: ("08:30", "09:20"),
+    1: ("09:30", "10:20"),
+    2: ("10:30", "11:20"),
+    3: ("11:30", "12:20"),
+    4: ("12:30", "13:20"),
+    5: ("13:30", "14:20"),
+    6: ("14:30", "15:20"),
+    7: ("15:30", "16:20"),
+    8: ("16:30", "17:20"),
+    9: ("17:30", "18:20"),
+    10: ("18:30", "19:20"),
+    11: ("19:30", "20:20"),
+    12: ("20:30", "21:20"),
+    13: ("21:30", "22:20"),
+}
+
+DAYS = ["월", "화", "수", "목", "금"]
+
+_PERIOD_RE = re.compile(r'(\d+)교시')
+
+# 속성 없는 <tr>만 시간표 행 (기존 정규식 '<tr>(.*?)</tr>'과 같은 대상)
+_ROWS = etree.XPath("//tr[not(@*)]")
+_CELLS = etree.XPath(".//td")
+# 시간표 셀에는 script가 없으므로 텍스트 노드를 바로 읽는다
+_ROW_TEXT = etree.XPath("string()")
+_CELL_TEXTS = etree.XPath("descendant::text()", smart_strings=False)
+
+
+def parse_timetable(html: str) -> list:
+    """시간표 HTML에서 수업 정보 파싱"""
+    schedules = []
+    subject_colors = {}
+
+    start, end = html.find('<table'), html.rfind('</table>')
+    if start >= 0 and end > start:
+        html = html[start:end + len('</table>')]
+
+    period_idx = -1
+    for row in _ROWS(parse_html(html)):
+        # 교시 정보 확인
+        period_match = _PERIOD_RE.search(_ROW_TEXT(row))
+        if period_match:
+            period_idx = int(period_match.group(1))
+
+        if period_idx < 0 or period_idx > 13:
+            continue
+
+        for day_idx, cell in enumerate(_CELLS(row)[:5]):
+            # &nbsp;가 있는 칸은 빈 칸
+            if cell.text and '\xa0' in cell.text:
+                continue
+            texts = _CELL_TEXTS(cell)
+            if any('\xa0' in text for text in texts):
+                continue
+            # 과목명 / 분반 / 교수 / 강의실 순서의 줄
+            lines = [line.strip() for text in texts for line in text.split('\n') if line.strip()]
+            if not lines:
+                continue
+
+            subject = lines[0]
+            professor = lines[2] if len(lines) > 2 else ""
+            room = lines[3] if len(lines) > 3 else ""
+
+            # 색상 할당
+            if subject not in subject_colors:
+                subject_colors[subject] = COLORS[len(subject_colors) % len(COLORS)]
+
+            start_time, end_time = PERIOD_TIMES.get(period_idx, ("09:00", "10:00"))
+
+            schedules.append({
+                "day": DAYS[day_idx],
+                "start_time": start_time,
+                "end_time": end_time,
+                "subject": subject,
+                "professor": professor,
+                "room": room,
+                "color": subject_colors[subject]
+            })
+
+    # 연속 수업 병합
+    return merge_consecutive_classes(schedules)
+
+
+def merge_consecutive_classes(schedules: list) -> list:
+    if not schedules:
+        return []
+
+    groups = {}
+    for s in schedules:
+        key = (s["subject"], s["day"])
+        if key not in groups:
+            groups[key] = []
+        groups[key].append(s)
+
+    merged = []
+    for key, classes in groups.items():
+        classes.sort(key=lambda x: x["start_time"])
+        current = classes[0].copy()
+
+        for i in range(1, len(classes)):
+            next_class = classes[i]
+            current_end = int(current["end_time"].replace(":", ""))
+            next_start = int(next_class["start_time"].replace(":", ""))
+
+            if next_start - current_end <= 10:
+                current["end_time"] = next_class["end_time"]
+            else:
+                merged.append(current)
+                current = next_class.copy()
+
+        merged.append(current)
+
+    return merged
@@ -0,0 +1,189 @@
+"""
+전화번호부 검색 인덱스 (프로세스 내)
+
+전화번호부는 작고 거의 바뀌지 않으므로 전체를 메모리에 올려 검색한다.
+- 부분 문자열 검색 (공백/대소문자 무시)
+- 초성 검색 (ㅋㅍㅌ → 컴퓨터), 초성과 완성형 혼합 (컴ㅍㅌ)
+- 숫자만 입력 시 하이픈 무시하고 전화번호 검색
+- 일치 위치/종류에 따른 랭킹
+
+워커 간 공유: 수정 시 캐시 레이어에 스냅샷과 버전을 올리고,
+각 워커는 VERSION_CHECK_SECONDS마다 버전을 확인해 바뀌었으면 스냅샷으로 재빌드한다.
+"""
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.cache import get_redis, smart_cache_get, smart_cache_set
+from app.core.database import SessionLocal
+from app.core.hangul import has_choseong as contains_choseong, mixed_find, to_choseong
+from app.models.phonebook import PhoneEntry
+from app.schemas.phonebook import PhoneEntryResponse
+
+CACHE_KEY_SNAPSHOT = "phonebook:index:snapshot"
+CACHE_KEY_VERSION = "phonebook:index:version"
+CACHE_EXPIRE = 86400  # 1일
+
+VERSION_CHECK_SECONDS = 5  # 공유 버전 확인 간격
+MAX_AGE_SECONDS = 600  # Redis가 없어 버전 공유가 안 될 때 DB 재빌드 주기
+
+_SPACE_RE = re.compile(r"\s+")
+_NON_DIGIT_RE = re.compile(r"\D")
+
+# 일치 종류별 점수 (높을수록 상위)
+SCORE_EXACT = 100
+SCORE_PREFIX = 80
+SCORE_SUBSTRING = 60
+SCORE_CHOSEONG_PREFIX = 50
+SCORE_CHOSEONG = 40
+SCORE_PHONE = 30
+
+
+def normalize(text: str) -> str:
+    return _SPACE_RE.sub("", (text or "").casefold())
+
+
+class PhonebookIndex:
+    """전화번호부 메모리 인덱스"""
+
+    def __init__(self, entries: List[Dict]):
+        self.entries = entries
+        self._rows: List[Tuple[Dict, Tuple[Tuple[str, str], ...], str]] = []
+        for entry in entries:
+            fields = []
+            for value in (entry.get("name"), entry.get("department")):
+                normalized = normalize(value)
+                fields.append((normalized, to_choseong(normalized)))
+            self._rows.append((entry, tuple(fields), _NON_DIGIT_RE.sub("", entry.get("phone") or "")))
+
+    def _score(self, fields, phone_digits: str, query: str, query_choseong: str,
+               has_choseong: bool, digits: Optional[str]) -> int:
+        best = 0
+        for text, text_choseong in fields:
+            if not has_choseong:
+                pos = text.find(query)
+                if pos == 0:
+                    best = max(best, SCORE_EXACT if len(text) == len(query) else SCORE_PREFIX)
+                elif pos > 0:
+                    best = max(best, SCORE_SUBSTRING)
+            else:
+                pos = mixed_find(text, text_choseong, query, query_choseong)
+                if pos == 0:
+                    best = max(best, SCORE_CHOSEONG_PREFIX)
+                elif pos > 0:
+                    best = max(best, SCORE_CHOSEONG)
+        if digits and digits in phone_digits:
+            best = max(best, SCORE_PHONE)
+        return best
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        category: Optional[str] = None,
+        department: Optional[str] = None
+    ) -> List[Dict]:
+        """검색 (검색어 없으면 필터만 적용한 전체 목록, 있으면 점수순)"""
+        query = normalize(query)
+        has_choseong = contains_choseong(query)
+        query_choseong = to_choseong(query) if has_choseong else query
+        digits = _NON_DIGIT_RE.sub("", query)
+        if len(digits) < 2 or len(digits) != len(query.replace("-", "").replace(".", "")):
+            digits = None
+
+        scored = []
+        for order, (entry, fields, phone_digits) in enumerate(self._rows):
+            if category and entry.get("category") != category:
+                continue
+            if department and entry.get("department") != department:
+                continue
+            if not query:
+                scored.append((0, order, entry))
+                continue
+            score = self._score(fields, phone_digits, query, query_choseong, has_choseong, digits)
+            if not score and not has_choseong and digits is None:
+                # 전화번호 원문 부분 일치 (기존 LIKE 검색과 동일)
+                if query in (entry.get("phone") or ""):
+                    score = SCORE_PHONE
+            if score:
+                scored.append((-score, order, entry))
+
+        scored.sort(key=lambda item: (item[0], item[1]))
+        return [entry for _, _, entry in scored]
+
+    def departments(self) -> List[str]:
+        return list(dict.fromkeys(e["department"] for e in self.entries if e.get("department")))
+
+
+def _load_entries_from_db() -> List[Dict]:
+    db = SessionLocal()
+    try:
+        entries = db.query(PhoneEntry).order_by(PhoneEntry.department, PhoneEntry.name).all()
+        return [PhoneEntryResponse.model_validate(e).model_dump(mode="json") for e in entries]
+    finally:
+        db.close()
+
+
+class SharedPhonebookIndex:
+    """캐시 레이어 버전으로 워커 간 동기화되는 인덱스"""
+
+    def __init__(self):
+        self._index: Optional[PhonebookIndex] = None
+        self._version: Optional[str] = None
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _build(self, entries: List[Dict], version: Optional[str]):
+        self._index = PhonebookIndex(entries)
+        self._version = version
+        self._built_at = time.monotonic()
+
+    def get(self) -> PhonebookIndex:
+        """현재 인덱스 반환 (필요 시 공유 스냅샷 또는 DB로 재빌드)"""
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < VERSION_CHECK_SECONDS:
+            return self._index
+
+        with self._lock:
+            now = time.monotonic()
+            if self._index is not None and now - self._checked_at < VERSION_CHECK_SECONDS:
+                return self._index
+            self._checked_at = now
+
+            shared = get_redis() is not None
+            shared_version = smart_cache_get(CACHE_KEY_VERSION) if shared else None
+            if self._index is not None:
+                if shared and shared_version == self._version:
+                    return self._index
+                if not shared and now - self._built_at < MAX_AGE_SECONDS:
+                    return self._index
+
+            snapshot = smart_cache_get(CACHE_KEY_SNAPSHOT) if shared_version else None
+            if snapshot and snapshot.get("version") == shared_version:
+                self._build(snapshot["entries"], shared_version)
+            else:
+                entries = _load_entries_from_db()
+                self._build(entries, shared_version)
+                if shared and shared_version is None:
+                    # 공유 스냅샷이 없으면 이 워커가 게시
+                    self._publish(entries)
+            print(f"[Phonebook] 검색 인덱스 빌드: {len(self._index.entries)}개 (version={self._version})")
+            return self._index
+
+    def _publish(self, entries: List[Dict]):
+        version = str(time.time_ns())
+        smart_cache_set(CACHE_KEY_SNAPSHOT, {"version": version, "entries": entries}, CACHE_EXPIRE)
+        smart_cache_set(CACHE_KEY_VERSION, version, CACHE_EXPIRE)
+        self._version = version
+
+    def rebuild(self):
+        """전화번호부 변경 후 호출 - DB에서 재빌드하고 다른 워커에 새 버전 게시"""
+        with self._lock:
+            entries = _load_entries_from_db()
+            self._build(entries, None)
+            self._publish(entries)
+            self._checked_at = time.monotonic()
+
+
+phonebook_index = SharedPhonebookIndex()
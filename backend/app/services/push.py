@@ -1,41 +1,42 @@
 """
 Swing2App 푸시 알림 서비스
+
+호출부는 enqueue_push / enqueue_push_to_all 로 아웃박스(SMU_PUSH_OUTBOX)에
+적재만 하고, 실제 발송은 run_push_dispatcher 워커가 비동기로 처리한다.
+- 수신자별 대기 알림 병합 (여러 건이면 "외 N건"으로 합침)
+- 동일 메시지 수신자를 PUSH_BATCH_SIZE 단위로 묶어 send_target_list 전송
+- 실패 시 지수 백오프 재시도, PUSH_MAX_ATTEMPTS 초과 시 failed 처리
+- 발송 완료/실패 행은 PUSH_RETENTION_DAYS 뒤 삭제 (purge_push_outbox, 매일 스케줄러)
 """
+import asyncio
+import hashlib
 import httpx
-from typing import List, Optional
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.push import PushOutbox
 
-# Swing2App API 설정
-SWING_PUSH_URL = "https://www.swing2app.com/swapi/push_api_send_message"
+# 전체 발송 대상 코드
+PUSH_TARGET_ALL = "-1"
 
+# 발송 중 상태로 이 시간 이상 머문 행은 워커 중단으로 보고 재시도
+STALE_SENDING_MINUTES = 10
 
-async def send_push_notification(
-    user_ids: List[str],
+
+def _build_form_data(
+    send_target: str,
     title: str,
     content: str,
     image_url: Optional[str] = None,
     link_url: Optional[str] = None
 ) -> dict:
-    """
-    Swing2App 푸시 알림 전송
-
-    Args:
-        user_ids: 발송 대상 사용자 ID 리스트 (학번)
-        title: 푸시 알림 제목
-        content: 푸시 알림 내용
-        image_url: 이미지 URL (선택)
-        link_url: 클릭 시 이동할 URL (선택)
-
-    Returns:
-        API 응답 결과
-    """
-    if not user_ids:
-        return {"success": False, "error": "No user IDs provided"}
-
-    # 사용자 ID 리스트를 쉼표로 구분된 문자열로 변환
-    send_target = ",".join(user_ids)
-
+    """Swing2App 발송 폼 데이터 생성"""
     form_data = {
         "app_id": settings.SWING_APP_ID,
         "app_api_key": settings.SWING_API_KEY,
@@ -51,109 +52,321 @@ async def send_push_notification(
     if link_url:
         form_data["message_link_url"] = link_url
 
+    return form_data
+
+
+async def _post_push(client: httpx.AsyncClient, form_data: dict) -> dict:
+    """Swing2App API 호출 (예외는 결과 dict로 변환)"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                SWING_PUSH_URL,
-                data=form_data
-            )
-
-            result = response.json() if response.status_code == 200 else {}
-            print(f"[Push] 푸시 알림 전송 결과: {result}")
-
-            return {
-                "success": response.status_code == 200 and result.get("result", False),
-                "response": result
-            }
+        response = await client.post(settings.SWING_PUSH_URL, data=form_data)
+        result = response.json() if response.status_code == 200 else {}
+        return {
+            "success": response.status_code == 200 and bool(result.get("result", False)),
+            "response": result,
+            "error": None if response.status_code == 200 else f"HTTP {response.status_code}"
+        }
     except Exception as e:
-        print(f"[Push] 푸시 알림 전송 실패: {e}")
-        return {"success": False, "error": str(e)}
+        return {"success": False, "response": {}, "error": str(e)}
+
+
+# ==================== 아웃박스 적재 ====================
 
+def _recipient_dedupe_key(dedupe_key: Optional[str], recipient: str) -> Optional[str]:
+    """수신자별 중복 방지 키 (컬럼 길이 초과 시 해시)"""
+    if not dedupe_key:
+        return None
+    key = f"{dedupe_key}:{recipient}"
+    if len(key) > 191:
+        key = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return key
 
-async def send_push_to_all(
+
+def enqueue_push(
+    db: Session,
+    user_ids: List[str],
     title: str,
     content: str,
     image_url: Optional[str] = None,
-    link_url: Optional[str] = None
-) -> dict:
+    link_url: Optional[str] = None,
+    dedupe_key: Optional[str] = None
+) -> int:
     """
-    모든 사용자에게 푸시 알림 전송
+    푸시 알림을 아웃박스에 적재 (즉시 반환, 실제 발송은 디스패처)
+
+    Args:
+        db: DB 세션 (내부에서 commit)
+        user_ids: 수신자 학번 리스트
+        dedupe_key: 같은 키로 이미 적재된 수신자는 건너뜀
+
+    Returns:
+        새로 적재된 수신자 수
     """
-    form_data = {
-        "app_id": settings.SWING_APP_ID,
-        "app_api_key": settings.SWING_API_KEY,
-        "send_target_list": "-1",  # -1은 전체 발송
-        "send_type": "push",
-        "message_title": title,
-        "message_content": content
-    }
+    recipients = list(OrderedDict.fromkeys(uid for uid in user_ids if uid))
+    if not recipients:
+        return 0
 
-    if image_url:
-        form_data["message_image_url"] = image_url
+    keys = {r: _recipient_dedupe_key(dedupe_key, r) for r in recipients}
 
-    if link_url:
-        form_data["message_link_url"] = link_url
+    # 이미 적재된 dedupe 키 제외
+    if dedupe_key:
+        existing = db.query(PushOutbox.dedupe_key).filter(
+            PushOutbox.dedupe_key.in_([k for k in keys.values()])
+        ).all()
+        existing_keys = {row[0] for row in existing}
+        recipients = [r for r in recipients if keys[r] not in existing_keys]
+        if not recipients:
+            return 0
+
+    now = datetime.now()
+    rows = [
+        PushOutbox(
+            recipient=r,
+            title=title,
+            content=content,
+            image_url=image_url,
+            link_url=link_url,
+            dedupe_key=keys[r],
+            status="pending",
+            attempts=0,
+            next_attempt_at=now
+        )
+        for r in recipients
+    ]
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                SWING_PUSH_URL,
-                data=form_data
-            )
-
-            result = response.json() if response.status_code == 200 else {}
-            print(f"[Push] 전체 푸시 알림 전송 결과: {result}")
-
-            return {
-                "success": response.status_code == 200 and result.get("result", False),
-                "response": result
-            }
-    except Exception as e:
-        print(f"[Push] 전체 푸시 알림 전송 실패: {e}")
-        return {"success": False, "error": str(e)}
+        db.add_all(rows)
+        db.commit()
+        return len(rows)
+    except IntegrityError:
+        # 동시 적재로 dedupe 키가 충돌한 경우 - 행 단위로 재시도
+        db.rollback()
+        inserted = 0
+        for r in recipients:
+            try:
+                with db.begin_nested():
+                    db.add(PushOutbox(
+                        recipient=r, title=title, content=content,
+                        image_url=image_url, link_url=link_url,
+                        dedupe_key=keys[r], status="pending",
+                        attempts=0, next_attempt_at=now
+                    ))
+                inserted += 1
+            except IntegrityError:
+                pass
+        db.commit()
+        return inserted
 
 
-def send_push_sync(
-    user_ids: List[str],
+def enqueue_push_to_all(
+    db: Session,
     title: str,
     content: str,
     image_url: Optional[str] = None,
-    link_url: Optional[str] = None
-) -> dict:
+    link_url: Optional[str] = None,
+    dedupe_key: Optional[str] = None
+) -> int:
+    """전체 사용자 대상 푸시 알림 적재"""
+    return enqueue_push(db, [PUSH_TARGET_ALL], title, content, image_url, link_url, dedupe_key)
+
+
+# ==================== 디스패처 ====================
+
+def _claim_due_rows(limit: int) -> List[dict]:
+    """발송 시각이 된 대기 행을 sending 상태로 선점"""
+    db = SessionLocal()
+    try:
+        now = datetime.now()
+
+        # 워커 중단으로 sending에 남은 행 복구
+        db.query(PushOutbox).filter(
+            PushOutbox.status == "sending",
+            PushOutbox.next_attempt_at < now - timedelta(minutes=STALE_SENDING_MINUTES)
+        ).update({PushOutbox.status: "pending"}, synchronize_session=False)
+
+        rows = db.query(PushOutbox).filter(
+            PushOutbox.status == "pending",
+            PushOutbox.next_attempt_at <= now
+        ).order_by(PushOutbox.id).limit(limit).with_for_update(skip_locked=True).all()
+
+        claimed = []
+        for row in rows:
+            row.status = "sending"
+            row.next_attempt_at = now
+            claimed.append({
+                "id": row.id,
+                "recipient": row.recipient,
+                "title": row.title,
+                "content": row.content,
+                "image_url": row.image_url,
+                "link_url": row.link_url,
+                "attempts": row.attempts or 0,
+            })
+        db.commit()
+        return claimed
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def coalesce_by_recipient(rows: List[dict]) -> List[dict]:
     """
-    동기 방식 푸시 알림 전송 (스케줄러에서 사용)
+    수신자별 대기 알림을 하나로 병합한 뒤 동일 메시지끼리 묶음
+
+    Returns:
+        [{"title", "content", "image_url", "link_url", "recipients": [...], "row_ids": [...]}]
     """
-    import requests
+    per_recipient: Dict[str, List[dict]] = OrderedDict()
+    for row in rows:
+        per_recipient.setdefault(row["recipient"], []).append(row)
 
-    if not user_ids:
-        return {"success": False, "error": "No user IDs provided"}
+    messages: Dict[tuple, dict] = OrderedDict()
+    for recipient, items in per_recipient.items():
+        latest = items[-1]
+        if len(items) == 1:
+            title = latest["title"]
+        else:
+            title = f"{latest['title']} 외 {len(items) - 1}건"
 
-    send_target = ",".join(user_ids)
+        key = (title, latest["content"], latest["image_url"], latest["link_url"])
+        if key not in messages:
+            messages[key] = {
+                "title": title,
+                "content": latest["content"],
+                "image_url": latest["image_url"],
+                "link_url": latest["link_url"],
+                "recipients": [],
+                "row_ids": [],
+            }
+        messages[key]["recipients"].append(recipient)
+        messages[key]["row_ids"].extend(item["id"] for item in items)
 
-    form_data = {
-        "app_id": settings.SWING_APP_ID,
-        "app_api_key": settings.SWING_API_KEY,
-        "send_target_list": send_target,
-        "send_type": "push",
-        "message_title": title,
-        "message_content": content
-    }
+    return list(messages.values())
 
-    if image_url:
-        form_data["message_image_url"] = image_url
 
-    if link_url:
-        form_data["message_link_url"] = link_url
+def _chunk(items: List, size: int) -> List[List]:
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
 
+
+def _mark_results(sent_ids: List[int], failed: Dict[int, tuple]):
+    """발송 결과 반영 (failed: row_id -> (attempts, error))"""
+    db = SessionLocal()
     try:
-        response = requests.post(SWING_PUSH_URL, data=form_data, timeout=30)
-        result = response.json() if response.status_code == 200 else {}
-        print(f"[Push] 푸시 알림 전송 결과: {result}")
+        now = datetime.now()
+        if sent_ids:
+            db.query(PushOutbox).filter(PushOutbox.id.in_(sent_ids)).update({
+                PushOutbox.status: "sent",
+                PushOutbox.sent_at: now,
+                PushOutbox.last_error: None,
+            }, synchronize_session=False)
 
-        return {
-            "success": response.status_code == 200 and result.get("result", False),
-            "response": result
-        }
+        for row_id, (attempts, error) in failed.items():
+            attempts += 1
+            if attempts >= settings.PUSH_MAX_ATTEMPTS:
+                values = {PushOutbox.status: "failed"}
+            else:
+                delay = settings.PUSH_RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+                values = {
+                    PushOutbox.status: "pending",
+                    PushOutbox.next_attempt_at: now + timedelta(seconds=delay),
+                }
+            values[PushOutbox.attempts] = attempts
+            values[PushOutbox.last_error] = (error or "unknown")[:500]
+            db.query(PushOutbox).filter(PushOutbox.id == row_id).update(values, synchronize_session=False)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def dispatch_pending(limit: int = 5000) -> dict:
+    """대기 중인 푸시를 한 번 발송 (디스패처 1회분)"""
+    rows = await asyncio.to_thread(_claim_due_rows, limit)
+    stats = {"claimed": len(rows), "requests": 0, "sent": 0, "failed": 0}
+    if not rows:
+        return stats
+
+    attempts_by_id = {row["id"]: row["attempts"] for row in rows}
+    recipient_rows: Dict[str, List[int]] = {}
+    for row in rows:
+        recipient_rows.setdefault(row["recipient"], []).append(row["id"])
+
+    sent_ids: List[int] = []
+    failed: Dict[int, tuple] = {}
+
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        for message in coalesce_by_recipient(rows):
+            for chunk in _chunk(message["recipients"], settings.PUSH_BATCH_SIZE):
+                form_data = _build_form_data(
+                    ",".join(chunk), message["title"], message["content"],
+                    message["image_url"], message["link_url"]
+                )
+                result = await _post_push(client, form_data)
+                stats["requests"] += 1
+
+                chunk_ids = [row_id for r in chunk for row_id in recipient_rows[r]]
+                if result["success"]:
+                    sent_ids.extend(chunk_ids)
+                else:
+                    error = result["error"] or str(result["response"])[:500]
+                    print(f"[Push] 발송 실패 ({len(chunk)}명): {error}")
+                    for row_id in chunk_ids:
+                        failed[row_id] = (attempts_by_id[row_id], error)
+
+    await asyncio.to_thread(_mark_results, sent_ids, failed)
+    stats["sent"] = len(sent_ids)
+    stats["failed"] = len(failed)
+    print(f"[Push] 디스패치 완료: {stats}")
+    return stats
+
+
+def purge_push_outbox() -> int:
+    """
+    PUSH_RETENTION_DAYS가 지난 sent/failed 행 삭제 (매일 스케줄러에서 실행), 삭제한 행 수
+    마지막 처리 시각(next_attempt_at)은 (status, next_attempt_at) 인덱스로 찾고
+    한 번에 PUSH_PURGE_BATCH_SIZE행씩 지워 긴 잠금을 피한다.
+    """
+    cutoff = datetime.now() - timedelta(days=settings.PUSH_RETENTION_DAYS)
+    deleted = 0
+    db = SessionLocal()
+    try:
+        while True:
+            ids = [row[0] for row in db.query(PushOutbox.id).filter(
+                PushOutbox.status.in_(("sent", "failed")),
+                PushOutbox.next_attempt_at < cutoff
+            ).limit(settings.PUSH_PURGE_BATCH_SIZE).all()]
+            if not ids:
+                break
+            db.query(PushOutbox).filter(PushOutbox.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+            deleted += len(ids)
+        if deleted:
+            print(f"[Push] 아웃박스 정리: {deleted}행 삭제 ({settings.PUSH_RETENTION_DAYS}일 경과)")
+        return deleted
     except Exception as e:
-        print(f"[Push] 푸시 알림 전송 실패: {e}")
-        return {"success": False, "error": str(e)}
+        db.rollback()
+        print(f"[Push] 아웃박스 정리 오류: {e}")
+        return deleted
+    finally:
+        db.close()
+
+
+async def run_push_dispatcher():
+    """아웃박스 디스패처 워커 (lifespan에서 백그라운드 태스크로 실행)"""
+    print("[Push] 디스패처 시작")
+    while True:
+        try:
+            stats = await dispatch_pending()
+            if stats["claimed"]:
+                # 밀린 알림이 있으면 바로 다음 배치 처리
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[Push] 디스패처 오류: {e}")
+        await asyncio.sleep(settings.PUSH_DISPATCH_INTERVAL_SECONDS)
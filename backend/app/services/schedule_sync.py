@@ -0,0 +1,145 @@
+"""
+로그인 시 SWS 시간표 → SMU_SCHEDULES 동기화 (변경분만 반영)
+
+학기 중에는 시간표가 거의 바뀌지 않는데 로그인마다 전부 지우고 다시 넣으면
+행 id가 바뀌고 과목/교수 인덱스도 매번 갱신된다.
+- 파싱한 시간표와 DB 행을 같은 규칙으로 해시해서 같으면 아무것도 쓰지 않음
+- 다르면 (요일, 시작 시간, 과목) 기준으로 맞춰 추가/수정/삭제만 한 트랜잭션으로 반영
+- 바뀐 경우 변경 이벤트를 구독자(과목 채팅방 접근 키, 공강 비트맵 등)에게 전달
+
+시간표 API로 직접 추가/수정/삭제할 때도 notify_schedule_change로 같은 이벤트를 보낸다.
+"""
+import hashlib
+import json
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.schedule import Schedule
+
+# 해시/비교 대상 필드 (id, 생성/수정 시각 제외)
+SYNC_FIELDS = ("day", "start_time", "end_time", "subject", "professor", "room", "color")
+
+# 같은 수업으로 보는 기준 (나머지 필드가 다르면 수정)
+MATCH_FIELDS = ("day", "start_time", "subject")
+
+_subscribers: List[Callable[[dict], None]] = []
+
+sync_stats = {"unchanged": 0, "changed": 0, "inserted": 0, "updated": 0, "deleted": 0}
+
+
+def subject_key(subject: str, professor: Optional[str]) -> str:
+    """과목 채팅방 키 (과목명|교수명) - chat.generate_subject_key와 같은 규칙"""
+    return f"{subject}|{professor or ''}"
+
+
+def user_subject_keys(db: Session, user_id: int) -> Set[str]:
+    """사용자 시간표의 과목 키 집합"""
+    rows = db.query(Schedule.subject, Schedule.professor).filter(Schedule.user_id == user_id).all()
+    return {subject_key(subject, professor) for subject, professor in rows}
+
+
+def _row(item) -> Tuple:
+    """dict(파싱 결과) 또는 Schedule → 비교용 튜플"""
+    if isinstance(item, dict):
+        return tuple(item.get(field) or None for field in SYNC_FIELDS)
+    return tuple(getattr(item, field) or None for field in SYNC_FIELDS)
+
+
+def timetable_hash(items) -> str:
+    """시간표 내용 해시 (행 순서 무관)"""
+    rows = sorted(_row(item) for item in items)
+    return hashlib.sha256(json.dumps(rows, ensure_ascii=False, default=str).encode()).hexdigest()
+
+
+def subscribe(handler: Callable[[dict], None]):
+    """
+    시간표 변경 이벤트 구독 (모듈 로드 시 등록)
+    이벤트: {"user_id", "source", "added", "updated", "removed", "subject_keys_added", "subject_keys_removed"}
+    커밋 후 같은 스레드에서 호출되므로 구독자는 캐시 무효화처럼 가벼운 일만 한다.
+    """
+    if handler not in _subscribers:
+        _subscribers.append(handler)
+
+
+def notify_schedule_change(user_id: int, source: str, added: List[dict] = (), updated: List[dict] = (),
+                           removed: List[dict] = (), keys_before: Set[str] = None, keys_after: Set[str] = None):
+    """구독자에게 변경 이벤트 전달 (구독자 오류는 기록만 하고 넘어감)"""
+    keys_before = keys_before or set()
+    keys_after = keys_after or set()
+    event = {
+        "user_id": user_id,
+        "source": source,
+        "added": list(added),
+        "updated": list(updated),
+        "removed": list(removed),
+        "subject_keys_added": sorted(keys_after - keys_before),
+        "subject_keys_removed": sorted(keys_before - keys_after),
+    }
+    for handler in _subscribers:
+        try:
+            handler(event)
+        except Exception as e:
+            print(f"[Schedule] 변경 이벤트 처리 오류 ({getattr(handler, '__name__', handler)}): {e}")
+
+
+def _as_dict(item) -> dict:
+    return dict(zip(SYNC_FIELDS, _row(item)))
+
+
+def sync_user_schedules(db: Session, user_id: int, schedules: List[dict]) -> dict:
+    """
+    파싱한 시간표를 사용자 시간표에 반영
+    반환: {"changed", "inserted", "updated", "deleted"} - 바뀐 게 없으면 DB에 쓰지 않는다
+    """
+    existing = db.query(Schedule).filter(Schedule.user_id == user_id).all()
+    if timetable_hash(existing) == timetable_hash(schedules):
+        sync_stats["unchanged"] += 1
+        return {"changed": False, "inserted": 0, "updated": 0, "deleted": 0}
+    keys_before = {subject_key(row.subject, row.professor) for row in existing}
+
+    # (요일, 시작, 과목) → 기존 행 목록 (같은 키가 여러 개여도 하나씩 짝지음)
+    by_key: Dict[Tuple, List[Schedule]] = defaultdict(list)
+    for row in existing:
+        by_key[tuple(getattr(row, field) for field in MATCH_FIELDS)].append(row)
+
+    added, updated, removed = [], [], []
+    try:
+        for sched in schedules:
+            candidates = by_key.get(tuple(sched[field] for field in MATCH_FIELDS))
+            if not candidates:
+                db.add(Schedule(user_id=user_id, **{field: sched[field] for field in SYNC_FIELDS}))
+                added.append(_as_dict(sched))
+                continue
+            # 내용까지 같은 행을 우선 짝지음
+            target = _row(sched)
+            row = next((c for c in candidates if _row(c) == target), candidates[0])
+            candidates.remove(row)
+            if _row(row) != target:
+                for field in SYNC_FIELDS:
+                    if getattr(row, field) != sched[field]:
+                        setattr(row, field, sched[field])
+                updated.append(_as_dict(sched))
+
+        for rows in by_key.values():
+            for row in rows:
+                removed.append(_as_dict(row))
+                db.delete(row)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    sync_stats["changed"] += 1
+    sync_stats["inserted"] += len(added)
+    sync_stats["updated"] += len(updated)
+    sync_stats["deleted"] += len(removed)
+
+    notify_schedule_change(
+        user_id, "login", added, updated, removed,
+        keys_before=keys_before,
+        keys_after={subject_key(s["subject"], s["professor"]) for s in schedules},
+    )
+    return {"changed": True, "inserted": len(added), "updated": len(updated), "deleted": len(removed)}
@@ -0,0 +1,241 @@
+"""
+학교 포털 세션 유지 (Canvas / EARS / GPT / folio)
+
+포털 세션 쿠키는 조용히 만료되고, 만료 후 첫 요청이 401을 받은 뒤에야
+수 초짜리 재로그인을 요청 안에서 하게 된다. 이를 줄이기 위해
+- 세션마다 생성 시각/마지막 성공 사용 시각을 기록하고 (note_created, note_used)
+- 만료가 감지되면 서비스별 통계로 남긴다 (note_expired)
+  수명 관측값은 마지막으로 살아 있던 시점이 KEEPALIVE_PROBE_INTERVAL_SECONDS 안인
+  만료만 쓴다 (오래 쉬다가 감지한 만료는 실제 만료 시점을 알 수 없어 수명이 길게 잡힌다)
+- 최근 사용한 사용자의 세션은 예상 만료가 가까워지면 가벼운 요청으로 살아 있는지 확인하고
+  (run_session_keepalive) 만료됐을 때만 재로그인한다. 살아 있으면 수명 관측을 위해
+  KEEPALIVE_PROBE_INTERVAL_SECONDS 뒤에 다시 확인한다.
+  확인 요청이 없는 서비스(GPT: 채팅 API뿐)는 예상 만료 전에 재로그인한다.
+  예상 수명은 관측값이 충분하면 관측 수명의 하위 10%, 아니면 DEFAULT_LIFETIME
+  세션마다 지터를 두고, 전체 확인/재로그인 속도는 KEEPALIVE_MAX_PER_MINUTE로 제한
+
+세션 캐시가 워커 메모리에 있으므로 워커마다 따로 동작한다.
+통계: GET /api/admin/sessions/stats
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+SERVICES = ("canvas", "ears", "gpt", "folio")
+
+# 관측값이 부족할 때 쓰는 예상 수명 (초)
+DEFAULT_LIFETIME = {"canvas": 3600, "ears": 1800, "gpt": 3600, "folio": 1800}
+
+# 서비스별로 보관하는 최근 관측값 수
+STATS_WINDOW = 500
+
+# (service, user_id) -> {"created_at", "last_used", "last_alive", "probed_at", "jitter", "keepalive"}
+_sessions: Dict[Tuple[str, int], dict] = {}
+
+expiry_stats: Dict[str, dict] = {
+    service: {
+        "expired": 0,                # 만료 감지 (요청 중 또는 확인 요청)
+        "expired_unsampled": 0,      # 마지막 생존 확인이 오래돼 수명 관측값으로 쓰지 않은 만료
+        "expired_after_refresh": 0,  # 미리 재로그인한 세션인데도 요청 중 만료
+        "probed_alive": 0,           # 확인 요청 결과 아직 살아 있음 (재로그인 안 함)
+        "refreshed": 0,              # 미리 재로그인 성공
+        "refresh_failed": 0,
+        "lifetimes": deque(maxlen=STATS_WINDOW),  # 생성 → 마지막 생존 확인 (초)
+        "idle": deque(maxlen=STATS_WINDOW),       # 마지막 성공 사용 → 만료 감지 (초)
+    }
+    for service in SERVICES
+}
+
+
+def note_created(service: str, user_id: int, keepalive: bool = False):
+    """로그인/재로그인으로 새 세션이 생김"""
+    now = time.time()
+    previous = _sessions.get((service, user_id))
+    _sessions[(service, user_id)] = {
+        "created_at": now,
+        "last_used": previous["last_used"] if previous else now,
+        "last_alive": now,
+        "probed_at": None,
+        "jitter": random.uniform(0, settings.KEEPALIVE_JITTER_SECONDS),
+        "keepalive": keepalive,
+    }
+
+
+def note_used(service: str, user_id: int):
+    """세션으로 upstream 호출 성공"""
+    entry = _sessions.get((service, user_id))
+    if entry is None:
+        # 추적 전에 만들어진 세션 (생성 시각을 모르므로 지금부터 계산)
+        note_created(service, user_id)
+        entry = _sessions[(service, user_id)]
+    entry["last_used"] = entry["last_alive"] = time.time()
+
+
+def note_expired(service: str, user_id: int, probed: bool = False):
+    """세션 만료 감지 (요청 중 401, NoLogin 등 / probed: 세션 유지 루프의 확인 요청)"""
+    entry = _sessions.pop((service, user_id), None)
+    stats = expiry_stats[service]
+    stats["expired"] += 1
+    if entry is None:
+        return
+    now = time.time()
+    # 마지막 생존 확인 ~ 감지 사이에 만료됐으므로, 그 간격이 짧을 때만 수명을 안다고 본다
+    if now - entry["last_alive"] <= settings.KEEPALIVE_PROBE_INTERVAL_SECONDS:
+        stats["lifetimes"].append(entry["last_alive"] - entry["created_at"])
+    else:
+        stats["expired_unsampled"] += 1
+    stats["idle"].append(now - entry["last_used"])
+    if entry["keepalive"] and not probed:
+        stats["expired_after_refresh"] += 1
+
+
+def _percentile(values, ratio: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def expected_lifetime(service: str) -> float:
+    """예상 세션 수명 (관측값이 충분하면 하위 10%)"""
+    lifetimes = expiry_stats[service]["lifetimes"]
+    if len(lifetimes) >= settings.KEEPALIVE_MIN_SAMPLES:
+        return _percentile(lifetimes, 0.1)
+    return DEFAULT_LIFETIME[service]
+
+
+def _refresh_at(service: str, entry: dict) -> float:
+    if entry["probed_at"] is not None:
+        return entry["probed_at"] + settings.KEEPALIVE_PROBE_INTERVAL_SECONDS
+    return entry["created_at"] + expected_lifetime(service) * settings.KEEPALIVE_REFRESH_RATIO - entry["jitter"]
+
+
+def due_sessions(now: Optional[float] = None) -> List[Tuple[float, str, int]]:
+    """지금 확인/갱신할 세션 (급한 순) - 최근 사용한 사용자만, 오래 안 쓴 세션은 추적 중단"""
+    now = now or time.time()
+    due = []
+    for (service, user_id), entry in list(_sessions.items()):
+        if now - entry["last_used"] > settings.KEEPALIVE_ACTIVE_SECONDS:
+            del _sessions[(service, user_id)]
+            continue
+        refresh_at = _refresh_at(service, entry)
+        if refresh_at <= now:
+            due.append((refresh_at, service, user_id))
+    due.sort()
+    return due
+
+
+async def _probe(service: str, user_id: int) -> Optional[bool]:
+    """세션이 살아 있는지 가벼운 요청으로 확인 (확인할 수 없으면 None)"""
+    if service == "canvas":
+        from app.routers.canvas import probe_canvas_session
+        return await probe_canvas_session(user_id)
+    if service == "ears":
+        from app.routers.ears import probe_ears_session
+        return await probe_ears_session(user_id)
+    if service == "folio":
+        from app.routers.scholarship import probe_folio_session
+        return await probe_folio_session(user_id)
+    return None
+
+
+async def _refresh(service: str, user_id: int):
+    if service == "canvas":
+        from app.routers.canvas import refresh_canvas_session
+        await refresh_canvas_session(user_id)
+    elif service == "ears":
+        from app.routers.ears import refresh_ears_session
+        await refresh_ears_session(user_id)
+    elif service == "gpt":
+        from app.routers.gpt import refresh_gpt_session
+        await refresh_gpt_session(user_id)
+    elif service == "folio":
+        from app.routers.scholarship import refresh_folio_session
+        await refresh_folio_session(user_id)
+
+
+async def refresh_due_sessions() -> int:
+    """
+    만료가 가까운 세션 확인 후 만료됐으면 재로그인 (분당 KEEPALIVE_MAX_PER_MINUTE개 간격으로), 처리한 수
+    확인 요청이 없는 서비스는 바로 재로그인
+    """
+    due = due_sessions()
+    budget = max(1, settings.KEEPALIVE_MAX_PER_MINUTE * settings.KEEPALIVE_INTERVAL_SECONDS // 60)
+    spacing = 60 / settings.KEEPALIVE_MAX_PER_MINUTE
+    handled = 0
+    for _, service, user_id in due[:budget]:
+        if handled:
+            await asyncio.sleep(spacing)
+        handled += 1
+        try:
+            entry = _sessions.get((service, user_id))
+            if entry is None:
+                continue
+            last_used = entry["last_used"]
+            alive = await _probe(service, user_id)
+            entry = _sessions.get((service, user_id))
+            if alive and entry is not None:
+                entry["last_alive"] = entry["probed_at"] = time.time()
+                expiry_stats[service]["probed_alive"] += 1
+                continue
+            if alive is False:
+                note_expired(service, user_id, probed=True)
+            await _refresh(service, user_id)
+            # 재로그인 함수가 note_created를 부르지만 미리 갱신한 세션임을 표시 (사용 시각은 그대로)
+            note_created(service, user_id, keepalive=True)
+            _sessions[(service, user_id)]["last_used"] = last_used
+            expiry_stats[service]["refreshed"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            expiry_stats[service]["refresh_failed"] += 1
+            _sessions.pop((service, user_id), None)
+            print(f"[Keepalive] {service} 세션 갱신 실패: user_id={user_id}, {getattr(e, 'detail', e)}")
+    if len(due) > budget:
+        print(f"[Keepalive] 갱신 대기 {len(due) - budget}개는 다음 주기로")
+    return handled
+
+
+async def run_session_keepalive():
+    """세션 유지 루프 (서버 시작 시 lifespan에서 실행)"""
+    print("[Keepalive] 포털 세션 유지 시작")
+    while True:
+        await asyncio.sleep(settings.KEEPALIVE_INTERVAL_SECONDS)
+        try:
+            await refresh_due_sessions()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[Keepalive] 오류: {e}")
+
+
+def session_stats() -> Dict[str, dict]:
+    """서비스별 만료 통계 (갱신 시점 조정용)"""
+    now = time.time()
+    result = {}
+    for service in SERVICES:
+        stats = expiry_stats[service]
+        tracked = [entry for (s, _), entry in _sessions.items() if s == service]
+        lifetimes = stats["lifetimes"]
+        result[service] = {
+            "tracked": len(tracked),
+            "active": sum(1 for e in tracked if now - e["last_used"] <= settings.KEEPALIVE_ACTIVE_SECONDS),
+            "expired": stats["expired"],
+            "expired_unsampled": stats["expired_unsampled"],
+            "expired_after_refresh": stats["expired_after_refresh"],
+            "probed_alive": stats["probed_alive"],
+            "refreshed": stats["refreshed"],
+            "refresh_failed": stats["refresh_failed"],
+            "samples": len(lifetimes),
+            "lifetime_p10": _percentile(lifetimes, 0.1),
+            "lifetime_p50": _percentile(lifetimes, 0.5),
+            "lifetime_p90": _percentile(lifetimes, 0.9),
+            "idle_p50": _percentile(stats["idle"], 0.5),
+            "expected_lifetime": expected_lifetime(service),
+            "refresh_after": expected_lifetime(service) * settings.KEEPALIVE_REFRESH_RATIO,
+        }
+    return result
@@ -0,0 +1,257 @@
+"""
+사용자 디렉터리 검색 인덱스 (친구 찾기용, 프로세스 내)
+
+- 이름: 정렬 목록 이진 탐색으로 접두사, 2-gram 역색인으로 부분 문자열
+  (한국 이름은 2~4음절이라 3-gram 대신 2-gram 사용)
+- 이름 초성: 같은 구조로 초성 접두사/부분 문자열, 초성·완성형 혼합 검색
+- 학번: 정렬 목록 이진 탐색으로 접두사
+- 학과 필터 (선택)
+
+가입/정보 변경/탈퇴 시 해당 워커 인덱스를 즉시 갱신하고,
+다른 워커의 변경은 REFRESH_SECONDS마다 updated_at 워터마크로 증분 반영한다.
+"""
+import bisect
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.hangul import has_choseong, mixed_find, to_choseong
+from app.models.user import User
+
+REFRESH_SECONDS = 30
+MIN_QUERY_LENGTH = 2
+
+# 일치 종류별 점수 (높을수록 상위)
+SCORE_NAME_EXACT = 100
+SCORE_NAME_PREFIX = 80
+SCORE_STUDENT_ID_PREFIX = 70
+SCORE_NAME_SUBSTRING = 60
+SCORE_CHOSEONG_PREFIX = 50
+SCORE_CHOSEONG = 40
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    return _SPACE_RE.sub("", (text or "").casefold())
+
+
+def bigrams(text: str) -> Set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class _PrefixNgramField:
+    """정렬 목록(접두사) + 2-gram 역색인(부분 문자열) 필드"""
+
+    def __init__(self, ngrams: bool = True):
+        self._sorted: List[Tuple[str, int]] = []
+        self._grams: Optional[Dict[str, Set[int]]] = {} if ngrams else None
+
+    def bulk_load(self, items: Iterable[Tuple[str, int]]):
+        self._sorted = sorted(items)
+        if self._grams is not None:
+            self._grams = {}
+            for value, user_id in self._sorted:
+                for gram in bigrams(value):
+                    self._grams.setdefault(gram, set()).add(user_id)
+
+    def add(self, value: str, user_id: int):
+        bisect.insort(self._sorted, (value, user_id))
+        if self._grams is not None:
+            for gram in bigrams(value):
+                self._grams.setdefault(gram, set()).add(user_id)
+
+    def remove(self, value: str, user_id: int):
+        i = bisect.bisect_left(self._sorted, (value, user_id))
+        if i < len(self._sorted) and self._sorted[i] == (value, user_id):
+            del self._sorted[i]
+        if self._grams is not None:
+            for gram in bigrams(value):
+                users = self._grams.get(gram)
+                if users is not None:
+                    users.discard(user_id)
+                    if not users:
+                        del self._grams[gram]
+
+    def prefix(self, query: str) -> Iterable[Tuple[str, int]]:
+        """접두사가 일치하는 (값, user_id)를 값 순서대로"""
+        i = bisect.bisect_left(self._sorted, (query, -1))
+        while i < len(self._sorted):
+            value, user_id = self._sorted[i]
+            if not value.startswith(query):
+                break
+            yield value, user_id
+            i += 1
+
+    def candidates(self, query: str) -> Set[int]:
+        """query의 모든 2-gram을 가진 user_id (부분 문자열 후보)"""
+        grams = sorted((self._grams.get(g, set()) for g in bigrams(query)), key=len)
+        if not grams or not grams[0]:
+            return set()
+        result = set(grams[0])
+        for users in grams[1:]:
+            result &= users
+            if not result:
+                break
+        return result
+
+
+class UserDirectory:
+    """사용자 디렉터리 인덱스"""
+
+    def __init__(self):
+        # user_id → (정규화 이름, 이름 초성, 학번, 학과, 원본 이름)
+        self._users: Dict[int, Tuple[str, str, str, str, str]] = {}
+        self._name = _PrefixNgramField()
+        self._choseong = _PrefixNgramField()
+        self._student_id = _PrefixNgramField(ngrams=False)
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._watermark: Optional[datetime] = None
+        self._refreshed_at = 0.0
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._users)
+
+    @staticmethod
+    def _record(name: str, student_id: str, department: str) -> Tuple[str, str, str, str, str]:
+        name_n = normalize(name)
+        return name_n, to_choseong(name_n), student_id or "", department or "", name or ""
+
+    def bulk_load(self, users: Iterable[Tuple[int, str, str, str]]):
+        """(id, name, student_id, department) 목록으로 전체 빌드"""
+        records = {uid: self._record(name, sid, dept) for uid, name, sid, dept in users}
+        with self._lock:
+            self._users = records
+            self._name.bulk_load((r[0], uid) for uid, r in records.items())
+            self._choseong.bulk_load((r[1], uid) for uid, r in records.items())
+            self._student_id.bulk_load((r[2], uid) for uid, r in records.items())
+            self._loaded = True
+
+    def upsert(self, user_id: int, name: str, student_id: str, department: str):
+        record = self._record(name, student_id, department)
+        with self._lock:
+            old = self._users.get(user_id)
+            if old == record:
+                return
+            if old is not None:
+                self._remove_fields(user_id, old)
+            self._users[user_id] = record
+            self._name.add(record[0], user_id)
+            self._choseong.add(record[1], user_id)
+            self._student_id.add(record[2], user_id)
+
+    def remove(self, user_id: int):
+        with self._lock:
+            old = self._users.pop(user_id, None)
+            if old is not None:
+                self._remove_fields(user_id, old)
+
+    def _remove_fields(self, user_id: int, record):
+        self._name.remove(record[0], user_id)
+        self._choseong.remove(record[1], user_id)
+        self._student_id.remove(record[2], user_id)
+
+    def search(
+        self,
+        query: str,
+        department: Optional[str] = None,
+        exclude_user_id: Optional[int] = None,
+        limit: int = 20
+    ) -> List[Tuple[int, int]]:
+        """(user_id, 점수) 목록 (점수 높은 순, 동점이면 이름/학번 순)"""
+        q = normalize(query)
+        if len(q) < MIN_QUERY_LENGTH:
+            return []
+
+        scores: Dict[int, int] = {}
+
+        def hit(user_id: int, score: int):
+            if user_id == exclude_user_id:
+                return
+            if department and self._users[user_id][3] != department:
+                return
+            if score > scores.get(user_id, 0):
+                scores[user_id] = score
+
+        with self._lock:
+            if q.isdigit():
+                # 모두 같은 점수 → 학번 순으로 limit개만
+                for _, user_id in self._student_id.prefix(q):
+                    hit(user_id, SCORE_STUDENT_ID_PREFIX)
+                    if len(scores) >= limit:
+                        break
+                return list(scores.items())
+            elif has_choseong(q):
+                q_choseong = to_choseong(q)
+                for _, user_id in self._choseong.prefix(q_choseong):
+                    record = self._users[user_id]
+                    if mixed_find(record[0], record[1], q, q_choseong) == 0:
+                        hit(user_id, SCORE_CHOSEONG_PREFIX)
+                for user_id in self._choseong.candidates(q_choseong):
+                    record = self._users[user_id]
+                    if mixed_find(record[0], record[1], q, q_choseong, 1) > 0:
+                        hit(user_id, SCORE_CHOSEONG)
+            else:
+                for name_n, user_id in self._name.prefix(q):
+                    hit(user_id, SCORE_NAME_EXACT if name_n == q else SCORE_NAME_PREFIX)
+                for user_id in self._name.candidates(q):
+                    if q in self._users[user_id][0][1:]:
+                        hit(user_id, SCORE_NAME_SUBSTRING)
+
+            ranked = sorted(
+                scores.items(),
+                key=lambda item: (-item[1], self._users[item[0]][0], self._users[item[0]][2])
+            )
+        return ranked[:limit]
+
+    def refresh(self, db: Session, force: bool = False):
+        """최초 전체 로드, 이후 updated_at 워터마크 이후 변경분과 탈퇴 반영"""
+        now = time.monotonic()
+        if self._loaded and not force and now - self._refreshed_at < REFRESH_SECONDS:
+            return
+        # 다른 요청이 갱신 중이면 (최초 로드가 아닌 한) 기존 인덱스로 응답
+        if not self._refresh_lock.acquire(blocking=not self._loaded):
+            return
+        try:
+            self._refresh(db, now)
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh(self, db: Session, now: float):
+        if self._loaded and now - self._refreshed_at < REFRESH_SECONDS:
+            return
+        self._refreshed_at = now
+
+        columns = (User.id, User.name, User.student_id, User.department, User.updated_at)
+        if not self._loaded:
+            rows = db.query(*columns).all()
+            self.bulk_load((r.id, r.name, r.student_id, r.department) for r in rows)
+            self._watermark = max((r.updated_at for r in rows if r.updated_at), default=None)
+            print(f"[UserDirectory] 사용자 인덱스 빌드: {len(rows)}명")
+            return
+
+        query = db.query(*columns)
+        if self._watermark is not None:
+            query = query.filter(User.updated_at >= self._watermark)
+        for r in query.all():
+            self.upsert(r.id, r.name, r.student_id, r.department)
+            if r.updated_at and (self._watermark is None or r.updated_at > self._watermark):
+                self._watermark = r.updated_at
+
+        # 다른 워커에서 탈퇴한 사용자 정리 (수가 다를 때만 id 대조)
+        if db.query(func.count(User.id)).scalar() != len(self._users):
+            live_ids = {row.id for row in db.query(User.id)}
+            with self._lock:
+                removed = [uid for uid in self._users if uid not in live_ids]
+            for user_id in removed:
+                self.remove(user_id)
+
+
+user_directory = UserDirectory()
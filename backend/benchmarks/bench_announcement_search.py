@@ -0,0 +1,195 @@
+"""
+공지사항 검색 벤치마크 (프로세스 내 2-gram 역색인)
+
+공지 50,000건(제목 + 본문 앞 1,000자, 도메인 단어 + 무작위 단어 5,000개 Zipf 분포)에 대해
+- 인덱스 빌드 시간 / 대략적인 메모리
+- 검색 지연 p50 / p95 (역색인 vs 전체 순차 검색)
+을 측정한다.
+
+--mysql URL을 주면 같은 공지를 빈 MySQL 데이터베이스(검색 전용 스크래치 DB)의
+SMU_ANNOUNCEMENTS에 넣고 FULLTEXT(ngram) 인덱스를 만든 뒤
+- FULLTEXT 인덱스 생성 시간
+- MATCH ... AGAINST 검색(_mysql_search) / 빌드 전 LIKE 순차 검색(_like_search) 지연 p50 / p95
+도 측정한다 (ngram 파서가 있는 MySQL 5.7+ 필요, MariaDB는 미지원).
+실수로 운영 DB를 덮어쓰지 않도록 SMU_ANNOUNCEMENTS가 이미 있으면 중단한다.
+
+실행: cd backend && python -m benchmarks.bench_announcement_search [--mysql mysql+pymysql://user:pw@host/scratch_db]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+from app.services.announcement_search import (
+    NgramIndex, _like_search, _mysql_search, normalize, split_terms
+)
+
+NOTICES = 50_000
+BODY_CHARS = 1000
+SEED = 7
+
+WORDS = [
+    "장학", "국가장학금", "근로", "등록금", "수강신청", "휴학", "복학", "졸업", "학위", "취업",
+    "채용", "인턴", "현장실습", "공모전", "대회", "특강", "세미나", "봉사", "교환학생", "어학",
+    "비교과", "마일리지", "기숙사", "생활관", "통학버스", "셔틀", "도서관", "학생증", "예비군", "신청",
+    "안내", "기간", "대상", "제출", "서류", "접수", "결과", "발표", "모집", "변경",
+    "학과", "학부", "대학원", "교직", "상담", "프로그램", "참가", "선발", "지원", "운영",
+]
+CATEGORIES = ["학사", "장학", "일반", "행사", "취업"]
+QUERIES = ["장학", "국가장학금 신청", "수강신청 변경", "현장실습 모집", "기숙사", "셔틀 운영",
+           "공모전 결과 발표", "교환학생", "마일리지", "근로 선발"]
+
+
+def make_vocab(rng):
+    """도메인 단어를 섞은 Zipf 분포 어휘 (실제 공지처럼 대부분 단어는 드물게 등장)"""
+    words = set()
+    while len(words) < 5000:
+        words.add("".join(chr(rng.randrange(0xAC00, 0xD7A4)) for _ in range(rng.randint(2, 4))))
+    vocab = list(words)
+    for word in WORDS:
+        vocab.insert(rng.randrange(0, 300), word)
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    return vocab, weights
+
+
+def make_notices(rng):
+    vocab, weights = make_vocab(rng)
+    notices = []
+    start = date(2020, 1, 1)
+    for i in range(NOTICES):
+        title = " ".join(rng.choices(vocab, weights, k=6))
+        body = " ".join(rng.choices(vocab, weights, k=250))[:BODY_CHARS]
+        notices.append((i + 1, title, body, rng.choice(CATEGORIES), start + timedelta(days=i % 2500)))
+    return notices
+
+
+def index_size_mb(index):
+    size = sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in index._postings.items())
+    size += sum(sys.getsizeof(t) + sys.getsizeof(b) for t, b in index._slot_text)
+    return size / 1024 / 1024
+
+
+def linear_search(docs, terms):
+    """전체 공지를 순차 검색 (LIKE '%키워드%'와 같은 방식)"""
+    return [doc_id for doc_id, title, body in docs if all(t in title or t in body for t in terms)]
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def main():
+    rng = random.Random(SEED)
+    notices = make_notices(rng)
+
+    started = time.perf_counter()
+    index = NgramIndex(BODY_CHARS)
+    for doc_id, title, body, category, notice_date in notices:
+        index.upsert(doc_id, title, body, category, notice_date)
+    build_seconds = time.perf_counter() - started
+
+    docs = [(doc_id, normalize(title), normalize(body)) for doc_id, title, body, _, _ in notices]
+
+    index_times, linear_times, totals = [], [], {}
+    for _ in range(5):
+        for query in QUERIES:
+            terms = split_terms(query)
+
+            started = time.perf_counter()
+            page, total = index.search(terms, limit=20)
+            index_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            expected = linear_search(docs, terms)
+            linear_times.append(time.perf_counter() - started)
+
+            assert total == len(expected), (query, total, len(expected))
+            totals[query] = total
+
+    started = time.perf_counter()
+    for doc_id, title, body, category, notice_date in notices[:1000]:
+        index.upsert(doc_id, title + " 변경", body, category, notice_date)
+    update_ms = (time.perf_counter() - started) * 1000 / 1000
+
+    print(f"공지 {NOTICES:,}건 (본문 {BODY_CHARS}자) / 검색어 {len(QUERIES)}종 × 5회")
+    print(f"인덱스 빌드       : {build_seconds:6.2f} s  (~{index_size_mb(index):.0f} MB)")
+    print(f"검색어별 매칭 수  : {totals}")
+    print(f"역색인 검색       : p50 {percentile(index_times, 0.5) * 1000:7.2f} ms  p95 {percentile(index_times, 0.95) * 1000:7.2f} ms")
+    print(f"순차 검색         : p50 {percentile(linear_times, 0.5) * 1000:7.2f} ms  p95 {percentile(linear_times, 0.95) * 1000:7.2f} ms")
+    print(f"speedup (p50)     : x{statistics.median(linear_times) / statistics.median(index_times):.1f}")
+    print(f"증분 갱신 (1건)   : {update_ms:6.3f} ms")
+    return notices, totals
+
+
+def timed_queries(func, db):
+    times, totals = [], {}
+    for _ in range(5):
+        for query in QUERIES:
+            started = time.perf_counter()
+            _, total = func(db, split_terms(query), None, 0, 20)
+            times.append(time.perf_counter() - started)
+            totals[query] = total
+    return times, totals
+
+
+def bench_mysql(url: str, notices, memory_totals):
+    """스크래치 MySQL DB에서 FULLTEXT(ngram) 검색과 LIKE 순차 검색 측정"""
+    from sqlalchemy import create_engine, inspect, text
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models.announcement import Announcement
+
+    engine = create_engine(url)
+    if inspect(engine).has_table(Announcement.__tablename__):
+        print(f"\n{Announcement.__tablename__}가 이미 있는 DB입니다. 빈 스크래치 DB를 지정하세요.")
+        return
+    Announcement.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        started = time.perf_counter()
+        rows = [
+            {"id": doc_id, "notice_no": doc_id, "title": title, "content": body, "search_text": body,
+             "category": category, "notice_date": notice_date}
+            for doc_id, title, body, category, notice_date in notices
+        ]
+        for i in range(0, len(rows), 2000):
+            db.execute(Announcement.__table__.insert(), rows[i:i + 2000])
+        db.commit()
+        insert_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for idx_sql in [
+            "CREATE FULLTEXT INDEX ft_announcement_title ON SMU_ANNOUNCEMENTS(title) WITH PARSER ngram",
+            "CREATE FULLTEXT INDEX ft_announcement_search ON SMU_ANNOUNCEMENTS(title, search_text) WITH PARSER ngram",
+        ]:
+            db.execute(text(idx_sql))
+        db.commit()
+        fulltext_seconds = time.perf_counter() - started
+
+        fulltext_times, fulltext_totals = timed_queries(_mysql_search, db)
+        like_times, like_totals = timed_queries(_like_search, db)
+    finally:
+        db.close()
+        Announcement.__table__.drop(engine)
+
+    print(f"\nMySQL {engine.dialect.server_version_info} (공지 적재 {insert_seconds:.1f}s)")
+    print(f"FULLTEXT 생성     : {fulltext_seconds:6.2f} s")
+    print(f"FULLTEXT 검색     : p50 {percentile(fulltext_times, 0.5) * 1000:7.2f} ms  p95 {percentile(fulltext_times, 0.95) * 1000:7.2f} ms")
+    print(f"LIKE 순차 검색    : p50 {percentile(like_times, 0.5) * 1000:7.2f} ms  p95 {percentile(like_times, 0.95) * 1000:7.2f} ms")
+    mismatched = {q: (memory_totals[q], fulltext_totals[q], like_totals[q])
+                  for q in QUERIES if len({memory_totals[q], fulltext_totals[q], like_totals[q]}) > 1}
+    print(f"매칭 수 차이 (역색인, FULLTEXT, LIKE): {mismatched or '없음'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mysql", help="검색 전용 스크래치 MySQL DB URL (FULLTEXT/LIKE 백엔드 측정)")
+    args = parser.parse_args()
+    notices, totals = main()
+    if args.mysql:
+        bench_mysql(args.mysql, notices, totals)
+    else:
+        print("\nMySQL FULLTEXT/LIKE 백엔드는 --mysql URL을 주면 측정한다.")
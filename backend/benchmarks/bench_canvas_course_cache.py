@@ -0,0 +1,142 @@
+"""
+Canvas 과목 공유 캐시 벤치마크 (upstream 호출 감소량)
+
+같은 과목 수강생 80명이 몇 분에 걸쳐 과목 목록을 보고 과목 화면(수업 계획서, 게시판,
+게시글 2개, 수강생, 공지 목록)을 여는 상황을 모의 Canvas 서버(응답 지연 UPSTREAM_LATENCY)로 재현해
+- 캐시 없음: 모든 요청을 각자 세션으로 upstream에 보냄 (refresh=true와 같은 경로)
+- 과목 공유 캐시: 수강 확인 후 먼저 받은 학생의 결과를 공유
+의 upstream 호출 수와 과목 데이터 요청 지연을 비교한다.
+
+실행: cd backend && python -m benchmarks.bench_canvas_course_cache
+"""
+import asyncio
+import json
+import os
+import random
+import time
+from types import SimpleNamespace
+
+from fastapi import Response
+
+from app.core import upstream
+from app.core.cache import memory_cache_delete_pattern
+from app.core.config import settings
+from app.routers import canvas
+
+CLASSMATES = 80
+COURSE_ID = 1234
+BOARD_IDS = (11, 12)
+UPSTREAM_LATENCY = 0.08  # Canvas 응답 지연 (초)
+ARRIVAL_WINDOW = 3.0     # 80명이 과목을 여는 기간 (초, 실제로는 수 분)
+SEED = 7
+
+SYLLABUS_HTML = open(os.path.join(os.path.dirname(__file__), "fixtures", "syllabus.typical.html"), encoding="utf-8").read()
+
+
+def mock_canvas(calls: dict):
+    """경로별 호출 수를 세는 모의 Canvas ASGI 앱"""
+    topics = [{"id": 900 + i, "title": f"공지 {i}", "read_state": "unread", "unread_count": 0,
+               "permissions": {"reply": True}, "posted_at": "2026-03-0%dT09:00:00Z" % (i + 1)} for i in range(5)]
+    bodies = {
+        "/api/v1/courses": [{"id": COURSE_ID, "name": "자료구조"}, {"id": 5678, "name": "운영체제"}],
+        f"/api/v1/courses/{COURSE_ID}/discussion_topics": topics,
+        f"/learningx/api/v1/learningx_board/courses/{COURSE_ID}/boards": [{"id": b, "name": f"게시판 {b}"} for b in BOARD_IDS],
+        f"/api/v1/courses/{COURSE_ID}/users": [{"id": i, "name": f"학생{i}"} for i in range(CLASSMATES)],
+    }
+    for board_id in BOARD_IDS:
+        bodies[f"/learningx/api/v1/learningx_board/courses/{COURSE_ID}/boards/{board_id}/posts"] = {
+            "items": [{"id": board_id * 100 + i, "title": f"글 {i}"} for i in range(20)]
+        }
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        path = scope["path"]
+        calls[path] = calls.get(path, 0) + 1
+        await asyncio.sleep(UPSTREAM_LATENCY)
+        if path.endswith("/assignments/syllabus"):
+            body, content_type = SYLLABUS_HTML.encode(), b"text/html; charset=utf-8"
+        else:
+            body, content_type = json.dumps(bodies.get(path, {}), ensure_ascii=False).encode(), b"application/json"
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+async def open_course(user, refresh: bool, latencies: list):
+    """과목 목록 → 과목 화면 열기 (프론트엔드가 부르는 순서)"""
+    requests = [
+        lambda: canvas.get_canvas_courses(Response(), refresh=refresh, current_user=user),
+        lambda: canvas.get_course_syllabus(COURSE_ID, refresh=refresh, current_user=user),
+        lambda: canvas.get_course_announcements(COURSE_ID, refresh=refresh, current_user=user),
+        lambda: canvas.get_course_boards(COURSE_ID, refresh=refresh, current_user=user),
+        lambda: canvas.get_course_users(COURSE_ID, refresh=refresh, current_user=user),
+    ] + [
+        (lambda board_id=board_id: canvas.get_board_posts(COURSE_ID, board_id, refresh=refresh, current_user=user))
+        for board_id in BOARD_IDS
+    ]
+    await requests[0]()
+    for request in requests[1:]:
+        started = time.perf_counter()
+        await request()
+        latencies.append(time.perf_counter() - started)
+
+
+async def scenario(refresh: bool) -> dict:
+    calls: dict = {}
+    upstream._replay_app = mock_canvas(calls)
+    memory_cache_delete_pattern("canvas:*")
+    for stats in canvas.course_cache_stats.values():
+        stats.update(hits=0, joined=0, upstream=0)
+
+    rng = random.Random(SEED)
+    users = [SimpleNamespace(id=1000 + i) for i in range(CLASSMATES)]
+    for user in users:
+        canvas.canvas_session_cache[user.id] = {"cookies": {}, "xn_api_token": "token"}
+
+    latencies: list = []
+
+    async def arrive(user):
+        await asyncio.sleep(rng.uniform(0, ARRIVAL_WINDOW))
+        await open_course(user, refresh, latencies)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[arrive(user) for user in users])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    course_list = calls.get("/api/v1/courses", 0)
+    return {
+        "course_data_calls": sum(calls.values()) - course_list,
+        "course_list_calls": course_list,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "elapsed": elapsed,
+    }
+
+
+async def main():
+    settings.UPSTREAM_REPLAY_URL = "mock"
+    requests = CLASSMATES * (4 + len(BOARD_IDS))
+    print(f"수강생 {CLASSMATES}명 × 과목 화면 요청 {4 + len(BOARD_IDS)}개 = {requests}건 (+ 과목 목록 {CLASSMATES}건), "
+          f"upstream 지연 {UPSTREAM_LATENCY * 1000:.0f}ms")
+    print(f"{'시나리오':<18}{'과목 데이터 호출':>16}{'과목 목록 호출':>14}{'p50(ms)':>10}{'p95(ms)':>10}")
+    results = {}
+    for name, refresh in (("캐시 없음", True), ("과목 공유 캐시", False)):
+        result = await scenario(refresh)
+        results[name] = result
+        print(f"{name:<18}{result['course_data_calls']:>16}{result['course_list_calls']:>14}"
+              f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}")
+
+    before = results["캐시 없음"]["course_data_calls"]
+    after = results["과목 공유 캐시"]
+    print(f"\n과목 데이터 upstream 호출 {before}건 → {after['course_data_calls']}건 "
+          f"({(1 - after['course_data_calls'] / before) * 100:.1f}% 감소), "
+          f"수강 확인은 과목 목록 캐시로 추가 호출 {after['course_list_calls'] - CLASSMATES}건")
+    print("자원별:", json.dumps(canvas.course_cache_stats, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
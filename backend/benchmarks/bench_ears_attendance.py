@@ -0,0 +1,126 @@
+"""
+EARS 전 과목 출석 조회 벤치마크 (과목별 캐시 + 백그라운드 갱신)
+
+EARS 출석부 API를 흉내 내는 서버를 로컬에 띄우고 (upstream 재생 경로로 연결)
+과목 조회 한 건마다 UPSTREAM_LATENCY만큼 지연시킨다. COURSES과목 수강생 한 명이
+시험 기간처럼 출석 화면을 계속 새로 고치는 상황에서 조회 한 번의 응답 시간과
+응답 전에 EARS로 나간 요청 수를 잰다.
+- 첫 조회: 캐시 없음 → 전 과목 조회 (사용자당 EARS_USER_CONCURRENCY개씩)
+- 신선한 캐시: EARS 요청 없음
+- 오래된 캐시: 캐시로 바로 응답, 갱신은 응답 뒤 백그라운드
+  (이전에는 전체 캐시 TTL이 지나면 조회가 전 과목 조회를 기다렸다)
+- 수업 종료 후 예약 갱신: 끝난 수업 과목만 조회
+
+httpx의 ASGITransport는 응답 본문을 모아서 돌려주므로 실제 소켓으로 띄운 서버를 쓴다.
+
+실행: cd backend && python -m benchmarks.bench_ears_attendance
+"""
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.routers import ears
+from app.services import attendance_refresh
+
+UPSTREAM_LATENCY = 0.08   # 과목 하나 출석 조회 (초)
+COURSES = 8
+STUDENT_ID = "20240000"
+USER_ID = 1
+
+upstream_state = {"calls": 0, "inflight": 0, "max_inflight": 0}
+
+
+async def attendance(request):
+    form = await request.form()
+    upstream_state["calls"] += 1
+    upstream_state["inflight"] += 1
+    upstream_state["max_inflight"] = max(upstream_state["max_inflight"], upstream_state["inflight"])
+    try:
+        await asyncio.sleep(UPSTREAM_LATENCY)
+    finally:
+        upstream_state["inflight"] -= 1
+    dclass = json.loads(form["ikey"])["dclass"]
+    return JSONResponse({
+        "rollbook": [{
+            "sugang_code": dclass,
+            "sugang_name": f"과목{dclass}",
+            "sugang_week": "1",
+            "sugang_starttime": "0900",
+            "sugangWeekInfoForJspList": [{
+                "sugang_order": week,
+                "sugang_date": f"03{week:02d}",
+                "sugangAttendLogList": [{"sugang_student_id": STUDENT_ID, "sugang_attend_kind": "2"}],
+            } for week in range(1, 16)],
+        }],
+        "rollbookuser": [],
+    })
+
+
+def start_upstream() -> int:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    app = Starlette(routes=[Route("/attend/iwin_st_chulseokbu", attendance, methods=["POST"])])
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return port
+
+
+def age_cache(seconds: float):
+    """캐시된 과목 항목을 seconds만큼 오래된 것으로"""
+    for dclass in range(COURSES):
+        key = ears.attendance_cache_key(USER_ID, str(dclass))
+        entry = ears.smart_cache_get(key)
+        entry["fetched_at"] -= seconds
+        ears.smart_cache_set(key, entry, settings.EARS_ATTENDANCE_STALE_SECONDS)
+
+
+async def view(label: str):
+    before = upstream_state["calls"]
+    started = time.perf_counter()
+    result = await ears.load_all_attendance(USER_ID, STUDENT_ID)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"  {label:<22}{elapsed:>8.1f}ms  응답 전 EARS 요청 {upstream_state['calls'] - before}건  "
+          f"과목 {len(result['courses'])}개")
+
+
+async def main():
+    port = start_upstream()
+    settings.UPSTREAM_REPLAY_URL = f"http://127.0.0.1:{port}"
+    ears.ears_session_cache[USER_ID] = {
+        "cookies": {},
+        "courses": [{"course_name": f"과목{i}", "sugang_codes": [str(i)]} for i in range(COURSES)],
+    }
+
+    print(f"{COURSES}과목, 과목 조회 {UPSTREAM_LATENCY * 1000:.0f}ms, "
+          f"사용자당 동시 조회 {settings.EARS_USER_CONCURRENCY}, 신선 {settings.EARS_ATTENDANCE_FRESH_SECONDS}s")
+    await view("첫 조회 (캐시 없음)")
+    print(f"    EARS 최대 동시 요청 {upstream_state['max_inflight']}")
+    await view("신선한 캐시")
+    age_cache(settings.EARS_ATTENDANCE_FRESH_SECONDS + 1)
+    await view("오래된 캐시")
+    before = upstream_state["calls"]
+    await asyncio.gather(*ears._background_tasks)
+    print(f"    백그라운드 갱신 EARS 요청 {upstream_state['calls'] - before}건")
+    await view("갱신 후")
+
+    age_cache(settings.EARS_ATTENDANCE_FRESH_SECONDS + 1)
+    before = upstream_state["calls"]
+    refreshed = await attendance_refresh.refresh_after_class(USER_ID, STUDENT_ID, ["과목3"])
+    print(f"\n수업 종료 후 예약 갱신 (과목3): {refreshed}과목, EARS 요청 {upstream_state['calls'] - before}건")
+    print(f"통계: {ears.attendance_cache_stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+"""
+folio 마일리지 조회 upstream 왕복 벤치마크 (세션 재사용, 동시 요청 제한)
+
+folio를 흉내 내는 서버를 로컬에 띄우고 (upstream 재생 경로로 연결)
+로그인/마일리지 요청마다 UPSTREAM_LATENCY만큼 지연시킨다.
+세션 쿠키가 없거나 만료됐으면 마일리지 요청을 로그인 폼으로 리다이렉트한다.
+- 재조회: 같은 사용자가 연도를 바꿔 가며 VIEWS번 조회 (결과 캐시는 거치지 않음)
+          이전에는 조회마다 로그인 + 마일리지 = 2왕복
+- 만료: 서버 쪽 세션을 모두 지운 뒤 조회 → 만료 감지 후 재로그인 한 번
+- 일괄 갱신: USERS명이 동시에 조회할 때 folio가 받는 최대 동시 요청 수 (FOLIO_CONCURRENCY)
+
+httpx의 ASGITransport는 응답 본문을 모아서 돌려주므로 실제 소켓으로 띄운 서버를 쓴다.
+
+실행: cd backend && python -m benchmarks.bench_folio_session
+"""
+import asyncio
+import socket
+import threading
+import time
+import uuid
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import HTMLResponse, RedirectResponse
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.routers import scholarship
+
+UPSTREAM_LATENCY = 0.05   # folio 요청 한 건 처리 시간 (초)
+VIEWS = 5
+USERS = 40
+
+MILEAGE_TABLE = (
+    "<table><tbody id='tbMileageList'><tr>"
+    + "".join(f"<td class='a_C'>{i + 1}</td>" for i in range(19))
+    + "</tr></tbody></table>"
+)
+
+upstream_state = {"logins": 0, "mileage": 0, "inflight": 0, "max_inflight": 0, "sessions": set()}
+
+
+async def _handle():
+    upstream_state["inflight"] += 1
+    upstream_state["max_inflight"] = max(upstream_state["max_inflight"], upstream_state["inflight"])
+    try:
+        await asyncio.sleep(UPSTREAM_LATENCY)
+    finally:
+        upstream_state["inflight"] -= 1
+
+
+async def login(request):
+    await _handle()
+    upstream_state["logins"] += 1
+    session_id = uuid.uuid4().hex
+    upstream_state["sessions"].add(session_id)
+    response = HTMLResponse("ok")
+    response.set_cookie("JSESSIONID", session_id)
+    return response
+
+
+async def mileage(request):
+    await _handle()
+    upstream_state["mileage"] += 1
+    if request.cookies.get("JSESSIONID") not in upstream_state["sessions"]:
+        return RedirectResponse("https://folio.sunmoon.ac.kr/hmpg/com/login/LoginForm.do", status_code=302)
+    return HTMLResponse(f"<html><a href='/logout'>로그아웃</a>{MILEAGE_TABLE}</html>")
+
+
+async def login_form(request):
+    return HTMLResponse("<form><input name='loginId'><input name='loginPassword'></form>")
+
+
+def start_upstream() -> int:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    app = Starlette(routes=[
+        Route("/hmpg/com/login/LoginConfirm.do", login, methods=["POST"]),
+        Route("/hmpg/efo/album/mlg/MlgList.do", mileage, methods=["POST"]),
+        Route("/hmpg/com/login/LoginForm.do", login_form),
+    ])
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return port
+
+
+def upstream_calls() -> int:
+    return upstream_state["logins"] + upstream_state["mileage"]
+
+
+async def measure_views(user_id: int) -> list:
+    """조회마다 (upstream 요청 수, 소요 ms)"""
+    rows = []
+    for i in range(VIEWS):
+        before = upstream_calls()
+        started = time.perf_counter()
+        await scholarship.load_mileage(user_id, str(user_id), 2025 - i)
+        rows.append((upstream_calls() - before, (time.perf_counter() - started) * 1000))
+    return rows
+
+
+async def main():
+    port = start_upstream()
+    settings.UPSTREAM_REPLAY_URL = f"http://127.0.0.1:{port}"
+    for user_id in range(1, USERS + 2):
+        scholarship.folio_credentials_cache[user_id] = {"login_id": str(user_id), "password": "pw"}
+
+    print(f"folio 요청 지연 {UPSTREAM_LATENCY * 1000:.0f}ms, 동시 요청 제한 {settings.FOLIO_CONCURRENCY}")
+    print(f"\n같은 사용자 {VIEWS}회 조회 (이전: 매번 로그인 + 마일리지 = 2왕복)")
+    for i, (calls, ms) in enumerate(await measure_views(1), 1):
+        print(f"  {i}회차: upstream {calls}왕복, {ms:.0f}ms")
+
+    upstream_state["sessions"].clear()
+    before = upstream_calls()
+    started = time.perf_counter()
+    await scholarship.load_mileage(1, "1", 2025)
+    print(f"\n서버 세션 만료 후 조회: upstream {upstream_calls() - before}왕복 "
+          f"(만료 감지 → 재로그인), {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    upstream_state["max_inflight"] = 0
+    before = upstream_calls()
+    started = time.perf_counter()
+    await asyncio.gather(*[scholarship.load_mileage(u, str(u), 2025) for u in range(2, USERS + 2)])
+    print(f"\n{USERS}명 동시 조회: upstream {upstream_calls() - before}왕복, "
+          f"folio 최대 동시 요청 {upstream_state['max_inflight']}, {time.perf_counter() - started:.2f}s")
+    print(f"통계: {scholarship.folio_session_stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
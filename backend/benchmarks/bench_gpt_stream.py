@@ -0,0 +1,135 @@
+"""
+GPT 답변 첫 토큰까지 걸린 시간(TTFT) 벤치마크 (/gpt/chat vs /gpt/chat/stream)
+
+선문GPT를 흉내 내는 SSE 서버를 로컬에 띄우고 (upstream 재생 경로로 연결)
+답변을 TOKENS개 조각으로 TOKEN_INTERVAL마다 내보낸다. 각 이벤트는 지금까지의
+누적 답변(answer)을 담고 마지막 이벤트에 id가 붙는다 (기존 파서가 마지막 answer를 읽는 형식).
+- /gpt/chat        : 응답 전체를 받은 뒤 답변 반환 → TTFT = 전체 시간
+- /gpt/chat/stream : 조각이 올 때마다 delta 이벤트 → TTFT = 첫 delta까지
+또 스트리밍 중 클라이언트가 끊으면 upstream 연결이 바로 닫히는지 확인한다.
+
+httpx의 ASGITransport는 응답 본문을 모아서 돌려주므로 실제 소켓으로 띄운 서버를 쓴다.
+
+실행: cd backend && python -m benchmarks.bench_gpt_stream
+"""
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.models.user import User
+from app.routers import gpt
+
+TOKENS = 60
+TOKEN_INTERVAL = 0.03     # 조각 간격 (초) → 답변 생성 약 1.8초
+ROUNDS = 5
+
+upstream_state = {"closed_early": 0, "finished": 0}
+
+
+async def get_answer(request):
+    async def events():
+        answer = ""
+        try:
+            for i in range(TOKENS):
+                await asyncio.sleep(TOKEN_INTERVAL)
+                answer += f"토큰{i} "
+                data = {"answer": answer}
+                if i == TOKENS - 1:
+                    data["id"] = 42
+                yield f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+            upstream_state["finished"] += 1
+        except (asyncio.CancelledError, GeneratorExit):
+            upstream_state["closed_early"] += 1
+            raise
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def start_upstream() -> int:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    app = Starlette(routes=[Route("/api/chat/getAnswer", get_answer, methods=["POST"])])
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return port
+
+
+def make_user() -> User:
+    user = User(student_id="20240000", name="벤치", department="")
+    user.id = 1
+    gpt.session_cache[user.id] = {}
+    return user
+
+
+def chat_request() -> gpt.ChatRequest:
+    return gpt.ChatRequest(messages=[gpt.Message(role="user", content="수강신청 기간 알려줘")], rid=1)
+
+
+async def measure_blocking(user: User) -> float:
+    started = time.perf_counter()
+    await gpt.chat_with_gpt(chat_request(), current_user=user, db=None)
+    return (time.perf_counter() - started) * 1000
+
+
+async def measure_stream(user: User):
+    started = time.perf_counter()
+    response = await gpt.chat_with_gpt_stream(chat_request(), current_user=user)
+    first = None
+    async for chunk in response.body_iterator:
+        if first is None and chunk.startswith("event: delta"):
+            first = (time.perf_counter() - started) * 1000
+    await response.background()
+    return first, (time.perf_counter() - started) * 1000
+
+
+async def measure_disconnect(user: User) -> float:
+    """delta 3개를 받고 끊은 뒤 upstream이 연결 종료를 알아채기까지 (ms)"""
+    before = upstream_state["closed_early"]
+    response = await gpt.chat_with_gpt_stream(chat_request(), current_user=user)
+    received = 0
+    async for chunk in response.body_iterator:
+        received += chunk.startswith("event: delta")
+        if received == 3:
+            break
+    disconnected = time.perf_counter()
+    await response.body_iterator.aclose()  # StreamingResponse가 연결 끊김 시 하는 것과 같은 정리
+    await response.background()
+    while upstream_state["closed_early"] == before:
+        if time.perf_counter() - disconnected > 5:
+            return float("nan")
+        await asyncio.sleep(0.005)
+    return (time.perf_counter() - disconnected) * 1000
+
+
+async def main():
+    port = start_upstream()
+    settings.UPSTREAM_REPLAY_URL = f"http://127.0.0.1:{port}"
+    user = make_user()
+
+    print(f"답변 {TOKENS}조각, {TOKEN_INTERVAL * 1000:.0f}ms 간격 (생성 약 {TOKENS * TOKEN_INTERVAL:.1f}s), {ROUNDS}회")
+    blocking = [await measure_blocking(user) for _ in range(ROUNDS)]
+    streamed = [await measure_stream(user) for _ in range(ROUNDS)]
+    print(f"{'방식':<18}{'첫 토큰 p50':>12}{'전체 p50':>12}")
+    print(f"{'/gpt/chat':<18}{sorted(blocking)[ROUNDS // 2]:>10.0f}ms{sorted(blocking)[ROUNDS // 2]:>10.0f}ms")
+    print(f"{'/gpt/chat/stream':<18}{sorted(s[0] for s in streamed)[ROUNDS // 2]:>10.0f}ms"
+          f"{sorted(s[1] for s in streamed)[ROUNDS // 2]:>10.0f}ms")
+
+    close_ms = await measure_disconnect(user)
+    print(f"\n스트리밍 중 연결 끊김 → upstream 연결 종료까지 {close_ms:.0f}ms "
+          f"(upstream 끝까지 생성 {upstream_state['finished']}회, 중간 종료 {upstream_state['closed_early']}회)")
+    print(f"통계: {gpt.gpt_stream_stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""
+로그인 폭주 중 이벤트 루프 지연 벤치마크 (암호 연산 오프로드 전/후)
+
+학기 초처럼 로그인이 한꺼번에 몰리는 상황을 재현한다. 로그인 한 건은
+포털 왕복(대기), 신규 가입자 bcrypt 해시, Canvas RSA 복호화, JWT 발급으로 이루어진다.
+- 인라인: 암호 연산을 이벤트 루프에서 바로 실행 (기존)
+- 오프로드: bcrypt/RSA를 전용 스레드(run_crypto)에서 실행
+같은 워커의 WebSocket/다른 요청이 느끼는 지연을 5ms 주기 타이머의 밀림으로 잰다.
+
+실행: cd backend && python -m benchmarks.bench_login_crypto
+"""
+import asyncio
+import base64
+import time
+
+from Crypto.Cipher import PKCS1_v1_5
+from Crypto.PublicKey import RSA
+
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash, get_password_hash_async, run_crypto
+from app.routers.canvas import decrypt_password
+
+LOGINS = 40
+NEW_USER_EVERY = 4          # 4명 중 1명은 첫 로그인 (bcrypt 해시)
+ARRIVAL_SPACING = 0.01      # 로그인 도착 간격 (초)
+UPSTREAM_LATENCY = 0.05     # 포털 왕복 한 번 (초)
+PROBE_INTERVAL = 0.005      # 지연 측정 타이머 주기 (초)
+
+
+def make_canvas_cryption():
+    """Canvas loginCryption과 같은 형태 (암호문 base64, 개인키 PEM)"""
+    key = RSA.generate(1024)
+    encrypted = PKCS1_v1_5.new(key.publickey()).encrypt(b"portal-password")
+    return base64.b64encode(encrypted).decode(), key.export_key().decode()
+
+
+async def login(i: int, offload: bool, cryption):
+    await asyncio.sleep(UPSTREAM_LATENCY)  # SWS 로그인
+    if i % NEW_USER_EVERY == 0:
+        if offload:
+            await get_password_hash_async("portal-password")
+        else:
+            get_password_hash("portal-password")
+    await asyncio.sleep(UPSTREAM_LATENCY)  # Canvas SSO
+    if offload:
+        await run_crypto(decrypt_password, *cryption)
+    else:
+        decrypt_password(*cryption)
+    create_access_token({"sub": str(i)})
+    await asyncio.sleep(UPSTREAM_LATENCY)  # Canvas 로그인 폼 제출
+
+
+async def probe(lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def storm(offload: bool, cryption) -> dict:
+    lags: list = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+
+    async def arrive(i):
+        await asyncio.sleep(i * ARRIVAL_SPACING)
+        started = time.perf_counter()
+        await login(i, offload, cryption)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    durations = await asyncio.gather(*[arrive(i) for i in range(LOGINS)])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+
+    lags.sort()
+    durations = sorted(durations)
+    return {
+        "lag_p50": lags[len(lags) // 2] * 1000,
+        "lag_p99": lags[int(len(lags) * 0.99)] * 1000,
+        "lag_max": lags[-1] * 1000,
+        "login_p50": durations[len(durations) // 2] * 1000,
+        "elapsed": elapsed,
+    }
+
+
+def time_once(func, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def main():
+    cryption = make_canvas_cryption()
+    token = create_access_token({"sub": "1"})
+    from app.core.security import decode_token
+    print("연산별 소요 (최소값):")
+    print(f"  bcrypt 해시      {time_once(get_password_hash, 'portal-password', repeat=3):8.2f} ms")
+    print(f"  RSA 복호화       {time_once(decrypt_password, *cryption):8.2f} ms")
+    print(f"  JWT 발급         {time_once(create_access_token, {'sub': '1'}):8.3f} ms")
+    print(f"  JWT 검증         {time_once(decode_token, token):8.3f} ms  (get_current_user는 동기 의존성이라 이미 스레드풀)")
+
+    print(f"\n로그인 {LOGINS}건 ({NEW_USER_EVERY}명 중 1명 신규), {ARRIVAL_SPACING * 1000:.0f}ms 간격 도착, "
+          f"암호 스레드 {settings.CRYPTO_EXECUTOR_WORKERS}개")
+    print(f"{'방식':<10}{'루프 지연 p50':>14}{'p99':>10}{'max':>10}{'로그인 p50':>12}{'전체(s)':>10}")
+    for name, offload in (("인라인", False), ("오프로드", True)):
+        r = await storm(offload, cryption)
+        print(f"{name:<10}{r['lag_p50']:>12.2f}ms{r['lag_p99']:>8.1f}ms{r['lag_max']:>8.1f}ms"
+              f"{r['login_p50']:>10.0f}ms{r['elapsed']:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
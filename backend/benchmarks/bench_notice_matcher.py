@@ -0,0 +1,118 @@
+"""
+공지 구독 매칭 벤치마크
+
+50,000개 구독 × 새 공지 100건 매칭을
+- 사용자별 키워드 루프 (naive)
+- SubscriptionIndex (Aho-Corasick + 카테고리 dict)
+로 비교한다.
+
+실행: cd backend && python -m benchmarks.bench_notice_matcher
+"""
+import random
+import time
+
+from app.services.notice_matcher import SubscriptionIndex, normalize
+
+SUBSCRIPTIONS = 50_000
+NOTICES = 100
+SEED = 42
+
+WORDS = [
+    "장학", "국가장학", "근로", "등록금", "수강신청", "휴학", "복학", "졸업", "학위", "취업",
+    "채용", "인턴", "현장실습", "공모전", "대회", "특강", "세미나", "봉사", "교환학생", "어학",
+    "TOEIC", "비교과", "마일리지", "기숙사", "생활관", "통학버스", "셔틀", "도서관", "학생증", "예비군",
+    "컴퓨터공학", "AI소프트웨어", "경영", "간호", "물리치료", "디자인", "기계", "전자", "화학", "건축",
+]
+CATEGORIES = ["학사", "장학", "일반", "행사", "취업", "국제", "입찰", "코로나"]
+
+
+def make_subscriptions(rng):
+    """(user_id, kind, value) 구독 생성 - 사용자당 평균 5개"""
+    rows = set()
+    users = SUBSCRIPTIONS // 5
+    vocab = WORDS + [f"{w}{i}" for w in WORDS for i in range(50)]
+    while len(rows) < SUBSCRIPTIONS:
+        user_id = rng.randrange(users)
+        if rng.random() < 0.8:
+            rows.add((user_id, "keyword", rng.choice(vocab)))
+        else:
+            rows.add((user_id, "category", rng.choice(CATEGORIES)))
+    return list(rows)
+
+
+def make_notices(rng):
+    notices = []
+    for i in range(NOTICES):
+        words = rng.sample(WORDS, 3)
+        notices.append({
+            "notice_no": 10_000 + i,
+            "title": f"[{rng.choice(CATEGORIES)}] 2026학년도 {words[0]} {words[1]} 관련 {words[2]} 안내",
+            "category": rng.choice(CATEGORIES),
+        })
+    return notices
+
+
+def naive_match(rows, notices):
+    """사용자별 구독을 공지마다 전부 검사"""
+    per_user = {}
+    for user_id, kind, value in rows:
+        per_user.setdefault(user_id, []).append((kind, normalize(value) if kind == "keyword" else value))
+
+    matches = {}
+    for notice in notices:
+        title = normalize(notice["title"])
+        for user_id, subs in per_user.items():
+            for kind, value in subs:
+                if (kind == "keyword" and value in title) or (kind == "category" and value == notice["category"]):
+                    matches.setdefault(user_id, {})[notice["notice_no"]] = notice
+                    break
+    return {u: list(found.values()) for u, found in matches.items()}
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    rng = random.Random(SEED)
+    rows = make_subscriptions(rng)
+    notices = make_notices(rng)
+
+    def build():
+        index = SubscriptionIndex()
+        index.sync(rows)
+        index._ensure_automaton()
+        return index
+
+    build_seconds, index = timed(build)
+    naive_seconds, naive = timed(naive_match, rows, notices)
+    index_seconds, indexed = timed(index.match, notices)
+
+    # 증분 변경: 기존 키워드 구독 추가는 재빌드 없음, 새 키워드 추가 시에만 오토마톤 재빌드
+    index.add(999_999, "keyword", WORDS[0])
+    assert not index._dirty
+    index.add(999_999, "keyword", "새로운키워드")
+    started = time.perf_counter()
+    index._ensure_automaton()
+    rebuild_seconds = time.perf_counter() - started
+
+    naive_ids = {u: sorted(n["notice_no"] for n in ns) for u, ns in naive.items()}
+    index_ids = {u: sorted(n["notice_no"] for n in ns) for u, ns in indexed.items()}
+    assert naive_ids == index_ids, "매칭 결과 불일치"
+
+    print(f"구독 {len(rows):,}개 / 고유 키워드 {len(index.keyword_users):,}개 / 공지 {len(notices)}건")
+    print(f"매칭 사용자 수          : {len(indexed):,}명")
+    print(f"인덱스 빌드             : {build_seconds * 1000:8.1f} ms")
+    print(f"naive 사용자 루프       : {naive_seconds * 1000:8.1f} ms")
+    print(f"Aho-Corasick 매칭       : {index_seconds * 1000:8.1f} ms  (x{naive_seconds / index_seconds:.1f})")
+    print(f"새 키워드 추가 후 재빌드: {rebuild_seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+큰 페이지 파싱 중 이벤트 루프 지연 벤치마크 (인라인 vs 프로세스 풀)
+
+Canvas 공지 상세(worst 픽스처, 약 160KB)와 공지 목록(worst)을 파싱하는 요청이
+몰리는 상황을 재현한다. 요청 한 건은 upstream 왕복(대기) 후 페이지를 파싱한다.
+- 인라인: 모든 페이지를 이벤트 루프에서 파싱 (PARSE_INLINE_MAX_BYTES = -1)
+- 풀: 기준 크기 이상은 run_parser가 프로세스 풀로 보냄 (기본 설정)
+같은 워커의 다른 요청/WebSocket이 느끼는 지연을 5ms 주기 타이머의 밀림으로 잰다.
+코어가 하나뿐인 기계에서도 파싱은 다른 프로세스에서 돌아 루프는 OS 스케줄링으로 계속 돈다.
+
+실행: cd backend && python -m benchmarks.bench_parse_pool
+"""
+import asyncio
+import time
+
+from app.core.config import settings
+from app.services.parsing import (
+    parse_announcement_page, parse_notice_page, parsing_stats, run_parser, shutdown_parse_pool, start_parse_pool
+)
+from benchmarks.parser_fixtures import FIXTURES as PARSER_FIXTURES
+
+REQUESTS = 60
+ARRIVAL_SPACING = 0.01      # 요청 도착 간격 (초)
+UPSTREAM_LATENCY = 0.05     # upstream 왕복 (초)
+PROBE_INTERVAL = 0.005      # 지연 측정 타이머 주기 (초)
+
+
+def load_page(name: str) -> str:
+    with open(f"{PARSER_FIXTURES}/{name}", encoding="utf-8") as f:
+        return f.read()
+
+
+async def probe(lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def storm(pages: list, inline_max_bytes: int) -> dict:
+    settings.PARSE_INLINE_MAX_BYTES = inline_max_bytes
+    lags: list = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+
+    async def request(i):
+        await asyncio.sleep(i * ARRIVAL_SPACING)
+        started = time.perf_counter()
+        await asyncio.sleep(UPSTREAM_LATENCY)
+        func, html = pages[i % len(pages)]
+        await run_parser(func, html)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    durations = await asyncio.gather(*[request(i) for i in range(REQUESTS)])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+
+    lags.sort()
+    durations = sorted(durations)
+    return {
+        "lag_p50": lags[len(lags) // 2] * 1000,
+        "lag_p99": lags[int(len(lags) * 0.99)] * 1000,
+        "lag_max": lags[-1] * 1000,
+        "request_p50": durations[len(durations) // 2] * 1000,
+        "request_p99": durations[int(len(durations) * 0.99)] * 1000,
+        "elapsed": elapsed,
+    }
+
+
+async def main():
+    default_inline_max = settings.PARSE_INLINE_MAX_BYTES
+    pages = [
+        (parse_announcement_page, load_page("canvas_announcement.worst.html")),
+        (parse_notice_page, load_page("notices.worst.html")),
+    ]
+    start_parse_pool()
+    # 워커 프로세스 생성 비용은 서버 시작 시 내므로 측정에서 제외
+    await run_parser(pages[0][0], pages[0][1] + " " * default_inline_max)
+
+    print(f"요청 {REQUESTS}건, {ARRIVAL_SPACING * 1000:.0f}ms 간격 도착, 페이지 "
+          + ", ".join(f"{len(html) // 1024}KB" for _, html in pages)
+          + f", 풀 기준 {default_inline_max // 1024}KB")
+    print(f"{'방식':<8}{'루프 지연 p50':>14}{'p99':>10}{'max':>10}{'요청 p50':>10}{'p99':>10}{'전체(s)':>10}")
+    for name, inline_max in (("인라인", -1), ("풀", default_inline_max)):
+        r = await storm(pages, inline_max)
+        print(f"{name:<8}{r['lag_p50']:>12.2f}ms{r['lag_p99']:>8.1f}ms{r['lag_max']:>8.1f}ms"
+              f"{r['request_p50']:>8.0f}ms{r['request_p99']:>8.0f}ms{r['elapsed']:>10.2f}")
+
+    stats = parsing_stats()
+    print(f"\n풀 최대 대기 {stats['pending_max']}건 (워커 {stats['pool_workers']}개)")
+    for parser, modes in stats["parsers"].items():
+        for mode, h in modes.items():
+            print(f"  {parser:<26}{mode:<8}{h['count']:>4}건  평균 {h['avg_ms']:6.2f}ms  "
+                  f"최대 {h['max_ms']:6.2f}ms  풀 대기 평균 {h['avg_queue_ms']:6.2f}ms")
+    shutdown_parse_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,320 @@
+"""
+파서 벤치마크: lxml 파싱 레이어 (출력 일치 + 크기별 속도/메모리 + 기준값 비교)
+
+파서마다 benchmarks/fixtures의 small / typical / worst 픽스처({이름}.{크기}.{확장자},
+typical은 기록된 페이지, 나머지는 parser_fixtures.py로 생성)로
+1) 포팅 전 구현(benchmarks/parsing_reference.py)이 있는 파서는 출력이 같은지 확인하고
+2) 상대 시간 : 파서 1회 시간 / 기준 작업 1회 시간
+               기준 작업은 포팅 전 구현(같은 픽스처), 없는 파서(병합, EARS, Canvas 공지)는
+               포팅 전 공지 목록 파서(notices.typical)
+               두 작업을 배치(약 5ms) 단위로 번갈아 재고 각각 가장 빠른 배치로 나누므로
+               기계 속도나 공유 CPU의 부하 변화는 양쪽에 같이 걸려 상쇄된다
+   peak KB   : 호출 중 Python 힙 최고 사용량 (tracemalloc, 호출 전 대비)
+   allocs    : 호출이 끝난 뒤에도 남아 있는 할당 블록 수 / 크기 (대부분 반환값)
+를 측정해 benchmarks/baselines/parsers.json의 기준값과 비교한다.
+
+HTML 문자열 필드(table_html, syllabus_html)는 직렬화 방식(<br/> 표기, 속성 순서)만
+다르므로 다시 파싱해 같은 구조인지로 비교한다.
+
+tracemalloc은 Python 할당자만 추적하므로 libxml2가 만드는 문서 트리 메모리는
+peak에 포함되지 않는다 (lxml 요소 프록시, 결과 문자열/딕셔너리만 보인다).
+
+기준값(--save)은 전체를 --repeat번(기본 3) 돌린 상대 시간의 중앙값으로 저장한다.
+다른 환경(Python/lxml/bs4 버전, CPU)에서 만든 기준값과는 비교 결과만 보여 주고
+실패로 처리하지 않는다 (--strict로 강제).
+
+실행: cd backend && python -m benchmarks.bench_parsers [--save] [--only cafeteria] [--threshold 0.25]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+
+import bs4
+import lxml
+import lxml.html
+
+from app.routers import ears
+from app.services import parsing
+from benchmarks import parsing_reference as reference
+from benchmarks.parser_fixtures import FIXTURES
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "parsers.json")
+SIZES = ("small", "typical", "worst")
+DEFAULT_THRESHOLD = 0.25
+# 몇 KB 수준의 메모리 차이는 측정 잡음으로 본다
+MEMORY_NOISE_KB = 4.0
+
+
+def load_fixture(fixture: str, ext: str, size: str):
+    with open(os.path.join(FIXTURES, f"{fixture}.{size}.{ext}"), encoding="utf-8") as f:
+        return json.load(f) if ext == "json" else f.read()
+
+
+def normalize_html(html: str) -> str:
+    """다시 파싱해 같은 방식으로 직렬화 (속성 순서 차이 무시)"""
+    if not html:
+        return ""
+    root = lxml.html.fragment_fromstring(html)
+    for element in root.iter():
+        attributes = sorted(element.attrib.items())
+        element.attrib.clear()
+        element.attrib.update(attributes)
+    return lxml.html.tostring(root, encoding="unicode")
+
+
+def new_shuttle(html):
+    return parsing.parse_shuttle_page(html)
+
+
+def old_shuttle(html):
+    result = reference.parse_shuttle_html(html, "asan_ktx")
+    del result["route"]
+    return result
+
+
+def new_notice_page(html):
+    doc = parsing.parse_html(html)
+    return parsing.parse_notices(doc), parsing.extract_form_data(doc)
+
+
+def old_notice_page(html):
+    return reference.parse_notices(html), reference.extract_form_data(html)
+
+
+def attendance(data):
+    return ears._process_attendance(data, data["target_student_id"])
+
+
+# (이름, 픽스처, 확장자, 새 구현, 포팅 전 구현, HTML 필드 정규화)
+CASES = [
+    ("sunmoon.parse_timetable", "timetable", "txt",
+     parsing.parse_timetable, reference.parse_timetable, ()),
+    ("sunmoon.merge_consecutive_classes", "timetable_merge", "json",
+     parsing.merge_consecutive_classes, None, ()),
+    ("cafeteria.parse_menu_html", "cafeteria", "html",
+     parsing.parse_menu_html, reference.parse_menu_html, ()),
+    ("shuttle.parse_shuttle_html", "shuttle", "html",
+     new_shuttle, old_shuttle, ("table_html",)),
+    ("crawler.parse_notices + extract_form_data", "notices", "html",
+     new_notice_page, old_notice_page, ()),
+    ("scholarship.parse_mileage_html", "mileage", "html",
+     parsing.find_mileage_values, reference.find_mileage_values, ()),
+    ("canvas.parse_syllabus_html", "syllabus", "html",
+     parsing.parse_syllabus_html, reference.parse_syllabus_html, ("syllabus_html",)),
+    ("ears._process_attendance", "ears", "json", attendance, None, ()),
+    ("canvas.parse_announcement_page", "canvas_announcement", "html",
+     parsing.parse_announcement_page, None, ()),
+]
+
+# 포팅 전 구현이 없는 파서의 기준 작업
+CALIBRATION = (old_notice_page, ("notices", "html", "typical"))
+
+
+def comparable(result, html_fields):
+    if isinstance(result, dict) and html_fields:
+        result = dict(result)
+        for field in html_fields:
+            result[field] = normalize_html(result[field])
+    return result
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "lxml": lxml.__version__,
+        "bs4": bs4.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def _batch_size(fn, arg) -> int:
+    """약 5ms가 걸리는 반복 횟수"""
+    for _ in range(3):
+        fn(arg)
+    started = time.perf_counter()
+    fn(arg)
+    return max(1, int(0.005 / max(time.perf_counter() - started, 1e-7)))
+
+
+def _run_batch(fn, arg, batch: int) -> float:
+    started = time.perf_counter()
+    for _ in range(batch):
+        fn(arg)
+    return (time.perf_counter() - started) / batch
+
+
+def measure_relative(fn, arg, base_fn, base_arg, min_seconds: float):
+    """파서와 기준 작업을 배치 단위로 번갈아 재서 (파서 1회 ms, 기준 작업 1회 ms)"""
+    batch, base_batch = _batch_size(fn, arg), _batch_size(base_fn, base_arg)
+    fastest, base_fastest = float("inf"), float("inf")
+    rounds = 0
+    deadline = time.perf_counter() + min_seconds
+    while time.perf_counter() < deadline or rounds < 5:
+        fastest = min(fastest, _run_batch(fn, arg, batch))
+        base_fastest = min(base_fastest, _run_batch(base_fn, base_arg, base_batch))
+        rounds += 1
+    return fastest * 1000, base_fastest * 1000
+
+
+def measure_memory(fn, arg) -> dict:
+    """1회 호출의 최고 힙 사용량과 호출 후 남은 할당"""
+    fn(arg)  # 지연 초기화(정규식, XPath 캐시 등)를 측정에서 제외
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before_snapshot = tracemalloc.take_snapshot()
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = fn(arg)
+        _, peak = tracemalloc.get_traced_memory()
+        after_snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    diff = [stat for stat in after_snapshot.compare_to(before_snapshot, "filename") if stat.size_diff > 0]
+    del result
+    return {
+        "peak_kb": round((peak - before) / 1024, 1),
+        "allocs": sum(stat.count_diff for stat in diff if stat.count_diff > 0),
+        "alloc_kb": round(sum(stat.size_diff for stat in diff) / 1024, 1),
+    }
+
+
+def selected_cases(only: str):
+    for name, fixture, ext, new_fn, old_fn, html_fields in CASES:
+        if only and only not in name:
+            continue
+        for size in SIZES:
+            if os.path.exists(os.path.join(FIXTURES, f"{fixture}.{size}.{ext}")):
+                yield f"{name}/{size}", load_fixture(fixture, ext, size), new_fn, old_fn, html_fields
+
+
+def check_outputs(only: str) -> list:
+    """포팅 전 구현과 출력이 다른 파서/크기"""
+    return [
+        key for key, arg, new_fn, old_fn, html_fields in selected_cases(only)
+        if old_fn and comparable(new_fn(arg), html_fields) != comparable(old_fn(arg), html_fields)
+    ]
+
+
+def run(only: str, min_seconds: float) -> dict:
+    calibration_fn, calibration_fixture = CALIBRATION
+    calibration_arg = load_fixture(*calibration_fixture)
+    results = {}
+    for key, arg, new_fn, old_fn, _ in selected_cases(only):
+        base_fn, base_arg = (old_fn, arg) if old_fn else (calibration_fn, calibration_arg)
+        ms, base_ms = measure_relative(new_fn, arg, base_fn, base_arg, min_seconds)
+        results[key] = {
+            "ms": round(ms, 4),
+            "base_ms": round(base_ms, 4),
+            "relative": round(ms / base_ms, 6),
+            "reference": "ported" if old_fn else "calibration",
+            **measure_memory(new_fn, arg),
+        }
+    return results
+
+
+def median_results(runs: list) -> dict:
+    """여러 번 돌린 결과의 키별 중앙값 (상대 시간 기준으로 고른 실행의 측정값)"""
+    merged = {}
+    for key in runs[0]:
+        samples = sorted((r[key] for r in runs), key=lambda r: r["relative"])
+        merged[key] = samples[len(samples) // 2]
+    return merged
+
+
+def compare(key: str, current: dict, baseline: dict, threshold: float) -> list:
+    """기준값 대비 threshold 이상 나빠진 지표"""
+    regressions = []
+    if current["relative"] > baseline["relative"] * (1 + threshold):
+        regressions.append(f"상대 시간 {baseline['relative']:.3g} → {current['relative']:.3g}")
+    for metric in ("peak_kb", "alloc_kb"):
+        old, new = baseline[metric], current[metric]
+        if new - old > MEMORY_NOISE_KB and new > old * (1 + threshold):
+            regressions.append(f"{metric} {old:.1f} → {new:.1f}")
+    return [f"{key}: {', '.join(regressions)}"] if regressions else []
+
+
+def load_baseline() -> dict:
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: dict, previous: dict, repeat: int):
+    # --only로 일부만 돌린 경우 나머지 기준값은 유지
+    merged = {**previous.get("results", {}), **results}
+    os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump({
+            "environment": environment(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "repeat": repeat,
+            "results": dict(sorted(merged.items())),
+        }, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"기준값 저장: {BASELINE_PATH} ({len(results)}개 갱신, {repeat}회 중앙값)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--save", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--only", default="", help="이름에 이 문자열이 들어간 파서만")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀로 볼 악화 비율 (기본 0.25)")
+    parser.add_argument("--min-time", type=float, default=0.3, help="파서/크기별 최소 측정 시간(초)")
+    parser.add_argument("--repeat", type=int, help="전체 측정 반복 횟수, 중앙값 사용 (기본: --save 3, 비교 1)")
+    parser.add_argument("--strict", action="store_true", help="다른 환경의 기준값이어도 회귀 시 실패")
+    args = parser.parse_args()
+    repeat = args.repeat or (3 if args.save else 1)
+
+    mismatched = check_outputs(args.only)
+    if mismatched:
+        raise SystemExit(f"출력 불일치: {', '.join(mismatched)}")
+
+    baseline = load_baseline()
+    baseline_results = baseline.get("results", {})
+    results = median_results([run(args.only, args.min_time) for _ in range(repeat)])
+
+    print(f"{'파서/크기':<52}{'ms':>9}{'기준 작업':>11}{'상대':>11}{'기준값 대비':>12}"
+          f"{'peak KB':>10}{'allocs':>8}{'alloc KB':>10}")
+    regressions = []
+    for key, current in results.items():
+        old = baseline_results.get(key)
+        change = f"{(current['relative'] / old['relative'] - 1) * 100:+.0f}%" if old else "-"
+        base = f"{current['base_ms']:.3f}" + ("" if current["reference"] == "ported" else "*")
+        print(f"{key:<52}{current['ms']:>9.3f}{base:>11}{current['relative']:>11.3g}{change:>12}"
+              f"{current['peak_kb']:>10.1f}{current['allocs']:>8}{current['alloc_kb']:>10.1f}")
+        if old:
+            regressions.extend(compare(key, current, old, args.threshold))
+    print("(기준 작업: 포팅 전 구현, *는 포팅 전 공지 목록 파서 / 상대 = ms / 기준 작업)")
+
+    if args.save:
+        save_baseline(results, baseline, repeat)
+        return
+    if not baseline_results:
+        print("기준값 없음: --save로 먼저 저장하세요.")
+        return
+
+    same_environment = baseline.get("environment") == environment()
+    if not same_environment:
+        print(f"[주의] 기준값 환경이 다릅니다: {baseline.get('environment')} / 현재 {environment()}")
+    if regressions:
+        print(f"\n회귀 {len(regressions)}건 (threshold {args.threshold:.0%}):")
+        for line in regressions:
+            print(f"  - {line}")
+        if same_environment or args.strict:
+            raise SystemExit(1)
+    else:
+        print(f"\n회귀 없음 (threshold {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+푸시 아웃박스 디스패처 벤치마크 (수신자별 병합, 배치 전송, 재시도 백오프)
+
+Swing2App 발송 API를 흉내 내는 서버를 로컬에 띄우고 (SWING_PUSH_URL) 요청마다
+UPSTREAM_LATENCY만큼 지연시킨다. 아웃박스는 같은 스키마의 SQLite 파일 DB를 쓴다
+(디스패처의 SessionLocal만 바꿈, MySQL 없이 실행).
+- 병합/배치: 공지 NOTICES건이 STUDENTS명에게 겹쳐서 적재된 상황
+  행마다 한 번씩 보내는 경우(이전 동작)와 요청 수/시간 비교, 수신자별로 받은 알림 수 확인
+  (병합은 한 번에 선점한 배치 안에서만 되므로 배치 경계에 걸친 수신자는 두 건을 받는다)
+- 백오프: 발송 API가 계속 실패할 때 재시도 간격이 PUSH_RETRY_BASE_SECONDS × 2^n으로
+  늘고 PUSH_MAX_ATTEMPTS회 뒤 failed가 되는지 확인 (기다리는 대신 next_attempt_at을 당겨서 진행)
+- 정리: PUSH_RETENTION_DAYS가 지난 sent/failed 행 삭제
+
+실행: cd backend && python -m benchmarks.bench_push_dispatch
+"""
+import asyncio
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import uvicorn
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.models.push import PushOutbox
+from app.services import push
+
+UPSTREAM_LATENCY = 0.03   # 발송 API 요청 한 건 (초)
+STUDENTS = 3000
+NOTICES = 4
+SEED = 7
+
+upstream_state = {"requests": 0, "targets": [], "fail": False, "received": Counter(), "titles": {}}
+
+
+async def send(request):
+    form = await request.form()
+    await asyncio.sleep(UPSTREAM_LATENCY)
+    upstream_state["requests"] += 1
+    if upstream_state["fail"]:
+        return JSONResponse({"result": False}, status_code=500)
+    targets = form["send_target_list"].split(",")
+    upstream_state["targets"].append(len(targets))
+    for target in targets:
+        upstream_state["received"][target] += 1
+        upstream_state["titles"][target] = form["message_title"]
+    return JSONResponse({"result": True})
+
+
+def start_upstream() -> int:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    app = Starlette(routes=[Route("/push", send, methods=["POST"])])
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return port
+
+
+def use_sqlite_outbox(path: str):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    PushOutbox.__table__.create(engine)
+    push.SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+def enqueue_notices(rng) -> dict:
+    """공지마다 학생 일부에게 적재, 학번 -> 받은 공지 수"""
+    students = [f"2026{i:05d}" for i in range(STUDENTS)]
+    expected = Counter()
+    db = push.SessionLocal()
+    try:
+        for n in range(NOTICES):
+            targets = rng.sample(students, STUDENTS // 2)
+            expected.update(targets)
+            push.enqueue_push(db, targets, f"새 공지 {n}", "공지가 등록되었습니다.", dedupe_key=f"notice:{n}")
+    finally:
+        db.close()
+    return expected
+
+
+async def naive_send(rows: int):
+    """행마다 요청 한 번 (이전 즉시 발송 방식) - 같은 서버로 일부만 보내 전체 시간을 추정"""
+    import httpx
+    sample = min(rows, 50)
+    started = time.perf_counter()
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        for i in range(sample):
+            await client.post(settings.SWING_PUSH_URL, data={"send_target_list": f"x{i}", "message_title": "t"})
+    return (time.perf_counter() - started) / sample * rows
+
+
+def outbox_rows(**filters):
+    db = push.SessionLocal()
+    try:
+        return db.query(PushOutbox).filter_by(**filters).all()
+    finally:
+        db.close()
+
+
+def pull_retries_forward():
+    """백오프 대기를 건너뛰기 위해 pending 행의 다음 시도 시각을 지금으로"""
+    db = push.SessionLocal()
+    try:
+        db.query(PushOutbox).filter(PushOutbox.status == "pending").update(
+            {PushOutbox.next_attempt_at: datetime.now()}, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def main():
+    port = start_upstream()
+    settings.SWING_PUSH_URL = f"http://127.0.0.1:{port}/push"
+    workdir = tempfile.mkdtemp()
+    use_sqlite_outbox(os.path.join(workdir, "outbox.db"))
+    rng = random.Random(SEED)
+
+    expected = enqueue_notices(rng)
+    rows = len(outbox_rows(status="pending"))
+    print(f"공지 {NOTICES}건 × 학생 {STUDENTS // 2}명 (겹침 포함) → 아웃박스 {rows}행, "
+          f"배치 {settings.PUSH_BATCH_SIZE}명, 요청 {UPSTREAM_LATENCY * 1000:.0f}ms")
+
+    naive_seconds = await naive_send(rows)
+    upstream_state["requests"] = 0
+    upstream_state["received"].clear()
+    started = time.perf_counter()
+    stats = Counter()
+    while True:
+        # run_push_dispatcher처럼 밀린 행이 없을 때까지 연속 처리
+        batch = await push.dispatch_pending()
+        if not batch["claimed"]:
+            break
+        stats.update(batch)
+    elapsed = time.perf_counter() - started
+
+    received = upstream_state["received"]
+    merged = sum(1 for title in upstream_state["titles"].values() if "외" in title)
+    print(f"  행마다 발송 (추정)  요청 {rows}건  {naive_seconds:.2f}s")
+    print(f"  디스패처           요청 {stats['requests']}건  {elapsed:.2f}s  "
+          f"(요청당 최대 {max(upstream_state['targets'])}명)")
+    # 병합은 선점한 배치(dispatch_pending의 limit) 안에서만 일어나므로
+    # 배치 경계에 행이 걸친 수신자는 배치마다 한 건씩 받는다
+    per_recipient = Counter(received.values())
+    print(f"  수신자 {len(received)}명 (적재 대상 {len(expected)}명, 누락 {len(set(expected) - set(received))}명), "
+          f"받은 알림 수별 수신자 {dict(sorted(per_recipient.items()))}, "
+          f"병합 제목('외 N건') {merged}명, sent {len(outbox_rows(status='sent'))}행")
+
+    # 백오프
+    upstream_state["fail"] = True
+    settings.PUSH_RETRY_BASE_SECONDS = 30
+    db = push.SessionLocal()
+    try:
+        push.enqueue_push(db, ["20269999"], "재시도 확인", "발송 API 실패")
+    finally:
+        db.close()
+    print(f"\n발송 API 실패 시 재시도 (기준 {settings.PUSH_RETRY_BASE_SECONDS}s, 최대 {settings.PUSH_MAX_ATTEMPTS}회)")
+    for _ in range(settings.PUSH_MAX_ATTEMPTS):
+        before = datetime.now()
+        await push.dispatch_pending()
+        row = outbox_rows(recipient="20269999")[0]
+        wait = (row.next_attempt_at - before).total_seconds() if row.status == "pending" else None
+        print(f"  시도 {row.attempts}회 → {row.status}"
+              + (f", 다음 시도 약 {wait:.0f}s 뒤" if wait is not None else ""))
+        pull_retries_forward()
+
+    # 보관 기간 정리
+    db = push.SessionLocal()
+    try:
+        db.query(PushOutbox).update(
+            {PushOutbox.next_attempt_at: datetime.now() - timedelta(days=settings.PUSH_RETENTION_DAYS + 1)},
+            synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+    deleted = push.purge_push_outbox()
+    print(f"\n{settings.PUSH_RETENTION_DAYS}일 지난 행 정리: {deleted}행 삭제, 남은 행 {len(outbox_rows())}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+HAR 재생 기반 스크래퍼 종단 간(end-to-end) 지연 벤치마크
+
+학교 서버 대신 저장소의 HAR(info.sunmoon.ac.kr.har)를 프로세스 안에서 재생해
+upstream 요청 → 파싱까지의 지연을 네트워크 없이 재현 가능하게 측정한다.
+- 재생 지연 0 : 우리 쪽 처리 비용 (클라이언트 생성, 전송, 파싱)
+- 기록 지연   : HAR에 기록된 실제 서버 응답 시간을 더한 값
+
+다른 경로(SWS 로그인, Canvas, EARS, GPT, folio)는 해당 흐름을 기록한 HAR를
+--har로 추가하면 같은 방식으로 재생된다.
+
+실행: cd backend && python -m benchmarks.bench_replay_scrapers [--har 추가.har]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from app.core.config import settings
+
+DEFAULT_HAR = os.path.join(os.path.dirname(__file__), "..", "..", "info.sunmoon.ac.kr.har")
+REPEAT = 50
+
+
+async def measure(fn, repeat=REPEAT):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        times.append(time.perf_counter() - started)
+    times.sort()
+    return times[len(times) // 2] * 1000, times[int(len(times) * 0.95) - 1] * 1000
+
+
+async def run(har_paths):
+    from app.core import upstream
+    from app.routers.cafeteria import fetch_cafeteria_menu
+    from app.services.har_replay import HarStore, create_replay_app
+
+    store = HarStore.from_files(har_paths, upstream._replay_hosts())
+    scenarios = [
+        ("재생 지연 0", create_replay_app(store)),
+        ("기록된 서버 지연", create_replay_app(store, recorded_timing=True)),
+    ]
+
+    async def cafeteria():
+        menu = await fetch_cafeteria_menu("003")
+        assert menu["daily_menus"], "재생 응답 파싱 실패"
+
+    print(f"HAR 응답 {store.size}개, 시나리오별 {REPEAT}회")
+    print(f"{'시나리오':<20}{'경로':<28}{'p50(ms)':>10}{'p95(ms)':>10}")
+    for name, app in scenarios:
+        upstream._replay_app = app
+        p50, p95 = await measure(cafeteria)
+        print(f"{name:<20}{'cafeteria.fetch_menu':<28}{p50:>10.2f}{p95:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--har", action="append", help="추가 HAR 파일")
+    args = parser.parse_args()
+
+    har_paths = [os.path.abspath(DEFAULT_HAR)] + (args.har or [])
+    settings.UPSTREAM_REPLAY_URL = ",".join(har_paths)
+    asyncio.run(run(har_paths))
+
+
+if __name__ == "__main__":
+    main()
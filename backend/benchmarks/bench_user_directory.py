@@ -0,0 +1,92 @@
+"""
+사용자 디렉터리(친구 검색) 벤치마크
+
+사용자 100,000명에 대해
+- 인덱스 빌드 시간
+- 검색 유형별 지연 (이름 접두사 / 이름 부분 / 초성 / 학번 접두사)
+  : UserDirectory vs 전체 순차 검색 (기존 LIKE '%q%'와 같은 방식)
+을 측정한다.
+
+실행: cd backend && python -m benchmarks.bench_user_directory
+"""
+import random
+import time
+
+from app.core.hangul import to_choseong
+from app.services.user_directory import UserDirectory
+
+USERS = 100_000
+SEED = 11
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구민진나지엄채원천방공현함변염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용예경봉사부가복태목형피두감호제"
+GIVEN = "민서준예도윤시우하지주원은현수건우선영유진성혜경동재승연태희채아다소나정한석용철"
+DEPARTMENTS = ["컴퓨터공학부", "AI소프트웨어학과", "경영학과", "간호학과", "물리치료학과",
+               "디자인학부", "기계공학과", "전자공학과", "화학과", "건축학부"]
+
+QUERIES = {
+    "이름 접두사": ["김민", "박서", "이지", "최현"],
+    "이름 부분": ["민준", "서연", "지우", "현수"],
+    "초성": ["ㄱㅁㅈ", "ㅂㅅㅇ", "ㅇㅈㅇ", "김ㅁㅈ"],
+    "학번 접두사": ["2021", "20231", "202415", "2020"],
+}
+
+
+def make_users(rng):
+    users = []
+    for i in range(USERS):
+        name = rng.choice(SURNAMES) + "".join(rng.choice(GIVEN) for _ in range(rng.choice((1, 2, 2, 2, 3))))
+        student_id = f"{rng.randint(2015, 2026)}{rng.randint(0, 99999):05d}"
+        users.append((i + 1, name, student_id, rng.choice(DEPARTMENTS)))
+    return users
+
+
+def naive_search(users, q):
+    """이름 또는 학번에 q가 포함된 사용자 (LIKE '%q%' OR LIKE '%q%')"""
+    return [u for u in users if q in u[1] or q in u[2]][:20]
+
+
+def naive_choseong(users, q):
+    return [u for u in users if q in to_choseong(u[1])][:20]
+
+
+def measure(fn, *args, repeat=20):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - started)
+    times.sort()
+    return times[len(times) // 2]
+
+
+def main():
+    rng = random.Random(SEED)
+    users = make_users(rng)
+
+    started = time.perf_counter()
+    directory = UserDirectory()
+    directory.bulk_load(users)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for user_id, name, student_id, department in users[:1000]:
+        directory.upsert(user_id, name + "가", student_id, department)
+    upsert_us = (time.perf_counter() - started) * 1_000_000 / 1000
+    for user_id, name, student_id, department in users[:1000]:
+        directory.upsert(user_id, name, student_id, department)
+
+    print(f"사용자 {USERS:,}명 / 인덱스 빌드 {build_seconds:.2f} s / 증분 갱신 {upsert_us:.0f} us/명")
+    print(f"{'유형':<10} {'검색어':<8} {'매칭':>7} {'인덱스(ms)':>11} {'순차(ms)':>10}")
+    for kind, queries in QUERIES.items():
+        for q in queries:
+            hits = directory.search(q, limit=20)
+            index_ms = measure(directory.search, q) * 1000
+            if kind == "초성":
+                naive_ms = measure(naive_choseong, users, q.replace("김", "ㄱ"), repeat=3) * 1000
+            else:
+                naive_ms = measure(naive_search, users, q, repeat=5) * 1000
+            print(f"{kind:<10} {q:<8} {len(hits):>7} {index_ms:>11.3f} {naive_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+워커 콜드 스타트 → 첫 빠른 응답까지 걸리는 시간 벤치마크
+
+새 프로세스(워커 재시작과 같은 상태)에서 식단 3곳 + 셔틀 다음 출발 조회를 보내
+첫 응답까지의 시간을 측정한다.
+- 디스크 스냅샷 없음: upstream에서 가져와야 응답 (upstream은 UPSTREAM_LATENCY 지연으로 모사)
+- 디스크 스냅샷 있음: 저장소에서 바로 로드해 응답
+
+실행: cd backend && python -m benchmarks.bench_warm_start
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+UPSTREAM_LATENCY = 1.0  # upstream 페이지 1회 응답 지연 (초)
+RUNS = 3
+
+SHUTTLE_TABLE = (
+    "<table><thead><tr><th>순번</th><th>아산캠퍼스</th><th>천안아산역</th></tr></thead><tbody>"
+    + "".join(
+        f"<tr><td>{i + 1}</td><td>{7 + i // 4:02d}:{(i % 4) * 15:02d}</td>"
+        f"<td>{7 + i // 4:02d}:{(i % 4) * 15 + 10:02d}</td></tr>"
+        for i in range(60)
+    )
+    + "</tbody></table>"
+)
+
+
+def child():
+    """워커 한 개의 시작 ~ 첫 응답 (결과를 JSON으로 출력)"""
+    started = time.perf_counter()
+
+    import asyncio
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.routers import cafeteria, shuttle
+
+    async def fake_menu(ca, day=None):
+        await asyncio.sleep(UPSTREAM_LATENCY)
+        return {"daily_menus": [{"date": day, "menus": ["백미밥", "된장국"]}], "week_info": day}
+
+    async def fake_shuttle(day_type, route):
+        await asyncio.sleep(UPSTREAM_LATENCY)
+        return {"route_info": [route], "notice": "", "table_html": SHUTTLE_TABLE}
+
+    cafeteria.fetch_cafeteria_menu = fake_menu
+    shuttle.fetch_shuttle_schedule = fake_shuttle
+
+    app = FastAPI()
+    app.include_router(cafeteria.router, prefix="/api")
+    app.include_router(shuttle.router, prefix="/api")
+    shuttle.load_shuttle_snapshots()
+
+    with TestClient(app) as client:
+        ready = time.perf_counter()
+        for kind in ("student", "orange", "staff"):
+            assert client.get(f"/api/cafeteria/menu/{kind}").status_code == 200
+        assert client.get("/api/shuttle/next?route=asan_ktx&day_type=weekday").status_code == 200
+        done = time.perf_counter()
+
+    print(json.dumps({"startup": ready - started, "first_response": done - started}))
+
+
+def run_child(store_path: str) -> dict:
+    env = dict(os.environ, SNAPSHOT_STORE_PATH=store_path)
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_warm_start", "--child"],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    print(f"upstream 지연 {UPSTREAM_LATENCY:.1f}s 가정, 식단 3곳 + 셔틀 1노선 첫 조회")
+    with tempfile.TemporaryDirectory() as tmp:
+        cold, warm = [], []
+        for i in range(RUNS):
+            store_path = os.path.join(tmp, f"snapshots-{i}.db")
+            cold.append(run_child(store_path))  # 빈 저장소 → upstream 조회 후 저장
+            warm.append(run_child(store_path))  # 재시작 → 디스크 스냅샷
+
+    def median(results, field):
+        values = sorted(r[field] for r in results)
+        return values[len(values) // 2] * 1000
+
+    print(f"{'':<22}{'시작(ms)':>12}{'첫 응답(ms)':>14}")
+    print(f"{'디스크 스냅샷 없음':<22}{median(cold, 'startup'):>12.0f}{median(cold, 'first_response'):>14.0f}")
+    print(f"{'디스크 스냅샷 있음':<22}{median(warm, 'startup'):>12.0f}{median(warm, 'first_response'):>14.0f}")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        child()
+    else:
+        main()
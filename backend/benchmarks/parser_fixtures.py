@@ -0,0 +1,285 @@
+"""
+파서 벤치마크용 크기별 픽스처 생성기
+
+benchmarks/fixtures의 기록된 페이지({이름}.typical.*)를 그대로 typical로 두고, 같은 구조에서
+small(빈 주/몇 행만 있는 페이지)과 worst(행·항목이 가장 많은 페이지)를 만들어
+같은 디렉터리에 {이름}.{크기}.{확장자}로 저장한다. EARS 출석부(JSON)와 Canvas 공지
+페이지는 기록본이 없어 실제 응답 구조를 본떠 세 크기 모두 생성한다.
+
+출력이 결정적(seed 고정)이므로 구조를 바꿀 때만 다시 실행한다.
+
+실행: cd backend && python -m benchmarks.parser_fixtures
+"""
+import json
+import os
+import random
+import re
+from unittest import mock
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+SEED = 42
+
+# 기록된 페이지 (생성하지 않고 typical로 그대로 쓴다)
+RECORDED_TYPICAL = {
+    "timetable": "timetable.typical.txt",
+    "cafeteria": "cafeteria.typical.html",
+    "shuttle": "shuttle.typical.html",
+    "notices": "notices.typical.html",
+    "mileage": "mileage.typical.html",
+    "syllabus": "syllabus.typical.html",
+}
+
+_DATA_ROW_RE = re.compile(r'^<tr><td>.*</tr>$', re.M)
+_MENU_CELL_RE = re.compile(r'<td>([^<]*(?:<br/>[^<]*)*)</td>')
+_EMPTY_MENU_CELL = "<td></td>"
+_DELTA_LENGTH_RE = re.compile(r'\|(\d+)\|updatePanel\|')
+
+
+def load(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def resize_rows(html: str, count: int) -> str:
+    """tbody 데이터 행(<tr><td>로 시작하는 줄)을 count개로 자르거나 순환 반복"""
+    rows = _DATA_ROW_RE.findall(html)
+    resized = [rows[i % len(rows)] for i in range(count)]
+    first, last = _DATA_ROW_RE.search(html), list(_DATA_ROW_RE.finditer(html))[-1]
+    return html[:first.start()] + "\n".join(resized) + html[last.end():]
+
+
+# ── 시간표 ───────────────────────────────────────────────
+
+def _timetable_cell(subject: str, professor: str, room: str) -> str:
+    return f'<td class="tt_cell"><span class="subj">{subject}</span><br>01<br>{professor}<br>{room}</td>'
+
+
+def timetable_delta(cells: dict) -> str:
+    """(교시, 요일) → (과목, 교수, 강의실) 배치로 기록본과 같은 형식의 AJAX delta 생성"""
+    from app.services.parsing.timetable import DAYS, PERIOD_TIMES
+
+    recorded = load(RECORDED_TYPICAL["timetable"])
+    start, end = recorded.find('<table'), recorded.rfind('</table>') + len('</table>')
+    head = recorded[start:recorded.find('<tbody>') + len('<tbody>')]
+
+    rows = []
+    for period, (begin, _) in PERIOD_TIMES.items():
+        tds = []
+        for day in range(len(DAYS)):
+            cell = cells.get((period, day))
+            tds.append(_timetable_cell(*cell) if cell else "<td>&nbsp;</td>")
+        rows.append(f"<tr><th>{period}교시<br>{begin.lstrip('0')}</th>{''.join(tds)}</tr>")
+    table = head + "".join(rows) + "</tbody></table>"
+
+    # 업데이트 패널 길이 필드를 바뀐 표 길이에 맞춘다
+    prefix = _DELTA_LENGTH_RE.sub(
+        lambda m: f"|{int(m.group(1)) + len(table) - (end - start)}|updatePanel|", recorded[:start], count=1
+    )
+    return prefix + table + recorded[end:]
+
+
+def timetable_small() -> str:
+    return timetable_delta({
+        (1, 0): ("채플", "교목실", "본관 대강당"),
+        (3, 2): ("대학영어", "김민수", "인문관 204"),
+    })
+
+
+def timetable_worst(rng: random.Random) -> str:
+    """70칸 전부 수업 (2~3교시 연강이 섞여 병합 대상이 가장 많은 주)"""
+    subjects = [f"전공과목{i:02d}" for i in range(24)]
+    cells = {}
+    for day in range(5):
+        period = 0
+        while period <= 13:
+            length = rng.choice((1, 2, 3))
+            subject = rng.choice(subjects)
+            for offset in range(length):
+                if period + offset <= 13:
+                    cells[(period + offset, day)] = (subject, f"교수{subjects.index(subject)}", f"공학관 {300 + day}")
+            period += length
+    return timetable_delta(cells)
+
+
+def unmerged_schedules(delta: str) -> list:
+    """parse_timetable이 병합 직전에 만드는 교시별 수업 목록 (merge_consecutive_classes 입력)"""
+    from app.services.parsing import timetable
+
+    with mock.patch.object(timetable, "merge_consecutive_classes", lambda schedules: schedules):
+        return timetable.parse_timetable(delta)
+
+
+# ── 식단 ─────────────────────────────────────────────────
+
+def cafeteria_small() -> str:
+    """방학 주: 표는 있지만 모든 칸이 빈 페이지"""
+    return _MENU_CELL_RE.sub(_EMPTY_MENU_CELL, load(RECORDED_TYPICAL["cafeteria"]))
+
+
+def cafeteria_worst() -> str:
+    """주말까지 모든 칸이 차 있고 칸마다 메뉴가 3배인 페이지"""
+    html = load(RECORDED_TYPICAL["cafeteria"])
+    filled = [m.group(1) for m in _MENU_CELL_RE.finditer(html) if m.group(1)]
+    counter = iter(range(10**6))
+
+    def replace(match):
+        items = filled[next(counter) % len(filled)]
+        return "<td>" + "<br/>".join([items] * 3) + "</td>"
+
+    return _MENU_CELL_RE.sub(replace, html)
+
+
+# ── 셔틀 / 공지 목록 ──────────────────────────────────────
+
+def shuttle_small() -> str:
+    return resize_rows(load(RECORDED_TYPICAL["shuttle"]), 4)
+
+
+def shuttle_worst() -> str:
+    return resize_rows(load(RECORDED_TYPICAL["shuttle"]), 160)
+
+
+def notices_small() -> str:
+    return resize_rows(load(RECORDED_TYPICAL["notices"]), 3)
+
+
+def notices_worst() -> str:
+    """pageSize=100으로 요청한 목록 페이지"""
+    return resize_rows(load(RECORDED_TYPICAL["notices"]), 100)
+
+
+# ── 마일리지 ─────────────────────────────────────────────
+
+def mileage_small() -> str:
+    """표만 있는 최소 페이지"""
+    html = load(RECORDED_TYPICAL["mileage"])
+    return "<html><body>" + html[html.find("<table"):html.rfind("</table>") + len("</table>")] + "</body></html>"
+
+
+def mileage_worst() -> str:
+    """tbody id가 빠져 대체 경로(a_C 셀 탐색)로 찾아야 하고, 메뉴가 20배인 페이지"""
+    html = load(RECORDED_TYPICAL["mileage"]).replace(' id="tbMileageList"', "")
+    menu_start = html.find('<ul class="gnb">')
+    menu_end = html.find("</ul>", menu_start) + len("</ul>")
+    return html[:menu_start] + html[menu_start:menu_end] * 20 + html[menu_end:]
+
+
+# ── EARS 출석부 (JSON) ────────────────────────────────────
+
+ATTEND_KINDS = ["2", "2", "2", "2", "12", "3", "1", "4", "92", "5"]
+
+
+def ears_rollbook(rng: random.Random, slots: int, weeks: int, students: int) -> dict:
+    """iwin_st_chulseokbu 응답 (대상 학생은 명단 마지막 → 학생 탐색이 가장 긴 경우)"""
+    student_ids = [f"2024{i:04d}" for i in range(students)]
+    rollbook = []
+    for slot in range(slots):
+        week_infos = []
+        for week in range(1, weeks + 1):
+            week_infos.append({
+                "sugang_order": week,
+                "sugang_date": f"{3 + (week - 1) // 4:02d}{1 + ((week - 1) % 4) * 7 + slot:02d}",
+                "sugangAttendLogList": [
+                    {"sugang_student_id": sid, "sugang_attend_kind": rng.choice(ATTEND_KINDS)}
+                    for sid in student_ids
+                ],
+            })
+        rollbook.append({
+            "sugang_code": f"CS2001-0{slot + 1}",
+            "sugang_name": "자료구조",
+            "sugang_sub_code": "CS2001",
+            "sugang_department_name": "컴퓨터공학부",
+            "professor_name": "홍길동",
+            "class_room": "공학관 301",
+            "sugang_points": "3",
+            "sugang_week": str(1 + slot * 2),
+            "sugang_starttime": f"{9 + slot:02d}30",
+            "sugangWeekInfoForJspList": week_infos,
+        })
+    rollbook_user = [
+        {
+            "sugang_student_id": sid,
+            "attendCountResultList": [
+                {"sugang_order": week, "attend_count": rng.randrange(3), "absent_count": rng.randrange(2),
+                 "late_count": rng.randrange(2), "early_count": 0, "none_count": rng.randrange(2)}
+                for week in range(1, weeks + 1)
+            ],
+        }
+        for sid in student_ids
+    ]
+    return {"rollbook": rollbook, "rollbookuser": rollbook_user, "target_student_id": student_ids[-1]}
+
+
+# ── Canvas 공지 상세 ─────────────────────────────────────
+
+def canvas_announcement(rng: random.Random, paragraphs: int, images: int, env_kb: int) -> str:
+    """
+    discussion_topics/{id} 페이지: 큰 ENV 스크립트 + 좌측 메뉴 + 본문
+    본문 이미지는 Canvas 밖 주소라 파서가 다운로드하지 않는다 (네트워크 제외, 파싱만 측정)
+    """
+    env = json.dumps({"ENV": {f"feature_{i}": "x" * 48 for i in range(env_kb * 1024 // 64)}})
+    nav = "".join(f'<li class="section"><a href="/courses/1234/tab{i}">메뉴 {i}</a></li>' for i in range(14))
+    body = []
+    for i in range(paragraphs):
+        body.append(
+            f"<p>{i + 1}. 과제 제출 기한과 평가 기준을 안내합니다. "
+            f'<a href="/courses/1234/assignments/{5000 + i}">과제 {i + 1}</a> 및 '
+            f'<a href="https://www.sunmoon.ac.kr/notice/{i}">학교 공지</a>를 확인하세요.</p>'
+        )
+        if i < images:
+            body.append(f'<p><img src="https://www.sunmoon.ac.kr/upload/{rng.randrange(10**6)}.png" alt="첨부 {i}"></p>')
+    return (
+        "<!DOCTYPE html><html><head><title>공지</title>"
+        f"<script>{env}</script></head><body>"
+        f'<nav id="breadcrumbs"><ul><li><a href="/">대시보드</a></li><li><a href="/courses/1234">자료구조(01)</a></li>'
+        f'<li><a href="/courses/1234/announcements">공지</a></li></ul></nav>'
+        f'<div id="left-side"><ul id="section-tabs">{nav}</ul></div>'
+        '<div id="content"><div class="discussion-section">'
+        '<h1 class="discussion-title">중간고사 일정 및 과제 안내</h1>'
+        '<a class="author" href="/courses/1234/users/77">홍길동</a>'
+        f'<div class="message user_content enhanced">{"".join(body)}</div>'
+        "</div></div></body></html>"
+    )
+
+
+def build() -> dict:
+    """생성할 픽스처 (파일명 → 내용)"""
+    rng = random.Random(SEED)
+    files = {
+        "timetable.small.txt": timetable_small(),
+        "timetable.worst.txt": timetable_worst(rng),
+        "cafeteria.small.html": cafeteria_small(),
+        "cafeteria.worst.html": cafeteria_worst(),
+        "shuttle.small.html": shuttle_small(),
+        "shuttle.worst.html": shuttle_worst(),
+        "notices.small.html": notices_small(),
+        "notices.worst.html": notices_worst(),
+        "mileage.small.html": mileage_small(),
+        "mileage.worst.html": mileage_worst(),
+        "ears.small.json": ears_rollbook(rng, slots=1, weeks=4, students=1),
+        "ears.typical.json": ears_rollbook(rng, slots=2, weeks=15, students=5),
+        "ears.worst.json": ears_rollbook(rng, slots=3, weeks=16, students=60),
+        "canvas_announcement.small.html": canvas_announcement(rng, paragraphs=1, images=0, env_kb=8),
+        "canvas_announcement.typical.html": canvas_announcement(rng, paragraphs=8, images=2, env_kb=64),
+        "canvas_announcement.worst.html": canvas_announcement(rng, paragraphs=80, images=40, env_kb=128),
+    }
+    for size, delta in (("small", files["timetable.small.txt"]),
+                        ("typical", load(RECORDED_TYPICAL["timetable"])),
+                        ("worst", files["timetable.worst.txt"])):
+        files[f"timetable_merge.{size}.json"] = unmerged_schedules(delta)
+    return files
+
+
+def main():
+    for name, content in build().items():
+        path = os.path.join(FIXTURES, name)
+        with open(path, "w", encoding="utf-8") as f:
+            if isinstance(content, str):
+                f.write(content)
+            else:
+                json.dump(content, f, ensure_ascii=False, separators=(",", ":"))
+        print(f"{name:<36}{os.path.getsize(path) / 1024:>8.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
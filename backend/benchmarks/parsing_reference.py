@@ -0,0 +1,469 @@
+"""
+파서 포팅 전 구현 (BeautifulSoup html.parser / 정규식)
+
+app.services.parsing의 lxml 구현과 출력이 같은지 확인하고
+속도를 비교하기 위한 기준 구현. 원본 코드를 그대로 옮겨 두었다.
+"""
+import re
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from app.services.parsing.notices import VIEW_URL, parse_notice_date
+from app.services.parsing.shuttle import clean_text, format_notice
+from app.services.parsing.timetable import merge_consecutive_classes
+
+
+# ==================== cafeteria ====================
+
+def preprocess_html(html: str) -> str:
+    """HTML 전처리 - 비정상적인 태그 수정"""
+    # </br>를 <br>로 변환
+    html = re.sub(r'</br>', '<br>', html, flags=re.IGNORECASE)
+    # <br>를 표준 형식으로
+    html = re.sub(r'<br\s*/?>', '<br/>', html, flags=re.IGNORECASE)
+
+    # 잘못된 행 닫힘 수정: </td> 또는 </th> 뒤에 오는 <tr>을 </tr>로 변환
+    # 패턴: </td>    <tr> -> </td></tr>
+    html = re.sub(r'(</td>)\s*<tr>\s*(?=<tr|</thead|</tbody|</table|\Z)', r'\1</tr>', html, flags=re.IGNORECASE)
+    html = re.sub(r'(</th>)\s*<tr>\s*(?=<tr|</thead|</tbody|</table|\Z)', r'\1</tr>', html, flags=re.IGNORECASE)
+
+    # 반복 적용 (중첩된 경우)
+    for _ in range(3):
+        html = re.sub(r'(</td>)\s*<tr>\s*(?=<tr|</thead|</tbody|</table|\Z)', r'\1</tr>', html, flags=re.IGNORECASE)
+
+    # 단독 빈 <tr> 제거
+    html = re.sub(r'<tr>\s*</tr>', '', html, flags=re.IGNORECASE)
+    html = re.sub(r'<tr>\s*(?=</tbody>|</thead>|</table>)', '', html, flags=re.IGNORECASE)
+
+    return html
+
+
+def extract_menu_items(cell) -> List[str]:
+    """셀에서 메뉴 항목 추출 (br 태그로 구분)"""
+    # br 태그를 특수 구분자로 치환
+    cell_html = str(cell)
+    # </br> 및 다양한 br 형식 처리
+    cell_html = re.sub(r'</br>', '|||', cell_html, flags=re.IGNORECASE)
+    cell_html = re.sub(r'<br\s*/?>', '|||', cell_html, flags=re.IGNORECASE)
+
+    # 다시 파싱해서 텍스트만 추출
+    cell_soup = BeautifulSoup(cell_html, 'html.parser')
+    text = cell_soup.get_text()
+
+    # 구분자로 분리하고 정리
+    items = [item.strip() for item in text.split('|||') if item.strip()]
+    return items
+
+
+def parse_menu_html(html: str) -> dict:
+    """식단 HTML 파싱"""
+    # HTML 전처리 (비정상 태그 수정)
+    html = preprocess_html(html)
+    soup = BeautifulSoup(html, 'html.parser')
+
+    result = {
+        "cafeteria_name": "",
+        "operating_info": [],
+        "date_range": "",
+        "menu_categories": [],
+        "daily_menus": []
+    }
+
+    # 운영 정보 추출
+    info_list = soup.find('ul', class_='bu_dot')
+    if info_list:
+        for li in info_list.find_all('li'):
+            text = li.get_text(strip=True)
+            if text:
+                result["operating_info"].append(text)
+
+    # 테이블 파싱
+    table = soup.find('table')
+    if not table:
+        return result
+
+    # 날짜 범위 추출
+    date_span = soup.find('span', class_='tit_day')
+    if date_span:
+        result["date_range"] = date_span.get_text(strip=True)
+
+    # thead에서 카테고리 추출
+    thead = table.find('thead')
+    if thead:
+        header_rows = thead.find_all('tr')
+        for row in header_rows:
+            ths = row.find_all('th')
+            # '일자' 헤더가 있는 행 찾기
+            if ths and ths[0].get_text(strip=True) == '일자':
+                for th in ths[1:]:
+                    cat_text = th.get_text(strip=True)
+                    if cat_text:
+                        result["menu_categories"].append(cat_text)
+                break
+
+    # tbody에서 일별 메뉴 추출
+    tbody = table.find('tbody')
+    if tbody:
+        rows = tbody.find_all('tr')
+    else:
+        rows = table.find_all('tr')
+
+    for row in rows:
+        # 첫 번째 셀에서 날짜 찾기
+        first_cell = row.find(['th', 'td'])
+        if not first_cell:
+            continue
+
+        date_text = first_cell.get_text(strip=True)
+
+        # 날짜 형식 확인 (예: "03.02 (월)" 또는 "03.02(월)")
+        if not re.match(r'\d{2}\.\d{2}', date_text):
+            continue
+
+        # 메뉴 셀들 찾기 (td만)
+        menu_cells = row.find_all('td')
+
+        if not menu_cells:
+            continue
+
+        day_menu = {
+            "date": date_text,
+            "menus": []
+        }
+
+        for td in menu_cells:
+            menu_items = extract_menu_items(td)
+            day_menu["menus"].append(menu_items)
+
+        result["daily_menus"].append(day_menu)
+
+    return result
+
+
+# ==================== shuttle ====================
+
+def parse_shuttle_html(html: str, route: str) -> dict:
+    """셔틀버스 HTML에서 테이블 추출"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    result = {
+        "route": route,
+                "route_info": "",
+        "notice": {
+            "holidays": [],
+            "bus_info": [],
+            "general": []
+        },
+        "table_html": ""
+    }
+
+    # 노선 정보 추출 (grayBox 내의 정보)
+    gray_box = soup.find('div', class_='grayBox')
+    if gray_box:
+        route_info_parts = []
+        title = gray_box.find('h4', class_='title22')
+        if title:
+            route_info_parts.append(clean_text(title.get_text()))
+
+        for p in gray_box.find_all('p', class_='blue_gray'):
+            text = clean_text(p.get_text())
+            if text:
+                route_info_parts.append(text)
+
+        result["route_info"] = ' / '.join(route_info_parts)
+
+    # 테이블 HTML 추출 (table_type2 div 내의 테이블)
+    table_div = soup.find('div', class_='table_type2')
+    if table_div:
+        # 빈 table 태그 제거하고 실제 테이블만 추출
+        tables = table_div.find_all('table')
+        for table in tables:
+            # thead나 tbody가 있는 테이블만 사용
+            if table.find('thead') or table.find('tbody') or table.find('tr'):
+                # 테이블 내용이 있는지 확인
+                if table.get_text(strip=True):
+                    result["table_html"] = str(table)
+                    break
+
+    # 안내사항 추출
+    notice_texts = []
+
+    # mgT30 div에서 안내사항 추출
+    content_div = soup.find('div', id='tabcontent22') or soup.find('div', class_='shuttle_wrap')
+    if content_div:
+        for div in content_div.find_all('div', class_='mgT30'):
+            # 테이블이 아닌 텍스트만
+            if not div.find('table'):
+                # 각 span/text 요소별로 텍스트 추출
+                text = div.get_text(separator='\n')
+                if text and ('*' in text or '안내' in text or '운행' in text or '-' in text):
+                    notice_texts.append(text)
+
+    # 안내사항 분류
+    if notice_texts:
+        combined = '\n'.join(notice_texts)
+        result["notice"] = format_notice(combined)
+
+    return result
+
+
+# ==================== notices ====================
+
+def extract_form_data(html: str) -> Dict[str, str]:
+    """HTML에서 ASP.NET 폼 데이터 추출"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    form_data = {}
+
+    # Hidden fields 추출
+    hidden_fields = [
+        '__VIEWSTATE', '__VIEWSTATEGENERATOR', '__EVENTVALIDATION',
+        '__SCROLLPOSITIONX', '__SCROLLPOSITIONY',
+        'ctl00$ContentPlaceHolder_Main$BoardList$hidBoardCode',
+        'ctl00$ContentPlaceHolder_Main$BoardList$txtSearch',
+        'ctl00$ContentPlaceHolder_Main$BoardList$pagPager$hidItemTotal',
+        'ctl00$ContentPlaceHolder_Main$BoardList$pagPager$hidCurPage',
+        'ctl00$ContentPlaceHolder_Main$BoardList$pagPager$hidItemInOnePage',
+        'ctl00$ContentPlaceHolder_Main$BoardList$pagPager$hidPagesInScreen'
+    ]
+
+    for field in hidden_fields:
+        element = soup.find('input', {'name': field})
+        if element:
+            form_data[field] = element.get('value', '')
+
+    return form_data
+
+
+def parse_notices(html: str) -> List[Dict]:
+    """HTML에서 공지사항 목록 파싱"""
+    soup = BeautifulSoup(html, 'html.parser')
+    notices = []
+
+    table = soup.find('div', class_='table_list')
+    if not table:
+        return notices
+
+    rows = table.find('tbody')
+    if not rows:
+        return notices
+
+    for row in rows.find_all('tr'):
+        cols = row.find_all('td')
+        if len(cols) < 6:
+            continue
+
+        try:
+            # 번호
+            num_text = cols[0].get_text(strip=True)
+            if not num_text.isdigit():
+                continue
+            notice_no = int(num_text)
+
+            # 카테고리
+            category_span = cols[1].find('span', class_='cate')
+            category = category_span.get_text(strip=True) if category_span else "일반"
+
+            # 제목과 링크
+            title_td = cols[2]
+            title_link = title_td.find('a')
+            if not title_link:
+                continue
+
+            title = title_link.get_text(strip=True)
+            href = title_link.get('href', '')
+
+            # URL에서 no와 cp 파라미터 추출
+            no_match = re.search(r'no=(\d+)', href)
+            cp_match = re.search(r'cp=(\d+)', href)
+
+            if no_match:
+                external_url = f"{VIEW_URL}?no={no_match.group(1)}"
+                if cp_match:
+                    external_url += f"&cp={cp_match.group(1)}"
+            else:
+                external_url = f"https://lily.sunmoon.ac.kr{href}" if href.startswith('/') else href
+
+            # 작성자
+            writer = cols[3].get_text(strip=True)
+
+            # 날짜
+            notice_date = parse_notice_date(cols[4].get_text(strip=True))
+
+            # 조회수
+            views_text = cols[5].get_text(strip=True)
+            views = int(views_text) if views_text.isdigit() else 0
+
+            notices.append({
+                'notice_no': notice_no,
+                'title': title,
+                'category': category,
+                'writer': writer,
+                'notice_date': notice_date,
+                'views': views,
+                'external_url': external_url
+            })
+        except Exception as e:
+            print(f"공지 파싱 오류: {e}")
+            continue
+
+    return notices
+
+
+# ==================== timetable ====================
+
+def parse_timetable(html: str) -> list:
+    """시간표 HTML에서 수업 정보 파싱"""
+    schedules = []
+    colors = ["#3B82F6", "#0EA5E9", "#06B6D4", "#8B5CF6", "#F59E0B", "#10B981", "#EF4444", "#EC4899"]
+    color_idx = 0
+    subject_colors = {}
+
+    period_times = {
+        0: ("08:30", "09:20"),
+        1: ("09:30", "10:20"),
+        2: ("10:30", "11:20"),
+        3: ("11:30", "12:20"),
+        4: ("12:30", "13:20"),
+        5: ("13:30", "14:20"),
+        6: ("14:30", "15:20"),
+        7: ("15:30", "16:20"),
+        8: ("16:30", "17:20"),
+        9: ("17:30", "18:20"),
+        10: ("18:30", "19:20"),
+        11: ("19:30", "20:20"),
+        12: ("20:30", "21:20"),
+        13: ("21:30", "22:20"),
+    }
+
+    days = ["월", "화", "수", "목", "금"]
+
+    # tbody 내의 tr들 파싱
+    rows = re.findall(r'<tr>(.*?)</tr>', html, re.DOTALL)
+
+    period_idx = -1
+    for row in rows:
+        # 교시 정보 확인
+        period_match = re.search(r'(\d+)교시', row)
+        if period_match:
+            period_idx = int(period_match.group(1))
+
+        if period_idx < 0 or period_idx > 13:
+            continue
+
+        # td 셀들 추출
+        cells = re.findall(r'<td[^>]*>(.*?)</td>', row, re.DOTALL)
+
+        for day_idx, cell in enumerate(cells[:5]):
+            if '&nbsp;' in cell or not cell.strip():
+                continue
+
+            # 과목명 추출
+            cell_clean = re.sub(r'<[^>]+>', '\n', cell)
+            lines = [l.strip() for l in cell_clean.split('\n') if l.strip()]
+
+            if not lines:
+                continue
+
+            subject = lines[0]
+            class_num = lines[1] if len(lines) > 1 else ""
+            professor = lines[2] if len(lines) > 2 else ""
+            room = lines[3] if len(lines) > 3 else ""
+
+            if subject in ['', '&nbsp;']:
+                continue
+
+            # 색상 할당
+            if subject not in subject_colors:
+                subject_colors[subject] = colors[color_idx % len(colors)]
+                color_idx += 1
+
+            start_time, end_time = period_times.get(period_idx, ("09:00", "10:00"))
+
+            schedules.append({
+                "day": days[day_idx],
+                "start_time": start_time,
+                "end_time": end_time,
+                "subject": subject,
+                "professor": professor,
+                "room": room,
+                "color": subject_colors[subject]
+            })
+
+    # 연속 수업 병합
+    return merge_consecutive_classes(schedules)
+
+
+# ==================== mileage ====================
+
+def find_mileage_values(html: str) -> Optional[List[int]]:
+    """마일리지 HTML 파싱 (원본 parse_mileage_html의 td 탐색 부분)"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    def get_value(td) -> int:
+        text = td.get_text(strip=True)
+        try:
+            return int(text)
+        except:
+            return 0
+
+    # 방법 1: tbody id='tbMileageList'에서 찾기
+    tbody = soup.find('tbody', id='tbMileageList')
+    if tbody:
+        tr = tbody.find('tr')
+        if tr:
+            tds = tr.find_all('td')
+            if len(tds) >= 19:
+                return [get_value(td) for td in tds[:19]]
+
+    # 방법 2: class='a_C'인 td들 직접 찾기
+    tds = soup.find_all('td', class_='a_C')
+    if len(tds) >= 19:
+        return [get_value(td) for td in tds[:19]]
+
+    # 방법 3: 모든 tr에서 td 19개 이상 있는 행 찾기
+    for tr in soup.find_all('tr'):
+        tds = tr.find_all('td')
+        if len(tds) >= 19:
+            return [get_value(td) for td in tds[:19]]
+
+    return None
+
+
+# ==================== syllabus ====================
+
+def parse_syllabus_html(html: str) -> dict:
+    """수업 계획서 HTML에서 내용 파싱"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    result = {
+        'syllabus_html': '',
+        'grading_weights': []
+    }
+
+    # 수업 계획서 본문 추출
+    syllabus_div = soup.find('div', id='course_syllabus')
+    if syllabus_div:
+        result['syllabus_html'] = str(syllabus_div)
+
+    # 평가 비중 추출
+    grading_div = soup.find('div', attrs={'aria-label': '과제 비중'})
+    if grading_div:
+        table = grading_div.find('table', class_='summary')
+        if table:
+            tbody = table.find('tbody')
+            if tbody:
+                for tr in tbody.find_all('tr'):
+                    th = tr.find('th', scope='row')
+                    td = tr.find('td')
+                    if th and td:
+                        result['grading_weights'].append({
+                            'group': th.get_text(strip=True),
+                            'weight': td.get_text(strip=True),
+                            'is_total': 'font-weight' in (tr.get('style') or '')
+                        })
+
+    return result
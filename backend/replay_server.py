@@ -0,0 +1,35 @@
+"""
+HAR 재생 서버 실행 스크립트
+학교 서버 대신 기록된 HAR 응답을 돌려준다 (부하 테스트/벤치마크용).
+
+실행: python replay_server.py --har ../info.sunmoon.ac.kr.har [--har 추가.har] [--port 8799]
+백엔드 설정: UPSTREAM_REPLAY_URL=http://127.0.0.1:8799
+"""
+import argparse
+
+import uvicorn
+
+from app.services.har_replay import HarStore, create_replay_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HAR 재생 서버")
+    parser.add_argument("--har", action="append", required=True, help="HAR 파일 (여러 번 지정 가능)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--hosts", default="sunmoon.ac.kr,*.sunmoon.ac.kr",
+                        help="재생할 upstream 호스트 패턴 (콤마 구분)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="모든 응답에 더할 지연 (ms)")
+    parser.add_argument("--recorded-timing", action="store_true", help="HAR에 기록된 응답 시간만큼 지연")
+    args = parser.parse_args()
+
+    hosts = [host.strip() for host in args.hosts.split(",") if host.strip()]
+    store = HarStore.from_files(args.har, hosts)
+    print(f"[Replay] {len(args.har)}개 파일, 응답 {store.size}개 로드")
+
+    app = create_replay_app(store, latency_ms=args.latency_ms, recorded_timing=args.recorded_timing)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
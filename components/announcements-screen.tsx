@@ -9,14 +9,14 @@ interface Announcement {
   id: number
   notice_no: number | null
   title: string
-  content: string | null
+  content?: string | null
   category: string
   writer: string | null
   notice_date: string | null
   views: number
   external_url: string | null
   is_new: number
-  created_at: string
+  created_at?: string
 }
 
 interface AnnouncementsScreenProps {
@@ -36,12 +36,15 @@ export function AnnouncementsScreen({ onBack }: AnnouncementsScreenProps) {
   const [isLoading, setIsLoading] = useState(true)
   const [selectedAnnouncement, setSelectedAnnouncement] = useState<Announcement | null>(null)
   const [isLoadingDetail, setIsLoadingDetail] = useState(false)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
 
   useEffect(() => {
     const fetchAnnouncements = async () => {
       try {
         const data = await announcementAPI.getAnnouncements()
-        setAnnouncements(data)
+        setAnnouncements(data.items)
+        setNextCursor(data.next_cursor)
       } catch (error) {
         console.error('공지사항 로딩 실패:', error)
       } finally {
@@ -51,6 +54,20 @@ export function AnnouncementsScreen({ onBack }: AnnouncementsScreenProps) {
     fetchAnnouncements()
   }, [])
 
+  const handleLoadMore = async () => {
+    if (!nextCursor || isLoadingMore) return
+    setIsLoadingMore(true)
+    try {
+      const data = await announcementAPI.getAnnouncements(undefined, nextCursor)
+      setAnnouncements((prev) => [...prev, ...data.items])
+      setNextCursor(data.next_cursor)
+    } catch (error) {
+      console.error('공지사항 추가 로딩 실패:', error)
+    } finally {
+      setIsLoadingMore(false)
+    }
+  }
+
   const handleAnnouncementClick = async (announcement: Announcement) => {
     // 이미 content가 있으면 바로 보여줌
     if (announcement.content) {
@@ -218,6 +235,16 @@ export function AnnouncementsScreen({ onBack }: AnnouncementsScreenProps) {
             )
           })
         )}
+
+        {nextCursor && (
+          <button
+            onClick={handleLoadMore}
+            disabled={isLoadingMore}
+            className="w-full py-3 text-sm font-medium text-muted-foreground bg-card rounded-2xl border border-border/50 disabled:opacity-50"
+          >
+            {isLoadingMore ? '불러오는 중...' : '더 보기'}
+          </button>
+        )}
       </div>
     </AppShell>
   )
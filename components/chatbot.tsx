@@ -45,7 +45,9 @@ export function Chatbot() {
   const [password, setPassword] = useState('')
   const [isInitializing, setIsInitializing] = useState(false)
   const [rid, setRid] = useState(1)
+  const [isStreaming, setIsStreaming] = useState(false)
   const messagesEndRef = useRef<HTMLDivElement>(null)
+  const streamAbortRef = useRef<AbortController | null>(null)
 
   useEffect(() => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' })
@@ -105,26 +107,40 @@ export function Chatbot() {
     setInput('')
     setIsLoading(true)
 
+    const controller = new AbortController()
+    streamAbortRef.current = controller
+
     try {
-      const response = await gptAPI.chat(
+      // 답변이 생성되는 대로 마지막 말풍선에 표시
+      const response = await gptAPI.chatStream(
         newMessages.map(m => ({ role: m.role, content: m.content })),
-        rid
+        rid,
+        (answer) => {
+          setIsStreaming(true)
+          setMessages([...newMessages, { role: 'assistant', content: answer }])
+        },
+        controller.signal
       )
       setMessages([...newMessages, { role: 'assistant', content: response.answer }])
       setRid(response.rid)
     } catch (error: any) {
-      if (error.message?.includes('세션')) {
+      if (error.name === 'AbortError') {
+        // 챗봇을 닫아 중단 - 받은 부분까지만 남김
+      } else if (error.message?.includes('세션')) {
         setIsSessionActive(false)
         setShowPasswordModal(true)
       } else {
         setMessages([...newMessages, { role: 'assistant', content: '죄송합니다. 오류가 발생했습니다. 다시 시도해주세요.' }])
       }
     } finally {
+      streamAbortRef.current = null
+      setIsStreaming(false)
       setIsLoading(false)
     }
   }
 
   const handleClose = () => {
+    streamAbortRef.current?.abort()
     setIsOpen(false)
     setShowPasswordModal(false)
   }
@@ -225,7 +241,7 @@ export function Chatbot() {
                       </div>
                     </div>
                   ))}
-                  {isLoading && (
+                  {isLoading && !isStreaming && (
                     <div className="self-start">
                       <div className="px-3 py-2 rounded-2xl rounded-tl-md bg-secondary">
                         <div className="flex gap-1">
@@ -3,7 +3,7 @@
 import { useState, useEffect } from 'react'
 import { Calendar, MessageCircle, MapPin, Users, LogOut, User, UserX, GraduationCap, Building2, Heart, Award, Bus, X, Nut, ShoppingBag } from 'lucide-react'
 import type { User as UserType } from '@/lib/store'
-import { authAPI, notificationAPI, bannerAPI, dotoriAPI } from '@/lib/api'
+import { authAPI, notificationAPI, dotoriAPI, dashboardAPI } from '@/lib/api'
 import { Chatbot } from './chatbot'
 import { DotoriShop } from './dotori-shop'
 
@@ -120,22 +120,22 @@ export function Dashboard({ user, onOpenApp, onLogout }: DashboardProps) {
     }
   }, [user.studentId, user.name])
 
-  // 배너/팝업 로드
+  // 대시보드 첫 화면 데이터 (배너, 팝업, 배지, 도토리, 랭킹, 선물) 한 번에 조회
   useEffect(() => {
     let cancelled = false
-    const loadBanners = async () => {
+    const loadDashboard = async () => {
       try {
-        const [bannerData, popupData] = await Promise.all([
-          bannerAPI.getMainBanner(),
-          bannerAPI.getPopup()
-        ])
+        const { sections } = await dashboardAPI.get(['banner', 'popup', 'badges', 'dotori', 'ranking', 'gifts'])
         if (cancelled) return
+        const ok = (name: string) => sections[name]?.status === 'ok' ? sections[name].data : null
 
-        if (bannerData.is_active) {
+        const bannerData = ok('banner')
+        if (bannerData?.is_active) {
           setMainBanner(bannerData)
         }
 
-        if (popupData.is_active) {
+        const popupData = ok('popup')
+        if (popupData?.is_active) {
           const dismissedDate = localStorage.getItem('popup_dismissed_date')
           const today = new Date().toDateString()
 
@@ -144,11 +144,30 @@ export function Dashboard({ user, onOpenApp, onLogout }: DashboardProps) {
             setShowPopup(true)
           }
         }
+
+        const badgesData = ok('badges')
+        if (badgesData) setBadges(badgesData)
+
+        const rankingData = ok('ranking')
+        if (rankingData) {
+          setRankings(rankingData.rankings || [])
+          setMyDeptRanking(rankingData.my_department || null)
+        }
+
+        const giftsData = ok('gifts')
+        if (giftsData?.gifts && giftsData.gifts.length > 0) {
+          setReceivedGifts(giftsData.gifts)
+          setCurrentGiftIndex(0)
+          setShowGiftPopup(true)
+        }
+
+        const info = ok('dotori')
+        if (info) await applyDotoriInfo(info, () => cancelled)
       } catch (err) {
         // 무시
       }
     }
-    loadBanners()
+    loadDashboard()
     return () => { cancelled = true }
   }, [])
 
@@ -162,7 +181,7 @@ export function Dashboard({ user, onOpenApp, onLogout }: DashboardProps) {
     setShowPopup(false)
   }
 
-  // 알림 배지 조회
+  // 알림 배지 갱신 (첫 조회는 대시보드 묶음 조회에서)
   useEffect(() => {
     let cancelled = false
     const fetchBadges = async () => {
@@ -173,7 +192,6 @@ export function Dashboard({ user, onOpenApp, onLogout }: DashboardProps) {
         // 무시
       }
     }
-    fetchBadges()
     // 60초마다 배지 갱신
     const interval = setInterval(fetchBadges, 60000)
     return () => { cancelled = true; clearInterval(interval) }
@@ -223,69 +241,26 @@ export function Dashboard({ user, onOpenApp, onLogout }: DashboardProps) {
     }
   }
 
-  // 도토리 정보 로드 + 자동 출석 체크
-  useEffect(() => {
-    let cancelled = false
-    const loadDotoriInfo = async () => {
+  // 도토리 정보 반영 + 자동 출석 체크
+  const applyDotoriInfo = async (info: any, isCancelled: () => boolean) => {
+    if (info.can_attend_today) {
       try {
-        const info = await dotoriAPI.getInfo()
-        if (cancelled) return
-
-        if (info.can_attend_today) {
-          try {
-            const attendResult = await dotoriAPI.checkAttendance()
-            if (cancelled) return
-            if (attendResult.success) {
-              setDotoriInfo({
-                ...info,
-                point: attendResult.total_point,
-                can_attend_today: false
-              })
-              setAttendanceMessage(attendResult.message)
-              setTimeout(() => setAttendanceMessage(null), 3000)
-              return
-            }
-          } catch { /* 출석 실패해도 info는 표시 */ }
+        const attendResult = await dotoriAPI.checkAttendance()
+        if (isCancelled()) return
+        if (attendResult.success) {
+          setDotoriInfo({
+            ...info,
+            point: attendResult.total_point,
+            can_attend_today: false
+          })
+          setAttendanceMessage(attendResult.message)
+          setTimeout(() => setAttendanceMessage(null), 3000)
+          return
         }
-        if (!cancelled) setDotoriInfo(info)
-      } catch { /* 무시 */ }
+      } catch { /* 출석 실패해도 info는 표시 */ }
     }
-    loadDotoriInfo()
-    return () => { cancelled = true }
-  }, [])
-
-  // 랭킹 조회 (독립 실행)
-  useEffect(() => {
-    let cancelled = false
-    const loadRanking = async () => {
-      try {
-        const rankingData = await dotoriAPI.getRanking()
-        if (cancelled) return
-        setRankings(rankingData.rankings || [])
-        setMyDeptRanking(rankingData.my_department || null)
-      } catch { /* 무시 */ }
-    }
-    loadRanking()
-    return () => { cancelled = true }
-  }, [])
-
-  // 읽지 않은 선물 확인 (독립 실행)
-  useEffect(() => {
-    let cancelled = false
-    const loadGifts = async () => {
-      try {
-        const giftsData = await dotoriAPI.getUnreadGifts()
-        if (cancelled) return
-        if (giftsData.gifts && giftsData.gifts.length > 0) {
-          setReceivedGifts(giftsData.gifts)
-          setCurrentGiftIndex(0)
-          setShowGiftPopup(true)
-        }
-      } catch { /* 무시 */ }
-    }
-    loadGifts()
-    return () => { cancelled = true }
-  }, [])
+    if (!isCancelled()) setDotoriInfo(info)
+  }
 
   // 상점에서 구매 완료 시 도토리 정보 갱신
   const handlePurchaseComplete = (newPoint: number, itemType: string, itemValue: string) => {
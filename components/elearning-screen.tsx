@@ -5,6 +5,8 @@ import { ArrowLeft, BookOpen, Video, FileText, MessageSquare, CheckCircle2, Cloc
 import { canvasAPI } from '@/lib/api'
 import { AttendanceScreen } from './attendance-screen'
 
+const WS_BASE_URL = process.env.NEXT_PUBLIC_WS_URL || 'ws://localhost:8000'
+
 interface TodoItem {
   section_id: number
   unit_id: number
@@ -179,6 +181,26 @@ export function ElearningScreen({ onBack }: ElearningScreenProps) {
     checkSessionAndLoad()
   }, [])
 
+  // 서버가 오래된 캐시를 먼저 응답한 뒤 백그라운드에서 갱신하면 사용자 알림 채널로 새 목록을 보낸다
+  useEffect(() => {
+    const token = localStorage.getItem('access_token')
+    if (!token) return
+
+    const ws = new WebSocket(`${WS_BASE_URL}/ws/user?token=${token}`)
+    ws.onmessage = (event) => {
+      const data = JSON.parse(event.data)
+      if (data.type === 'canvas_todos') {
+        setTodos(data.data?.to_dos || [])
+      } else if (data.type === 'canvas_courses') {
+        setCourses(data.data || [])
+      } else if (data.type === 'canvas_session_expired') {
+        setIsSessionActive(false)
+        setShowLoginModal(true)
+      }
+    }
+    return () => ws.close()
+  }, [])
+
   // 저장된 자격 증명으로 자동 로그인 시도
   const tryAutoLogin = async (): Promise<boolean> => {
     const creds = getCanvasCredentials()
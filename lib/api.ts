@@ -109,6 +109,40 @@ const getCredentials = (): { studentId: string, password: string } | null => {
   return null
 }
 
+// 본문 이미지 프록시 (sha256 → blob URL, 내용이 바뀌지 않으므로 한 번 받으면 재사용)
+const imageObjectUrls = new Map<string, Promise<string | null>>()
+
+const loadProxyImage = (digest: string): Promise<string | null> => {
+  let pending = imageObjectUrls.get(digest)
+  if (!pending) {
+    // <img>는 Authorization 헤더를 보내지 못하므로 토큰을 붙여 받아 blob URL로 사용
+    const token = getToken()
+    pending = fetchWithTimeout(`${API_BASE_URL}/images/${digest}`, {
+      headers: token ? { Authorization: `Bearer ${token}` } : {},
+    })
+      .then(async (response) => (response.ok ? URL.createObjectURL(await response.blob()) : null))
+      .catch(() => null)
+      .then((url) => {
+        if (!url) imageObjectUrls.delete(digest)
+        return url
+      })
+    imageObjectUrls.set(digest, pending)
+  }
+  return pending
+}
+
+// 본문 이미지 프록시 경로(/api/images/{sha256})를 인증해서 받은 blob URL로 변환
+export const resolveImageProxyUrls = async (html: string) => {
+  if (!html) return html
+  const pattern = /src="\/api\/images\/([0-9a-f]{64})"/g
+  const digests = Array.from(new Set(Array.from(html.matchAll(pattern), (match) => match[1])))
+  const urls = new Map(await Promise.all(digests.map(async (digest) => [digest, await loadProxyImage(digest)] as const)))
+  return html.replace(pattern, (match, digest) => {
+    const url = urls.get(digest)
+    return url ? `src="${url}"` : match
+  })
+}
+
 // API 요청 헬퍼
 async function fetchAPI(endpoint: string, options: RequestInit = {}) {
   const token = getToken()
@@ -371,15 +405,19 @@ export const quickRoomAPI = {
 
 // 공지사항 API
 export const announcementAPI = {
-  // 목록 조회
-  getAnnouncements: async (category?: string) => {
-    const query = category ? `?category=${category}` : ''
-    return fetchAPI(`/announcements${query}`)
+  // 목록 조회 (요약 필드만, next_cursor로 다음 페이지 조회)
+  getAnnouncements: async (category?: string, cursor?: string | null, limit: number = 20) => {
+    const params = new URLSearchParams()
+    if (category) params.append('category', category)
+    if (cursor) params.append('cursor', cursor)
+    params.append('limit', String(limit))
+    return fetchAPI(`/announcements?${params.toString()}`)
   },
 
   // 상세 조회
   getAnnouncement: async (id: number) => {
-    return fetchAPI(`/announcements/${id}`)
+    const data = await fetchAPI(`/announcements/${id}`)
+    return data && { ...data, content: await resolveImageProxyUrls(data.content) }
   },
 }
 
@@ -487,8 +525,12 @@ export const randomChatAPI = {
 
 // GPT 세션 자동 재인증 래퍼
 async function fetchGptWithAutoRetry(endpoint: string, options: RequestInit = {}) {
+  return withGptAutoRetry(() => fetchAPI(endpoint, options))
+}
+
+async function withGptAutoRetry<T>(request: () => Promise<T>): Promise<T> {
   try {
-    return await fetchAPI(endpoint, options)
+    return await request()
   } catch (error: any) {
     // 401 에러이고 저장된 자격증명이 있으면 재인증 시도
     if (error.message?.includes('세션') || error.message?.includes('401') || error.message?.includes('로그인')) {
@@ -501,7 +543,7 @@ async function fetchGptWithAutoRetry(endpoint: string, options: RequestInit = {}
             body: JSON.stringify({ password: creds.password }),
           })
           // 원래 요청 재시도
-          return await fetchAPI(endpoint, options)
+          return await request()
         } catch (retryError) {
           throw error
         }
@@ -511,6 +553,75 @@ async function fetchGptWithAutoRetry(endpoint: string, options: RequestInit = {}
   }
 }
 
+// GPT 스트리밍 응답(SSE) 읽기 - 조각이 올 때마다 onAnswer(지금까지의 답변)
+async function streamGptAnswer(
+  messages: { role: string; content: string }[],
+  rid: number,
+  onAnswer: (answer: string) => void,
+  signal?: AbortSignal
+): Promise<{ answer: string; rid: number }> {
+  const token = getToken()
+  const headers: Record<string, string> = { 'Content-Type': 'application/json' }
+  if (token) {
+    headers['Authorization'] = `Bearer ${token}`
+  }
+
+  const response = await fetch(`${API_BASE_URL}/gpt/chat/stream`, {
+    method: 'POST',
+    headers,
+    body: JSON.stringify({ messages, rid }),
+    signal,
+  })
+
+  if (!response.ok || !response.body) {
+    const error = await response.json().catch(() => ({ detail: '요청 실패' }))
+    const message = response.status === 401
+      ? `401: ${error.detail || '인증 만료'}`
+      : (error.detail || '요청 실패')
+    throw new Error(message)
+  }
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  let answer = ''
+
+  while (true) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+
+    // 이벤트는 빈 줄로 구분 (event: 이름 / data: JSON)
+    let boundary
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+      let event = 'message'
+      let data = ''
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event:')) event = line.slice(6).trim()
+        else if (line.startsWith('data:')) data += line.slice(5).trim()
+      }
+      if (!data) continue
+
+      const payload = JSON.parse(data)
+      if (event === 'delta') {
+        answer += payload.delta
+        onAnswer(answer)
+      } else if (event === 'replace') {
+        answer = payload.answer
+        onAnswer(answer)
+      } else if (event === 'done') {
+        onAnswer(payload.answer)
+        return { answer: payload.answer, rid: payload.rid }
+      } else if (event === 'error') {
+        throw new Error(payload.detail || 'GPT 응답 오류')
+      }
+    }
+  }
+  throw new Error('GPT 응답이 중단되었습니다')
+}
+
 // GPT 챗봇 API
 export const gptAPI = {
   // 세션 초기화
@@ -533,6 +644,16 @@ export const gptAPI = {
       body: JSON.stringify({ messages, rid }),
     })
   },
+
+  // GPT와 대화 - 답변을 생성되는 대로 받음 (자동 재인증, signal로 중단)
+  chatStream: async (
+    messages: { role: string; content: string }[],
+    rid: number,
+    onAnswer: (answer: string) => void,
+    signal?: AbortSignal
+  ) => {
+    return withGptAutoRetry(() => streamGptAnswer(messages, rid, onAnswer, signal))
+  },
 }
 
 // 차단/신고 API
@@ -619,44 +740,45 @@ export const canvasAPI = {
     return fetchAPI('/canvas/status')
   },
 
-  // 할 일 목록 조회 (자동 재인증)
-  getTodos: async () => {
-    return fetchCanvasWithAutoRetry('/canvas/todos')
+  // 할 일 목록 조회 (자동 재인증, refresh: 서버 캐시 무시)
+  getTodos: async (refresh: boolean = false) => {
+    return fetchCanvasWithAutoRetry(`/canvas/todos${refresh ? '?refresh=true' : ''}`)
   },
 
-  // 수강 과목 목록 조회 (자동 재인증)
-  getCourses: async () => {
-    return fetchCanvasWithAutoRetry('/canvas/courses')
+  // 수강 과목 목록 조회 (자동 재인증, 캐시가 오래되면 /ws/user로 갱신 결과 푸시)
+  getCourses: async (refresh: boolean = false) => {
+    return fetchCanvasWithAutoRetry(`/canvas/courses${refresh ? '?refresh=true' : ''}`)
   },
 
-  // 과목별 공지사항 목록 조회 (자동 재인증)
-  getCourseAnnouncements: async (courseId: number) => {
-    return fetchCanvasWithAutoRetry(`/canvas/courses/${courseId}/announcements`)
+  // 과목별 공지사항 목록 조회 (자동 재인증, refresh: 과목 공유 캐시 무시)
+  getCourseAnnouncements: async (courseId: number, refresh: boolean = false) => {
+    return fetchCanvasWithAutoRetry(`/canvas/courses/${courseId}/announcements${refresh ? '?refresh=true' : ''}`)
   },
 
   // 공지사항 상세 조회 (자동 재인증)
   getAnnouncement: async (courseId: number, topicId: number) => {
-    return fetchCanvasWithAutoRetry(`/canvas/announcements/${courseId}/${topicId}`)
+    const data = await fetchCanvasWithAutoRetry(`/canvas/announcements/${courseId}/${topicId}`)
+    return data && { ...data, content: await resolveImageProxyUrls(data.content) }
   },
 
   // 과목별 게시판 목록 조회 (자동 재인증)
-  getCourseBoards: async (courseId: number) => {
-    return fetchCanvasWithAutoRetry(`/canvas/courses/${courseId}/boards`)
+  getCourseBoards: async (courseId: number, refresh: boolean = false) => {
+    return fetchCanvasWithAutoRetry(`/canvas/courses/${courseId}/boards${refresh ? '?refresh=true' : ''}`)
   },
 
   // 게시판 게시글 목록 조회 (자동 재인증)
-  getBoardPosts: async (courseId: number, boardId: number) => {
-    return fetchCanvasWithAutoRetry(`/canvas/courses/${courseId}/boards/${boardId}/posts`)
+  getBoardPosts: async (courseId: number, boardId: number, refresh: boolean = false) => {
+    return fetchCanvasWithAutoRetry(`/canvas/courses/${courseId}/boards/${boardId}/posts${refresh ? '?refresh=true' : ''}`)
   },
 
   // 과목 수강생 목록 조회 (자동 재인증)
-  getCourseUsers: async (courseId: number) => {
-    return fetchCanvasWithAutoRetry(`/canvas/courses/${courseId}/users`)
+  getCourseUsers: async (courseId: number, refresh: boolean = false) => {
+    return fetchCanvasWithAutoRetry(`/canvas/courses/${courseId}/users${refresh ? '?refresh=true' : ''}`)
   },
 
   // 수업 계획서 조회 (자동 재인증)
-  getCourseSyllabus: async (courseId: number) => {
-    return fetchCanvasWithAutoRetry(`/canvas/courses/${courseId}/syllabus`)
+  getCourseSyllabus: async (courseId: number, refresh: boolean = false) => {
+    return fetchCanvasWithAutoRetry(`/canvas/courses/${courseId}/syllabus${refresh ? '?refresh=true' : ''}`)
   },
 }
 
@@ -902,6 +1024,21 @@ export const notificationAPI = {
   },
 }
 
+// 대시보드 묶음 조회 API (섹션별 status: ok, timeout, unauthorized, error)
+export interface DashboardSection<T = any> {
+  status: 'ok' | 'timeout' | 'unauthorized' | 'error'
+  data: T | null
+  detail?: string
+  elapsed_ms: number
+}
+
+export const dashboardAPI = {
+  // 여러 섹션을 한 요청으로 동시 조회 (느린 섹션은 timeout으로 비워서 응답)
+  get: async (sections: string[]): Promise<{ sections: Record<string, DashboardSection> }> => {
+    return fetchAPI(`/dashboard?sections=${sections.join(',')}`)
+  },
+}
+
 // 셔틀버스 API
 export const shuttleAPI = {
   // 시간표 조회